@@ -0,0 +1,74 @@
+"""End-to-end ``POST /evidence/analyze`` with stub providers.
+
+``cold`` gives every request a new tenant so the analysis cache always
+misses and the full extract/map/score pipeline runs; ``warm`` repeats one
+tenant and measures the cached path.
+"""
+import itertools
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks.corpora import document, mime_type
+from benchmarks.stubs import StubLLMService
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from src.a3e.api.routes import user_intelligence_simple as uis
+    from src.a3e.services import analysis_cache
+    from src.a3e.services.analysis_cache import AnalysisCache
+    from src.a3e.services.user_kv_store import UserKVStore
+
+    async def no_user(identifier):
+        return None
+
+    async def no_record(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(uis, "get_user_uuid_from_email", no_user)
+    monkeypatch.setattr(uis, "_record_user_upload", no_record)
+    monkeypatch.setattr(uis, "_get_user_reviews", lambda claims, filename: {})
+    monkeypatch.setattr(analysis_cache, "_cache", AnalysisCache(UserKVStore(str(tmp_path / "kv.sqlite3"))))
+
+    # Route the AI mapping path through the stub LLM
+    if uis.USE_ENHANCED_MAPPER:
+        mapper = uis.enhanced_evidence_mapper
+        monkeypatch.setattr(uis.settings, "openai_api_key", "stub-key")
+        monkeypatch.setattr(mapper, "llm_service", StubLLMService())
+        monkeypatch.setattr(mapper, "_initialized", True)
+
+    app = FastAPI()
+    app.include_router(uis.router)
+    app.state.tenants = itertools.count()
+    app.dependency_overrides[uis.get_current_user_simple] = lambda: {"sub": "bench@example.edu"}
+    with TestClient(app) as test_client:
+        test_client.uis = uis
+        yield test_client
+
+
+@pytest.mark.benchmark(group="analyze_route")
+@pytest.mark.parametrize("cache", ["cold", "warm"])
+@pytest.mark.parametrize("kind,pages", [("pdf", 10), ("pdf", 100), ("docx", 10), ("xlsx", 10)])
+def bench_analyze_route(benchmark, client, kind, pages, cache):
+    blob = document(kind, pages)
+    uis = client.uis
+    path = f"{uis.router.prefix}/evidence/analyze"
+    files = {"file": (f"evidence.{kind}", blob, mime_type(kind))}
+    benchmark.extra_info.update(pages=pages, bytes=len(blob), ai=bool(uis.USE_ENHANCED_MAPPER))
+
+    def post():
+        response = client.post(path, files=files, data={"doc_type": "policy"})
+        assert response.status_code == 200, response.text
+        return response
+
+    if cache == "warm":
+        post()
+    else:
+        tenants = client.app.state.tenants
+        client.app.dependency_overrides[uis.get_current_user_simple] = (
+            lambda: {"sub": f"bench-{next(tenants)}@example.edu"}
+        )
+
+    benchmark.pedantic(post, rounds=5 if pages >= 100 else 10, iterations=1)
@@ -0,0 +1,21 @@
+import asyncio
+
+import pytest
+
+from benchmarks.corpora import PAGE_SIZES, document, mime_type, rounds_for
+from src.a3e.services.chunking_service import ArtifactChunker
+
+
+@pytest.mark.benchmark(group="chunker")
+@pytest.mark.parametrize("pages", PAGE_SIZES)
+@pytest.mark.parametrize("kind", ["pdf", "docx", "xlsx"])
+def bench_chunk(benchmark, kind, pages):
+    blob = document(kind, pages)
+    mime = mime_type(kind)
+    chunker = ArtifactChunker()
+    benchmark.extra_info.update(pages=pages, bytes=len(blob))
+
+    chunks = benchmark.pedantic(
+        lambda: asyncio.run(chunker.chunk(blob, mime)), rounds=rounds_for(pages), iterations=1
+    )
+    benchmark.extra_info["chunks"] = len(chunks)
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+
+from benchmarks.corpora import PAGE_SIZES, page_texts, rounds_for
+from src.a3e.services.evidence_mapper import EvidenceDocument, EvidenceMapper
+
+
+@pytest.fixture(scope="module")
+def mapper(standards_graph, monkeypatch_module):
+    monkeypatch_module.setattr("src.a3e.services.evidence_mapper.standards_graph", standards_graph)
+    return EvidenceMapper()
+
+
+@pytest.fixture(scope="module")
+def monkeypatch_module():
+    mp = pytest.MonkeyPatch()
+    yield mp
+    mp.undo()
+
+
+@pytest.mark.benchmark(group="evidence_mapper")
+def bench_build_index(benchmark, standards_graph, monkeypatch):
+    monkeypatch.setattr("src.a3e.services.evidence_mapper.standards_graph", standards_graph)
+    benchmark.pedantic(EvidenceMapper, rounds=5, iterations=1)
+
+
+@pytest.mark.benchmark(group="evidence_mapper")
+@pytest.mark.parametrize("pages", PAGE_SIZES)
+def bench_map_evidence(benchmark, mapper, pages):
+    text = "\n".join(page_texts(pages))
+    doc = EvidenceDocument(
+        doc_id=f"bench-{pages}", text=text, metadata={}, doc_type="policy",
+        source_system="manual", upload_date=datetime(2025, 1, 1),
+    )
+    benchmark.extra_info.update(pages=pages, chars=len(text))
+
+    mappings = benchmark.pedantic(mapper.map_evidence, args=(doc,), rounds=rounds_for(pages), iterations=1)
+    benchmark.extra_info["mappings"] = len(mappings)
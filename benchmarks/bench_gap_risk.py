@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.a3e.services.gap_risk_predictor import GapRiskPredictor
+
+SIZES = [1_000, 10_000]
+
+
+def _inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    evidence = rng.integers(0, 8, size=n)
+    return {
+        "standard_ids": [f"STD-{i}" for i in range(n)],
+        "coverage_percentage": rng.uniform(0, 100, size=n),
+        "evidence_trust_scores": [rng.uniform(0.2, 1.0, size=k).tolist() for k in evidence],
+        "evidence_ages_days": [rng.integers(0, 1500, size=k).tolist() for k in evidence],
+        "overdue_tasks_count": rng.integers(0, 6, size=n),
+        "total_tasks_count": rng.integers(5, 12, size=n),
+        "recent_changes_count": rng.integers(0, 4, size=n),
+        "historical_findings_count": rng.integers(0, 3, size=n),
+        "time_to_next_review_days": rng.integers(10, 900, size=n),
+    }
+
+
+@pytest.mark.benchmark(group="gap_risk")
+@pytest.mark.parametrize("standards", SIZES)
+def bench_predict_risk_loop(benchmark, standards):
+    predictor = GapRiskPredictor()
+    data = _inputs(standards)
+    rows = list(zip(*(data[k] for k in data)))
+
+    def run():
+        return [
+            predictor.predict_risk(
+                standard_id=sid, coverage_percentage=float(cov), evidence_trust_scores=trust,
+                evidence_ages_days=ages, overdue_tasks_count=int(overdue), total_tasks_count=int(total),
+                recent_changes_count=int(changes), historical_findings_count=int(findings),
+                time_to_next_review_days=int(review),
+            )
+            for sid, cov, trust, ages, overdue, total, changes, findings, review in rows
+        ]
+
+    benchmark.pedantic(run, rounds=3, iterations=1)
+
+
+@pytest.mark.benchmark(group="gap_risk")
+@pytest.mark.parametrize("standards", SIZES)
+def bench_predict_risk_batch(benchmark, standards):
+    predictor = GapRiskPredictor()
+    data = _inputs(standards)
+    benchmark.pedantic(lambda: predictor.predict_risk_batch(**data), rounds=10, iterations=1)
@@ -0,0 +1,121 @@
+"""Hierarchy scoring throughput: per-call graph walks vs the closure tables.
+
+``legacy`` reproduces the lookups as they were before ``OntologyClosure``
+(a fresh BFS per standard with ``list.pop(0)``, ancestor chains rebuilt with
+``list.insert(0)``); ``closure`` is the shipped implementation. Both score
+every (evidence, concept) pair of the full ontology.
+"""
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.a3e.core.accreditation_ontology import AccreditationOntology, EvidenceType
+from src.a3e.core.vector_matching import EvidenceDocument, VectorWeightedMatcher
+
+
+class LegacyOntology(AccreditationOntology):
+    def get_concept_hierarchy(self, concept_id):
+        if concept_id not in self.nodes:
+            return []
+        hierarchy = [concept_id]
+        current = self.nodes[concept_id]
+        while current.parent_id:
+            hierarchy.insert(0, current.parent_id)
+            current = self.nodes[current.parent_id]
+        return hierarchy
+
+    def find_related_concepts(self, concept_id, max_distance=2):
+        if concept_id not in self.nodes:
+            return []
+        related, visited, queue = [], set(), [(concept_id, 0)]
+        while queue:
+            current_id, distance = queue.pop(0)
+            if current_id in visited or distance > max_distance:
+                continue
+            visited.add(current_id)
+            if distance > 0:
+                related.append((current_id, distance))
+            node = self.nodes[current_id]
+            if node.parent_id and distance < max_distance:
+                queue.append((node.parent_id, distance + 1))
+            for child_id in node.children_ids:
+                if distance < max_distance:
+                    queue.append((child_id, distance + 1))
+            for related_id in node.related_concepts:
+                if distance < max_distance:
+                    queue.append((related_id, distance + 1))
+        return related
+
+
+class LegacyMatcher(VectorWeightedMatcher):
+    def _compute_hierarchy_score(self, evidence, standard_node):
+        score = 0.0
+        for concept_id in evidence.mapped_concepts:
+            if concept_id == standard_node.id:
+                score += 1.0
+            elif concept_id in standard_node.children_ids:
+                score += 0.8
+            elif standard_node.id in self.ontology.get_concept_hierarchy(concept_id):
+                score += 0.6
+        for concept_id in evidence.inferred_concepts:
+            if concept_id == standard_node.id:
+                score += 0.7
+            elif concept_id in standard_node.children_ids:
+                score += 0.5
+        related_concepts = [rel[0] for rel in self.ontology.find_related_concepts(standard_node.id)]
+        for concept_id in evidence.mapped_concepts + evidence.inferred_concepts:
+            if concept_id in related_concepts:
+                score += 0.3
+        max_possible = len(evidence.mapped_concepts) + len(evidence.inferred_concepts)
+        if max_possible > 0:
+            score = score / max_possible
+        return min(1.0, score)
+
+
+def _evidence(ontology, count=200, seed=0):
+    rng = random.Random(seed)
+    concepts = sorted(ontology.nodes)
+    empty = np.zeros(1)
+    return [
+        EvidenceDocument(
+            id=f"ev-{i}", content="", title="", evidence_type=EvidenceType.POLICY_DOCUMENT,
+            content_embedding=empty, title_embedding=empty, source_system="manual",
+            collection_date=datetime(2025, 1, 1),
+            mapped_concepts=rng.sample(concepts, 3), inferred_concepts=rng.sample(concepts, 2),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.benchmark(group="ontology_hierarchy_score")
+@pytest.mark.parametrize("implementation", ["legacy", "closure"])
+def bench_hierarchy_scoring(benchmark, implementation):
+    if implementation == "legacy":
+        ontology = LegacyOntology()
+        matcher = LegacyMatcher(ontology)
+    else:
+        ontology = AccreditationOntology()
+        matcher = VectorWeightedMatcher(ontology)
+    evidence = _evidence(ontology)
+    nodes = list(ontology.nodes.values())
+    benchmark.extra_info.update(pairs=len(evidence) * len(nodes))
+
+    def run():
+        return [matcher._compute_hierarchy_score(doc, node) for doc in evidence for node in nodes]
+
+    scores = benchmark.pedantic(run, rounds=10, iterations=1)
+    reference = LegacyMatcher(LegacyOntology())
+    assert scores == [reference._compute_hierarchy_score(doc, node) for doc in evidence for node in nodes]
+
+
+@pytest.mark.benchmark(group="ontology_closure")
+def bench_closure_build(benchmark):
+    ontology = AccreditationOntology()
+
+    def rebuild():
+        ontology.invalidate_closure()
+        return ontology.closure()
+
+    benchmark(rebuild)
@@ -0,0 +1,41 @@
+import itertools
+
+import pytest
+
+from benchmarks.corpora import STANDARDS_DIR, evidence_text
+from src.a3e.services.standards_graph import StandardsGraph
+
+
+@pytest.mark.benchmark(group="standards_graph")
+def bench_load_corpus(benchmark):
+    graph = StandardsGraph()
+    stats = benchmark.pedantic(
+        graph.reload_from_corpus, args=(str(STANDARDS_DIR),), kwargs={"fallback_to_seed": False},
+        rounds=5, iterations=1,
+    )
+    benchmark.extra_info["nodes"] = stats.get("total_nodes", len(graph.nodes))
+
+
+@pytest.mark.benchmark(group="standards_graph")
+@pytest.mark.parametrize("queries", [1, 100])
+def bench_keyword_search(benchmark, standards_graph, queries):
+    keyword_sets = [
+        standards_graph._extract_keywords(evidence_text(60, seed)) for seed in range(queries)
+    ]
+
+    def run():
+        return [standards_graph.search_by_keywords(keywords, limit=10) for keywords in keyword_sets]
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group="standards_graph")
+def bench_crosswalk(benchmark, standards_graph):
+    accreditors = sorted(standards_graph.accreditor_roots)
+    pairs = list(itertools.permutations(accreditors, 2))
+    benchmark.extra_info["pairs"] = len(pairs)
+
+    def run():
+        return [standards_graph.find_cross_accreditor_matches(a, b) for a, b in pairs]
+
+    benchmark.pedantic(run, rounds=5, iterations=1)
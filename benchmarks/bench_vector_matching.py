@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+
+from benchmarks.corpora import evidence_text, rounds_for
+from benchmarks.stubs import stub_embedding
+from src.a3e.core.accreditation_ontology import AccreditationOntology, EvidenceType
+from src.a3e.core.vector_matching import EvidenceDocument, VectorWeightedMatcher
+
+
+@pytest.fixture(scope="module")
+def ontology():
+    ontology = AccreditationOntology()
+    dim = ontology.embedding_schema.TOTAL_DIMENSIONS
+    for node in ontology.nodes.values():
+        node.embedding_vector = stub_embedding(" ".join([node.label, *node.synonyms]), dim)
+    return ontology
+
+
+def _evidence(ontology, count):
+    dim = ontology.embedding_schema.TOTAL_DIMENSIONS
+    concepts = sorted(ontology.nodes)
+    docs = []
+    for i in range(count):
+        text = evidence_text(400, seed=i)
+        title = f"Evidence {i}"
+        docs.append(EvidenceDocument(
+            id=f"ev-{i}", content=text, title=title,
+            evidence_type=list(EvidenceType)[i % len(EvidenceType)],
+            content_embedding=stub_embedding(text, dim), title_embedding=stub_embedding(title, dim),
+            source_system="manual", collection_date=datetime(2025, 1, 1), quality_score=0.8,
+            mapped_concepts=[concepts[i % len(concepts)]],
+        ))
+    return docs
+
+
+@pytest.mark.benchmark(group="vector_matching")
+@pytest.mark.parametrize("documents", [10, 100, 1000])
+def bench_batch_match_evidence(benchmark, ontology, documents):
+    matcher = VectorWeightedMatcher(ontology)
+    evidence = _evidence(ontology, documents)
+    standards = sorted(ontology.nodes)
+    benchmark.extra_info.update(documents=documents, standards=len(standards))
+
+    def fresh_cache():
+        # Results are memoised per evidence id; measure the uncached path
+        matcher.match_cache.clear()
+        return (evidence, standards), {}
+
+    benchmark.pedantic(
+        matcher.batch_match_evidence, setup=fresh_cache, rounds=rounds_for(documents), iterations=1
+    )
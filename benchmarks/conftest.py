@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Route modules read settings at import time
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-jwt-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./benchmark.db")
+
+
+@pytest.fixture(scope="session")
+def standards_graph():
+    from benchmarks.corpora import STANDARDS_DIR
+    from src.a3e.services.standards_graph import StandardsGraph
+
+    graph = StandardsGraph()
+    graph.reload_from_corpus(str(STANDARDS_DIR), fallback_to_seed=False)
+    return graph
@@ -0,0 +1,132 @@
+"""Deterministic synthetic evidence corpora for the benchmark suite.
+
+Documents are built from a fixed pool of accreditation-style sentences with a
+seeded RNG, so the same size always yields the same bytes and timings stay
+comparable between commits.
+"""
+from __future__ import annotations
+
+import io
+import random
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+STANDARDS_DIR = REPO_ROOT / "data" / "standards"
+
+PAGE_SIZES = (10, 100, 1000)
+WORDS_PER_PAGE = 350
+XLSX_ROWS_PER_PAGE = 50
+
+SENTENCES = (
+    "The institution publishes a mission statement approved by the board of trustees.",
+    "Student learning outcomes are assessed annually for every degree program.",
+    "Assessment results are used to improve curriculum design and instruction.",
+    "Faculty credentials are verified against discipline-specific qualification standards.",
+    "The governing board reviews the annual operating budget and audited financial statements.",
+    "Academic advising services are evaluated through student satisfaction surveys.",
+    "Retention and graduation rates are reported to the institutional effectiveness committee.",
+    "The library provides information literacy instruction and adequate learning resources.",
+    "Distance education courses meet the same quality standards as on-campus offerings.",
+    "The strategic plan identifies measurable goals, responsible units and timelines.",
+    "Policies are reviewed on a three-year cycle and archived with version history.",
+    "Complaints are tracked, resolved and analysed for recurring institutional issues.",
+    "Physical facilities are maintained to support programs and ensure campus safety.",
+    "Faculty participate in professional development funded through the academic affairs budget.",
+    "Program review findings are linked to resource allocation decisions.",
+)
+
+
+def rounds_for(size: int, budget: int = 300) -> int:
+    """Fewer rounds for bigger inputs so a full run stays in minutes."""
+    return max(3, budget // size)
+
+
+def evidence_text(words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out: List[str] = []
+    count = 0
+    while count < words:
+        sentence = rng.choice(SENTENCES)
+        out.append(sentence)
+        count += len(sentence.split())
+    return " ".join(out)
+
+
+def page_texts(pages: int, seed: int = 0) -> List[str]:
+    return [evidence_text(WORDS_PER_PAGE, seed * 100_003 + page) for page in range(pages)]
+
+
+@lru_cache(maxsize=None)
+def make_pdf(pages: int, seed: int = 0) -> bytes:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter, invariant=1)
+    width, height = letter
+    for text in page_texts(pages, seed):
+        y = height - 54
+        line: List[str] = []
+        for word in text.split():
+            line.append(word)
+            if len(line) == 14:
+                pdf.drawString(54, y, " ".join(line))
+                y -= 14
+                line = []
+        if line:
+            pdf.drawString(54, y, " ".join(line))
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=None)
+def make_docx(pages: int, seed: int = 0) -> bytes:
+    from docx import Document
+
+    document = Document()
+    for number, text in enumerate(page_texts(pages, seed), start=1):
+        document.add_heading(f"Section {number}", level=2)
+        document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=None)
+def make_xlsx(pages: int, seed: int = 0) -> bytes:
+    from openpyxl import Workbook
+
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Assessment")
+    sheet.append(["Program", "Outcome", "Measure", "Target", "Result", "Action"])
+    for row in range(pages * XLSX_ROWS_PER_PAGE):
+        sheet.append([
+            f"PRG-{row % 40:03d}",
+            rng.choice(SENTENCES),
+            rng.choice(("Rubric", "Exam", "Portfolio", "Survey")),
+            rng.choice((70, 75, 80)),
+            round(rng.uniform(55, 98), 1),
+            rng.choice(SENTENCES),
+        ])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+BUILDERS = {
+    "pdf": (make_pdf, "application/pdf"),
+    "docx": (make_docx, "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "xlsx": (make_xlsx, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def document(kind: str, pages: int, seed: int = 0) -> bytes:
+    return BUILDERS[kind][0](pages, seed)
+
+
+def mime_type(kind: str) -> str:
+    return BUILDERS[kind][1]
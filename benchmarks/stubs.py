@@ -0,0 +1,54 @@
+"""Offline stand-ins for the embedding and LLM providers.
+
+They are deterministic and do no network I/O, so benchmarks measure this
+codebase rather than a vendor's latency.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import Any
+
+import numpy as np
+
+from src.a3e.services.llm_service import LLMResponse
+
+_TOKEN = re.compile(r"[a-z]{3,}")
+
+
+def stub_embedding(text: str, dim: int) -> np.ndarray:
+    """Hashed bag-of-words vector: similar texts get similar embeddings."""
+    vector = np.zeros(dim)
+    for token in _TOKEN.findall(text.lower()):
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], "little") % dim
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class StubLLMService:
+    """Answers mapping prompts with the candidate standards it was given."""
+
+    _STANDARD = re.compile(r"Standard ID: (\S+)\s+Title: .*?\s+Accreditor: .*?\s+Initial Confidence: ([0-9.]+)", re.S)
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def initialize(self) -> None:
+        return None
+
+    async def generate_response(self, prompt: str, **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        mappings = [
+            {
+                "standard_id": standard_id,
+                "confidence": min(1.0, float(confidence) + 0.05),
+                "match_type": "strong",
+                "rationale_spans": [],
+                "explanation": "Stub provider rationale.",
+            }
+            for standard_id, confidence in self._STANDARD.findall(prompt)
+        ]
+        return LLMResponse(content=json.dumps({"mappings": mappings}), model="stub")
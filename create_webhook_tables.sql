@@ -54,4 +54,25 @@ CREATE INDEX idx_webhook_deliveries_status ON webhook_deliveries(response_status
 
 -- Sample webhook configurations for testing
 -- INSERT INTO webhook_configs (id, institution_id, url, events, active) VALUES
--- ('wh_sample_1', 'inst_sample', 'https://webhook.site/test', '["evidence.uploaded", "evidence.processed"]', true);
\ No newline at end of file
+-- ('wh_sample_1', 'inst_sample', 'https://webhook.site/test', '["evidence.uploaded", "evidence.processed"]', true);
+-- Transactional outbox: events are inserted in the same transaction as the
+-- business change and drained by the webhook dispatcher
+CREATE TABLE IF NOT EXISTS webhook_outbox (
+    id VARCHAR(36) PRIMARY KEY,
+    event VARCHAR(100) NOT NULL,
+    payload TEXT NOT NULL,
+    institution_id VARCHAR(255),
+    webhook_id VARCHAR(255),
+    parent_id VARCHAR(36),
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_until TIMESTAMP WITH TIME ZONE,
+    claim_token VARCHAR(36),
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX ix_webhook_outbox_due ON webhook_outbox(status, next_attempt_at);
+CREATE INDEX ix_webhook_outbox_claim_token ON webhook_outbox(claim_token);
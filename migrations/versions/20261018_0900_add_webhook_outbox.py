@@ -0,0 +1,42 @@
+"""Add webhook_outbox for transactional webhook delivery
+
+Revision ID: 20261018_0900_add_webhook_outbox
+Revises: 20251010_1500_add_ai_modules_schema
+Create Date: 2026-10-18 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_0900_add_webhook_outbox"
+down_revision = "20251010_1500_add_ai_modules_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "webhook_outbox",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("event", sa.String(100), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("institution_id", sa.String(255)),
+        sa.Column("webhook_id", sa.String(255)),
+        sa.Column("parent_id", sa.String(36)),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("locked_until", sa.TIMESTAMP(timezone=True)),
+        sa.Column("claim_token", sa.String(36)),
+        sa.Column("last_error", sa.Text()),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.TIMESTAMP(timezone=True)),
+    )
+    op.create_index("ix_webhook_outbox_due", "webhook_outbox", ["status", "next_attempt_at"])
+    op.create_index("ix_webhook_outbox_claim_token", "webhook_outbox", ["claim_token"])
+
+
+def downgrade():
+    op.drop_index("ix_webhook_outbox_claim_token", table_name="webhook_outbox")
+    op.drop_index("ix_webhook_outbox_due", table_name="webhook_outbox")
+    op.drop_table("webhook_outbox")
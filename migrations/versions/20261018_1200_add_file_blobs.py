@@ -0,0 +1,43 @@
+"""Content-addressed file blobs: files.content_sha256 and file_blobs refcounts
+
+Revision ID: 20261018_1200_add_file_blobs
+Revises: 20261018_0900_add_webhook_outbox
+Create Date: 2026-10-18 12:00:00
+
+files.file_content stays (nullable) until scripts/migrate_file_blobs.py has
+moved every row's bytes into the blob store.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_1200_add_file_blobs"
+down_revision = "20261018_0900_add_webhook_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "file_blobs",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("mime_type", sa.String(100)),
+        sa.Column("refcount", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_referenced_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_file_blobs_unreferenced", "file_blobs", ["refcount", "last_referenced_at"])
+
+    if sa.inspect(op.get_bind()).has_table("files"):
+        op.add_column("files", sa.Column("content_sha256", sa.String(64)))
+        op.create_index("ix_files_content_sha256", "files", ["content_sha256"])
+        op.alter_column("files", "file_content", nullable=True)
+
+
+def downgrade():
+    if sa.inspect(op.get_bind()).has_table("files"):
+        op.drop_index("ix_files_content_sha256", table_name="files")
+        op.drop_column("files", "content_sha256")
+    op.drop_index("ix_file_blobs_unreferenced", table_name="file_blobs")
+    op.drop_table("file_blobs")
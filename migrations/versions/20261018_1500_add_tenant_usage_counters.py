@@ -0,0 +1,32 @@
+"""Shared tenant usage counters for the metering engine
+
+Revision ID: 20261018_1500_add_tenant_usage_counters
+Revises: 20261018_1200_add_file_blobs
+Create Date: 2026-10-18 15:00:00
+
+One row per counter key (monthly rollup, running total or sliding-window
+bucket); see src/a3e/services/tenant_metering.py.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_1500_add_tenant_usage_counters"
+down_revision = "20261018_1200_add_file_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tenant_usage_counters",
+        sa.Column("counter_key", sa.String(255), primary_key=True),
+        sa.Column("value", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("expires_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_tenant_usage_counters_expires_at", "tenant_usage_counters", ["expires_at"])
+
+
+def downgrade():
+    op.drop_index("ix_tenant_usage_counters_expires_at", table_name="tenant_usage_counters")
+    op.drop_table("tenant_usage_counters")
@@ -0,0 +1,83 @@
+"""Local mirror of Stripe customers, subscriptions, prices and checkout sessions
+
+Revision ID: 20261018_1600_add_stripe_mirror_tables
+Revises: 20261018_1500_add_tenant_usage_counters
+Create Date: 2026-10-18 16:00:00
+
+stripe_events records webhook event ids once their handler has succeeded;
+the object tables are written by webhooks, read-through misses and the
+periodic reconcile. See src/a3e/services/stripe_mirror.py.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_1600_add_stripe_mirror_tables"
+down_revision = "20261018_1500_add_tenant_usage_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "stripe_events",
+        sa.Column("id", sa.String(255), primary_key=True),
+        sa.Column("type", sa.String(100), nullable=False),
+        sa.Column("created", sa.BigInteger()),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        "stripe_customers",
+        sa.Column("id", sa.String(255), primary_key=True),
+        sa.Column("email", sa.String(255)),
+        sa.Column("name", sa.String(255)),
+        sa.Column("deleted", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("data", sa.Text(), nullable=False),
+        sa.Column("stripe_version", sa.BigInteger(), nullable=False),
+        sa.Column("synced_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_stripe_customers_email", "stripe_customers", ["email"])
+    op.create_table(
+        "stripe_subscriptions",
+        sa.Column("id", sa.String(255), primary_key=True),
+        sa.Column("customer_id", sa.String(255)),
+        sa.Column("status", sa.String(40), nullable=False),
+        sa.Column("price_id", sa.String(255)),
+        sa.Column("cancel_at_period_end", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("current_period_end", sa.BigInteger()),
+        sa.Column("data", sa.Text(), nullable=False),
+        sa.Column("stripe_version", sa.BigInteger(), nullable=False),
+        sa.Column("synced_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_stripe_subscriptions_customer_id", "stripe_subscriptions", ["customer_id"])
+    op.create_table(
+        "stripe_prices",
+        sa.Column("id", sa.String(255), primary_key=True),
+        sa.Column("active", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("currency", sa.String(10)),
+        sa.Column("unit_amount", sa.BigInteger()),
+        sa.Column("data", sa.Text(), nullable=False),
+        sa.Column("stripe_version", sa.BigInteger(), nullable=False),
+        sa.Column("synced_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        "stripe_checkout_sessions",
+        sa.Column("id", sa.String(255), primary_key=True),
+        sa.Column("customer_id", sa.String(255)),
+        sa.Column("email", sa.String(255)),
+        sa.Column("payment_status", sa.String(40)),
+        sa.Column("subscription_id", sa.String(255)),
+        sa.Column("data", sa.Text(), nullable=False),
+        sa.Column("stripe_version", sa.BigInteger(), nullable=False),
+        sa.Column("synced_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("stripe_checkout_sessions")
+    op.drop_table("stripe_prices")
+    op.drop_index("ix_stripe_subscriptions_customer_id", table_name="stripe_subscriptions")
+    op.drop_table("stripe_subscriptions")
+    op.drop_index("ix_stripe_customers_email", table_name="stripe_customers")
+    op.drop_table("stripe_customers")
+    op.drop_table("stripe_events")
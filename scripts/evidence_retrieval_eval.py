@@ -0,0 +1,142 @@
+"""Offline recall@k and latency for EvidenceMapper retrieval.
+
+Runs each case in a labelled evidence-to-standard fixture through every
+retrieval mode and prints the mean recall@k and per-query latency:
+
+  tfidf           the pre-hybrid retriever (TF-IDF cosine, original settings)
+  tfidf+rerank    ... followed by the cross-encoder rerank (the old map_evidence ranking)
+  bm25, dense     each hybrid leg on its own
+  hybrid          BM25 and dense fused with weighted RRF
+  hybrid+rerank   the fused shortlist reranked (the current map_evidence ranking)
+
+A retrieved node counts as a hit for a labelled standard if it is that
+standard or one of its clauses or indicators. Each standard is counted once.
+
+Usage:
+    python scripts/evidence_retrieval_eval.py
+    python scripts/evidence_retrieval_eval.py --weights bm25=1.0,dense=0.5 --rrf-k 30 --k 5 10 20
+    python scripts/evidence_retrieval_eval.py --fixture my_labels.json --shortlist 40
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.a3e.services.evidence_mapper import EvidenceMapper, _parse_weights  # noqa: E402
+from src.a3e.services.hybrid_retrieval import TfidfIndex  # noqa: E402
+
+DEFAULT_FIXTURE = REPO_ROOT / "tests" / "fixtures" / "evidence_mapping_eval.json"
+
+Ranker = Callable[[str, int], List[str]]
+
+
+def load_cases(path: Path) -> List[Dict]:
+    return json.loads(Path(path).read_text())["cases"]
+
+
+def build_rankers(mapper: EvidenceMapper, shortlist: int) -> Dict[str, Ranker]:
+    node_ids = mapper.corpus_node_ids
+    corpus = []
+    for node_id in node_ids:
+        node = mapper.graph.nodes[node_id]
+        text = f"{node.title} {node.description} {node.text_content}"
+        corpus.append(text + (" " + " ".join(node.evidence_requirements) if node.evidence_requirements else ""))
+    tfidf = TfidfIndex(corpus, max_features=5000, ngram_range=(1, 3), min_df=2, stop_words="english")
+    legs = mapper.retriever.legs
+
+    def leg(index) -> Ranker:
+        return lambda text, k: [node_ids[i] for i, _ in index.search(text, k)]
+
+    def reranked(first_stage: Callable[[str, int], List]) -> Ranker:
+        def rank(text: str, k: int) -> List[str]:
+            return [node_id for node_id, _, _ in mapper._cross_encode_rerank(text, first_stage(text, shortlist))][:k]
+        return rank
+
+    return {
+        "tfidf": leg(tfidf),
+        "tfidf+rerank": reranked(lambda text, k: [(node_ids[i], s) for i, s in tfidf.search(text, k)]),
+        "bm25": leg(legs["bm25"]),
+        "dense": leg(legs["dense"]),
+        "hybrid": lambda text, k: [node_id for node_id, _ in mapper._retrieve_candidates(text, k)],
+        "hybrid+rerank": reranked(mapper._retrieve_candidates),
+    }
+
+
+def _standards_hit(mapper: EvidenceMapper, ranked: Sequence[str], relevant: set) -> set:
+    hits = set()
+    for node_id in ranked:
+        seen = set()
+        while node_id and node_id not in seen:  # some corpus nodes list themselves as parent
+            if node_id in relevant:
+                hits.add(node_id)
+                break
+            seen.add(node_id)
+            node = mapper.graph.nodes.get(node_id)
+            node_id = node.parent_id if node else None
+    return hits
+
+
+def evaluate(mapper: EvidenceMapper, cases: Sequence[Dict], ks: Sequence[int], shortlist: int = 20,
+             repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """Mean recall@k and latency (ms) per retrieval mode."""
+    depth = max(ks)
+    report = {}
+    for mode, rank in build_rankers(mapper, shortlist).items():
+        recalls = {k: [] for k in ks}
+        latencies = []
+        for case in cases:
+            relevant = set(case["relevant"])
+            for _ in range(repeat):
+                started = time.perf_counter()
+                ranked = rank(case["text"], depth)
+                latencies.append(time.perf_counter() - started)
+            for k in ks:
+                recalls[k].append(len(_standards_hit(mapper, ranked[:k], relevant)) / len(relevant))
+        ordered = sorted(latencies)
+        report[mode] = {
+            **{f"recall@{k}": statistics.mean(values) for k, values in recalls.items()},
+            "p50_ms": statistics.median(ordered) * 1000,
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        }
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE)
+    parser.add_argument("--k", type=int, nargs="+", default=[5, 10, 20])
+    parser.add_argument("--weights", help="RRF leg weights, e.g. bm25=1.0,dense=0.5 (default: EVIDENCE_RRF_WEIGHTS)")
+    parser.add_argument("--rrf-k", type=float, help="RRF rank constant (default: EVIDENCE_RRF_K)")
+    parser.add_argument("--shortlist", type=int, default=20, help="first-stage candidates handed to the reranker")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    mapper = EvidenceMapper(retrieval_weights=_parse_weights(args.weights) if args.weights else None)
+    if args.rrf_k is not None:
+        mapper.retriever.rrf_k = args.rrf_k
+    cases = load_cases(args.fixture)
+    print(f"{len(cases)} labelled cases, {len(mapper.corpus_node_ids)} standards "
+          f"(index built in {time.perf_counter() - started:.1f}s); "
+          f"weights {mapper.retriever.weights}, rrf_k {mapper.retriever.rrf_k:g}")
+
+    report = evaluate(mapper, cases, args.k, args.shortlist, args.repeat)
+    header = "".join(f"{f'recall@{k}':>11}" for k in args.k)
+    print(f"{'mode':15s}{header}{'p50 ms':>10}{'p95 ms':>10}")
+    for mode, row in report.items():
+        cells = "".join(f"{row[f'recall@{k}']:11.3f}" for k in args.k)
+        print(f"{mode:15s}{cells}{row['p50_ms']:10.2f}{row['p95_ms']:10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
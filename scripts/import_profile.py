@@ -0,0 +1,103 @@
+"""Profile worker import time and optionally enforce a budget.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and
+reports the slowest modules by cumulative and self time.
+
+Usage:
+    python scripts/import_profile.py                       # top 25 modules
+    python scripts/import_profile.py --top 50 --json out.json
+    python scripts/import_profile.py --budget-ms 4000      # exit 1 if over budget
+    python scripts/import_profile.py --target-ms 1000      # report the gap, never fail
+
+The budget can also come from IMPORT_TIME_BUDGET_MS so CI can tune it
+without editing the workflow. The budget is a regression gate set just above
+what the tree meets today; the target (IMPORT_TIME_TARGET_MS) is the goal
+still being worked towards and is only reported.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def run_importtime(module: str) -> str:
+    env = dict(os.environ)
+    env.setdefault("PYTHONPATH", str(REPO_ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(REPO_ROOT),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(f"Importing {module} failed with exit code {proc.returncode}")
+    return proc.stderr
+
+
+def parse_importtime(output: str) -> List[Dict[str, object]]:
+    rows: List[Dict[str, object]] = []
+    for line in output.splitlines():
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        rows.append({
+            "module": m.group(4),
+            "self_ms": int(m.group(1)) / 1000.0,
+            "cumulative_ms": int(m.group(2)) / 1000.0,
+            "depth": len(m.group(3)) // 2,
+        })
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.a3e.main")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_TIME_BUDGET_MS", "0") or 0))
+    parser.add_argument("--target-ms", type=float, default=float(os.getenv("IMPORT_TIME_TARGET_MS", "0") or 0))
+    parser.add_argument("--json", dest="json_path", help="write the full profile to this file")
+    args = parser.parse_args()
+
+    rows = parse_importtime(run_importtime(args.module))
+    total = next((r["cumulative_ms"] for r in rows if r["module"] == args.module), 0.0)
+
+    print(f"Total import time for {args.module}: {total:.0f} ms")
+    print(f"\nTop {args.top} by cumulative time:")
+    for r in sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True)[: args.top]:
+        print(f"  {r['cumulative_ms']:9.1f} ms  {r['module']}")
+    print(f"\nTop {args.top} by self time:")
+    for r in sorted(rows, key=lambda r: r["self_ms"], reverse=True)[: args.top]:
+        print(f"  {r['self_ms']:9.1f} ms  {r['module']}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(
+            json.dumps({"module": args.module, "total_ms": total, "modules": rows}, indent=2),
+            encoding="utf-8",
+        )
+
+    if args.target_ms:
+        gap = total - args.target_ms
+        print(f"\nTarget {args.target_ms:.0f} ms: " + (f"{gap:.0f} ms to go" if gap > 0 else "met"))
+
+    if args.budget_ms and total > args.budget_ms:
+        print(f"\nFAIL: import time {total:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        return 1
+    if args.budget_ms:
+        print(f"\nOK: import time within budget {args.budget_ms:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Latency of unrelated endpoints while a worker absorbs a burst of logins.
+
+Serves a minimal app in-process: ``POST /login`` checks a bcrypt hash and
+``GET /ping`` does nothing. A steady stream of pings runs alongside a burst of
+logins, once with bcrypt called inline (the old auth_complete behaviour) and
+once through ``PasswordHasher``; an idle run with no logins is the baseline.
+Ping latency is printed as p50/p99/max alongside the login status codes.
+
+Usage:
+    python scripts/login_load_test.py                     # 200 logins over 1s at cost 12
+    python scripts/login_load_test.py --logins 50 --rounds 10 --pings 300
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import bcrypt  # noqa: E402
+import httpx  # noqa: E402
+from fastapi import FastAPI, HTTPException  # noqa: E402
+
+from src.a3e.services.password_hasher import HashingOverloaded, PasswordHasher  # noqa: E402
+
+
+def build_app(mode: str, rounds: int, hasher: PasswordHasher) -> FastAPI:
+    app = FastAPI()
+    stored = bcrypt.hashpw(b"hunter2", bcrypt.gensalt(rounds)).decode()
+
+    @app.post("/login")
+    async def login(payload: Dict[str, str]):
+        if mode == "inline":
+            ok = bcrypt.checkpw(payload["password"].encode(), stored.encode())
+        else:
+            try:
+                ok = await hasher.verify(payload["password"], stored)
+            except HashingOverloaded as e:
+                raise HTTPException(status_code=e.status_code, detail=e.detail)
+        if not ok:
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def _pct(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+
+async def run(mode: str, logins: int, pings: int, rounds: int, burst: float, interval: float) -> Dict[str, object]:
+    hasher = PasswordHasher(rounds=rounds)
+    app = build_app(mode, rounds, hasher)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+        await client.get("/ping")
+        latencies: List[float] = []
+
+        started = time.perf_counter()
+
+        async def pinger():
+            # Latency is measured from when each ping was due, so pings the
+            # blocked loop could not even send still count against it
+            for i in range(pings):
+                due = started + i * interval
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await client.get("/ping")
+                latencies.append(time.perf_counter() - due)
+
+        async def login(i: int):
+            await asyncio.sleep(burst * i / max(1, logins))
+            return (await client.post("/login", json={"password": "hunter2"})).status_code
+
+        burst_size = 0 if mode == "idle" else logins
+        codes, _ = await asyncio.gather(asyncio.gather(*(login(i) for i in range(burst_size))), pinger())
+        elapsed = time.perf_counter() - started
+    hasher.shutdown()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p99": _pct(latencies, 0.99),
+        "max": max(latencies) * 1000,
+        "codes": dict(sorted(Counter(codes).items())),
+        "elapsed": elapsed,
+        "hasher": hasher.metrics() if mode == "pooled" else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--pings", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--burst", type=float, default=1.0, help="seconds over which the logins arrive")
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between pings")
+    args = parser.parse_args()
+
+    print(f"{args.logins} logins over {args.burst:g}s at bcrypt cost {args.rounds}, a ping every {args.interval * 1000:g} ms")
+    for mode in ("idle", "inline", "pooled"):
+        r = asyncio.run(run(mode, args.logins, args.pings, args.rounds, args.burst, args.interval))
+        print(f"  {mode:7s} /ping p50 {r['p50']:8.1f} ms  p99 {r['p99']:8.1f} ms  max {r['max']:8.1f} ms"
+              f"   /login {r['codes']}  ({r['elapsed']:.1f}s)")
+        if r["hasher"]:
+            h = r["hasher"]
+            print(f"          hasher: peak queue {h['peak_queued']}, rejected {h['rejected']}, "
+                  f"shed {h['shed']}, wait avg {h['wait_ms_avg']} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
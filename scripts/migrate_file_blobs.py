@@ -0,0 +1,206 @@
+"""Move ``files.file_content`` bytes into the content-addressed blob store.
+
+Walks ``files`` in keyset-paginated batches (only ``--batch-size`` rows of
+bytes in memory at a time). Each row's bytes are hashed and stored once per
+distinct SHA-256. The row gets ``content_sha256`` and its ``file_content`` is
+set to NULL, all in one transaction per batch. Re-running the script resumes
+where it stopped, because migrated rows already have a hash.
+
+The script reports logical versus stored bytes (what de-duplication saved).
+It also reports the latency of the two file list/metadata reads before and
+after:
+``GET /api/uploads/recent`` (jobs JOIN files) and the
+per-file metadata fetch (``SELECT *`` before, explicit columns after).
+
+Blobs go to the backend ``get_blob_store()`` picks (S3 via StorageService,
+else ``BLOB_STORE_PATH``). Run ``alembic upgrade head`` first.
+
+Usage:
+    python scripts/migrate_file_blobs.py                       # DATABASE_URL
+    python scripts/migrate_file_blobs.py --database-url sqlite:///a3e.db --batch-size 20
+    python scripts/migrate_file_blobs.py --demo 400            # throwaway SQLite corpus with duplicates
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from src.a3e.database.connection import _async_url  # noqa: E402
+from src.a3e.services.blob_store import (  # noqa: E402
+    BlobStore,
+    LocalBlobBackend,
+    ensure_blob_table,
+    get_blob_store,
+)
+
+LIST_RECENT = text(
+    """
+    SELECT j.job_id, j.file_id, j.status, j.progress, j.created_at, j.updated_at,
+           f.original_filename AS filename, f.file_size
+    FROM jobs j
+    JOIN files f ON j.file_id = f.file_id
+    WHERE j.user_id = :user_id
+    ORDER BY COALESCE(j.updated_at, j.created_at) DESC
+    LIMIT 50
+    """
+)
+METADATA_COLUMNS = "file_id, user_id, filename, original_filename, content_type, file_size, content_sha256, created_at"
+
+
+async def _latency(session_factory, query, params_list: List[Dict], repeat: int) -> Dict[str, float]:
+    samples = []
+    async with session_factory() as session:
+        for _ in range(repeat):
+            for params in params_list:
+                started = time.perf_counter()
+                (await session.execute(query, params)).fetchall()
+                samples.append(time.perf_counter() - started)
+    ordered = sorted(samples)
+    return {"p50": statistics.median(ordered) * 1000, "p95": ordered[int(len(ordered) * 0.95)] * 1000}
+
+
+async def measure(session_factory, after: bool, repeat: int) -> Dict[str, Dict[str, float]]:
+    async with session_factory() as session:
+        users = (await session.execute(text("SELECT DISTINCT user_id FROM files LIMIT 20"))).scalars().all()
+        files = (await session.execute(text("SELECT file_id FROM files LIMIT 50"))).scalars().all()
+    metadata = text(f"SELECT {METADATA_COLUMNS if after else '*'} FROM files WHERE file_id = :file_id")
+    return {
+        "uploads/recent": await _latency(session_factory, LIST_RECENT, [{"user_id": u} for u in users], repeat),
+        "file metadata": await _latency(session_factory, metadata, [{"file_id": f} for f in files], repeat),
+    }
+
+
+async def migrate(session_factory, store: BlobStore, batch_size: int) -> Dict[str, int]:
+    moved = logical = 0
+    after = ""
+    while True:
+        async with session_factory() as session:
+            rows = (await session.execute(
+                text(
+                    "SELECT file_id, content_type, file_content FROM files "
+                    "WHERE content_sha256 IS NULL AND file_content IS NOT NULL AND file_id > :after "
+                    "ORDER BY file_id LIMIT :limit"
+                ),
+                {"after": after, "limit": batch_size},
+            )).fetchall()
+            if not rows:
+                break
+            for file_id, content_type, content in rows:
+                content = bytes(content)
+                sha = await store.put(session, content, content_type)
+                await session.execute(
+                    text("UPDATE files SET content_sha256 = :sha, file_content = NULL WHERE file_id = :file_id"),
+                    {"sha": sha, "file_id": file_id},
+                )
+                moved += 1
+                logical += len(content)
+            await session.commit()
+            after = rows[-1][0]
+        print(f"  migrated {moved} rows", end="\r", flush=True)
+    print()
+    return {"rows": moved, "logical_bytes": logical, "stored_bytes": store.stats["bytes_written"]}
+
+
+def build_demo_corpus(path: Path, files: int, duplicate_ratio: float, seed: int = 7) -> None:
+    """SQLite ``files``/``jobs`` with a pre-migration layout; ~duplicate_ratio of uploads repeat a document."""
+    import sqlite3
+
+    rnd = random.Random(seed)
+    originals: List[bytes] = []
+    now = datetime.utcnow()
+    with sqlite3.connect(path) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE files (file_id TEXT PRIMARY KEY, user_id TEXT, filename TEXT, original_filename TEXT,
+                                content_type TEXT, file_size INTEGER, file_content BLOB, content_sha256 TEXT,
+                                created_at TIMESTAMP, updated_at TIMESTAMP);
+            CREATE INDEX ix_files_content_sha256 ON files (content_sha256);
+            CREATE TABLE jobs (job_id TEXT PRIMARY KEY, user_id TEXT, file_id TEXT, status TEXT, progress INTEGER,
+                               created_at TIMESTAMP, updated_at TIMESTAMP);
+            CREATE INDEX ix_jobs_user ON jobs (user_id);
+            """
+        )
+        for n in range(files):
+            if originals and rnd.random() < duplicate_ratio:
+                content = rnd.choice(originals)
+            else:
+                content = rnd.randbytes(rnd.randint(50_000, 400_000))
+                originals.append(content)
+            created = now - timedelta(minutes=n)
+            user = f"user-{n % 20}"
+            conn.execute("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, NULL, ?, ?)",
+                         (f"file_{n:06d}", user, f"file_{n:06d}.pdf", f"doc{n}.pdf", "application/pdf",
+                          len(content), content, created, created))
+            conn.execute("INSERT INTO jobs VALUES (?, ?, ?, 'completed', 100, ?, ?)",
+                         (f"job_{n:06d}", user, f"file_{n:06d}", created, created))
+
+
+def _print_latency(label: str, results: Dict[str, Dict[str, float]]) -> None:
+    for name, r in results.items():
+        print(f"  {label:6s} {name:15s} p50 {r['p50']:7.2f} ms  p95 {r['p95']:7.2f} ms")
+
+
+async def run(database_url: str, store: BlobStore, batch_size: int, repeat: int) -> int:
+    engine = create_async_engine(_async_url(database_url))
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(ensure_blob_table)
+        before = await measure(session_factory, after=False, repeat=repeat)
+        started = time.perf_counter()
+        result = await migrate(session_factory, store, batch_size)
+        elapsed = time.perf_counter() - started
+        after = await measure(session_factory, after=True, repeat=repeat)
+    finally:
+        await engine.dispose()
+
+    logical, stored = result["logical_bytes"], result["stored_bytes"]
+    saved = logical - stored
+    share = saved / logical if logical else 0.0
+    print(f"Moved {result['rows']} rows in {elapsed:.1f}s: {logical / 1e6:.1f} MB of uploads stored as "
+          f"{stored / 1e6:.1f} MB of blobs ({store.stats['deduplicated']} duplicates, "
+          f"{saved / 1e6:.1f} MB / {share:.0%} saved)")
+    print("List/metadata latency:")
+    _print_latency("before", before)
+    _print_latency("after", after)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5, help="passes over each latency query")
+    parser.add_argument("--demo", type=int, metavar="FILES", help="migrate a generated SQLite corpus instead")
+    parser.add_argument("--duplicates", type=float, default=0.4, help="demo: share of uploads that repeat a document")
+    args = parser.parse_args()
+
+    if args.demo:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Path(tmp) / "files.db"
+            build_demo_corpus(db, args.demo, args.duplicates)
+            store = BlobStore(LocalBlobBackend(Path(tmp) / "blobs"))
+            return asyncio.run(run(f"sqlite:///{db}", store, args.batch_size, args.repeat))
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    return asyncio.run(run(args.database_url, get_blob_store(), args.batch_size, args.repeat))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
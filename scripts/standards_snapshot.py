@@ -0,0 +1,145 @@
+"""Compile, verify and time the standards snapshots.
+
+Workers load ``data/standards/*.yaml`` and ``config/standards_config.yaml``
+from compiled snapshots (see ``src/a3e/core/standards_snapshot.py``) and fall
+back to YAML when a source file changed. Run ``build`` at image build time
+so no worker pays for the parse.
+
+Usage:
+    python scripts/standards_snapshot.py build            # (re)compile snapshots
+    python scripts/standards_snapshot.py check            # exit 1 if any snapshot is stale
+    python scripts/standards_snapshot.py time --runs 5    # cold worker start: snapshot vs YAML
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+CORPUS_DIR = REPO_ROOT / "data" / "standards"
+CONFIG_PATH = REPO_ROOT / "config" / "standards_config.yaml"
+
+# What a fresh worker does with the standards data on first use
+_COLD_START = """
+import json, time
+t0 = time.perf_counter()
+from src.a3e.services.standards_graph import StandardsGraph
+from src.a3e.core.standards_config import StandardsConfigLoader
+t1 = time.perf_counter()
+graph = StandardsGraph()
+loader = StandardsConfigLoader({config!r})
+loader.get_accreditors()
+t2 = time.perf_counter()
+print(json.dumps({{"import_ms": (t1 - t0) * 1000, "load_ms": (t2 - t1) * 1000, "nodes": len(graph.nodes)}}))
+"""
+
+
+def _targets():
+    from src.a3e.core.standards_config import CONFIG_LOADER_VERSION
+    from src.a3e.core.standards_snapshot import snapshot_path
+    from src.a3e.services.standards_loader import CORPUS_LOADER_VERSION, corpus_sources
+
+    return [
+        ("corpus", snapshot_path(CORPUS_DIR, "corpus"), corpus_sources(CORPUS_DIR), CORPUS_LOADER_VERSION),
+        ("config", snapshot_path(CONFIG_PATH, CONFIG_PATH.stem), [CONFIG_PATH], CONFIG_LOADER_VERSION),
+    ]
+
+
+def _display(path: Path) -> str:
+    # STANDARDS_SNAPSHOT_DIR usually points outside the repo in deploys and CI
+    try:
+        return str(path.relative_to(REPO_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def build() -> int:
+    import yaml
+
+    from src.a3e.core.standards_snapshot import source_digest, write_snapshot
+    from src.a3e.services.standards_loader import _parse_corpus
+
+    for kind, path, sources, version in _targets():
+        if kind == "corpus":
+            data = _parse_corpus(sources)
+        else:
+            data = yaml.safe_load(sources[0].read_text(encoding="utf-8"))
+        write_snapshot(path, kind, source_digest(sources, version), data)
+        print(f"wrote {_display(path)} ({path.stat().st_size} bytes, {len(sources)} sources)")
+    return 0
+
+
+def check() -> int:
+    from src.a3e.core.standards_snapshot import read_snapshot, source_digest
+
+    stale = 0
+    for kind, path, sources, version in _targets():
+        ok = read_snapshot(path, kind, source_digest(sources, version)) is not None
+        stale += not ok
+        print(f"{'current' if ok else 'STALE  '} {_display(path)}")
+    return 1 if stale else 0
+
+
+def _cold_start(snapshot: bool) -> Dict[str, float]:
+    env = dict(os.environ)
+    env.setdefault("PYTHONPATH", str(REPO_ROOT))
+    env["STANDARDS_SNAPSHOT"] = "1" if snapshot else "0"
+    proc = subprocess.run(
+        [sys.executable, "-c", _COLD_START.format(config=str(CONFIG_PATH))],
+        cwd=str(REPO_ROOT), env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(f"cold start failed with exit code {proc.returncode}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def time_cold_start(runs: int, json_path: str = "") -> int:
+    build()
+    results: Dict[str, List[Dict[str, float]]] = {"yaml": [], "snapshot": []}
+    for _ in range(runs):
+        results["yaml"].append(_cold_start(snapshot=False))
+        results["snapshot"].append(_cold_start(snapshot=True))
+
+    summary = {}
+    print(f"\nCold worker start, median of {runs} fresh interpreters:")
+    for mode, samples in results.items():
+        load = statistics.median(s["load_ms"] for s in samples)
+        imports = statistics.median(s["import_ms"] for s in samples)
+        summary[mode] = {"load_ms": load, "import_ms": imports, "nodes": samples[0]["nodes"]}
+        print(f"  {mode:9s} load {load:8.1f} ms   (imports {imports:7.1f} ms, {samples[0]['nodes']} nodes)")
+    print(f"  speedup   {summary['yaml']['load_ms'] / max(summary['snapshot']['load_ms'], 1e-6):.1f}x")
+
+    if json_path:
+        Path(json_path).write_text(json.dumps({"summary": summary, "runs": results}, indent=2), encoding="utf-8")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build")
+    sub.add_parser("check")
+    timing = sub.add_parser("time")
+    timing.add_argument("--runs", type=int, default=5)
+    timing.add_argument("--json", dest="json_path", default="", help="write raw timings to this file")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        return build()
+    if args.command == "check":
+        return check()
+    return time_cold_start(args.runs, args.json_path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
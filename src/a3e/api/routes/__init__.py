@@ -18,11 +18,9 @@ from .nurturing import router as nurturing_router
 from .org_chart import router as org_chart_router
 from .scenarios import router as scenarios_router
 from .enterprise_metrics import router as enterprise_metrics_router
-from .powerbi import router as powerbi_router
 from .evidence_mapper_ai import router as evidence_mapper_ai_router
 from .teams import router as teams_router
 from .audit_logs import router as audit_logs_router
-from .sso import router as sso_router
 from .webhooks import router as webhooks_router
 from .intelligence_showcase import router as intelligence_showcase_router
 
@@ -77,12 +75,13 @@ api_router.include_router(nurturing_router)
 api_router.include_router(org_chart_router, tags=["organization"])
 api_router.include_router(scenarios_router, tags=["scenarios"])
 api_router.include_router(enterprise_metrics_router, tags=["metrics"])
-api_router.include_router(powerbi_router, tags=["powerbi"])
 
 # Include enterprise features
 api_router.include_router(teams_router, prefix="/teams", tags=["teams"])
 api_router.include_router(audit_logs_router, prefix="/audit-logs", tags=["audit"])
-api_router.include_router(sso_router, prefix="/sso", tags=["sso"])
+
+# PowerBI and SSO pull in heavy optional clients; main.py registers them
+# lazily under the API prefix so they load on first request.
 
 # Include webhook management
 api_router.include_router(webhooks_router, prefix="/webhooks", tags=["webhooks"])
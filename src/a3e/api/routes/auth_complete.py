@@ -5,11 +5,9 @@ Complete authentication implementation for customer experience
 from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 import jwt
-import bcrypt
 import secrets
-import hashlib
 import os
 from datetime import datetime, timedelta
 import logging
@@ -21,6 +19,9 @@ from ...models import User
 from ...models.user import PasswordReset
 from ...services.database_service import DatabaseService
 from ...services.email_service import EmailService
+from ...services.password_hasher import HashingOverloaded, check_password, get_password_hasher
+from ...services.stripe_mirror import get_stripe_mirror
+from ...services.token_verifier import get_token_verifier, revoke_token
 
 logger = logging.getLogger(__name__)
 
@@ -76,12 +77,36 @@ class AuthResponse(BaseModel):
 
 # Helper functions
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    """Hash a password using bcrypt (blocking; async handlers use hash_password_async)"""
+    return get_password_hasher().hash_sync(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    """Verify a password against its hash (blocking)"""
+    return check_password(plain_password, hashed_password)
+
+def _hashing_busy(e: HashingOverloaded) -> HTTPException:
+    return HTTPException(status_code=e.status_code, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
+
+async def hash_password_async(password: str) -> str:
+    """Hash on the bounded hashing pool; 429/503 when this worker is saturated"""
+    try:
+        return await get_password_hasher().hash(password)
+    except HashingOverloaded as e:
+        raise _hashing_busy(e)
+
+async def check_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify on the hashing pool without rehashing (for routers that do not persist upgrades)"""
+    try:
+        return await get_password_hasher().verify(plain_password, hashed_password)
+    except HashingOverloaded as e:
+        raise _hashing_busy(e)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify on the hashing pool; also returns a replacement hash when the stored cost is outdated"""
+    try:
+        return await get_password_hasher().verify_and_upgrade(plain_password, hashed_password)
+    except HashingOverloaded as e:
+        raise _hashing_busy(e)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
@@ -97,7 +122,12 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     secret_key = getattr(settings, 'secret_key', None) or os.environ.get('SECRET_KEY') or 'fallback-secret-key-for-production'
     jwt_algorithm = getattr(settings, 'jwt_algorithm', 'HS256')
     
-    encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=jwt_algorithm)
+    encoded_jwt = jwt.encode(
+        to_encode,
+        secret_key,
+        algorithm=jwt_algorithm,
+        headers=get_token_verifier("auth").signing_headers(secret_key) or None,
+    )
     return encoded_jwt
 
 def generate_api_key() -> str:
@@ -146,21 +176,19 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
             logger.error(f"User {request.email} has no password hash")
             raise HTTPException(status_code=401, detail="Invalid email or password")
         
-        # Verify password - support both bcrypt and our custom hash format
-        password_valid = False
-        if user.password_hash.startswith('$2b$'):
-            # bcrypt format
-            password_valid = bcrypt.checkpw(request.password.encode('utf-8'), user.password_hash.encode('utf-8'))
-        else:
-            # Our custom salt:hash format
-            try:
-                salt, password_hash = user.password_hash.split(':')
-                computed_hash = hashlib.pbkdf2_hmac('sha256', request.password.encode(), salt.encode(), 100000)
-                password_valid = password_hash == computed_hash.hex()
-            except:
-                password_valid = False
+        # Verify password - supports bcrypt and our legacy PBKDF2 salt:hash format
+        password_valid, upgraded_hash = await verify_password_async(request.password, user.password_hash)
         
         if password_valid:
+            if upgraded_hash:
+                # Stored hash predates the configured cost; replace it while we have the password
+                try:
+                    user.password_hash = upgraded_hash
+                    await db.commit()
+                except Exception as e:
+                    logger.warning(f"Password rehash not saved for {request.email}: {e}")
+                    await db.rollback()
+            
             token = create_access_token(
                 data={"sub": user.email, "user_id": str(user.id)},
                 expires_delta=timedelta(days=7 if request.remember else 1)
@@ -214,7 +242,7 @@ async def register(request: RegisterRequest, db: AsyncSession = Depends(get_db))
         # Generate user data
         user_id = f"user_{secrets.token_hex(8)}"
         api_key = generate_api_key()
-        password_hash = bcrypt.hashpw(request.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        password_hash = await hash_password_async(request.password)
         
         # Create new user
         full_name = f"{request.first_name} {request.last_name}"
@@ -366,7 +394,7 @@ async def complete_password_setup(request: PasswordSetupComplete, db: AsyncSessi
         if not user:
             raise HTTPException(status_code=400, detail="Invalid token")
         # Update password
-        new_hash = bcrypt.hashpw(request.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        new_hash = await hash_password_async(request.password)
         user.password_hash = new_hash
         user.is_verified = True
         reset.used_at = datetime.utcnow()
@@ -410,7 +438,7 @@ async def checkout_password_setup(request: CheckoutPasswordSetupRequest, db: Asy
             )
         
         # Set the password
-        password_hash = bcrypt.hashpw(request.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        password_hash = await hash_password_async(request.password)
         
         # Update user with raw SQL
         await db.execute(text("""
@@ -538,11 +566,9 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
 @router.post("/logout", response_model=AuthResponse)
 async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Logout user (client-side token removal)"""
-    # In a real implementation, you might want to:
-    # 1. Add token to a blacklist
-    # 2. Clear server-side sessions
-    # 3. Log the logout event
-    
+    # Revocation is per worker; other workers accept the token until exp
+    revoke_token(credentials.credentials)
+
     return AuthResponse(
         success=True,
         message="Logged out successfully",
@@ -563,14 +589,16 @@ async def complete_registration(request: CompleteRegistrationRequest, db: AsyncS
         # Verify the Stripe session if API key is configured
         if settings.STRIPE_SECRET_KEY and settings.STRIPE_SECRET_KEY != "":
             try:
-                session = stripe.checkout.Session.retrieve(request.session_id)
-                if session.payment_status != 'paid':
+                # Served from the webhook-fed mirror; Stripe is only asked on a miss
+                mirror = get_stripe_mirror()
+                session = await mirror.get_checkout_session(request.session_id)
+                if session.get('payment_status') != 'paid':
                     raise HTTPException(status_code=400, detail="Payment not completed")
                 
                 # Get customer email from Stripe session
-                customer_id = session.customer
-                customer = stripe.Customer.retrieve(customer_id) if customer_id else None
-                stripe_email = customer.email if customer else None
+                customer_id = session.get('customer')
+                customer = await mirror.get_customer(customer_id) if customer_id else None
+                stripe_email = customer.get('email') if customer else None
                 
                 # Verify email matches
                 if stripe_email and stripe_email.lower() != request.email.lower():
@@ -595,14 +623,14 @@ async def complete_registration(request: CompleteRegistrationRequest, db: AsyncS
         
         if existing_user:
             # Update existing user with password
-            existing_user.password_hash = hash_password(request.password)
+            existing_user.password_hash = await hash_password_async(request.password)
             existing_user.is_verified = True  # Use is_verified instead of email_verified
             existing_user.stripe_customer_id = customer_id
             await db.commit()
             user = existing_user
         else:
             # Create new user
-            hashed_password = hash_password(request.password)
+            hashed_password = await hash_password_async(request.password)
             user = User(
                 email=request.email.lower(),
                 password_hash=hashed_password,
@@ -8,7 +8,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-import hashlib
 import secrets
 import time
 from datetime import datetime, timedelta
@@ -20,6 +19,7 @@ from ...services.database_service import DatabaseService
 from ...services.payment_service import PaymentService
 from ...services.email_service import EmailService
 from ...core.config import get_settings
+from .auth_complete import check_password_async, hash_password_async
 from .auth_impl import create_jwt_token
 
 logger = logging.getLogger(__name__)
@@ -55,21 +55,6 @@ class LoginResponse(BaseModel):
     message: str
     data: Optional[dict] = None
 
-def hash_password(password: str) -> str:
-    """Hash a password with salt"""
-    salt = secrets.token_hex(16)
-    password_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), 100000)
-    return f"{salt}:{password_hash.hex()}"
-
-def verify_password(password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    try:
-        salt, password_hash = hashed_password.split(':')
-        computed_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), 100000)
-        return password_hash == computed_hash.hex()
-    except:
-        return False
-
 @router.post("/register", response_model=LoginResponse)
 async def register_user(
     request: UserRegistrationRequest,
@@ -89,7 +74,7 @@ async def register_user(
             )
         
         # Hash the password
-        password_hash = hash_password(request.password)
+        password_hash = await hash_password_async(request.password)
         
         # Generate API key
         api_key = secrets.token_urlsafe(32)
@@ -177,7 +162,7 @@ async def login_user(
             )
         
         # Verify password
-        if not verify_password(request.password, user.password_hash):
+        if not await check_password_async(request.password, user.password_hash or ""):
             raise HTTPException(
                 status_code=401,
                 detail="Invalid email or password"
@@ -10,7 +10,6 @@ from typing import Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import jwt
-import bcrypt
 import logging
 import secrets
 import uuid
@@ -19,6 +18,8 @@ import hashlib
 from ...models.user import User, UserSession
 from ...services.database_service import DatabaseService
 from ...core.config import get_settings
+from ...services.token_verifier import get_token_verifier
+from .auth_complete import check_password_async
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 security = HTTPBearer()
@@ -67,10 +68,6 @@ def hash_password(password: str) -> str:
     """Simple password hashing (use bcrypt in production)"""
     return hashlib.sha256(password.encode()).hexdigest()
 
-def verify_password(password: str, password_hash: str) -> bool:
-    """Verify password against hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
-
 def create_jwt_token(user_id: str, email: str, name: str = None, remember: bool = False) -> str:
     """Create JWT token for authenticated user with UUID
     
@@ -92,36 +89,24 @@ def create_jwt_token(user_id: str, email: str, name: str = None, remember: bool
         "iat": datetime.utcnow()
     }
     
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
-
-def _candidate_secrets() -> list:
-    from os import getenv
-    # Try common keys to handle legacy tokens
-    return [
-        settings.jwt_secret_key,
-        getattr(settings, 'secret_key', None),
-        getenv('JWT_SECRET_KEY'),
-        getenv('SECRET_KEY'),
-        'your-secret-key-here-change-in-production',
-    ]
+    return jwt.encode(
+        payload,
+        JWT_SECRET,
+        algorithm=JWT_ALGORITHM,
+        headers=get_token_verifier("auth").signing_headers(JWT_SECRET) or None,
+    )
 
 def verify_jwt_token(token: str) -> Optional[Dict[str, Any]]:
-    """Verify JWT token and return payload if valid. Tries multiple secrets.
-    
+    """Verify JWT token and return payload if valid.
+
+    Uses the kid-routed "auth" verifier, which falls back to the configured
+    JWT/app secrets for tokens without a key id.
+
     Returns:
         Dict containing user information if valid, None otherwise
     """
-    for secret in _candidate_secrets():
-        if not secret:
-            continue
-        try:
-            payload = jwt.decode(token, secret, algorithms=[JWT_ALGORITHM])
-            # Return the full payload to support both old (email) and new (UUID) tokens
-            return payload
-        except Exception:
-            continue
-    logger.warning("JWT verification failed for all candidate secrets")
-    return None
+    # Return the full payload to support both old (email) and new (UUID) tokens
+    return get_token_verifier("auth").verify(token)
 
 
 def verify_jwt_token_email(token: str) -> Optional[str]:
@@ -156,7 +141,7 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
             )
         
         # Verify password
-        if not verify_password(request.password, user.password_hash):
+        if not await check_password_async(request.password, user.password_hash or ""):
             raise HTTPException(
                 status_code=401,
                 detail="Invalid email or password"
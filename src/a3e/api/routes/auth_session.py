@@ -23,6 +23,8 @@ from typing import Optional
 import jwt  # PyJWT
 from contextlib import asynccontextmanager
 
+from ...services.password_hasher import HashingOverloaded, get_password_hasher
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/auth", tags=["auth-session"])
@@ -176,6 +178,14 @@ except Exception:  # pragma: no cover - fallback
             return False
 
 
+async def _off_loop(fn, *args):
+    """Run a hashing function on the bounded hashing pool; 429/503 when it is saturated."""
+    try:
+        return await get_password_hasher().run(fn, *args)
+    except HashingOverloaded as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
+
+
 class RegisterRequest(BaseModel):
     email: EmailStr
     password: str
@@ -234,9 +244,8 @@ def _get_user_by_email(email: str):
     return None
 
 
-def _create_user(email: str, password: str) -> str:
+def _create_user(email: str, pw_hash: str) -> str:
     user_id = f"user_{secrets.token_hex(8)}"
-    pw_hash = hash_password(password)
     c = _conn()
     cur = c.cursor()
     cur.execute(
@@ -261,7 +270,7 @@ def _set_auth_cookies(resp: Response, access_token: str, access_exp: datetime, r
 async def register(req: RegisterRequest, response: Response):
     if _get_user_by_email(req.email):
         raise HTTPException(status_code=400, detail="User already exists")
-    user_id = _create_user(req.email, req.password)
+    user_id = _create_user(req.email, await _off_loop(hash_password, req.password))
     access, aexp = _issue_access_token(user_id, req.email)
     refresh_days = REFRESH_DAYS
     refresh, rexp = _new_refresh_token(user_id, refresh_days)
@@ -280,7 +289,7 @@ async def login(req: LoginRequest, response: Response):
         return AuthSuccess(access_token=access, expires_in=ACCESS_MINUTES * 60)
 
     user = _get_user_by_email(req.email)
-    if not user or not user["is_active"] or not verify_password(req.password, user["password_hash"]):
+    if not user or not user["is_active"] or not await _off_loop(verify_password, req.password, user["password_hash"]):
         # Fallback: try primary DB (users table managed by ORM) to support existing paid users
         auth_failed = False
         async with _maybe_session() as session:
@@ -290,22 +299,19 @@ async def login(req: LoginRequest, response: Response):
                     result = await session.execute(_select(User).where(User.email == req.email.lower()))
                     db_user = result.scalar_one_or_none()
                     if db_user and getattr(db_user, 'password_hash', None):
-                        # db_user.password_hash likely bcrypt
+                        # db_user.password_hash likely bcrypt; verify_password never raises
                         ph = db_user.password_hash
-                        ph_bytes = ph if isinstance(ph, (bytes, bytearray)) else ph.encode('utf-8')
-                        try:
-                            import bcrypt as _bc
-                            if _bc.checkpw(req.password.encode('utf-8'), ph_bytes):
-                                # Provision sqlite mirror and continue
-                                _ensure_sqlite_user_record(str(db_user.id), db_user.email, ph if isinstance(ph, str) else ph_bytes.decode())
-                                user = {"user_id": str(db_user.id), "email": db_user.email, "password_hash": ph if isinstance(ph, str) else ph_bytes.decode(), "is_active": True}
-                            else:
-                                auth_failed = True
-                        except Exception:
-                            # If bcrypt check fails unexpectedly, do not expose details
+                        ph = ph.decode() if isinstance(ph, (bytes, bytearray)) else ph
+                        if await _off_loop(verify_password, req.password, ph):
+                            # Provision sqlite mirror and continue
+                            _ensure_sqlite_user_record(str(db_user.id), db_user.email, ph)
+                            user = {"user_id": str(db_user.id), "email": db_user.email, "password_hash": ph, "is_active": True}
+                        else:
                             auth_failed = True
                     else:
                         auth_failed = True
+                except HTTPException:
+                    raise
                 except Exception as e:  # pragma: no cover
                     logger.error(f"Fallback DB auth failed: {e}")
                     auth_failed = True
@@ -5,7 +5,6 @@ Simple authentication endpoint that works
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
-import bcrypt
 import jwt
 import secrets
 from datetime import datetime, timedelta
@@ -25,6 +24,7 @@ try:
     from ...core.config import settings
     from ...models import User
     from ...services.database_service import DatabaseService
+    from .auth_complete import check_password_async
     SECRET_KEY = settings.secret_key
     JWT_SECRET = getattr(settings, 'jwt_secret_key', None) or os.getenv("JWT_SECRET_KEY") or SECRET_KEY
     ALGORITHM = settings.jwt_algorithm
@@ -160,8 +160,8 @@ async def do_login(request: LoginRequest, db: Optional[AsyncSession]):
             logger.error(f"User {request.email} has no password hash")
             raise HTTPException(status_code=401, detail="Invalid email or password")
 
-        password_hash_bytes = user.password_hash.encode('utf-8') if isinstance(user.password_hash, str) else user.password_hash
-        if not bcrypt.checkpw(request.password.encode('utf-8'), password_hash_bytes):
+        password_hash = user.password_hash.decode('utf-8') if isinstance(user.password_hash, bytes) else user.password_hash
+        if not await check_password_async(request.password, password_hash):
             logger.warning(f"Invalid password for user: {request.email}")
             raise HTTPException(status_code=401, detail="Invalid email or password")
 
@@ -354,29 +354,31 @@ async def trial_diagnose(payment_service: PaymentService = Depends(get_payment_s
 
 @router.get("/trial/verify-prices", include_in_schema=False)
 async def trial_verify_prices(payment_service: PaymentService = Depends(get_payment_service)):
-    """Retrieve each configured price from Stripe to confirm it exists under current key."""
+    """Confirm each configured price exists, from the Stripe mirror (fetching unknown prices once)."""
     import stripe
+    from ...services.stripe_mirror import get_stripe_mirror
     plans = ['college_monthly', 'college_yearly', 'multicampus_monthly', 'multicampus_yearly']
+    price_ids = {p: payment_service._get_price_id(p) for p in plans}  # type: ignore
+    prices = await get_stripe_mirror().get_prices([pid for pid in price_ids.values() if pid])
     results = {}
-    for p in plans:
-        pid = payment_service._get_price_id(p)  # type: ignore
+    for p, pid in price_ids.items():
         if not pid:
             results[p] = {'price_id': None, 'exists': False, 'error': 'missing_price_id'}
             continue
-        try:
-            price_obj = stripe.Price.retrieve(pid)
+        price_obj = prices.get(pid)
+        if isinstance(price_obj, stripe.error.InvalidRequestError):
+            results[p] = {'price_id': pid, 'exists': False, 'error': str(price_obj)}
+        elif isinstance(price_obj, Exception) or price_obj is None:  # pragma: no cover
+            results[p] = {'price_id': pid, 'exists': False, 'error': f'unexpected: {price_obj}'}
+        else:
             results[p] = {
                 'price_id': pid,
                 'exists': True,
-                'currency': getattr(price_obj, 'currency', None),
-                'unit_amount': getattr(price_obj, 'unit_amount', None),
-                'recurring': getattr(price_obj, 'recurring', None),
-                'livemode': getattr(price_obj, 'livemode', None)
+                'currency': price_obj.get('currency'),
+                'unit_amount': price_obj.get('unit_amount'),
+                'recurring': price_obj.get('recurring'),
+                'livemode': price_obj.get('livemode')
             }
-        except stripe.error.InvalidRequestError as e:
-            results[p] = {'price_id': pid, 'exists': False, 'error': str(e)}
-        except Exception as e:  # pragma: no cover
-            results[p] = {'price_id': pid, 'exists': False, 'error': f'unexpected: {e}'}
     return {'verification': results}
 
 @router.post("/subscription/create", response_model=PaymentResponse)
@@ -603,6 +605,21 @@ async def stripe_webhook(request: Request):
         
         event_type = event.get("type")
         logger.info(f"Processing webhook: {event_type}")
+
+        # Keep the local Stripe mirror current; an already handled event id is
+        # skipped. The id is recorded only after the handling below succeeds.
+        from ...services.stripe_mirror import get_stripe_mirror
+
+        stripe_mirror = get_stripe_mirror()
+        try:
+            if not await stripe_mirror.apply_event_async(event, record=False):
+                logger.info(f"Duplicate webhook {event.get('id')} ignored")
+                return {"status": "duplicate", "type": event_type}
+        except Exception as e:
+            logger.error(f"Stripe mirror update failed: {e}")
+        
+        # Side effects that must not repeat on a retried delivery
+        after_record = []
         
         # Handle checkout session completed
         if event_type == "checkout.session.completed":
@@ -621,50 +638,13 @@ async def stripe_webhook(request: Request):
                 # Log successful subscription
                 logger.info(f"✅ New subscription: {customer_email} - {plan_name} Plan")
                 
-                # Send welcome email to customer
-                try:
-                    # Use the regular email service which has the proper methods
-                    from ...services.email_service import email_service
-                    
-                    # Extract customer name if available
-                    customer_name = session.get("customer_details", {}).get("name", "Valued Customer")
-                    
-                    # Send welcome email
-                    email_sent = email_service.send_welcome_email(
-                        user_email=customer_email,
-                        user_name=customer_name,
-                        plan_name=plan_name
-                    )
-                    
-                    if email_sent:
-                        logger.info(f"✅ Welcome email sent to {customer_email}")
-                    else:
-                        logger.warning(f"⚠️ Failed to send welcome email to {customer_email}")
-                    
-                    # Send admin notification
-                    admin_notification = email_service.send_admin_new_signup_notification(
-                        user_email=customer_email,
-                        user_name=customer_name,
-                        institution=metadata.get("institution_name"),
-                        trial=False,
-                        plan_name=plan_name,
-                        amount=amount_total,
-                        stripe_customer_id=stripe_customer_id,
-                        subscription_id=subscription_id
-                    )
-                    
-                    if admin_notification:
-                        logger.info(f"✅ Admin notification sent for new subscription: {customer_email}")
-                    
-                except Exception as e:
-                    logger.error(f"Error sending emails for checkout completion: {e}")
-                
                 # Create user in database
                 try:
-                    from ...models.user import User
+                    from ...models.user import User, PasswordReset
                     from ...services.database_service import DatabaseService
                     from ...core.config import get_settings
                     import secrets
+                    import uuid
                     from datetime import datetime, timedelta
                     
                     settings = get_settings()
@@ -699,42 +679,19 @@ async def stripe_webhook(request: Request):
                                 email_verified_at=datetime.utcnow()
                             )
                             db.add(user)
+                            await db.flush()
+                            
+                            # Password setup token for Stripe checkout users, committed with the user
+                            token = str(uuid.uuid4())
+                            db.add(PasswordReset(
+                                user_id=user.id,
+                                reset_token=token,
+                                reset_code=secrets.token_hex(3).upper(),  # 6-char code
+                                expires_at=datetime.utcnow() + timedelta(hours=48)
+                            ))
                             await db.commit()
                             logger.info(f"✅ Created user in database: {customer_email}")
-                            
-                            # Send password setup email for Stripe checkout users
-                            try:
-                                from ...models.user import PasswordReset
-                                import uuid
-                                
-                                # Generate password setup token
-                                token = str(uuid.uuid4())
-                                code = secrets.token_hex(3).upper()  # 6-char code
-                                expires_at = datetime.utcnow() + timedelta(hours=48)
-                                
-                                # Create password reset entry
-                                password_reset = PasswordReset(
-                                    user_id=user.id,
-                                    reset_token=token,
-                                    reset_code=code,
-                                    expires_at=expires_at
-                                )
-                                db.add(password_reset)
-                                await db.commit()
-                                
-                                # Send password setup email
-                                setup_link = f"https://platform.mapmystandards.ai/set-password?token={token}"
-                                email_service.send_password_setup_email(
-                                    user_email=customer_email,
-                                    user_name=customer_name,
-                                    setup_link=setup_link
-                                )
-                                logger.info(f"✅ Sent password setup email to {customer_email}")
-                                
-                            except Exception as e:
-                                logger.error(f"Failed to send password setup email: {e}")
-                                # Don't fail the webhook if email fails
-                                
+                            setup_link = f"https://platform.mapmystandards.ai/set-password?token={token}"
                         else:
                             # Update existing user
                             existing_user.stripe_customer_id = stripe_customer_id
@@ -745,9 +702,52 @@ async def stripe_webhook(request: Request):
                             existing_user.email_verified_at = datetime.utcnow()
                             await db.commit()
                             logger.info(f"✅ Updated existing user in database: {customer_email}")
+                            setup_link = None
                             
                 except Exception as e:
                     logger.error(f"Error creating/updating user in database: {e}")
+                    # Fail the delivery so Stripe retries it; no email has gone out yet
+                    raise
+                
+                # Emails go out only once the user is committed, so a retried delivery
+                # cannot send them twice (handled event ids are skipped above)
+                def send_checkout_emails():
+                    from ...services.email_service import email_service
+                    
+                    # Extract customer name if available
+                    user_name = session.get("customer_details", {}).get("name", "Valued Customer")
+                    
+                    if email_service.send_welcome_email(
+                        user_email=customer_email,
+                        user_name=user_name,
+                        plan_name=plan_name
+                    ):
+                        logger.info(f"✅ Welcome email sent to {customer_email}")
+                    else:
+                        logger.warning(f"⚠️ Failed to send welcome email to {customer_email}")
+                    
+                    # Send admin notification
+                    if email_service.send_admin_new_signup_notification(
+                        user_email=customer_email,
+                        user_name=user_name,
+                        institution=metadata.get("institution_name"),
+                        trial=False,
+                        plan_name=plan_name,
+                        amount=amount_total,
+                        stripe_customer_id=stripe_customer_id,
+                        subscription_id=subscription_id
+                    ):
+                        logger.info(f"✅ Admin notification sent for new subscription: {customer_email}")
+                    
+                    if setup_link:
+                        email_service.send_password_setup_email(
+                            user_email=customer_email,
+                            user_name=customer_name,
+                            setup_link=setup_link
+                        )
+                        logger.info(f"✅ Sent password setup email to {customer_email}")
+                
+                after_record.append(send_checkout_emails)
                 
         elif event_type == "payment_intent.succeeded":
             # Handle successful payment
@@ -764,6 +764,17 @@ async def stripe_webhook(request: Request):
             subscription = event["data"]["object"]
             logger.info(f"Subscription cancelled: {subscription.get('id')}")
         
+        try:
+            await stripe_mirror.record_event_async(event)
+        except Exception as e:
+            logger.error(f"Failed to record Stripe event {event.get('id')}: {e}")
+        
+        for send in after_record:
+            try:
+                send()
+            except Exception as e:
+                logger.error(f"Error sending emails for {event_type}: {e}")
+        
         return {"status": "success", "type": event_type}
         
     except HTTPException:
@@ -1212,6 +1223,10 @@ async def migrate_users_table():
         except Exception as idx_error:
             logger.warning(f"Index creation warning (may already exist): {idx_error}")
         
+        # Columns were just added; drop cached layouts
+        from ...database.schema_cache import get_schema_cache
+        get_schema_cache().invalidate()
+        
         # Verify migration by checking new columns
         columns_after = await conn.fetch("""
             SELECT column_name, data_type, is_nullable, column_default
@@ -5,12 +5,13 @@ older frontend code (or Stripe webhooks) still reference the non-versioned prefi
 """
 from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
-import stripe
+import importlib
 import os
 import logging
 from typing import Optional, Dict
 
 from ..dependencies import get_optional_user, get_current_user
+from ...core.lazy_loading import LazyObject
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 # Create a custom security scheme that doesn't raise on missing auth
@@ -49,8 +50,15 @@ def _rate_limited(ip: str) -> bool:
 router = APIRouter(prefix="/api/v1/billing", tags=["billing-single"])
 legacy_single_plan_router = APIRouter(prefix="/api/billing", tags=["billing-single-legacy"])
 
-# Initialize Stripe with test or live key (defer so env already loaded)
-stripe.api_key = os.getenv("STRIPE_SECRET_KEY", "")
+# Initialize Stripe with test or live key on first use (the SDK is slow to import)
+def _load_stripe():
+    module = importlib.import_module("stripe")
+    if not module.api_key:
+        module.api_key = os.getenv("STRIPE_SECRET_KEY", "")
+    return module
+
+
+stripe = LazyObject(_load_stripe, "stripe (single-plan billing)")
 
 def _resolve_single_price_id() -> str:
     """Return the single plan price ID using multiple fallback env vars.
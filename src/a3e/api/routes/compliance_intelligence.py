@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Backgro
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from uuid import UUID
 import json
 import logging
 
@@ -14,6 +15,7 @@ from ...services.standards_graph import standards_graph
 from ...services.evidence_mapper import evidence_mapper, EvidenceDocument
 from ...services.evidence_trust import evidence_trust_scorer, EvidenceType, SourceSystem
 from ...services.gap_risk_predictor import gap_risk_predictor
+from ...services.coverage_index import CoverageIndex, get_coverage_indexes
 from ...core.auth import verify_api_key
 
 router = APIRouter(prefix="/api/intelligence", tags=["compliance-intelligence"])
@@ -63,6 +65,7 @@ class GapRiskRequest(BaseModel):
 class ComplianceStatusRequest(BaseModel):
     """Request for comprehensive compliance status"""
     accreditor: str
+    org_id: Optional[str] = None
     include_predictions: bool = True
     include_trust_scores: bool = True
 
@@ -200,6 +203,9 @@ async def get_compliance_status(
     api_key: str = Depends(verify_api_key)
 ) -> Dict[str, Any]:
     """Get comprehensive compliance status with predictions"""
+    if request.org_id:
+        await _require_org_access(api_key, request.org_id)
+        return await _indexed_compliance_status(request)
     try:
         # Get standards for accreditor
         standards = standards_graph.get_accreditor_standards(request.accreditor)
@@ -270,6 +276,151 @@ async def get_compliance_status(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _require_org_access(api_key: str, org_id: str) -> None:
+    """Org-scoped reads are limited to members of the org (the API key's user, matched by email)."""
+    try:
+        org_uuid = UUID(org_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid org_id: {org_id}")
+    try:
+        from sqlalchemy import text
+        from ...database.connection import db_manager
+
+        async with db_manager.get_session() as session:
+            result = await session.execute(
+                text(
+                    "SELECT 1 FROM users u JOIN app_users a ON lower(a.email) = lower(u.email) "
+                    "WHERE u.api_key = :api_key AND a.org_id = :org_id LIMIT 1"
+                ),
+                {"api_key": api_key, "org_id": org_uuid},
+            )
+            member = result.scalar() is not None
+    except Exception as e:
+        logger.error(f"Org membership check failed for {org_id}: {e}")
+        raise HTTPException(status_code=503, detail="Coverage data temporarily unavailable")
+    if not member:
+        raise HTTPException(status_code=403, detail="Not authorized for this organization")
+
+
+async def _coverage_index(org_id: str, accreditor: str) -> CoverageIndex:
+    """Coverage index for an org, (re-)seeded from evidence_links when stale."""
+    registry = get_coverage_indexes()
+    if not registry.is_stale(org_id, accreditor):
+        return registry.get(org_id, accreditor)
+    try:
+        org_uuid = UUID(org_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid org_id: {org_id}")
+    try:
+        from ...database.ai_repositories import EvidenceLinkRepository
+        from ...database.connection import db_manager
+
+        async with db_manager.get_session() as session:
+            links = await EvidenceLinkRepository(session).get_latest(
+                org_id=org_uuid, standard_set=accreditor
+            )
+    except Exception as e:
+        if registry.is_loaded(org_id, accreditor):
+            logger.warning(f"Coverage index re-seed failed for {org_id}/{accreditor}, serving last seed: {e}")
+            return registry.get(org_id, accreditor)
+        logger.error(f"Coverage index seed failed for {org_id}/{accreditor}: {e}")
+        raise HTTPException(status_code=503, detail="Coverage data temporarily unavailable")
+    return registry.load(org_id, accreditor, links)
+
+
+async def _indexed_compliance_status(request: ComplianceStatusRequest) -> Dict[str, Any]:
+    """Compliance status read from the precomputed coverage vectors."""
+    try:
+        index = await _coverage_index(request.org_id, request.accreditor)
+        rows = index.standards()
+        status = {
+            "accreditor": request.accreditor,
+            "org_id": request.org_id,
+            "timestamp": datetime.utcnow().isoformat(),
+            "standards_count": len(rows),
+            "standards": [],
+        }
+        batch = None
+        if request.include_predictions and rows:
+            batch = gap_risk_predictor.predict_risk_batch(
+                [r["standard_id"] for r in rows],
+                [r["coverage_percentage"] for r in rows],
+                average_trust=[float("nan") if r["average_trust"] is None else r["average_trust"] for r in rows],
+                average_age_days=[float("nan") if r["average_age_days"] is None else r["average_age_days"] for r in rows],
+            )
+            levels = batch.risk_levels()
+
+        total_coverage = 0.0
+        trust_sum = 0.0
+        trust_n = 0
+        high_risk_count = 0
+        for i, row in enumerate(rows):
+            standard_status = {
+                "standard_id": row["standard_id"],
+                "title": row["title"],
+                "coverage_percentage": row["coverage_percentage"],
+                "evidence_count": row["evidence_count"],
+            }
+            if request.include_trust_scores and row["average_trust"] is not None:
+                standard_status["average_trust"] = row["average_trust"]
+                trust_sum += row["average_trust"] * row["evidence_count"]
+                trust_n += row["evidence_count"]
+            if batch is not None:
+                risk_score = float(batch.risk_score[i])
+                standard_status["risk_score"] = round(risk_score, 3)
+                standard_status["risk_level"] = levels[i].value
+                if risk_score > 0.5:
+                    high_risk_count += 1
+            total_coverage += row["coverage_percentage"]
+            status["standards"].append(standard_status)
+
+        average_coverage = total_coverage / len(rows) if rows else 0.0
+        average_trust = trust_sum / trust_n if trust_n else 0.0
+        status["overall_metrics"] = {
+            "average_coverage": round(average_coverage, 1),
+            "average_trust": round(average_trust, 3),
+            "high_risk_standards": high_risk_count,
+            "compliance_score": round(average_coverage * 0.7 + average_trust * 100 * 0.3, 1),
+        }
+        return status
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting indexed compliance status: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/compliance/gaps")
+async def get_coverage_gaps(
+    org_id: str,
+    accreditor: str,
+    api_key: str = Depends(verify_api_key)
+) -> Dict[str, Any]:
+    """Uncovered indicators per standard from the coverage index"""
+    await _require_org_access(api_key, org_id)
+    index = await _coverage_index(org_id, accreditor)
+    gaps = index.gap_summary()
+    return {
+        "org_id": org_id,
+        "accreditor": accreditor,
+        "total_uncovered": sum(g["uncovered_count"] for g in gaps),
+        "gaps": gaps,
+    }
+
+
+@router.get("/compliance/heatmap")
+async def get_coverage_heatmap(
+    org_id: str,
+    accreditor: str,
+    api_key: str = Depends(verify_api_key)
+) -> Dict[str, Any]:
+    """Clause-level coverage heatmap from the coverage index"""
+    await _require_org_access(api_key, org_id)
+    index = await _coverage_index(org_id, accreditor)
+    return {"org_id": org_id, "accreditor": accreditor, "heatmap": index.heatmap()}
+
+
 @router.post("/evidence/analyze-document")
 async def analyze_uploaded_document(
     file: UploadFile = File(...),
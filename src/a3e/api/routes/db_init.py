@@ -9,6 +9,8 @@ import logging
 import os
 from typing import Dict, Any
 
+from ...database.schema_cache import get_schema_cache
+
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -223,6 +225,9 @@ async def initialize_database(secret_key: str = None) -> Dict[str, Any]:
             result = conn.execute(text("SELECT COUNT(*) FROM standards"))
             total_standards = result.scalar()
             
+            # Tables may have just been created; drop cached layouts
+            get_schema_cache().invalidate()
+            
             return {
                 "success": True,
                 "message": "Database initialized successfully",
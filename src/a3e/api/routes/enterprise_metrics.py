@@ -18,9 +18,9 @@ router = APIRouter()
 
 # Dependency for async database session
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Get async database session"""
+    """Get async database session (read-only dashboard queries go to the replica if configured)"""
     await db_manager.initialize()
-    async with db_manager.get_session() as session:
+    async with db_manager.get_session(read_only=True) as session:
         yield session
 
 
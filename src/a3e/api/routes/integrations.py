@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from typing import Dict, List, Any, Optional
 import logging
 
+from .user_intelligence_simple import get_current_user_simple
 from ...services.integration_service import integration_manager
 from ...services.mock_canvas_service import mock_integration_manager
 from ...core.standards_config import standards_config
@@ -142,13 +143,16 @@ async def get_integration_status() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail="Failed to get integration status")
 
 @router.post("/sync")
-async def sync_integration_data(background_tasks: BackgroundTasks) -> Dict[str, str]:
+async def sync_integration_data(
+    background_tasks: BackgroundTasks,
+    current_user: Dict[str, Any] = Depends(get_current_user_simple)
+) -> Dict[str, str]:
     """Trigger data synchronization from all integrated systems."""
     try:
         manager = get_integration_manager()
         
-        # Add sync task to background
-        background_tasks.add_task(perform_sync, manager)
+        # Synced documents are analyzed and stored as the user who started the sync
+        background_tasks.add_task(perform_sync, manager, current_user)
         
         return {
             "message": "Data synchronization started",
@@ -160,15 +164,34 @@ async def sync_integration_data(background_tasks: BackgroundTasks) -> Dict[str,
         logger.error(f"Error starting sync: {e}")
         raise HTTPException(status_code=500, detail="Failed to start synchronization")
 
-async def perform_sync(manager):
+async def analyze_synced_document(document, owner: Dict[str, Any]) -> str:
+    """Analyze a new or changed connector document and store it for ``owner``.
+    
+    Raises when the analysis or its document record fails, so the sync
+    engine offers the document again on the next sync.
+    """
+    from .user_intelligence_simple import _analyze_evidence_from_bytes
+    
+    result = await _analyze_evidence_from_bytes(
+        document.name,
+        document.content,
+        f"{document.source}_sync",
+        dict(owner),
+    )
+    document_id = result.get("document_id")
+    if not document_id:
+        raise RuntimeError(f"analysis of {document.name} was not persisted")
+    return document_id
+
+async def perform_sync(manager, owner: Dict[str, Any]):
     """Background task to perform data synchronization."""
+    async def on_document(document):
+        await analyze_synced_document(document, owner)
+    
     try:
         logger.info("Starting integration data sync...")
-        results = await manager.sync_all_data()
-        logger.info(f"Sync completed with results: {results}")
-        
-        # Here you would typically save the synced data to your database
-        # For now, we'll just log the results
+        results = await manager.sync_all_data(on_document=on_document)
+        logger.info(f"Sync completed: {results.get('stats')} errors={results.get('errors')}")
         
     except Exception as e:
         logger.error(f"Sync task failed: {e}")
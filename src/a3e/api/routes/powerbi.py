@@ -16,7 +16,7 @@ from ...database.connection import db_manager
 from ..dependencies import get_current_user, has_active_subscription
 from ...models import User
 from ...database.enterprise_models import PowerBIConfig as PowerBIConfigModel
-from ...services.powerbi_service import create_powerbi_service, PowerBIService
+from ...services.powerbi_service import get_powerbi_service, PowerBIService
 
 router = APIRouter()
 # Dependency for async database session
@@ -111,7 +111,7 @@ async def get_powerbi_config(
         )
     
     # Test actual Power BI connection
-    powerbi_service = create_powerbi_service()
+    powerbi_service = get_powerbi_service()
     if not powerbi_service:
         return PowerBIStatus(
             configured=False,
@@ -177,7 +177,7 @@ async def create_embed_token(
             detail="Active subscription required"
         )
     
-    powerbi_service = create_powerbi_service()
+    powerbi_service = get_powerbi_service()
     if not powerbi_service:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -257,7 +257,7 @@ async def list_powerbi_reports(
             detail="Active subscription required"
         )
     
-    powerbi_service = create_powerbi_service()
+    powerbi_service = get_powerbi_service()
     if not powerbi_service:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -298,7 +298,7 @@ async def list_powerbi_datasets(
             detail="Active subscription required"
         )
     
-    powerbi_service = create_powerbi_service()
+    powerbi_service = get_powerbi_service()
     if not powerbi_service:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -345,7 +345,7 @@ async def refresh_powerbi_dataset(
             detail="Active subscription required"
         )
     
-    powerbi_service = create_powerbi_service()
+    powerbi_service = get_powerbi_service()
     if not powerbi_service:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -384,7 +384,7 @@ async def get_refresh_history(
             detail="Active subscription required"
         )
     
-    powerbi_service = create_powerbi_service()
+    powerbi_service = get_powerbi_service()
     if not powerbi_service:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
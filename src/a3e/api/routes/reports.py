@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from fastapi.responses import JSONResponse, FileResponse
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+import asyncio
 import logging
 import secrets
 import json
@@ -14,6 +15,7 @@ from pathlib import Path
 from io import BytesIO
 
 from ...core.config import settings
+from ...services.report_renderer import digest, get_report_renderer
 from ..dependencies import get_current_user
 
 logger = logging.getLogger(__name__)
@@ -304,15 +306,17 @@ def generate_html_report(report_type: str, data: Dict[str, Any]) -> str:
 </body>
 </html>"""
 
-async def generate_pdf_from_html(html_content: str, output_path: Path):
+# Bump when generate_html_report output changes so cached files are not reused
+HTML_REPORT_TEMPLATE_VERSION = 1
+
+def write_pdf_from_html(html_content: str, output_path: str) -> str:
     """
-    Generate PDF from HTML content
+    Write the report file for HTML content (runs in the render process pool)
     In production, use a proper HTML-to-PDF library like weasyprint or playwright
     For now, we'll create a simple text file that represents the PDF
     """
-    try:
-        # Simple mock PDF generation - in production use real PDF library
-        pdf_content = f"""MapMyStandards A³E Report - Generated {datetime.now()}
+    # Simple mock PDF generation - in production use real PDF library
+    pdf_content = f"""MapMyStandards A³E Report - Generated {datetime.now()}
         
 {html_content[:500]}...
 
@@ -321,10 +325,17 @@ async def generate_pdf_from_html(html_content: str, output_path: Path):
 Report generated by MapMyStandards A³E Platform
 Contact: support@mapmystandards.ai
 """
-        
-        with open(output_path, 'w') as f:
-            f.write(pdf_content)
-            
+    
+    with open(output_path, 'w') as f:
+        f.write(pdf_content)
+    return output_path
+
+async def generate_pdf_from_html(html_content: str, output_path: Path):
+    """
+    Generate PDF from HTML content without blocking the event loop
+    """
+    try:
+        await asyncio.to_thread(write_pdf_from_html, html_content, str(output_path))
         logger.info(f"Mock PDF generated: {output_path}")
         
     except Exception as e:
@@ -400,13 +411,17 @@ async def generate_report_background(report_id: str, report_type: str, params: D
         })
         save_report_status(report_id, status_data)
         
-        # Generate HTML content
-        html_content = generate_html_report(report_type, params)
+        # Identical (type, template, params) requests reuse the cached file
+        renderer = get_report_renderer()
+        cache_key = digest("html_report", report_type, HTML_REPORT_TEMPLATE_VERSION, params)
+        cached_path, cache_hit = await renderer.get_or_render(
+            cache_key,
+            write_pdf_from_html,
+            generate_html_report(report_type, params),
+        )
         
-        # Generate PDF
         pdf_filename = f"{report_id}_{report_type}.pdf"
-        pdf_path = REPORTS_DIR / pdf_filename
-        await generate_pdf_from_html(html_content, pdf_path)
+        pdf_path = renderer.materialize(cached_path, REPORTS_DIR / pdf_filename)
         
         # Update status to completed
         status_data.update({
@@ -415,6 +430,7 @@ async def generate_report_background(report_id: str, report_type: str, params: D
             "message": "Report generated successfully",
             "pdf_filename": pdf_filename,
             "pdf_path": str(pdf_path),
+            "cache_hit": cache_hit,
             "download_url": f"/api/reports/{report_id}/download",
             "completed_at": datetime.utcnow().isoformat(),
             "updated_at": datetime.utcnow().isoformat()
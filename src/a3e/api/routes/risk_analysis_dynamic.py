@@ -16,15 +16,20 @@ from ...models.database_schema import (
     StandardMapping, Document, AccreditationStandard, 
     StandardComplianceStatus
 )
-from ...services.risk_explainer import RiskExplainer, StandardEvidenceSnapshot
+from ...services.risk_explainer import StandardEvidenceSnapshot, risk_explainer
 from ...services.gap_risk_predictor import GapRiskScore
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/risk", tags=["risk-analysis"])
 
-# Create instance of risk explainer
-risk_explainer = RiskExplainer()
+
+def _tenant(current_user: Optional[dict]) -> Optional[str]:
+    """Per-user score cache key (same precedence as the user intelligence routes)."""
+    claims = current_user or {}
+    key = claims.get("email") or claims.get("sub") or claims.get("user_id")
+    return str(key) if key else None
+
 
 async def get_evidence_data_for_standard(
     standard_id: str, 
@@ -183,7 +188,7 @@ async def score_standard_dynamic(
         )
         
         # Calculate risk score
-        risk_score = risk_explainer.compute_standard_risk(snapshot)
+        risk_score = risk_explainer.compute_standard_risk(snapshot, tenant=_tenant(current_user))
         
         # Enhance predicted issues based on actual evidence data
         enhanced_issues = list(risk_score.predicted_issues)
@@ -251,7 +256,7 @@ async def get_standard_risk_summary(
             days_to_review=180
         )
         
-        risk_score = risk_explainer.compute_standard_risk(snapshot)
+        risk_score = risk_explainer.compute_standard_risk(snapshot, tenant=_tenant(current_user))
         
         # Get document details for the summary
         standard_result = await db.execute(
@@ -318,15 +323,15 @@ async def bulk_score_dynamic(
         if not standard_ids:
             raise HTTPException(status_code=400, detail="No standards provided")
         
-        results = []
+        snapshots = []
+        evidence = []
         
         for standard_id in standard_ids[:50]:  # Limit to 50 standards
             try:
                 # Get evidence data
                 evidence_data = await get_evidence_data_for_standard(standard_id, accreditor, db)
                 
-                # Create snapshot
-                snapshot = StandardEvidenceSnapshot(
+                snapshots.append(StandardEvidenceSnapshot(
                     standard_id=standard_id,
                     coverage_percent=evidence_data["coverage"],
                     trust_scores=evidence_data["trust_scores"],
@@ -336,23 +341,26 @@ async def bulk_score_dynamic(
                     recent_changes=0,
                     historical_findings=0,
                     days_to_review=180
-                )
-                
-                # Calculate risk
-                risk_score = risk_explainer.compute_standard_risk(snapshot)
-                
-                result = {
-                    "standard_id": standard_id,
-                    "risk_score": risk_score.risk_score,
-                    "risk_level": risk_score.risk_level.value,
-                    "coverage": evidence_data["coverage"],
-                    "evidence_count": evidence_data["evidence_count"]
-                }
-                results.append(result)
+                ))
+                evidence.append(evidence_data)
             except Exception as e:
-                logger.error(f"Error scoring standard {standard_id}: {e}")
+                logger.error(f"Error loading evidence for standard {standard_id}: {e}")
                 continue
         
+        # Score every standard in one vectorized pass
+        batch = risk_explainer.compute_snapshots(snapshots, tenant=_tenant(current_user))
+        levels = batch.risk_levels()
+        results = [
+            {
+                "standard_id": snapshot.standard_id,
+                "risk_score": float(batch.risk_score[i]),
+                "risk_level": levels[i].value,
+                "coverage": evidence_data["coverage"],
+                "evidence_count": evidence_data["evidence_count"]
+            }
+            for i, (snapshot, evidence_data) in enumerate(zip(snapshots, evidence))
+        ]
+        
         return {
             "success": True,
             "data": {
@@ -4,7 +4,8 @@ Handles saving, retrieving, and calculating ROI scenarios
 """
 
 from datetime import datetime
-from typing import List, Optional, Dict, Any, AsyncGenerator
+import numpy as np
+from typing import Annotated, List, Optional, Dict, Any, AsyncGenerator
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,9 +15,20 @@ from ..dependencies import get_current_user, has_active_subscription
 from ...models import User
 from ...database.enterprise_models import Scenario
 from ...services.subscription_value_engine import SubscriptionValueEngine
+from ...services import scenario_model
+from ...services.scenario_model import (
+    SUBSCRIPTION_COST,
+    TEAM_EFFICIENCY_GAIN,
+    TEAM_HOURS_PER_YEAR,
+    TIME_REDUCTION_FACTOR,
+    scenario_metrics,
+)
 
 router = APIRouter()
 
+MAX_SWEEP_POINTS = 250_000
+MAX_RETURNED_POINTS = 10_000
+
 # Dependency for async database session
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Get async database session"""
@@ -77,6 +89,33 @@ class ScenarioResponse(BaseModel):
     created_by: str
 
 
+class ParameterSpec(BaseModel):
+    """Range (grid) or distribution (Monte Carlo) for one swept input"""
+    values: Optional[List[float]] = Field(None, description="Explicit values (grid) or categorical samples")
+    min: Optional[float] = None
+    max: Optional[float] = None
+    steps: int = Field(default=10, ge=2, le=500, description="Grid points between min and max")
+    distribution: Optional[str] = Field(None, description="uniform | triangular | normal | lognormal")
+    mode: Optional[float] = None
+    mean: Optional[float] = None
+    std: Optional[float] = Field(None, ge=0)
+
+
+class ScenarioSweepRequest(BaseModel):
+    """Evaluate a grid or Monte Carlo sample of scenarios around a base point"""
+    base: ScenarioInputs
+    parameters: Dict[str, ParameterSpec]
+    mode: str = Field(default="grid", description="grid | monte_carlo")
+    samples: int = Field(default=100_000, ge=100, le=MAX_SWEEP_POINTS)
+    seed: Optional[int] = None
+    percentiles: List[Annotated[float, Field(ge=0, le=100, allow_inf_nan=False)]] = Field(
+        default_factory=lambda: [5, 25, 50, 75, 95]
+    )
+    surface: Optional[List[str]] = Field(None, description="Two parameters for the break-even surface")
+    surface_resolution: int = Field(default=25, ge=5, le=100)
+    return_points: bool = Field(default=False, description="Include per-point columns (grid mode, capped)")
+
+
 @router.post("/scenarios/calculate", response_model=ScenarioResults)
 async def calculate_scenario(
     inputs: ScenarioInputs,
@@ -95,30 +134,26 @@ async def calculate_scenario(
     # Use the existing SubscriptionValueEngine for calculations
     value_engine = SubscriptionValueEngine()
     
-    # Calculate current costs
-    report_costs = inputs.reports_per_year * inputs.hours_per_report * inputs.avg_hourly_rate
-    team_costs = inputs.compliance_team_size * inputs.avg_hourly_rate * 2000  # Assume 2000 hours/year
-    current_annual_cost = report_costs + team_costs
-    
-    # MapMyStandards reduces time by 70-80%
-    time_reduction_factor = 0.75
-    time_saved_hours = inputs.reports_per_year * inputs.hours_per_report * time_reduction_factor
-    
-    # Calculate projected costs with MapMyStandards
-    subscription_cost = 199 * 12  # $199/month
-    reduced_report_costs = inputs.reports_per_year * inputs.hours_per_report * (1 - time_reduction_factor) * inputs.avg_hourly_rate
-    efficient_team_costs = inputs.compliance_team_size * inputs.avg_hourly_rate * 2000 * 0.5  # 50% more efficient team
-    projected_annual_cost = subscription_cost + reduced_report_costs + efficient_team_costs
-    
-    annual_savings = current_annual_cost - projected_annual_cost
-    five_year_savings = annual_savings * 5 - subscription_cost * 4  # Subtract 4 years of subscription
-    
-    # ROI calculation
-    roi_percentage = (annual_savings / subscription_cost) * 100
-    payback_period_months = int((subscription_cost / annual_savings) * 12) if annual_savings > 0 else 999
+    # Cost/savings formulas are shared with the sweep endpoint
+    metrics = scenario_metrics(
+        reports_per_year=inputs.reports_per_year,
+        hours_per_report=inputs.hours_per_report,
+        avg_hourly_rate=inputs.avg_hourly_rate,
+        compliance_team_size=inputs.compliance_team_size,
+        annual_budget=inputs.annual_budget,
+    )
+    time_reduction_factor = TIME_REDUCTION_FACTOR
+    subscription_cost = SUBSCRIPTION_COST
+    current_annual_cost = metrics["current_annual_cost"]
+    projected_annual_cost = metrics["projected_annual_cost"]
+    annual_savings = metrics["annual_savings"]
+    five_year_savings = metrics["five_year_savings"]
+    roi_percentage = metrics["roi_percentage"]
+    payback_period_months = metrics["payback_period_months"]
+    time_saved_hours = metrics["time_saved_hours"]
     
     # Risk reduction value (compliance penalties avoided)
-    risk_reduction_value = inputs.annual_budget * 0.002  # 0.2% of budget as potential penalty avoidance
+    risk_reduction_value = metrics["risk_reduction_value"]
     
     # Productivity metrics
     productivity_metrics = {
@@ -131,7 +166,7 @@ async def calculate_scenario(
     # Savings breakdown
     savings_breakdown = {
         "time_savings": time_saved_hours * inputs.avg_hourly_rate,
-        "efficiency_gains": inputs.compliance_team_size * inputs.avg_hourly_rate * 2000 * 0.5,
+        "efficiency_gains": inputs.compliance_team_size * inputs.avg_hourly_rate * TEAM_HOURS_PER_YEAR * TEAM_EFFICIENCY_GAIN,
         "risk_mitigation": risk_reduction_value,
         "process_improvement": annual_savings * 0.1
     }
@@ -167,6 +202,75 @@ async def calculate_scenario(
     )
 
 
+@router.post("/scenarios/sweep")
+async def sweep_scenarios(
+    request: ScenarioSweepRequest,
+    current_user: Dict = Depends(get_current_user),
+    has_subscription: bool = Depends(has_active_subscription)
+):
+    """
+    Evaluate many ROI scenarios in one vectorized pass (grid or Monte Carlo)
+    """
+    if not has_subscription:
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail="Active subscription required"
+        )
+
+    unknown = sorted(set(request.parameters) - set(scenario_model.SWEEPABLE))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot sweep {unknown}; sweepable inputs are {list(scenario_model.SWEEPABLE)}"
+        )
+    if request.mode not in ("grid", "monte_carlo"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="mode must be grid or monte_carlo")
+
+    base = request.base.dict()
+    specs = {name: spec.dict(exclude_none=True) for name, spec in request.parameters.items()}
+    rng = np.random.default_rng(request.seed)
+    try:
+        ranges = {name: scenario_model.bounds(spec, rng) for name, spec in specs.items()}
+        response: Dict[str, Any] = {"mode": request.mode, "base": scenario_model.evaluate(base, {})}
+        if request.mode == "grid":
+            axes = {name: scenario_model.grid_values(spec) for name, spec in specs.items()}
+            points = int(np.prod([len(v) for v in axes.values()])) if axes else 1
+            if points > MAX_SWEEP_POINTS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Grid has {points} points; the limit is {MAX_SWEEP_POINTS}"
+                )
+            mesh = np.meshgrid(*axes.values(), indexing="ij") if axes else []
+            results = scenario_model.evaluate(base, dict(zip(axes, mesh)))
+            response["axes"] = {name: values.tolist() for name, values in axes.items()}
+            if request.return_points and points <= MAX_RETURNED_POINTS:
+                # Columnar, C-order over the axes above
+                response["columns"] = {
+                    name: np.round(np.asarray(results[name]).ravel(), 2).tolist()
+                    for name in ("annual_savings", "roi_percentage", "payback_period_months")
+                }
+        else:
+            points = request.samples
+            draws = {name: scenario_model.sample_values(spec, points, rng) for name, spec in specs.items()}
+            results = scenario_model.evaluate(base, draws)
+        summary = scenario_model.summarize(results, request.percentiles)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid parameter spec: {e}")
+
+    response["base"] = {name: round(float(value), 2) for name, value in response["base"].items()}
+    response["points"] = points
+    response["percentiles"] = summary
+    response["sensitivity"] = scenario_model.tornado(base, ranges)
+
+    surface_axes = request.surface or list(specs)[:2]
+    if len(surface_axes) == 2 and all(name in ranges for name in surface_axes):
+        x, y = surface_axes
+        response["break_even_surface"] = scenario_model.break_even_surface(
+            base, x, ranges[x], y, ranges[y], resolution=request.surface_resolution
+        )
+    return response
+
+
 @router.post("/scenarios", response_model=ScenarioResponse)
 async def create_scenario(
     scenario: ScenarioCreate,
@@ -9,13 +9,13 @@ from typing import Optional
 import hashlib
 import secrets
 import uuid
-import bcrypt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...models.user import User
 from ...services.database_service import DatabaseService
 from ...services.payment_service import PaymentService
 from ...core.config import get_settings
+from .auth_complete import hash_password_async
 
 router = APIRouter(prefix="/api/trial", tags=["trial"])
 settings = get_settings()
@@ -45,10 +45,6 @@ class TrialSignupResponse(BaseModel):
     message: str
     api_key: Optional[str] = None
 
-def hash_password(password: str) -> str:
-    """Hash password using bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
 def generate_api_key() -> str:
     """Generate a secure API key"""
     return f"mms_{''.join(secrets.token_urlsafe(32))}"
@@ -121,6 +117,10 @@ async def signup_trial(
                 detail="An account with this email already exists"
             )
 
+        # Hash before creating the Stripe subscription so a saturated hashing pool
+        # (429/503) cannot leave a subscription without an account
+        password_hash = await hash_password_async(request.password)
+
         # Initialize PaymentService and create Stripe trial subscription
         payment_service = PaymentService()
         
@@ -139,8 +139,6 @@ async def signup_trial(
             )
 
         # Create user account with Stripe information
-        password_hash = hash_password(request.password)
-        
         # Parse trial end date from Stripe response
         trial_end_str = stripe_result.get('trial_end')
         if trial_end_str:
@@ -220,7 +218,7 @@ async def signup_trial_lite(
         if existing_user:
             raise HTTPException(status_code=400, detail="An account with this email already exists")
 
-        password_hash = hash_password(request.password)
+        password_hash = await hash_password_async(request.password)
         trial_expires = datetime.utcnow() + timedelta(days=7)
 
         # Generate standalone API key (not Stripe managed)
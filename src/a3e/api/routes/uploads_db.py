@@ -7,13 +7,14 @@ import logging
 import asyncio
 import uuid
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from typing import Optional
 from datetime import datetime
 
 from ...database.services import FileService, JobService, UserService, StandardService
 from ..dependencies import get_current_user
 from ...database.connection import db_manager
+from ...services.blob_store import get_blob_store
 from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
@@ -314,7 +315,7 @@ async def download_file(
     file_id: str,
     current_user: dict = Depends(get_current_user)
 ):
-    """Download file content from database"""
+    """Download file content, streamed from the blob store"""
     try:
         user_id = current_user.get("user_id")
         
@@ -323,21 +324,31 @@ async def download_file(
         if not file:
             raise HTTPException(status_code=404, detail="File not found")
         
+        headers = {"Content-Disposition": f"attachment; filename=\"{file.original_filename}\""}
+        sha = getattr(file, "content_sha256", None)
+        if sha:
+            chunks = get_blob_store().stream(sha)
+            first = await anext(chunks, None)
+            if first is None:
+                raise HTTPException(status_code=404, detail="File content not found")
+            
+            async def body():
+                yield first
+                async for chunk in chunks:
+                    yield chunk
+            
+            if file.file_size:
+                headers["Content-Length"] = str(file.file_size)
+            return StreamingResponse(body(), media_type=file.content_type, headers=headers)
+        
+        # Legacy rows not yet moved to the blob store
         content = await FileService.get_file_content(file_id, user_id)
         
         if not content:
             raise HTTPException(status_code=404, detail="File content not found")
         
-        from fastapi.responses import Response
-        
-        return Response(
-            content=content,
-            media_type=file.content_type,
-            headers={
-                "Content-Disposition": f"attachment; filename=\"{file.original_filename}\"",
-                "Content-Length": str(len(content))
-            }
-        )
+        headers["Content-Length"] = str(len(content))
+        return Response(content=content, media_type=file.content_type, headers=headers)
         
     except HTTPException:
         raise
@@ -346,6 +357,27 @@ async def download_file(
         raise HTTPException(status_code=500, detail="Failed to download file")
 
 
+
+@router.delete("/files/{file_id}")
+async def delete_file(
+    file_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Delete a file and release its stored content"""
+    try:
+        user_id = current_user.get("user_id")
+        
+        if not await FileService.delete_file(file_id, user_id):
+            raise HTTPException(status_code=404, detail="File not found")
+        
+        return {"success": True, "data": {"file_id": file_id, "deleted": True}}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"File delete error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete file")
+
 @router.get("/recent")
 async def list_recent_uploads(
     limit: int = 10,
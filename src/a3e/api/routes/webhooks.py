@@ -9,6 +9,7 @@ import logging
 from datetime import datetime, timezone
 
 from ...services.webhook_service import webhook_service, WebhookEvent
+from ...database.connection import db_manager
 from ..dependencies import get_current_user
 
 logger = logging.getLogger(__name__)
@@ -91,16 +92,21 @@ async def create_webhook(
 ) -> Dict[str, str]:
     """Create a new webhook."""
     try:
-        async with webhook_service:
-            webhook_id = await webhook_service.create_webhook(
-                institution_id=current_user.get("institution_id"),
-                url=str(request.url),
-                events=request.events,
-                secret=request.secret,
-                headers=request.headers
+        async with db_manager.get_session() as session:
+            webhook_id = await session.run_sync(
+                lambda sync_session: webhook_service.create_webhook(
+                    sync_session,
+                    name=str(request.url),
+                    url=str(request.url),
+                    events=[e.value for e in request.events],
+                    institution_id=current_user.get("institution_id"),
+                    secret=request.secret,
+                    headers=request.headers,
+                    commit=False
+                )
             )
             
-            # Test the webhook with a ping event
+            # Test the webhook with a ping event, committed with the config
             await webhook_service.trigger_event(
                 event=WebhookEvent.INTEGRATION_CONNECTED,
                 data={
@@ -109,8 +115,10 @@ async def create_webhook(
                     "events": [e.value for e in request.events]
                 },
                 institution_id=current_user.get("institution_id"),
-                metadata={"test": True}
+                metadata={"test": True},
+                db=session
             )
+            await session.commit()
             
             return {
                 "message": "Webhook created successfully",
@@ -4,7 +4,7 @@ Proprietary accreditation intelligence platform
 """
 
 from .standards_config import StandardsConfigLoader
-from .accreditation_ontology import AccreditationOntology, AccreditationDomain, EvidenceType, accreditation_ontology
+from .accreditation_ontology import AccreditationOntology, AccreditationDomain, EvidenceType, OntologyClosure, accreditation_ontology
 from .vector_matching import VectorWeightedMatcher, MatchingStrategy, StandardMatch, EvidenceDocument
 from .multi_agent_pipeline import MultiAgentPipeline, AgentRole, PipelineContext, ProcessingPhase
 from .audit_trail import AuditTrailSystem, AuditEvent, TraceabilityLink, TraceabilityLevel, initialize_audit_system, get_audit_system
@@ -14,6 +14,7 @@ __all__ = [
     "AccreditationOntology", 
     "AccreditationDomain",
     "EvidenceType",
+    "OntologyClosure",
     "accreditation_ontology",
     "VectorWeightedMatcher",
     "MatchingStrategy", 
@@ -3,8 +3,9 @@ Proprietary Accreditation Ontology and Embeddings Schema for A³E
 Advanced semantic framework for accreditation standards and evidence mapping
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
+from collections import deque
 from enum import Enum
 from datetime import datetime
 import uuid
@@ -143,6 +144,147 @@ class EmbeddingSchema:
             
         return mapping
 
+def _bfs_related(nodes: Dict[str, AccreditationOntologyNode], concept_id: str,
+                 max_distance: int) -> List[Tuple[str, int]]:
+    """Breadth-first walk over parent, child and related links (in that order)."""
+    related = []
+    visited = set()
+    queue = deque([(concept_id, 0)])
+    
+    while queue:
+        current_id, distance = queue.popleft()
+        
+        if current_id in visited or distance > max_distance or current_id not in nodes:
+            continue
+        
+        visited.add(current_id)
+        if distance > 0:  # Don't include the starting concept
+            related.append((current_id, distance))
+        
+        if distance < max_distance:
+            current_node = nodes[current_id]
+            if current_node.parent_id:
+                queue.append((current_node.parent_id, distance + 1))
+            for child_id in current_node.children_ids:
+                queue.append((child_id, distance + 1))
+            for related_id in current_node.related_concepts:
+                queue.append((related_id, distance + 1))
+    
+    return related
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+class OntologyClosure:
+    """Precomputed transitive relationships for one ontology snapshot.
+    
+    Concepts get dense integer ids so ancestor and neighbour sets can also be
+    held as int bitsets; every query is a dict lookup or a mask operation
+    instead of a graph walk.
+    """
+    
+    def __init__(self, nodes: Dict[str, AccreditationOntologyNode], max_hops: int = 2):
+        self.max_hops = max_hops
+        self.ids: List[str] = list(nodes)
+        self.index: Dict[str, int] = {concept_id: i for i, concept_id in enumerate(self.ids)}
+        
+        # Root-to-concept paths (inclusive) and the matching ancestor sets/masks
+        self._paths: Dict[str, Tuple[str, ...]] = {}
+        for concept_id in self.ids:
+            self._path(nodes, concept_id)
+        self._ancestors: Dict[str, FrozenSet[str]] = {
+            concept_id: frozenset(path) for concept_id, path in self._paths.items()
+        }
+        self._ancestor_masks: Dict[str, int] = {
+            concept_id: self.mask(path) for concept_id, path in self._paths.items()
+        }
+        
+        # k-hop neighbourhoods in BFS order, with distances
+        self._neighbours: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        self._distances: Dict[str, Dict[str, int]] = {}
+        self._related: Dict[str, FrozenSet[str]] = {}
+        self._related_masks: Dict[str, int] = {}
+        for concept_id in self.ids:
+            neighbours = tuple(_bfs_related(nodes, concept_id, max_hops))
+            self._neighbours[concept_id] = neighbours
+            self._distances[concept_id] = dict(neighbours)
+            self._related[concept_id] = frozenset(self._distances[concept_id])
+            self._related_masks[concept_id] = self.mask(self._distances[concept_id])
+    
+    def _path(self, nodes: Dict[str, AccreditationOntologyNode], concept_id: str) -> Tuple[str, ...]:
+        path = self._paths.get(concept_id)
+        if path is not None:
+            return path
+        chain = [concept_id]
+        parent_id = nodes[concept_id].parent_id
+        while parent_id and parent_id in nodes and parent_id not in chain:
+            if parent_id in self._paths:
+                path = self._paths[parent_id] + tuple(reversed(chain))
+                break
+            chain.append(parent_id)
+            parent_id = nodes[parent_id].parent_id
+        else:
+            path = tuple(reversed(chain))
+        self._paths[concept_id] = path
+        return path
+    
+    def mask(self, concept_ids: Iterable[str]) -> int:
+        """Bitset of the given concepts (unknown ids are ignored)."""
+        result = 0
+        for concept_id in concept_ids:
+            i = self.index.get(concept_id)
+            if i is not None:
+                result |= 1 << i
+        return result
+    
+    def concepts(self, mask: int) -> List[str]:
+        return [concept_id for i, concept_id in enumerate(self.ids) if mask >> i & 1]
+    
+    def hierarchy(self, concept_id: str) -> Tuple[str, ...]:
+        """Root-to-concept path, inclusive."""
+        return self._paths.get(concept_id, ())
+    
+    def ancestors(self, concept_id: str) -> FrozenSet[str]:
+        """The concept and all of its ancestors."""
+        return self._ancestors.get(concept_id, frozenset())
+    
+    def ancestor_mask(self, concept_id: str) -> int:
+        return self._ancestor_masks.get(concept_id, 0)
+    
+    def is_ancestor(self, ancestor_id: str, concept_id: str) -> bool:
+        return ancestor_id in self._ancestors.get(concept_id, ())
+    
+    def depth(self, concept_id: str) -> int:
+        return len(self._paths.get(concept_id, ())) - 1
+    
+    def hierarchy_distance(self, a: str, b: str) -> Optional[int]:
+        """Tree distance through the lowest common ancestor, or None if unrelated."""
+        common = self.ancestor_mask(a) & self.ancestor_mask(b)
+        if not common:
+            return None
+        lca_depth = _popcount(common) - 1
+        return self.depth(a) + self.depth(b) - 2 * lca_depth
+    
+    def related(self, concept_id: str, max_distance: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Concepts within ``max_distance`` hops (at most ``max_hops``), nearest first."""
+        neighbours = self._neighbours.get(concept_id, ())
+        if max_distance is None or max_distance >= self.max_hops:
+            return list(neighbours)
+        return [(cid, d) for cid, d in neighbours if d <= max_distance]
+    
+    def related_set(self, concept_id: str) -> FrozenSet[str]:
+        return self._related.get(concept_id, frozenset())
+    
+    def related_mask(self, concept_id: str) -> int:
+        return self._related_masks.get(concept_id, 0)
+    
+    def distance(self, a: str, b: str) -> Optional[int]:
+        """Hop distance from ``a`` to ``b`` if within ``max_hops``."""
+        return self._distances.get(a, {}).get(b)
+
+
 class AccreditationOntology:
     """Proprietary accreditation ontology with hierarchical concept relationships."""
     
@@ -150,7 +292,19 @@ class AccreditationOntology:
         self.nodes: Dict[str, AccreditationOntologyNode] = {}
         self.embedding_schema = EmbeddingSchema()
         self.dimension_mapping = self.embedding_schema.get_dimension_mapping()
+        self._closure: Optional[OntologyClosure] = None
         self._build_core_ontology()
+        self._closure = OntologyClosure(self.nodes)
+    
+    def closure(self) -> OntologyClosure:
+        """Closure tables for the current ontology, rebuilt after structural changes."""
+        if self._closure is None:
+            self._closure = OntologyClosure(self.nodes)
+        return self._closure
+    
+    def invalidate_closure(self) -> None:
+        """Call after editing node links (parent/children/related) in place."""
+        self._closure = None
     
     def _build_core_ontology(self):
         """Build the core accreditation ontology structure."""
@@ -225,6 +379,7 @@ class AccreditationOntology:
         )
         
         self.nodes[node_id] = node
+        self._closure = None
         
         # Update parent-child relationships
         if parent_id and parent_id in self.nodes:
@@ -293,54 +448,17 @@ class AccreditationOntology:
     
     def get_concept_hierarchy(self, concept_id: str) -> List[str]:
         """Get the full hierarchy path for a concept."""
-        if concept_id not in self.nodes:
-            return []
-        
-        hierarchy = [concept_id]
-        current = self.nodes[concept_id]
-        
-        while current.parent_id:
-            hierarchy.insert(0, current.parent_id)
-            current = self.nodes[current.parent_id]
-        
-        return hierarchy
+        return list(self.closure().hierarchy(concept_id))
     
     def find_related_concepts(self, concept_id: str, max_distance: int = 2) -> List[Tuple[str, int]]:
         """Find concepts related to the given concept within max_distance."""
         if concept_id not in self.nodes:
             return []
         
-        related = []
-        visited = set()
-        queue = [(concept_id, 0)]
-        
-        while queue:
-            current_id, distance = queue.pop(0)
-            
-            if current_id in visited or distance > max_distance:
-                continue
-            
-            visited.add(current_id)
-            if distance > 0:  # Don't include the starting concept
-                related.append((current_id, distance))
-            
-            current_node = self.nodes[current_id]
-            
-            # Add parent
-            if current_node.parent_id and distance < max_distance:
-                queue.append((current_node.parent_id, distance + 1))
-            
-            # Add children
-            for child_id in current_node.children_ids:
-                if distance < max_distance:
-                    queue.append((child_id, distance + 1))
-            
-            # Add explicitly related concepts
-            for related_id in current_node.related_concepts:
-                if distance < max_distance:
-                    queue.append((related_id, distance + 1))
-        
-        return related
+        closure = self.closure()
+        if max_distance <= closure.max_hops:
+            return closure.related(concept_id, max_distance)
+        return _bfs_related(self.nodes, concept_id, max_distance)
     
     def map_to_accreditor_standard(self, concept_id: str, accreditor_id: str) -> Optional[str]:
         """Map an ontology concept to a specific accreditor's standard."""
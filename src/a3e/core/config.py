@@ -47,6 +47,10 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///./a3e.db"
     database_pool_size: int = 20
     database_max_overflow: int = 30
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 3600
+    # Optional replica for read-only dashboard/metrics/list queries
+    database_read_replica_url: Optional[str] = None
     database_init_retries: int = 10
     database_init_backoff: float = 3.0
     allow_start_without_db: bool = True
@@ -265,6 +269,9 @@ def database_config(self: Settings) -> Dict[str, Any]:  # type: ignore
         "url": self.database_url,
         "pool_size": self.database_pool_size,
         "max_overflow": self.database_max_overflow,
+        "pool_timeout": self.database_pool_timeout,
+        "pool_recycle": self.database_pool_recycle,
+        "read_replica_url": self.database_read_replica_url,
         "echo": is_development.__get__(self, Settings)(),
     }
 
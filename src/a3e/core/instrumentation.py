@@ -0,0 +1,185 @@
+"""
+Request and stage timing instrumentation.
+
+Provides:
+- ``REQUEST_LATENCY``: request latency histogram labelled by matched route
+  template (e.g. ``/documents/{document_id}/analysis``) and status class, so
+  path parameters never create new Prometheus series.
+- ``timed_stage``: a context manager / decorator for hot-path stages
+  (extraction, chunking, embedding, vector search, LLM calls, DB writes).
+  Durations are observed into ``STAGE_LATENCY`` and, when enabled, collected
+  per request and emitted as a ``Server-Timing`` response header.
+
+prometheus_client is optional; without it the helpers still collect
+Server-Timing data and otherwise do nothing.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import os
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from prometheus_client import Histogram  # type: ignore
+
+    _LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+    REQUEST_LATENCY = Histogram(
+        "app_request_duration_seconds",
+        "HTTP request latency by route template",
+        ["method", "route", "status_class"],
+        buckets=_LATENCY_BUCKETS,
+    )
+    STAGE_LATENCY = Histogram(
+        "app_stage_duration_seconds",
+        "Latency of instrumented processing stages",
+        ["stage"],
+        buckets=_LATENCY_BUCKETS,
+    )
+    prometheus_enabled = True
+except Exception:  # pragma: no cover - optional dependency / duplicate registration
+    REQUEST_LATENCY = None
+    STAGE_LATENCY = None
+    prometheus_enabled = False
+
+# "off" (default), "on" (every response) or "header" (only when the request
+# sends ``X-Server-Timing: 1``).
+SERVER_TIMING_MODE = os.getenv("SERVER_TIMING", "off").lower()
+SERVER_TIMING_REQUEST_HEADER = "x-server-timing"
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Per-request list of (stage, seconds). The middleware installs a fresh list
+# before calling the app; child tasks inherit the same list object, so stages
+# timed inside the endpoint are visible to the middleware afterwards.
+_stage_timings: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "stage_timings", default=None
+)
+_TOKEN_RE = re.compile(r"[^A-Za-z0-9_.\-]")
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Record an externally measured stage duration."""
+    if STAGE_LATENCY is not None:
+        try:
+            STAGE_LATENCY.labels(stage=stage).observe(seconds)
+        except Exception:
+            pass
+    timings = _stage_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+class timed_stage:
+    """Time a block or function as a named stage.
+
+    Usage::
+
+        with timed_stage("extract"):
+            ...
+
+        @timed_stage("embed")
+        async def embed(...): ...
+    """
+
+    __slots__ = ("stage", "_start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._start = 0.0
+
+    def __enter__(self) -> "timed_stage":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        record_stage(self.stage, time.perf_counter() - self._start)
+
+    def __call__(self, func: Callable) -> Callable:
+        stage = self.stage
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def _async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with timed_stage(stage):
+                    return await func(*args, **kwargs)
+            return _async_wrapper
+
+        @functools.wraps(func)
+        def _wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed_stage(stage):
+                return func(*args, **kwargs)
+        return _wrapper
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Return the matched route's path template, or a fixed label if none matched."""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if path:
+        return path
+    app = scope.get("app")
+    request_path = scope.get("path", "")
+    # Mounted sub-apps (static files) do not set scope["route"]; label by mount prefix
+    for candidate in getattr(getattr(app, "router", None), "routes", []) or []:
+        mount_path = getattr(candidate, "path", None)
+        if mount_path and hasattr(candidate, "app") and not hasattr(candidate, "endpoint"):
+            if request_path == mount_path or request_path.startswith(mount_path.rstrip("/") + "/"):
+                return mount_path.rstrip("/") + "/{path}"
+    return UNMATCHED_ROUTE
+
+
+def status_class(status_code: int) -> str:
+    return f"{int(status_code) // 100}xx"
+
+
+def begin_request_timings() -> contextvars.Token:
+    return _stage_timings.set([])
+
+
+def end_request_timings(token: contextvars.Token) -> List[Tuple[str, float]]:
+    timings = _stage_timings.get() or []
+    _stage_timings.reset(token)
+    return timings
+
+
+def observe_request(method: str, route: str, status_code: int, seconds: float) -> None:
+    if REQUEST_LATENCY is None:
+        return
+    try:
+        REQUEST_LATENCY.labels(method=method, route=route, status_class=status_class(status_code)).observe(seconds)
+    except Exception:
+        pass
+
+
+def format_server_timing(timings: List[Tuple[str, float]], total_seconds: Optional[float] = None) -> str:
+    """Render stage timings as a Server-Timing header value (durations in ms).
+
+    Repeated stages are summed and annotated with a call count.
+    """
+    totals: Dict[str, List[float]] = {}
+    for stage, seconds in timings:
+        entry = totals.setdefault(stage, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    parts = []
+    for stage, (seconds, count) in totals.items():
+        name = _TOKEN_RE.sub("_", stage)
+        desc = f';desc="x{count}"' if count > 1 else ""
+        parts.append(f"{name};dur={seconds * 1000:.1f}{desc}")
+    if total_seconds is not None:
+        parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def server_timing_requested(headers: Any) -> bool:
+    if SERVER_TIMING_MODE in {"1", "on", "true", "yes"}:
+        return True
+    if SERVER_TIMING_MODE != "header":
+        return False
+    try:
+        return str(headers.get(SERVER_TIMING_REQUEST_HEADER, "")).lower() in {"1", "true", "yes"}
+    except Exception:
+        return False
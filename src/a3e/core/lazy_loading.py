@@ -0,0 +1,199 @@
+"""
+Deferred loading helpers for worker startup.
+
+Provides:
+- ``LazyObject``: a thread-safe proxy for module-level singletons whose
+  construction is expensive (TF-IDF indexes, the standards corpus). The
+  object is built on first attribute access.
+- ``include_lazy_router``: registers a placeholder route for a URL prefix.
+  The router module is imported and its routes are spliced into the app, at
+  the placeholder's position, on the first request under that prefix.
+
+Set ``LAZY_ROUTERS=0`` to import every lazy router at registration time
+(useful when generating the full OpenAPI schema offline).
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+LAZY_ROUTERS_ENABLED = os.getenv("LAZY_ROUTERS", "1").lower() in {"1", "true", "yes"}
+
+_LOCK = threading.RLock()
+_lazy_objects: List["LazyObject"] = []
+
+
+class LazyObject:
+    """Proxy that builds its target with ``factory()`` on first use."""
+
+    __slots__ = ("_factory", "_name", "_target", "_lock")
+
+    def __init__(self, factory: Callable[[], Any], name: str = ""):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_name", name or getattr(factory, "__qualname__", "lazy"))
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+        with _LOCK:
+            _lazy_objects.append(self)
+
+    @property
+    def is_loaded(self) -> bool:
+        return object.__getattribute__(self, "_target") is not None
+
+    def _resolve(self) -> Any:
+        target = object.__getattribute__(self, "_target")
+        if target is not None:
+            return target
+        with object.__getattribute__(self, "_lock"):
+            target = object.__getattribute__(self, "_target")
+            if target is None:
+                started = time.perf_counter()
+                target = object.__getattribute__(self, "_factory")()
+                object.__setattr__(self, "_target", target)
+                logger.info(
+                    "Loaded %s in %.1f ms",
+                    object.__getattribute__(self, "_name"),
+                    (time.perf_counter() - started) * 1000,
+                )
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._resolve(), name, value)
+
+    def __repr__(self) -> str:
+        if self.is_loaded:
+            return repr(self._resolve())
+        return f"<LazyObject {object.__getattribute__(self, '_name')} (not loaded)>"
+
+
+def warm_lazy_objects() -> None:
+    """Build every registered lazy singleton (run off the request path)."""
+    with _LOCK:
+        pending = [obj for obj in _lazy_objects if not obj.is_loaded]
+    for obj in pending:
+        try:
+            obj._resolve()
+        except Exception as e:  # pragma: no cover - surfaced again on first real use
+            logger.warning(f"Lazy warm-up failed for {obj!r}: {e}")
+
+
+class LazyRouterRoute(BaseRoute):
+    """Placeholder route that imports a router on first matching request."""
+
+    def __init__(self, app: Any, url_prefix: str, module: str, attr: str = "router", **include_kwargs: Any):
+        self.app = app
+        self.prefix = url_prefix.rstrip("/")
+        self.module = module
+        self.attr = attr
+        self.include_kwargs = include_kwargs
+        self.loaded = False
+        self.include_in_schema = False
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        return self.prefix + "/{path}"
+
+    def matches(self, scope: Scope) -> tuple:
+        if scope["type"] in ("http", "websocket"):
+            path = scope.get("path", "")
+            if path == self.prefix or path.startswith(self.prefix + "/"):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any) -> Any:
+        raise NoMatchFound(name, path_params)
+
+    def load(self) -> None:
+        """Import the router and splice its routes in place of this placeholder."""
+        with self._lock:
+            if self.loaded:
+                return
+            started = time.perf_counter()
+            router = getattr(importlib.import_module(self.module), self.attr)
+            routes = self.app.router.routes
+            before = len(routes)
+            self.app.include_router(router, **self.include_kwargs)
+            added = routes[before:]
+            del routes[before:]
+            try:
+                index = routes.index(self)
+                routes[index:index + 1] = added
+            except ValueError:
+                routes.extend(added)
+            self.app.openapi_schema = None
+            self.loaded = True
+            logger.info(
+                "Loaded lazy router %s (%d routes) in %.1f ms",
+                self.module,
+                len(added),
+                (time.perf_counter() - started) * 1000,
+            )
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.loaded:
+            try:
+                self.load()
+            except Exception as e:
+                # Same outcome as a router whose eager import failed: not mounted
+                logger.warning(f"⚠️ Lazy router {self.module} not available: {e}")
+                self.loaded = True
+                if self in self.app.router.routes:
+                    self.app.router.routes.remove(self)
+        # Re-dispatch now that the real routes sit where the placeholder was
+        await self.app.router(scope, receive, send)
+
+
+def include_lazy_router(app: Any, url_prefix: str, module: str, attr: str = "router", **include_kwargs: Any) -> LazyRouterRoute:
+    """Defer importing ``module`` until a request arrives under ``url_prefix``.
+
+    ``url_prefix`` is the full URL prefix the router's routes live under once
+    mounted. ``include_kwargs`` are forwarded to ``app.include_router`` (e.g.
+    an outer ``prefix`` and ``tags``).
+    """
+    placeholder = LazyRouterRoute(app, url_prefix, module, attr, **include_kwargs)
+    app.router.routes.append(placeholder)
+    _install_openapi_hook(app)
+    if not LAZY_ROUTERS_ENABLED:
+        placeholder.load()
+    return placeholder
+
+
+def load_lazy_routers(app: Any) -> None:
+    """Import every pending lazy router (e.g. before rendering the schema)."""
+    for route in list(app.router.routes):
+        if isinstance(route, LazyRouterRoute) and not route.loaded:
+            try:
+                route.load()
+            except Exception as e:
+                logger.warning(f"Lazy router {route.module} failed to load: {e}")
+
+
+def _install_openapi_hook(app: Any) -> None:
+    if getattr(app, "_lazy_openapi_installed", False):
+        return
+    original: Callable[[], Dict[str, Any]] = app.openapi
+
+    def openapi() -> Dict[str, Any]:
+        load_lazy_routers(app)
+        return original()
+
+    app.openapi = openapi
+    app._lazy_openapi_installed = True
+
+
+def pending_lazy_routers(app: Any) -> List[str]:
+    return [r.module for r in app.router.routes if isinstance(r, LazyRouterRoute) and not r.loaded]
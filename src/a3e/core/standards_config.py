@@ -9,6 +9,11 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
+from .standards_snapshot import load_with_snapshot, snapshot_path
+
+# Bump when the parsed shape changes so existing snapshots are rebuilt
+CONFIG_LOADER_VERSION = "1"
+
 @dataclass
 class AccreditorStandard:
     """Represents a single accreditation standard."""
@@ -76,6 +81,9 @@ class StandardsConfigLoader:
         """Initialize config loader with path to YAML file."""
         if config_path is None:
             config_path = Path(__file__).parent.parent / "config" / "standards_config.yaml"
+            if not config_path.exists():
+                # Repository layout keeps it in <repo>/config
+                config_path = Path(__file__).resolve().parents[3] / "config" / "standards_config.yaml"
         
         self.config_path = Path(config_path)
         self._config_data: Optional[Dict[str, Any]] = None
@@ -86,13 +94,19 @@ class StandardsConfigLoader:
         self._agent_configs: Optional[Dict[str, AgentConfig]] = None
     
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from YAML file."""
+        """Load configuration from YAML file (or its compiled snapshot)."""
         if self._config_data is None:
             if not self.config_path.exists():
                 raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
             
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self._config_data = yaml.safe_load(f)
+            def parse() -> Dict[str, Any]:
+                with open(self.config_path, 'r', encoding='utf-8') as f:
+                    return yaml.safe_load(f)
+            
+            self._config_data = load_with_snapshot(
+                snapshot_path(self.config_path, self.config_path.stem), "config",
+                [self.config_path], CONFIG_LOADER_VERSION, parse
+            )
         
         return self._config_data
     
@@ -0,0 +1,187 @@
+"""
+Compiled binary snapshots of YAML-sourced standards data.
+
+Parsing ``data/standards/*.yaml`` and ``config/standards_config.yaml`` with
+PyYAML costs every worker a few hundred milliseconds, and workers are
+recycled often (``max_requests``). A snapshot stores the parsed result once,
+keyed by a hash of the source bytes, and workers map it directly:
+
+    magic     8 bytes   b"A3ESNAP\\0"
+    format    u16       SNAPSHOT_FORMAT
+    codec     u16       CODEC_JSON or CODEC_MSGPACK
+    kind      16 bytes  ASCII, NUL padded ("corpus", "config", ...)
+    source    32 bytes  sha256 over source names + bytes + loader version
+    checksum  32 bytes  sha256 of the payload
+    length    u64       payload length
+    payload
+
+A snapshot is used only if magic, format, kind, source hash and checksum
+all match, so edited YAML (or a changed loader) silently falls back to the
+parser, which then rewrites the snapshot. ``scripts/standards_snapshot.py``
+compiles snapshots at build time and times cold loads both ways.
+
+Set ``STANDARDS_SNAPSHOT=0`` to always parse YAML, and
+``STANDARDS_SNAPSHOT_DIR`` to keep snapshots outside the source tree
+(e.g. on a read-only image).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover - optional fast codec
+    msgpack = None  # type: ignore
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional fast codec
+    orjson = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"A3ESNAP\0"
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = ".snap"
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+_HEADER = struct.Struct("<8sHH16s32s32sQ")
+
+stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0}
+
+
+def snapshot_enabled() -> bool:
+    return os.getenv("STANDARDS_SNAPSHOT", "1").lower() not in {"0", "false", "no"}
+
+
+def snapshot_path(source: Path, name: str) -> Path:
+    """Where the snapshot for ``source`` (a corpus dir or a YAML file) lives."""
+    override = os.getenv("STANDARDS_SNAPSHOT_DIR")
+    if override:
+        return Path(override) / f"{name}{SNAPSHOT_SUFFIX}"
+    base = source if source.is_dir() else source.parent
+    return base / ".compiled" / f"{name}{SNAPSHOT_SUFFIX}"
+
+
+def source_digest(paths: Iterable[Path], loader_version: str) -> bytes:
+    h = hashlib.sha256(f"{SNAPSHOT_FORMAT}\x1f{loader_version}".encode("utf-8"))
+    for path in paths:
+        data = Path(path).read_bytes()
+        h.update(f"\x1e{Path(path).name}\x1f{len(data)}\x1f".encode("utf-8"))
+        h.update(data)
+    return h.digest()
+
+
+def _check_plain(value: Any) -> None:
+    """Only JSON-native values round-trip identically through every codec."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"non-string key {key!r}")
+            _check_plain(item)
+    elif isinstance(value, list):
+        for item in value:
+            _check_plain(item)
+    elif isinstance(value, float):
+        if not math.isfinite(value):
+            raise TypeError(f"non-finite float {value!r}")
+    elif not (value is None or isinstance(value, (str, bool, int))):
+        raise TypeError(f"unsupported type {type(value).__name__}")
+
+
+def _encode(data: Any) -> tuple:
+    if msgpack is not None:
+        return CODEC_MSGPACK, msgpack.packb(data, use_bin_type=True)
+    if orjson is not None:
+        return CODEC_JSON, orjson.dumps(data)
+    return CODEC_JSON, json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(codec: int, payload: memoryview) -> Any:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("snapshot needs msgpack")
+        return msgpack.unpackb(payload, raw=False)
+    if codec == CODEC_JSON:
+        return orjson.loads(payload) if orjson is not None else json.loads(bytes(payload))
+    raise ValueError(f"unknown codec {codec}")
+
+
+def write_snapshot(path: Path, kind: str, source_hash: bytes, data: Any) -> Path:
+    """Atomically write ``data`` as a snapshot of ``kind``."""
+    _check_plain(data)
+    codec, payload = _encode(data)
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, codec, kind.encode("ascii")[:16],
+        source_hash, hashlib.sha256(payload).digest(), len(payload),
+    )
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(payload)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    stats["writes"] += 1
+    return path
+
+
+def read_snapshot(path: Path, kind: str, source_hash: bytes) -> Optional[Any]:
+    """Return the snapshot payload, or None if missing, stale or corrupt."""
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < _HEADER.size:
+                return None
+            magic, fmt, codec, snap_kind, snap_source, checksum, length = _HEADER.unpack_from(mm)
+            if (magic != SNAPSHOT_MAGIC or fmt != SNAPSHOT_FORMAT
+                    or snap_kind.rstrip(b"\0") != kind.encode("ascii")[:16]
+                    or snap_source != source_hash or len(mm) != _HEADER.size + length):
+                return None
+            view = memoryview(mm)
+            try:
+                payload = view[_HEADER.size:]
+                if hashlib.sha256(payload).digest() != checksum:
+                    logger.warning("Standards snapshot %s failed its checksum; ignoring", path)
+                    return None
+                return _decode(codec, payload)
+            finally:
+                payload.release()
+                view.release()
+    except (OSError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning("Standards snapshot %s unreadable: %s", path, e)
+        return None
+
+
+def load_with_snapshot(path: Path, kind: str, sources: Iterable[Path], loader_version: str,
+                       parse: Callable[[], Any]) -> Any:
+    """Return the snapshot for ``sources`` if current, else ``parse()`` and store it."""
+    if not snapshot_enabled():
+        return parse()
+    source_hash = source_digest(sources, loader_version)
+    data = read_snapshot(path, kind, source_hash)
+    if data is not None:
+        stats["hits"] += 1
+        return data
+    stats["misses"] += 1
+    data = parse()
+    try:
+        write_snapshot(path, kind, source_hash, data)
+    except (OSError, TypeError) as e:
+        # Read-only tree or data the codecs cannot round-trip: keep serving the parse
+        logger.info("Standards snapshot %s not written: %s", path, e)
+    return data
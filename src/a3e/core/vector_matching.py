@@ -13,9 +13,12 @@ import uuid
 # Optional scientific computing imports
 try:
     import numpy as np
-    from scipy.spatial.distance import cosine
-    from sklearn.metrics.pairwise import cosine_similarity
     SCIENTIFIC_FEATURES_AVAILABLE = True
+
+    def cosine(a, b):
+        # scipy is imported on first use; it dominates import time otherwise
+        from scipy.spatial.distance import cosine as _cosine
+        return _cosine(a, b)
 except ImportError:
     SCIENTIFIC_FEATURES_AVAILABLE = False
     # Mock implementations for basic functionality
@@ -34,9 +37,6 @@ except ImportError:
         def dot(a, b):
             return sum(x * y for x, y in zip(a, b))
     
-    def cosine_similarity(a, b):
-        return [[1.0]]  # Simple fallback
-    
     def cosine(a, b):
         return 0.0  # Simple fallback
 
@@ -277,6 +277,7 @@ class VectorWeightedMatcher:
         """Compute score based on ontology hierarchy relationships."""
         
         score = 0.0
+        closure = self.ontology.closure()
         
         # Direct concept matches
         for concept_id in evidence.mapped_concepts:
@@ -284,7 +285,7 @@ class VectorWeightedMatcher:
                 score += 1.0
             elif concept_id in standard_node.children_ids:
                 score += 0.8
-            elif standard_node.id in self.ontology.get_concept_hierarchy(concept_id):
+            elif closure.is_ancestor(standard_node.id, concept_id):
                 score += 0.6
         
         # Inferred concept matches (lower weight)
@@ -295,7 +296,7 @@ class VectorWeightedMatcher:
                 score += 0.5
         
         # Related concept matches
-        related_concepts = [rel[0] for rel in self.ontology.find_related_concepts(standard_node.id)]
+        related_concepts = closure.related_set(standard_node.id)
         for concept_id in evidence.mapped_concepts + evidence.inferred_concepts:
             if concept_id in related_concepts:
                 score += 0.3
@@ -376,8 +377,7 @@ class VectorWeightedMatcher:
         # Evidence type compatibility matrix
         evidence_compatibility = {
             EvidenceType.POLICY_DOCUMENT: [
-                EvidenceType.GOVERNANCE_RECORD,
-                EvidenceType.COMPLIANCE_ETHICS
+                EvidenceType.GOVERNANCE_RECORD
             ],
             EvidenceType.ASSESSMENT_DATA: [
                 EvidenceType.LEARNING_OUTCOME,
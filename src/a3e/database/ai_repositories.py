@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 from typing import Iterable, List, Optional, Sequence
 from uuid import UUID
 
@@ -24,6 +25,8 @@ from .ai_models import (
     TrustSignal,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class OrgRepository:
     def __init__(self, session: AsyncSession):
@@ -136,6 +139,7 @@ class EvidenceLinkRepository:
         self.session = session
 
     async def upsert_links(self, links: Iterable[EvidenceLink]) -> None:
+        links = list(links)
         for link in links:
             stmt = pg_insert(EvidenceLink).values(
                 id=link.id,
@@ -162,6 +166,14 @@ class EvidenceLinkRepository:
             await self.session.execute(stmt)
         await self.session.commit()
 
+        # Keep the in-memory coverage vectors in step with committed links
+        from ..services.coverage_index import get_coverage_indexes
+
+        try:
+            get_coverage_indexes().apply_links(links)
+        except Exception as exc:  # the index is derived state; never fail the write
+            logger.warning("Coverage index update failed: %s", exc)
+
     async def get_latest(self, *, org_id: UUID, standard_set: str) -> List[EvidenceLink]:
         result = await self.session.execute(
             select(EvidenceLink)
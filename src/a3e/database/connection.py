@@ -1,35 +1,175 @@
 """
 Database connection and session management for Railway PostgreSQL
 Production-ready async database connection with proper error handling
+
+Pools are sized from ``database_pool_size``/``database_max_overflow``/
+``database_pool_timeout``/``database_pool_recycle`` in ``core/config.py``.
+When ``DATABASE_READ_REPLICA_URL`` is set, ``get_session(read_only=True)``
+runs on a second engine pointed at the replica; without it, read-only
+sessions use the primary. ``pool_metrics()`` reports checked-out
+connections, overflow, checkout wait and checkout timeouts per pool and
+mirrors them into Prometheus metrics when prometheus_client is installed.
 """
 
 import os
 import logging
+import threading
+import time
 from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Optional
 import asyncpg
 
 from ..models import Base
 
 logger = logging.getLogger(__name__)
 
+try:
+    from prometheus_client import Counter, Gauge, Histogram  # type: ignore
+
+    DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections checked out of the pool", ["pool"])
+    DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size", ["pool"])
+    DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size", ["pool"])
+    DB_POOL_WAIT = Histogram(
+        "db_pool_checkout_wait_seconds", "Time a session waited for a pooled connection", ["pool"],
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    )
+    DB_POOL_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Pool checkouts that timed out", ["pool"])
+except Exception:  # pragma: no cover - optional dependency / duplicate registration
+    DB_POOL_CHECKED_OUT = None
+    DB_POOL_OVERFLOW = None
+    DB_POOL_SIZE = None
+    DB_POOL_WAIT = None
+    DB_POOL_TIMEOUTS = None
+
+
+def _async_url(database_url: str) -> str:
+    """Map a sync URL onto the async driver for the same database"""
+    if database_url.startswith('postgresql://'):
+        return database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    if database_url.startswith('sqlite:///'):
+        return database_url.replace('sqlite:///', 'sqlite+aiosqlite:///', 1)
+    return database_url
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith('sqlite') and (':memory:' in url or url.rstrip('/').endswith(('sqlite:', 'aiosqlite:')))
+
+
+class _PoolStats:
+    """Checkout wait/timeout counters for one named pool"""
+
+    __slots__ = ("checkouts", "timeouts", "wait_total", "wait_max", "lock")
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, pool: str, waited: float) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        if DB_POOL_WAIT is not None:
+            DB_POOL_WAIT.labels(pool=pool).observe(waited)
+
+    def timed_out(self, pool: str) -> None:
+        with self.lock:
+            self.timeouts += 1
+        if DB_POOL_TIMEOUTS is not None:
+            DB_POOL_TIMEOUTS.labels(pool=pool).inc()
+
+
 class DatabaseManager:
     """Production database manager with Railway PostgreSQL support"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        read_replica_url: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+        pool_recycle: Optional[int] = None,
+        bootstrap: bool = True,
+    ):
+        # Unset arguments fall back to the environment/settings at initialize()
+        self._database_url = database_url
+        self._read_replica_url = read_replica_url
+        self._pool_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+        }
+        # Create tables and seed default data on initialize()
+        self._bootstrap = bootstrap
         self.engine = None
         self.async_engine = None
+        self.read_engine = None
         self.SessionLocal = None
         self.AsyncSessionLocal = None
+        self.ReadSessionLocal = None
         self._initialized = False
+        self._pool_stats: Dict[str, _PoolStats] = {"primary": _PoolStats(), "replica": _PoolStats()}
+    
+    def _resolve_pool_options(self) -> Dict[str, Any]:
+        options = dict(self._pool_options)
+        missing = [k for k, v in options.items() if v is None]
+        if missing:
+            from ..core.config import get_settings
+
+            config = get_settings()
+            defaults = {
+                "pool_size": config.database_pool_size,
+                "max_overflow": config.database_max_overflow,
+                "pool_timeout": config.database_pool_timeout,
+                "pool_recycle": config.database_pool_recycle,
+            }
+            for key in missing:
+                options[key] = defaults[key]
+        return options
+    
+    def _engine_options(self, url: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {
+            "pool_pre_ping": True,
+            "pool_recycle": options["pool_recycle"],
+            "echo": os.getenv('DEBUG') == 'true',
+        }
+        # In-memory SQLite uses a single shared connection and takes no sizing
+        if not _is_memory_sqlite(url):
+            kwargs.update(
+                pool_size=options["pool_size"],
+                max_overflow=options["max_overflow"],
+                pool_timeout=options["pool_timeout"],
+            )
+            if url.startswith('sqlite+aiosqlite'):
+                # aiosqlite defaults to NullPool, which cannot be sized or observed
+                kwargs["poolclass"] = AsyncAdaptedQueuePool
+        return kwargs
+    
+    def _get_replica_url(self) -> Optional[str]:
+        url = self._read_replica_url or os.getenv('DATABASE_READ_REPLICA_URL')
+        if not url:
+            try:
+                from ..core.config import get_settings
+
+                url = get_settings().database_read_replica_url
+            except Exception:
+                url = None
+        return url or None
     
     def _get_database_url(self) -> tuple[str, str]:
         """Get database URLs from Railway environment"""
         # Railway provides DATABASE_URL automatically
-        database_url = os.getenv('DATABASE_URL')
+        database_url = self._database_url or os.getenv('DATABASE_URL')
         
         if not database_url:
             # Fallback for local development
@@ -42,14 +182,7 @@ class DatabaseManager:
             database_url = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
         
         # Create async URL for appropriate driver
-        if database_url.startswith('postgresql://'):
-            async_database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://')
-        elif database_url.startswith('sqlite:///'):
-            async_database_url = database_url.replace('sqlite:///', 'sqlite+aiosqlite:///')
-        else:
-            async_database_url = database_url
-        
-        return database_url, async_database_url
+        return database_url, _async_url(database_url)
     
     async def initialize(self):
         """Initialize database connections and create tables"""
@@ -64,21 +197,24 @@ class DatabaseManager:
             if os.getenv('DEBUG') == 'true':
                 logger.info(f"Database host: {sync_url.split('@')[1].split('/')[0] if '@' in sync_url else 'unknown'}")
             
+            options = self._resolve_pool_options()
+            
             # Synchronous engine for migrations and admin tasks
-            self.engine = create_engine(
-                sync_url,
-                pool_pre_ping=True,
-                pool_recycle=3600,
-                echo=os.getenv('DEBUG') == 'true'
-            )
+            self.engine = create_engine(sync_url, **self._engine_options(sync_url, options))
             
             # Async engine for FastAPI operations
-            self.async_engine = create_async_engine(
-                async_url,
-                pool_pre_ping=True,
-                pool_recycle=3600,
-                echo=os.getenv('DEBUG') == 'true'
-            )
+            self.async_engine = create_async_engine(async_url, **self._engine_options(async_url, options))
+            
+            # Optional read replica for read-only sessions; falls back to the primary
+            replica_url = self._get_replica_url()
+            if replica_url:
+                replica_async_url = _async_url(replica_url)
+                self.read_engine = create_async_engine(
+                    replica_async_url, **self._engine_options(replica_async_url, options)
+                )
+                logger.info("Read-only sessions routed to the database read replica")
+            else:
+                self.read_engine = self.async_engine
             
             # Session makers
             self.SessionLocal = sessionmaker(bind=self.engine)
@@ -87,12 +223,24 @@ class DatabaseManager:
                 class_=AsyncSession,
                 expire_on_commit=False
             )
+            self.ReadSessionLocal = sessionmaker(
+                bind=self.read_engine,
+                class_=AsyncSession,
+                expire_on_commit=False
+            )
+            
+            if self._bootstrap:
+                # Create tables
+                await self._create_tables()
+                
+                # Initialize default data
+                await self._initialize_default_data()
             
-            # Create tables
-            await self._create_tables()
+            # Load the table/column layout once instead of per request
+            from .schema_cache import get_schema_cache
             
-            # Initialize default data
-            await self._initialize_default_data()
+            get_schema_cache().invalidate(self.async_engine)
+            await get_schema_cache().warm(self.async_engine)
             
             self._initialized = True
             logger.info("✅ Database initialized successfully")
@@ -269,14 +417,37 @@ class DatabaseManager:
         if os.getenv('DEBUG') == 'true':
             logger.info(f"✅ Seeded {len(standards_data)} SACSCOC standards")
     
+    @property
+    def has_read_replica(self) -> bool:
+        return self.read_engine is not None and self.read_engine is not self.async_engine
+    
+    async def _checkout(self, session: AsyncSession, pool: str) -> None:
+        """Take the session's connection up front so pool wait is measured"""
+        stats = self._pool_stats[pool]
+        started = time.perf_counter()
+        try:
+            await session.connection()
+        except PoolTimeoutError:
+            stats.timed_out(pool)
+            logger.warning(f"Database pool '{pool}' checkout timed out")
+            raise
+        stats.observe(pool, time.perf_counter() - started)
+    
     @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """Get async database session with proper cleanup"""
+    async def get_session(self, read_only: bool = False) -> AsyncGenerator[AsyncSession, None]:
+        """Get async database session with proper cleanup
+        
+        ``read_only=True`` routes the session to the read replica when one is
+        configured; use it only for queries that tolerate replication lag.
+        """
         if not self._initialized:
             raise RuntimeError("Database not initialized. Call initialize() first.")
         
-        async with self.AsyncSessionLocal() as session:
+        replica = read_only and self.has_read_replica
+        factory = self.ReadSessionLocal if replica else self.AsyncSessionLocal
+        async with factory() as session:
             try:
+                await self._checkout(session, "replica" if replica else "primary")
                 yield session
             except Exception:
                 await session.rollback()
@@ -319,8 +490,42 @@ class DatabaseManager:
             logger.error(f"Failed to get database metrics: {e}")
             return {}
     
+    def pool_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-pool utilisation; also refreshes the Prometheus pool gauges"""
+        engines = {"primary": self.async_engine}
+        if self.has_read_replica:
+            engines["replica"] = self.read_engine
+        metrics: Dict[str, Dict[str, Any]] = {}
+        for name, engine in engines.items():
+            if engine is None:
+                continue
+            pool = engine.sync_engine.pool
+            stats = self._pool_stats[name]
+            entry: Dict[str, Any] = {"pool": type(pool).__name__}
+            for key, method in (("size", "size"), ("checked_out", "checkedout"),
+                                ("overflow", "overflow"), ("idle", "checkedin")):
+                fn = getattr(pool, method, None)
+                entry[key] = fn() if callable(fn) else None
+            with stats.lock:
+                entry.update(
+                    checkouts=stats.checkouts,
+                    checkout_timeouts=stats.timeouts,
+                    wait_ms_avg=round(stats.wait_total / stats.checkouts * 1000, 3) if stats.checkouts else 0.0,
+                    wait_ms_max=round(stats.wait_max * 1000, 3),
+                )
+            metrics[name] = entry
+            if DB_POOL_CHECKED_OUT is not None:
+                DB_POOL_CHECKED_OUT.labels(pool=name).set(entry["checked_out"] or 0)
+                # QueuePool reports overflow as negative while below pool_size
+                DB_POOL_OVERFLOW.labels(pool=name).set(max(0, entry["overflow"] or 0))
+                DB_POOL_SIZE.labels(pool=name).set(entry["size"] or 0)
+        return metrics
+    
     async def close(self):
         """Close database connections"""
+        if self.has_read_replica:
+            await self.read_engine.dispose()
+        self.read_engine = None
         if self.async_engine:
             await self.async_engine.dispose()
         if self.engine:
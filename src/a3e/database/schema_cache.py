@@ -0,0 +1,141 @@
+"""
+Per-engine cache of the live table/column layout.
+
+Service code adapts its SQL to whichever optional columns a deployment has
+(``files.title``, ``users.user_id`` vs ``users.id``, ``jobs.result`` vs
+``jobs.results``...). Asking ``information_schema`` on every call cost each
+upload and dashboard request an extra catalog round-trip, so the layout is
+read once per engine, at startup via ``warm()`` or lazily on first use, in a
+single batched inspection on its own connection (never inside the caller's
+transaction).
+
+The cache records the Alembic revision it was loaded at. At most every
+``SCHEMA_CACHE_REVISION_CHECK_SECONDS`` (300) one call re-reads
+``alembic_version``; if a migration moved the revision, the layout is
+reloaded. Code that changes the schema in-process calls ``invalidate()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import weakref
+from typing import Any, Dict, FrozenSet, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+_REVISION_CHECK_SECONDS = float(os.getenv("SCHEMA_CACHE_REVISION_CHECK_SECONDS", "300"))
+
+
+class _EngineSchema:
+    __slots__ = ("tables", "revision", "checked_at", "lock")
+
+    def __init__(self) -> None:
+        self.tables: Optional[Dict[str, FrozenSet[str]]] = None
+        self.revision: Optional[str] = None
+        self.checked_at = 0.0
+        self.lock = asyncio.Lock()
+
+
+def _inspect_columns(connection: Any) -> Dict[str, FrozenSet[str]]:
+    inspector = inspect(connection)
+    multi = getattr(inspector, "get_multi_columns", None)
+    if multi is not None:
+        # One batched catalog query on dialects that support it (PostgreSQL)
+        return {table: frozenset(c["name"] for c in cols) for (_, table), cols in multi().items()}
+    return {table: frozenset(c["name"] for c in inspector.get_columns(table))
+            for table in inspector.get_table_names()}
+
+
+def _read_revision(connection: Any) -> Optional[str]:
+    if not inspect(connection).has_table("alembic_version"):
+        return None
+    rows = connection.execute(text("SELECT version_num FROM alembic_version")).scalars().all()
+    return ",".join(sorted(rows)) or None
+
+
+class SchemaCache:
+    """Table -> column-set map for each engine, refreshed when the Alembic revision moves."""
+
+    def __init__(self, revision_check_seconds: float = _REVISION_CHECK_SECONDS):
+        self.revision_check_seconds = revision_check_seconds
+        self._engines: "weakref.WeakKeyDictionary[Any, _EngineSchema]" = weakref.WeakKeyDictionary()
+        self.stats = {"catalog_queries": 0, "revision_checks": 0, "reloads": 0}
+
+    def _entry(self, engine: AsyncEngine) -> _EngineSchema:
+        entry = self._engines.get(engine.sync_engine)
+        if entry is None:
+            entry = self._engines[engine.sync_engine] = _EngineSchema()
+        return entry
+
+    async def _load(self, engine: AsyncEngine, entry: _EngineSchema) -> None:
+        async with engine.connect() as conn:
+            self.stats["catalog_queries"] += 1
+            tables = await conn.run_sync(_inspect_columns)
+            revision = await conn.run_sync(_read_revision)
+        entry.tables, entry.revision, entry.checked_at = tables, revision, time.monotonic()
+        self.stats["reloads"] += 1
+        logger.info(f"Schema cache loaded {len(tables)} tables (revision {revision or 'unversioned'})")
+
+    async def _revision_moved(self, engine: AsyncEngine, entry: _EngineSchema) -> bool:
+        self.stats["revision_checks"] += 1
+        async with engine.connect() as conn:
+            revision = await conn.run_sync(_read_revision)
+        entry.checked_at = time.monotonic()
+        return revision != entry.revision
+
+    async def tables(self, engine: AsyncEngine) -> Dict[str, FrozenSet[str]]:
+        """The full table/column layout for ``engine``; empty if it cannot be inspected."""
+        entry = self._entry(engine)
+        stale = time.monotonic() - entry.checked_at > self.revision_check_seconds
+        if entry.tables is not None and not stale:
+            return entry.tables
+        async with entry.lock:
+            try:
+                if entry.tables is None:
+                    await self._load(engine, entry)
+                elif time.monotonic() - entry.checked_at > self.revision_check_seconds:
+                    if await self._revision_moved(engine, entry):
+                        await self._load(engine, entry)
+            except Exception as e:
+                logger.warning(f"Schema introspection failed: {e}")
+                entry.checked_at = time.monotonic()
+                if entry.tables is None:
+                    return {}
+        return entry.tables
+
+    async def columns(self, engine: AsyncEngine, table: str) -> FrozenSet[str]:
+        return (await self.tables(engine)).get(table, frozenset())
+
+    async def warm(self, engine: AsyncEngine) -> None:
+        await self.tables(engine)
+
+    def invalidate(self, engine: Optional[AsyncEngine] = None) -> None:
+        """Drop the cached layout for one engine (or all) after an in-process schema change."""
+        if engine is None:
+            self._engines.clear()
+        else:
+            self._engines.pop(engine.sync_engine, None)
+
+
+_schema_cache: Optional[SchemaCache] = None
+
+
+def get_schema_cache() -> SchemaCache:
+    global _schema_cache
+    if _schema_cache is None:
+        _schema_cache = SchemaCache()
+    return _schema_cache
+
+
+async def table_columns(session: Any, table: str) -> FrozenSet[str]:
+    """Columns of ``table`` on the engine ``session`` is bound to (empty if unknown)."""
+    engine = session.bind
+    if not isinstance(engine, AsyncEngine):
+        return frozenset()
+    return await get_schema_cache().columns(engine, table)
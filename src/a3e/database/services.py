@@ -19,24 +19,15 @@ from ..models.database_schema import (
 )
 from types import SimpleNamespace as _Obj
 from .connection import db_manager
+from .schema_cache import table_columns
+from ..services.blob_store import get_blob_store
 
 logger = logging.getLogger(__name__)
 
 
-async def _get_table_columns(session, table_name: str) -> set:
-    try:
-        res = await session.execute(
-            text(
-                """
-                SELECT column_name FROM information_schema.columns
-                WHERE table_schema = 'public' AND table_name = :t
-                """
-            ),
-            {"t": table_name},
-        )
-        return {r[0] for r in res.fetchall()}
-    except Exception:
-        return set()
+async def _get_table_columns(session, table_name: str) -> frozenset:
+    """Live columns of ``table_name``, from the per-engine schema cache"""
+    return await table_columns(session, table_name)
 
 class UserService:
     """User management service"""
@@ -101,7 +92,7 @@ class UserService:
     @staticmethod
     async def get_user_metrics(user_id: str) -> Dict[str, Any]:
         """Get comprehensive user metrics for dashboard"""
-        async with db_manager.get_session() as session:
+        async with db_manager.get_session(read_only=True) as session:
             # Get user info
             user_result = await session.execute(
                 text("SELECT * FROM users WHERE user_id = :user_id"),
@@ -229,16 +220,23 @@ class FileService:
                 "content_type": content_type,
                 "file_size": len(content),
                 "file_content": content,
+                "content_sha256": None,
                 "title": title,
                 "description": description,
                 "accreditor_id": accreditor_id,
                 "created_at": datetime.utcnow(),
                 "updated_at": datetime.utcnow(),
             }
+            if "content_sha256" in cols:
+                # Bytes go to the content-addressed blob store; the row keeps only the hash
+                candidate["content_sha256"] = await get_blob_store().put(session, content, content_type)
+                del candidate["file_content"]
+            else:
+                del candidate["content_sha256"]
             use_cols = [k for k in candidate.keys() if (not cols) or (k in cols)]
             placeholders = ", ".join([f":{c}" for c in use_cols])
             column_list = ", ".join(use_cols)
-            returning = [c for c in ["file_id", "user_id", "filename", "original_filename", "content_type", "file_size", "created_at", "updated_at"] if (not cols) or (c in cols)]
+            returning = [c for c in ["file_id", "user_id", "filename", "original_filename", "content_type", "file_size", "content_sha256", "created_at", "updated_at"] if (not cols) or (c in cols)]
             returning_sql = ", ".join(returning) if returning else "file_id"
 
             sql = f"INSERT INTO files ({column_list}) VALUES ({placeholders}) RETURNING {returning_sql}"
@@ -254,9 +252,11 @@ class FileService:
     
     @staticmethod
     async def get_file(file_id: str, user_id: str = None) -> Optional[_Obj]:
-        """Get file by ID with optional user check"""
+        """Get file metadata by ID with optional user check (never the bytes)"""
         async with db_manager.get_session() as session:
-            query = "SELECT * FROM files WHERE file_id = :file_id"
+            cols = await _get_table_columns(session, "files")
+            select_sql = ", ".join(sorted(c for c in cols if c != "file_content")) if cols else "*"
+            query = f"SELECT {select_sql} FROM files WHERE file_id = :file_id"
             params = {"file_id": file_id}
             
             if user_id:
@@ -272,11 +272,45 @@ class FileService:
     
     @staticmethod
     async def get_file_content(file_id: str, user_id: str = None) -> Optional[bytes]:
-        """Get file content from database"""
+        """Get file content from the blob store, or the legacy bytea column for unmigrated rows"""
         file = await FileService.get_file(file_id, user_id)
-        if file and file.file_content:
+        if not file:
+            return None
+        sha = getattr(file, "content_sha256", None)
+        if sha:
+            return await get_blob_store().get(sha)
+        if getattr(file, "file_content", None):
             return file.file_content
-        return None
+        async with db_manager.get_session() as session:
+            result = await session.execute(
+                text("SELECT file_content FROM files WHERE file_id = :file_id"), {"file_id": file_id}
+            )
+            content = result.scalar()
+        return content or None
+
+    @staticmethod
+    async def delete_file(file_id: str, user_id: str = None) -> bool:
+        """Delete a file row, its jobs and its blob reference in one transaction"""
+        async with db_manager.get_session() as session:
+            cols = await _get_table_columns(session, "files")
+            where = "file_id = :file_id"
+            params = {"file_id": file_id}
+            if user_id:
+                where += " AND user_id = :user_id"
+                params["user_id"] = user_id
+            key_col = "content_sha256" if "content_sha256" in cols else "file_id"
+            owned = await session.execute(text(f"SELECT {key_col} FROM files WHERE {where}"), params)
+            row = owned.fetchone()
+            if not row:
+                return False
+            await session.execute(text("DELETE FROM jobs WHERE file_id = :file_id"), {"file_id": file_id})
+            await session.execute(text(f"DELETE FROM files WHERE {where}"), params)
+            if key_col == "content_sha256" and row[0]:
+                # Bytes stay until collect_garbage finds the blob unreferenced
+                await get_blob_store().release(session, row[0])
+            await session.commit()
+            logger.info(f"🗑️ Deleted file: {file_id}")
+            return True
 
 class JobService:
     """Background job management service"""
@@ -509,7 +543,7 @@ class StandardService:
         limit: int = 100
     ) -> List[Standard]:
         """Get standards with optional filtering"""
-        async with db_manager.get_session() as session:
+        async with db_manager.get_session(read_only=True) as session:
             query = "SELECT * FROM standards WHERE 1=1"
             params = {}
             
@@ -536,7 +570,7 @@ class StandardService:
     @staticmethod
     async def get_accreditors() -> List[Accreditor]:
         """Get all accreditors"""
-        async with db_manager.get_session() as session:
+        async with db_manager.get_session(read_only=True) as session:
             result = await session.execute(text("SELECT * FROM accreditors ORDER BY acronym"))
             accreditors_data = result.fetchall()
             
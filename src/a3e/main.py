@@ -486,6 +486,14 @@ document_service: Any = None
 agent_orchestrator: Any = None
 
 
+def _log_warmup_result(task: "asyncio.Task") -> None:
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.warning(f"⚠️ Lazy warm-up failed: {error}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
@@ -637,6 +645,49 @@ async def lifespan(app: FastAPI):
             await _load_accreditation_standards()
             logger.info("✅ Accreditation standards loaded")
 
+        # Build deferred singletons (standards graph, TF-IDF mappers) off the request path
+        if os.getenv("LAZY_WARMUP", "1").strip().lower() in ("1", "true", "yes"):
+            try:
+                # Keep a reference so the task is not garbage-collected mid-run
+                app.state.lazy_warmup_task = asyncio.create_task(
+                    asyncio.to_thread(warm_lazy_objects), name="lazy-warmup"
+                )
+                app.state.lazy_warmup_task.add_done_callback(_log_warmup_result)
+            except Exception as e:
+                logger.warning(f"Lazy warm-up scheduling failed: {e}")
+
+        # Shared outbound HTTP pools (clients are created per host on first use)
+        from .services.http_clients import get_http_clients
+
+        get_http_clients()
+
+        # Deliver queued webhook events from the outbox in the background
+        if os.getenv("WEBHOOK_DISPATCHER", "1").strip().lower() in ("1", "true", "yes"):
+            try:
+                from .services.webhook_dispatcher import get_webhook_dispatcher
+
+                await get_webhook_dispatcher().start()
+            except Exception as e:
+                logger.warning(f"⚠️ Webhook dispatcher not started: {e}")
+
+        # Periodically reconcile the local Stripe mirror against Stripe
+        if settings.STRIPE_SECRET_KEY and os.getenv("STRIPE_MIRROR_RECONCILE", "1").strip().lower() in ("1", "true", "yes"):
+            try:
+                from .services.stripe_mirror import get_stripe_mirror
+
+                await get_stripe_mirror().start()
+            except Exception as e:
+                logger.warning(f"⚠️ Stripe mirror reconcile not started: {e}")
+
+        # Remove unreferenced and orphaned upload blobs in the background
+        if os.getenv("BLOB_STORE_GC", "1").strip().lower() in ("1", "true", "yes"):
+            try:
+                from .services.blob_store import get_blob_store
+
+                await get_blob_store().start()
+            except Exception as e:
+                logger.warning(f"⚠️ Blob store garbage collection not started: {e}")
+
         logger.info("🎉 MapMyStandards Application startup complete!")
 
     except Exception as e:
@@ -648,6 +699,55 @@ async def lifespan(app: FastAPI):
     # Cleanup
     logger.info("🛑 Shutting down MapMyStandards Application...")
 
+    try:
+        from .services.report_renderer import get_report_renderer
+
+        get_report_renderer().shutdown()
+    except Exception as e:
+        logger.error(f"❌ Report renderer shutdown error: {e}")
+
+    try:
+        from .services.webhook_dispatcher import get_webhook_dispatcher
+
+        await get_webhook_dispatcher().stop()
+    except Exception as e:
+        logger.error(f"❌ Webhook dispatcher shutdown error: {e}")
+
+    try:
+        from .services.stripe_mirror import get_stripe_mirror
+
+        await get_stripe_mirror().stop()
+    except Exception as e:
+        logger.error(f"❌ Stripe mirror shutdown error: {e}")
+
+    try:
+        from .services.blob_store import get_blob_store
+
+        await get_blob_store().stop()
+    except Exception as e:
+        logger.error(f"❌ Blob store shutdown error: {e}")
+
+    try:
+        from .services.password_hasher import get_password_hasher
+
+        get_password_hasher().shutdown()
+    except Exception as e:
+        logger.error(f"❌ Password hasher shutdown error: {e}")
+
+    try:
+        from .services.evidence_trust import evidence_trust_scorer
+
+        evidence_trust_scorer.shutdown()
+    except Exception as e:
+        logger.error(f"❌ Evidence trust scorer shutdown error: {e}")
+
+    try:
+        from .services.http_clients import get_http_clients
+
+        await get_http_clients().aclose()
+    except Exception as e:
+        logger.error(f"❌ HTTP client pool shutdown error: {e}")
+
     # Close production database
     try:
         from .database.connection import db_manager
@@ -1027,6 +1127,16 @@ async def _sentinel_simple():  # noqa: D401
     }
 
 
+from .core.lazy_loading import include_lazy_router, warm_lazy_objects
+from .core.instrumentation import (
+    begin_request_timings,
+    end_request_timings,
+    format_server_timing,
+    observe_request,
+    route_template,
+    server_timing_requested,
+)
+
 try:
     from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST  # type: ignore
 
@@ -1049,15 +1159,29 @@ except Exception:
 
 @app.middleware("http")
 async def _metrics_middleware(request, call_next):  # type: ignore
-    if not _prom_enabled:
+    want_server_timing = server_timing_requested(request.headers)
+    if not _prom_enabled and not want_server_timing:
         return await call_next(request)
-    from time import time
+    from time import time, perf_counter
 
     start = time()
-    response = await call_next(request)
+    started = perf_counter()
+    timings_token = begin_request_timings()
+    try:
+        response = await call_next(request)
+    finally:
+        stage_timings = end_request_timings(timings_token)
+    elapsed = perf_counter() - started
+    # Label by matched route template, never the raw path, to keep series bounded
+    route = route_template(request.scope)
+    observe_request(request.method, route, response.status_code, elapsed)
+    if want_server_timing:
+        response.headers["Server-Timing"] = format_server_timing(stage_timings, elapsed)
+    if not _prom_enabled:
+        return response
     try:
         REQUEST_COUNT.labels(
-            method=request.method, path=request.url.path, status=response.status_code
+            method=request.method, path=route, status=response.status_code
         ).inc()
     except Exception:
         pass
@@ -1083,6 +1207,19 @@ async def _metrics_middleware(request, call_next):  # type: ignore
 async def metrics():  # noqa: D401
     if not _prom_enabled:
         return Response("prometheus_client not installed", status_code=503)
+    try:
+        from .services.http_clients import get_http_clients
+
+        get_http_clients().metrics()  # refresh outbound pool gauges
+    except Exception:
+        pass
+    try:
+        from .database.connection import db_manager
+
+        if db_manager._initialized:
+            db_manager.pool_metrics()  # refresh database pool gauges
+    except Exception:
+        pass
     data = generate_latest()  # type: ignore
     return Response(content=data, media_type=CONTENT_TYPE_LATEST)
 
@@ -1402,6 +1539,26 @@ if api_router:
     except Exception as e:
         logger.error(f"❌ API router failed: {e}")
 
+# Heavy optional subsystems are imported on the first request to their prefix
+try:
+    include_lazy_router(
+        app,
+        f"{settings.api_prefix}/powerbi",
+        f"{__package__}.api.routes.powerbi",
+        prefix=settings.api_prefix,
+        tags=["powerbi"],
+    )
+    include_lazy_router(
+        app,
+        f"{settings.api_prefix}/sso",
+        f"{__package__}.api.routes.sso",
+        prefix=f"{settings.api_prefix}/sso",
+        tags=["sso"],
+    )
+    logger.info("✅ PowerBI and SSO routers registered (lazy)")
+except Exception as e:
+    logger.error(f"❌ Lazy PowerBI/SSO router registration failed: {e}")
+
 # Import and include customer pages router
 try:
     from .routes import upload_api as lightweight_upload_api
@@ -1420,12 +1577,10 @@ try:
 except Exception as e:
     logger.warning(f"⚠️ Could not load document processing router: {e}")
 
-# Real report generation
+# Real report generation (reportlab is imported on first request)
 try:
-    from .api.routes.report_generation import router as report_generation_router
-
-    app.include_router(report_generation_router)
-    logger.info("✅ Report generation router loaded (real reports)")
+    include_lazy_router(app, "/api/v1/reports", f"{__package__}.api.routes.report_generation")
+    logger.info("✅ Report generation router registered (lazy)")
 except Exception as e:
     logger.warning(f"⚠️ Could not load report generation router: {e}")
 
@@ -1521,7 +1676,7 @@ async def health_check():
                 return {"status": "skipped", "detail": "database not initialized"}
 
             try:
-                async with db_manager.get_session() as session:
+                async with db_manager.get_session(read_only=True) as session:
                     result = await session.execute(
                         text(
                             """
@@ -1644,12 +1799,14 @@ async def health_check():
 
         # Check if services are initialized (during startup they might be None)
         db_ok, db_latency = (False, None)
+        db_pools: Dict[str, Any] = {}
         # Try production db_manager first, fallback to legacy db_service
         try:
             from .database.connection import db_manager
 
             if db_manager and db_manager._initialized:
                 db_ok, db_latency = await timed(db_manager.health_check())
+                db_pools = db_manager.pool_metrics()
         except:
             pass
 
@@ -1732,6 +1889,20 @@ async def health_check():
                 overall = "degraded"
                 status_code = 200
 
+        try:
+            from .services.http_clients import get_http_clients
+
+            outbound_pools = get_http_clients().metrics()
+        except Exception as pool_err:
+            outbound_pools = {"error": str(pool_err)}
+
+        try:
+            from .services.password_hasher import get_password_hasher
+
+            password_hashing = get_password_hasher().metrics()
+        except Exception as hash_err:
+            password_hashing = {"error": str(hash_err)}
+
         body: Dict[str, Any] = {
             "status": overall,
             "timestamp": now.isoformat(),
@@ -1744,6 +1915,7 @@ async def health_check():
                     if db_ok
                     else ("unavailable" if not db_service else "unhealthy"),
                     "latency_ms": db_latency,
+                    "pools": db_pools,
                 },
                 "llm_service": {
                     "status": "healthy"
@@ -1754,6 +1926,8 @@ async def health_check():
                 "vector_db": {"status": vector_status, "latency_ms": vector_latency},
                 "agent_orchestrator": {"status": orchestrator_status},
                 "analytics_consistency": analytics_check,
+                "outbound_http": {"status": "healthy", "pools": outbound_pools},
+                "password_hashing": password_hashing,
             },
             "capabilities": {
                 "proprietary_ontology": True,
@@ -2221,21 +2395,12 @@ async def upload_evidence(
                 detail=f"Unsupported file type. Supported: {settings.supported_file_types}",
             )
 
-        # Process document
-        evidence_item = await document_service.process_uploaded_file(
-            file=file,
-            institution_id=institution_id,
-            evidence_type=evidence_type,
-            description=description,
-            uploaded_by=current_user["user_id"],
-        )
-
-        # Trigger webhook for evidence uploaded
-        async with webhook_service:
+        async def queue_uploaded_event(session, evidence):
+            # Same transaction as the evidence insert
             await webhook_service.trigger_event(
                 event=WebhookEvent.EVIDENCE_UPLOADED,
                 data={
-                    "evidence_id": str(evidence_item.id),
+                    "evidence_id": str(evidence.id),
                     "filename": file.filename,
                     "evidence_type": evidence_type,
                     "description": description,
@@ -2244,8 +2409,19 @@ async def upload_evidence(
                     "institution_id": institution_id,
                 },
                 institution_id=institution_id,
+                db=session,
             )
 
+        # Process document
+        evidence_item = await document_service.process_uploaded_file(
+            file=file,
+            institution_id=institution_id,
+            evidence_type=evidence_type,
+            description=description,
+            uploaded_by=current_user["user_id"],
+            before_commit=queue_uploaded_event,
+        )
+
         return {
             "message": "Evidence uploaded and processing started",
             "evidence_id": str(evidence_item.id),
@@ -2300,13 +2476,8 @@ async def _execute_workflow_background(
             max_rounds=settings.agent_max_rounds,
         )
 
-        # Save results to database
-        await db_service.save_workflow_results(results, user_id)
-
-        logger.info(f"Workflow completed for institution {institution.id}")
-
-        # Trigger webhook for evidence processed
-        async with webhook_service:
+        async def queue_processed_event(session):
+            # Same transaction as the saved results
             await webhook_service.trigger_event(
                 event=WebhookEvent.EVIDENCE_PROCESSED,
                 data={
@@ -2318,8 +2489,16 @@ async def _execute_workflow_background(
                     "user_id": user_id,
                 },
                 institution_id=institution.id,
+                db=session,
             )
 
+        # Save results to database
+        await db_service.save_workflow_results(
+            results, user_id, before_commit=queue_processed_event
+        )
+
+        logger.info(f"Workflow completed for institution {institution.id}")
+
     except Exception as e:
         logger.error(f"Workflow execution failed: {e}")
         # TODO: Update workflow status to failed in database
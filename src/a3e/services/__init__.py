@@ -3,6 +3,6 @@ Services package for MapMyStandards platform
 Contains business logic and external integrations
 """
 
-from .powerbi_service import PowerBIService, create_powerbi_service
+from .powerbi_service import PowerBIService, create_powerbi_service, get_powerbi_service
 
-__all__ = ["PowerBIService", "create_powerbi_service"]
+__all__ = ["PowerBIService", "create_powerbi_service", "get_powerbi_service"]
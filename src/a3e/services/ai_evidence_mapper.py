@@ -15,6 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..api.models import EvidenceMapRequest, EvidenceMatch, EvidenceMapResponse, EvidenceSpan
 from ..core.config import Settings
+from ..core.instrumentation import timed_stage
 from ..database.ai_models import Artifact, ArtifactChunk, EvidenceLink, StandardClause
 from ..database.ai_repositories import (
     ArtifactRepository,
@@ -64,14 +65,15 @@ class EvidenceMapperService:
             logger.error("Embedding generation failed: %s", exc)
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Embedding provider failure")
 
-        candidates = await self._score_candidates(
-            artifact_repo=artifact_repo,
-            artifact=artifact,
-            standards=standards,
-            embeddings=standard_embeddings,
-            top_k=payload.top_k,
-            threshold=payload.threshold,
-        )
+        with timed_stage("vector_search"):
+            candidates = await self._score_candidates(
+                artifact_repo=artifact_repo,
+                artifact=artifact,
+                standards=standards,
+                embeddings=standard_embeddings,
+                top_k=payload.top_k,
+                threshold=payload.threshold,
+            )
 
         candidates.sort(key=lambda c: c.score, reverse=True)
         selected = candidates[: payload.top_k]
@@ -79,9 +81,10 @@ class EvidenceMapperService:
         matches = [self._to_evidence_match(candidate, payload.explain) for candidate in selected]
         computed_at = datetime.utcnow()
         if selected:
-            await evidence_repo.upsert_links(
-                self._to_evidence_links(artifact, selected, computed_at)
-            )
+            with timed_stage("db.write"):
+                await evidence_repo.upsert_links(
+                    self._to_evidence_links(artifact, selected, computed_at)
+                )
 
         return EvidenceMapResponse(
             artifact_id=str(artifact.id),
@@ -104,11 +107,13 @@ class EvidenceMapperService:
         if not artifact.storage_key:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact storage key missing")
 
-        binary = await self.storage.get_file(artifact.storage_key)
+        with timed_stage("storage.fetch"):
+            binary = await self.storage.get_file(artifact.storage_key)
         if not binary:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact binary missing from storage")
 
-        chunk_structs: List[Chunk] = await self.chunker.chunk(binary, artifact.mime_type or "text/plain")
+        with timed_stage("chunk"):
+            chunk_structs: List[Chunk] = await self.chunker.chunk(binary, artifact.mime_type or "text/plain")
         if not chunk_structs:
             raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Unable to extract text from artifact")
 
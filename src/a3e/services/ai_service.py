@@ -10,7 +10,8 @@ import json
 import logging
 from typing import Dict, Any, Optional, List
 from enum import Enum
-import httpx
+
+from .http_clients import get_http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -108,7 +109,7 @@ class AIService:
                 ),
                 "messages": [{"role": "user", "content": prompt}],
             }
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with get_http_clients().borrow("https://api.anthropic.com") as client:
                 resp = await client.post(
                     "https://api.anthropic.com/v1/messages",
                     headers=headers,
@@ -159,7 +160,7 @@ class AIService:
                 "max_tokens": max_tokens,
                 "response_format": {"type": "json_object"},
             }
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with get_http_clients().borrow("https://api.openai.com") as client:
                 resp = await client.post(
                     "https://api.openai.com/v1/chat/completions",
                     headers=headers,
@@ -305,7 +306,7 @@ Return a JSON array of mappings, each with:
                     ),
                     "messages": [{"role": "user", "content": prompt}],
                 }
-                async with httpx.AsyncClient(timeout=60.0) as client:
+                async with get_http_clients().borrow("https://api.anthropic.com") as client:
                     resp = await client.post(
                         "https://api.anthropic.com/v1/messages",
                         headers=headers,
@@ -339,7 +340,7 @@ Return a JSON array of mappings, each with:
                     "temperature": 0.2,
                     "max_tokens": 1000,
                 }
-                async with httpx.AsyncClient(timeout=60.0) as client:
+                async with get_http_clients().borrow("https://api.openai.com") as client:
                     resp = await client.post(
                         "https://api.openai.com/v1/chat/completions",
                         headers=headers,
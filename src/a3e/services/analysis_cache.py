@@ -0,0 +1,137 @@
+"""
+Persisted evidence-analysis cache.
+
+The expensive half of ``_analyze_evidence_from_bytes`` (text extraction, OCR,
+redaction, standards mapping and trust scoring) depends only on the file
+bytes and on the mapping configuration, so its output is stored under
+
+    (content sha256, scope, accreditor, corpus version, mapper version, AI on/off)
+
+in the user KV store. ``scope`` is the institution (or the user when no
+institution is known) so cached text previews never cross tenants.
+The corpus version is a digest of the loaded StandardsGraph and the mapper
+version is a constant on each mapper class; either changing produces new
+keys, so stale analyses are never served.
+
+Superseded keys are never read again, so the namespace is bounded instead:
+entries older than ``ANALYSIS_CACHE_TTL_SECONDS`` (30 days) are treated as
+misses, and every write prunes entries idle for longer than that plus the
+least recently used ones beyond ``ANALYSIS_CACHE_MAX_ENTRIES`` (10000).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from .user_kv_store import UserKVStore, get_user_kv_store
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_CACHE_NAMESPACE = "analysis_cache"
+_TTL_SECONDS = float(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "10000"))
+
+_corpus_version: Optional[Tuple[int, int, str]] = None
+
+
+def corpus_version(graph: Any = None) -> str:
+    """Digest of the standards graph content, memoised per graph revision."""
+    global _corpus_version
+    if graph is None:
+        from .standards_graph import standards_graph as graph
+    revision = getattr(graph, "revision", 0)
+    cached = _corpus_version
+    if cached is not None and cached[0] == id(graph) and cached[1] == revision:
+        return cached[2]
+    h = hashlib.sha256()
+    for node_id in sorted(graph.nodes):
+        node = graph.nodes[node_id]
+        h.update(f"{node_id}\x1f{getattr(node, 'version', '')}\x1f{node.text_content}\x1e".encode("utf-8"))
+    version = h.hexdigest()[:16]
+    _corpus_version = (id(graph), revision, version)
+    return version
+
+
+class AnalysisCache:
+    """Content-addressed analysis results stored in the user KV store."""
+
+    def __init__(self, store: Optional[UserKVStore] = None, ttl_seconds: float = _TTL_SECONDS,
+                 max_entries: int = _MAX_ENTRIES):
+        self._store = store
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "expired": 0, "evicted": 0}
+
+    @property
+    def store(self) -> UserKVStore:
+        if self._store is None:
+            self._store = get_user_kv_store()
+        return self._store
+
+    @staticmethod
+    def key(content_sha256: str, scope: str, accreditor: str, corpus: str, mapper_version: str,
+            use_ai: bool) -> str:
+        raw = json.dumps([content_sha256, scope, accreditor.upper(), corpus, mapper_version, bool(use_ai)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        try:
+            return datetime.fromisoformat(entry["cached_at"]) < datetime.utcnow() - self.ttl
+        except (KeyError, TypeError, ValueError):
+            return True
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.store.get(ANALYSIS_CACHE_NAMESPACE, key, default=None)
+        if not entry:
+            return None
+        if self._expired(entry):
+            self.store.delete(ANALYSIS_CACHE_NAMESPACE, key)
+            self.stats["expired"] += 1
+            return None
+        self.store.touch(ANALYSIS_CACHE_NAMESPACE, key)
+        return entry
+
+    def _store_entry(self, key: str, entry: Dict[str, Any]) -> int:
+        self.store.put(ANALYSIS_CACHE_NAMESPACE, key, entry)
+        return self.store.prune(
+            ANALYSIS_CACHE_NAMESPACE,
+            max_entries=self.max_entries,
+            updated_before=datetime.utcnow() - self.ttl,
+        )
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            entry = await asyncio.to_thread(self._lookup, key)
+        except Exception as e:
+            logger.warning(f"Analysis cache read failed: {e}")
+            entry = None
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return entry.get("result")
+
+    async def put(self, key: str, result: Dict[str, Any]) -> None:
+        entry = {"result": result, "cached_at": datetime.utcnow().isoformat()}
+        try:
+            evicted = await asyncio.to_thread(self._store_entry, key, entry)
+            self.stats["writes"] += 1
+            self.stats["evicted"] += evicted
+        except Exception as e:
+            logger.warning(f"Analysis cache write failed: {e}")
+
+
+_cache: Optional[AnalysisCache] = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    global _cache
+    if _cache is None:
+        _cache = AnalysisCache()
+    return _cache
@@ -0,0 +1,409 @@
+"""
+Content-addressed storage for uploaded file bytes.
+
+Uploads used to live in ``files.file_content`` (bytea), so every metadata
+fetch dragged the whole document over the connection and re-uploads of the
+same PDF were stored again. Bytes now live in a blob backend keyed by their
+SHA-256; ``files`` keeps only ``content_sha256``, ``file_size`` and
+``content_type``.
+
+``file_blobs`` holds one row per distinct blob with a reference count. The
+count changes in the caller's transaction (``put``/``release`` take the
+session that inserts or deletes the ``files`` row), so it commits or rolls
+back with it. Bytes are written when a blob gains its first reference and
+removed only by ``collect_garbage`` once the count has been zero for a
+grace period; it deletes the bytes while holding the blob's row, so a
+concurrent re-upload waits and then writes them again.
+``put`` writes the bytes before the caller commits, so an upload that rolls
+back leaves bytes without a ``file_blobs`` row; ``collect_garbage`` also
+sweeps those once they are older than the grace period. ``start()`` runs it
+every ``BLOB_STORE_GC_INTERVAL_SECONDS`` (default one hour).
+
+Backends: the local filesystem (``BLOB_STORE_PATH``, default
+``uploads/blobs``) or S3 through ``StorageService`` when it is configured
+for S3 (keys under ``BLOB_STORE_PREFIX``, default ``blobs/``).
+``scripts/migrate_file_blobs.py`` moves existing bytea rows across.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1024 * 1024
+_GC_GRACE = timedelta(hours=float(os.getenv("BLOB_STORE_GC_GRACE_HOURS", "24")))
+_GC_INTERVAL = float(os.getenv("BLOB_STORE_GC_INTERVAL_SECONDS", "3600"))
+_GC_BATCH = 500
+
+_blob_metadata = sa.MetaData()
+
+file_blobs = sa.Table(
+    "file_blobs",
+    _blob_metadata,
+    sa.Column("sha256", sa.String(64), primary_key=True),
+    sa.Column("size", sa.BigInteger, nullable=False),
+    sa.Column("mime_type", sa.String(100), nullable=True),
+    sa.Column("refcount", sa.Integer, nullable=False, default=0),
+    sa.Column("created_at", sa.DateTime, nullable=False),
+    sa.Column("last_referenced_at", sa.DateTime, nullable=False),
+    sa.Index("ix_file_blobs_unreferenced", "refcount", "last_referenced_at"),
+)
+
+
+def ensure_blob_table(bind: Any) -> None:
+    """Create ``file_blobs`` if migrations have not (SQLite/dev setups)."""
+    file_blobs.create(bind=bind, checkfirst=True)
+
+
+def content_sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobBackend(Protocol):
+    """Blocking byte storage keyed by SHA-256 hex digest."""
+
+    def put(self, sha256: str, data: bytes, mime_type: Optional[str]) -> None: ...
+
+    def get(self, sha256: str) -> Optional[bytes]: ...
+
+    def iter_chunks(self, sha256: str, chunk_size: int) -> Optional[Iterator[bytes]]: ...
+
+    def exists(self, sha256: str) -> bool: ...
+
+    def delete(self, sha256: str) -> None: ...
+
+    def list_blobs(self) -> Iterable[Tuple[str, datetime]]:
+        """Every stored digest with its last write time (naive UTC)."""
+        ...
+
+
+class LocalBlobBackend:
+    """``<root>/ab/cd/abcd...``; writes are atomic renames, so readers never see partial blobs."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or os.getenv("BLOB_STORE_PATH", "uploads/blobs"))
+
+    def _path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256[2:4] / sha256
+
+    def put(self, sha256: str, data: bytes, mime_type: Optional[str]) -> None:
+        path = self._path(sha256)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{sha256}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def get(self, sha256: str) -> Optional[bytes]:
+        try:
+            return self._path(sha256).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def iter_chunks(self, sha256: str, chunk_size: int) -> Optional[Iterator[bytes]]:
+        try:
+            f = open(self._path(sha256), "rb")
+        except FileNotFoundError:
+            return None
+
+        def chunks() -> Iterator[bytes]:
+            with f:
+                while True:
+                    block = f.read(chunk_size)
+                    if not block:
+                        return
+                    yield block
+
+        return chunks()
+
+    def exists(self, sha256: str) -> bool:
+        return self._path(sha256).exists()
+
+    def delete(self, sha256: str) -> None:
+        try:
+            self._path(sha256).unlink()
+        except FileNotFoundError:
+            pass
+
+    def list_blobs(self) -> Iterable[Tuple[str, datetime]]:
+        for path in self.root.glob("*/*/*"):
+            if len(path.name) == 64 and "." not in path.name:
+                yield path.name, datetime.utcfromtimestamp(path.stat().st_mtime)
+
+
+class S3BlobBackend:
+    """Blobs in the ``StorageService`` bucket under a fixed prefix."""
+
+    def __init__(self, client: Any, bucket: str, prefix: Optional[str] = None):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix if prefix is not None else os.getenv("BLOB_STORE_PREFIX", "blobs/")
+
+    def _key(self, sha256: str) -> str:
+        return f"{self.prefix}{sha256[:2]}/{sha256}"
+
+    def put(self, sha256: str, data: bytes, mime_type: Optional[str]) -> None:
+        extra = {"ContentType": mime_type} if mime_type else {}
+        self.client.put_object(Bucket=self.bucket, Key=self._key(sha256), Body=data,
+                               Metadata={"sha256": sha256}, **extra)
+
+    def get(self, sha256: str) -> Optional[bytes]:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(sha256))["Body"].read()
+        except self.client.exceptions.NoSuchKey:
+            return None
+
+    def iter_chunks(self, sha256: str, chunk_size: int) -> Optional[Iterator[bytes]]:
+        try:
+            body = self.client.get_object(Bucket=self.bucket, Key=self._key(sha256))["Body"]
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return body.iter_chunks(chunk_size)
+
+    def exists(self, sha256: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(sha256))
+            return True
+        except Exception:
+            return False
+
+    def delete(self, sha256: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(sha256))
+
+    def list_blobs(self) -> Iterable[Tuple[str, datetime]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for obj in page.get("Contents", []):
+                modified = obj["LastModified"]
+                if modified.tzinfo is not None:
+                    modified = modified.astimezone(timezone.utc).replace(tzinfo=None)
+                yield obj["Key"].rsplit("/", 1)[-1], modified
+
+
+def _default_backend() -> BlobBackend:
+    from .storage_service import get_storage_service
+
+    storage = get_storage_service()
+    if storage.storage_type == "s3" and storage.s3_client is not None:
+        return S3BlobBackend(storage.s3_client, storage.bucket_name)
+    return LocalBlobBackend()
+
+
+class BlobStore:
+    """Reference-counted, content-addressed blobs."""
+
+    def __init__(self, backend: Optional[BlobBackend] = None, gc_interval: float = _GC_INTERVAL):
+        self._backend = backend
+        self.gc_interval = gc_interval
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"puts": 0, "deduplicated": 0, "bytes_written": 0, "collected": 0, "orphans": 0}
+
+    @property
+    def backend(self) -> BlobBackend:
+        if self._backend is None:
+            self._backend = _default_backend()
+        return self._backend
+
+    async def put(self, session: Any, data: bytes, mime_type: Optional[str] = None,
+                  sha256: Optional[str] = None) -> str:
+        """Add a reference to ``data`` in ``session``'s transaction; returns its SHA-256."""
+        sha256 = sha256 or content_sha256(data)
+        now = datetime.utcnow()
+        result = await session.execute(
+            text(
+                """
+                INSERT INTO file_blobs (sha256, size, mime_type, refcount, created_at, last_referenced_at)
+                VALUES (:sha256, :size, :mime_type, 1, :now, :now)
+                ON CONFLICT (sha256) DO UPDATE
+                SET refcount = file_blobs.refcount + 1, last_referenced_at = :now
+                RETURNING refcount
+                """
+            ),
+            {"sha256": sha256, "size": len(data), "mime_type": mime_type, "now": now},
+        )
+        refcount = result.scalar()
+        self.stats["puts"] += 1
+        # First reference (new or resurrected blob), or bytes lost out of band: (re)write
+        if refcount == 1 or not await asyncio.to_thread(self.backend.exists, sha256):
+            await asyncio.to_thread(self.backend.put, sha256, data, mime_type)
+            self.stats["bytes_written"] += len(data)
+        else:
+            self.stats["deduplicated"] += 1
+        return sha256
+
+    async def release(self, session: Any, sha256: str) -> int:
+        """Drop one reference; bytes go once ``collect_garbage`` finds the blob unreferenced."""
+        result = await session.execute(
+            text(
+                """
+                UPDATE file_blobs SET refcount = refcount - 1, last_referenced_at = :now
+                WHERE sha256 = :sha256 AND refcount > 0
+                RETURNING refcount
+                """
+            ),
+            {"sha256": sha256, "now": datetime.utcnow()},
+        )
+        remaining = result.scalar()
+        return int(remaining or 0)
+
+    async def get(self, sha256: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self.backend.get, sha256)
+
+    async def stream(self, sha256: str, chunk_size: int = _CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Yield the blob chunk by chunk as the backend reads it."""
+        chunks = await asyncio.to_thread(self.backend.iter_chunks, sha256, chunk_size)
+        if chunks is None:
+            return
+        try:
+            while True:
+                block = await asyncio.to_thread(next, chunks, None)
+                if block is None:
+                    return
+                yield block
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    async def collect_garbage(self, session: Any, grace: timedelta = _GC_GRACE) -> List[str]:
+        """Delete blobs unreferenced for longer than ``grace``; returns their hashes.
+
+        Also removes bytes older than ``grace`` that have no ``file_blobs`` row
+        at all (left behind by uploads whose transaction rolled back).
+
+        Each blob is reaped in its own transaction that holds its row (the
+        deleted row, or a claim row for orphans) while the bytes are removed.
+        A concurrent ``put`` waits on that row and then writes the bytes
+        again as a first reference, so it can never lose them to the sweep.
+        """
+        cutoff = datetime.utcnow() - grace
+        rows = await session.execute(
+            text("SELECT sha256 FROM file_blobs WHERE refcount <= 0 AND last_referenced_at < :cutoff"),
+            {"cutoff": cutoff},
+        )
+        candidates = [r[0] for r in rows.fetchall()]
+        await session.commit()
+        doomed = [sha for sha in candidates if await self._reap(session, sha, cutoff)]
+        self.stats["collected"] += len(doomed)
+
+        orphans = [sha for sha in await self._orphans(session, cutoff)
+                   if await self._reap_orphan(session, sha, cutoff)]
+        self.stats["orphans"] += len(orphans)
+        return doomed + orphans
+
+    async def _reap(self, session: Any, sha256: str, cutoff: datetime) -> bool:
+        # Re-checked under the row lock: a put may have referenced it since the scan
+        result = await session.execute(
+            text(
+                "DELETE FROM file_blobs WHERE sha256 = :sha256 AND refcount <= 0 "
+                "AND last_referenced_at < :cutoff RETURNING sha256"
+            ),
+            {"sha256": sha256, "cutoff": cutoff},
+        )
+        if result.scalar() is None:
+            await session.rollback()
+            return False
+        return await self._delete_claimed(session, sha256)
+
+    async def _reap_orphan(self, session: Any, sha256: str, cutoff: datetime) -> bool:
+        # Claim row: conflicts with (or waits for) any put of the same blob
+        result = await session.execute(
+            text(
+                """
+                INSERT INTO file_blobs (sha256, size, mime_type, refcount, created_at, last_referenced_at)
+                VALUES (:sha256, 0, NULL, 0, :cutoff, :cutoff)
+                ON CONFLICT (sha256) DO NOTHING
+                RETURNING sha256
+                """
+            ),
+            {"sha256": sha256, "cutoff": cutoff},
+        )
+        if result.scalar() is None:
+            await session.rollback()
+            return False
+        await session.execute(text("DELETE FROM file_blobs WHERE sha256 = :sha256"), {"sha256": sha256})
+        return await self._delete_claimed(session, sha256)
+
+    async def _delete_claimed(self, session: Any, sha256: str) -> bool:
+        """Remove the bytes, then commit the row deletion that has held off ``put``."""
+        try:
+            await asyncio.to_thread(self.backend.delete, sha256)
+        except Exception as e:
+            await session.rollback()
+            logger.warning(f"Blob {sha256} not collected: {e}")
+            return False
+        await session.commit()
+        return True
+
+    async def _orphans(self, session: Any, cutoff: datetime) -> List[str]:
+        stored = await asyncio.to_thread(
+            lambda: [sha for sha, modified in self.backend.list_blobs() if modified < cutoff]
+        )
+        orphans: List[str] = []
+        query = text("SELECT sha256 FROM file_blobs WHERE sha256 IN :shas").bindparams(
+            sa.bindparam("shas", expanding=True)
+        )
+        for start in range(0, len(stored), _GC_BATCH):
+            batch = stored[start:start + _GC_BATCH]
+            known = {r[0] for r in (await session.execute(query, {"shas": batch})).fetchall()}
+            orphans.extend(sha for sha in batch if sha not in known)
+        await session.commit()
+        return orphans
+
+    # ------------------------------------------------------------------
+    # Background collection
+    # ------------------------------------------------------------------
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="blob-store-gc")
+        logger.info("✅ Blob store garbage collection scheduled")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        from ..database.connection import db_manager
+
+        while True:
+            await asyncio.sleep(self.gc_interval)
+            try:
+                async with db_manager.get_session() as session:
+                    collected = await self.collect_garbage(session)
+                if collected:
+                    logger.info(f"Blob store collected {len(collected)} blobs")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Blob store garbage collection failed: {e}")
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore()
+    return _blob_store
@@ -0,0 +1,341 @@
+"""
+Incremental standards coverage index.
+
+Each (org, standard set) keeps NumPy columns over the ordinals of that
+accreditor's StandardsGraph nodes: direct link counts, trust sums and
+evidence timestamps. ``EvidenceLinkRepository.upsert_links`` feeds every write
+into the index, so reads (compliance status, gap summaries, heatmaps) come
+from these vectors instead of scanning ``evidence_links``.
+
+Coverage semantics: a leaf node (indicator, or a clause/standard without
+children) is covered when it has a direct link or one of its clause-level
+ancestors does. Coverage, link counts, average trust and average evidence age
+roll up indicator -> clause -> standard with ``np.add.at`` passes; the rollup
+is recomputed lazily only after a change.
+
+Indexes are per worker process: writes made through another worker only
+reach this one when the index is re-seeded, which happens on the first read
+after ``COVERAGE_INDEX_RESEED_SECONDS`` or after ``invalidate``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_LEVELS = {"standard": 0, "clause": 1, "indicator": 2}
+_SECONDS_PER_DAY = 86400.0
+_RESEED_SECONDS = float(os.getenv("COVERAGE_INDEX_RESEED_SECONDS", "300"))
+
+
+def _epoch(value: Any) -> float:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return datetime.now(timezone.utc).timestamp()
+
+
+def _float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _entry(link: Any) -> Tuple[float, Optional[float], float]:
+    return (float(link.score), _float(getattr(link, "evidence_trust", None)),
+            _epoch(getattr(link, "computed_at", None)))
+
+
+class StandardsLayout:
+    """Ordinal layout of one accreditor's nodes (parents, levels, leaves)."""
+
+    def __init__(self, graph: Any, accreditor: str):
+        nodes = graph.get_nodes_by_accreditor(accreditor)
+        self.accreditor = accreditor
+        self.ids: List[str] = [n.node_id for n in nodes]
+        self.titles: List[str] = [n.title for n in nodes]
+        self.ordinal: Dict[str, int] = {nid: i for i, nid in enumerate(self.ids)}
+        self.level = np.array([_LEVELS.get(n.level, 2) for n in nodes], dtype=np.int8)
+        self.parent = np.array([self.ordinal.get(n.parent_id, -1) if n.parent_id else -1 for n in nodes],
+                               dtype=np.int64)
+        has_children = np.zeros(len(nodes), dtype=bool)
+        has_children[self.parent[self.parent >= 0]] = True
+        self.leaf = ~has_children
+        self.roots = np.array([self.ordinal[r] for r in graph.accreditor_roots.get(accreditor, [])
+                               if r in self.ordinal], dtype=np.int64)
+        self.revision = getattr(graph, "revision", 0)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def resolve(self, code: str) -> Optional[int]:
+        """Map a link's ``standard_code`` to an ordinal (bare or accreditor-prefixed)."""
+        ordinal = self.ordinal.get(code)
+        if ordinal is None:
+            ordinal = self.ordinal.get(f"{self.accreditor}_{code}")
+        return ordinal
+
+    def roll_up(self, values: np.ndarray) -> np.ndarray:
+        """Subtree sums: add each node's total into its parent, deepest level first."""
+        totals = values.astype(np.float64, copy=True)
+        for lvl in (2, 1):
+            mask = (self.level == lvl) & (self.parent >= 0)
+            np.add.at(totals, self.parent[mask], totals[mask])
+        return totals
+
+    def push_down(self, flags: np.ndarray) -> np.ndarray:
+        """Propagate clause-level coverage to the clause's indicators."""
+        flags = flags.copy()
+        for lvl in (1, 2):
+            mask = (self.level == lvl) & (self.parent >= 0)
+            parents = self.parent[mask]
+            flags[mask] |= flags[parents] & (self.level[parents] >= 1)
+        return flags
+
+
+class CoverageIndex:
+    """Coverage state for one (org, standard set), updated link by link."""
+
+    def __init__(self, layout: StandardsLayout):
+        self._lock = threading.Lock()
+        # (artifact_id, standard_code) -> (score, trust, computed_at epoch)
+        self._links: Dict[Tuple[str, str], Tuple[float, Optional[float], float]] = {}
+        self._reset(layout)
+
+    def _reset(self, layout: StandardsLayout) -> None:
+        n = len(layout)
+        self.layout = layout
+        self.link_count = np.zeros(n, dtype=np.int64)
+        self.trust_sum = np.zeros(n, dtype=np.float64)
+        self.trust_n = np.zeros(n, dtype=np.int64)
+        self.time_sum = np.zeros(n, dtype=np.float64)
+        self.unmapped = 0
+        self._rollup: Optional[Dict[str, np.ndarray]] = None
+        for (_, code), entry in self._links.items():
+            self._account(code, entry, +1)
+
+    def _account(self, code: str, entry: Tuple[float, Optional[float], float], sign: int) -> None:
+        ordinal = self.layout.resolve(code)
+        if ordinal is None:
+            self.unmapped += sign
+            return
+        _, trust, ts = entry
+        self.link_count[ordinal] += sign
+        self.time_sum[ordinal] += sign * ts
+        if trust is not None:
+            self.trust_sum[ordinal] += sign * trust
+            self.trust_n[ordinal] += sign
+
+    def relayout(self, layout: StandardsLayout) -> None:
+        """Re-resolve every link against a rebuilt graph."""
+        with self._lock:
+            self._reset(layout)
+
+    def apply(self, links: Iterable[Any]) -> int:
+        """Upsert links (objects with EvidenceLink attributes); returns how many changed."""
+        changed = 0
+        with self._lock:
+            for link in links:
+                key = (str(link.artifact_id), str(link.standard_code))
+                entry = _entry(link)
+                previous = self._links.get(key)
+                if previous == entry:
+                    continue
+                if previous is not None:
+                    self._account(key[1], previous, -1)
+                self._links[key] = entry
+                self._account(key[1], entry, +1)
+                changed += 1
+            if changed:
+                self._rollup = None
+        return changed
+
+    def replace(self, links: Iterable[Any]) -> None:
+        """Reset to exactly ``links`` (a fresh ``evidence_links`` read)."""
+        entries = {(str(link.artifact_id), str(link.standard_code)): _entry(link) for link in links}
+        with self._lock:
+            self._links = entries
+            self._reset(self.layout)
+
+    # -- aggregates ----------------------------------------------------
+    def rollup(self) -> Dict[str, np.ndarray]:
+        with self._lock:
+            if self._rollup is None:
+                layout = self.layout
+                covered = layout.push_down(self.link_count > 0) & layout.leaf
+                self._rollup = {
+                    "leaves": layout.roll_up(layout.leaf),
+                    "covered": layout.roll_up(covered),
+                    "links": layout.roll_up(self.link_count),
+                    "trust_sum": layout.roll_up(self.trust_sum),
+                    "trust_n": layout.roll_up(self.trust_n),
+                    "time_sum": layout.roll_up(self.time_sum),
+                    "covered_leaf": covered,
+                }
+            return self._rollup
+
+    def node_metrics(self, ordinals: np.ndarray, now: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Coverage %, link count, average trust and average age (NaN = no evidence)."""
+        agg = self.rollup()
+        now = datetime.now(timezone.utc).timestamp() if now is None else now
+        leaves = agg["leaves"][ordinals]
+        links = agg["links"][ordinals]
+        trust_n = agg["trust_n"][ordinals]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            coverage = np.where(leaves > 0, 100.0 * agg["covered"][ordinals] / leaves, 0.0)
+            average_trust = np.where(trust_n > 0, agg["trust_sum"][ordinals] / trust_n, np.nan)
+            average_age = np.where(links > 0, (now - agg["time_sum"][ordinals] / links) / _SECONDS_PER_DAY, np.nan)
+        return {
+            "coverage": coverage,
+            "evidence_count": links.astype(np.int64),
+            "average_trust": average_trust,
+            "average_age_days": np.maximum(average_age, 0.0),
+        }
+
+    def standards(self) -> List[Dict[str, Any]]:
+        """Per-standard rollup rows in accreditor order."""
+        layout = self.layout
+        metrics = self.node_metrics(layout.roots)
+        rows = []
+        for i, ordinal in enumerate(layout.roots.tolist()):
+            trust = metrics["average_trust"][i]
+            age = metrics["average_age_days"][i]
+            rows.append({
+                "standard_id": layout.ids[ordinal],
+                "title": layout.titles[ordinal],
+                "coverage_percentage": round(float(metrics["coverage"][i]), 1),
+                "evidence_count": int(metrics["evidence_count"][i]),
+                "average_trust": None if np.isnan(trust) else round(float(trust), 3),
+                "average_age_days": None if np.isnan(age) else round(float(age), 1),
+            })
+        return rows
+
+    def gap_summary(self) -> List[Dict[str, Any]]:
+        """Uncovered leaves grouped by standard."""
+        layout = self.layout
+        agg = self.rollup()
+        uncovered = np.flatnonzero(layout.leaf & ~agg["covered_leaf"])
+        owners = uncovered.copy()
+        for _ in range(2):
+            has_parent = layout.parent[owners] >= 0
+            owners[has_parent] = layout.parent[owners[has_parent]]
+        grouped: Dict[int, List[str]] = {}
+        for leaf, owner in zip(uncovered.tolist(), owners.tolist()):
+            grouped.setdefault(owner, []).append(layout.ids[leaf])
+        return [
+            {"standard_id": layout.ids[root], "title": layout.titles[root],
+             "uncovered": grouped[root], "uncovered_count": len(grouped[root])}
+            for root in layout.roots.tolist() if root in grouped
+        ]
+
+    def heatmap(self) -> Dict[str, Dict[str, float]]:
+        """Standard -> clause -> coverage %."""
+        layout = self.layout
+        clauses = np.flatnonzero(layout.level == 1)
+        coverage = self.node_metrics(clauses)["coverage"]
+        cells: Dict[str, Dict[str, float]] = {layout.ids[r]: {} for r in layout.roots.tolist()}
+        for clause, value in zip(clauses.tolist(), coverage.tolist()):
+            parent = int(layout.parent[clause])
+            if parent >= 0:
+                cells.setdefault(layout.ids[parent], {})[layout.ids[clause]] = round(value, 1)
+        return cells
+
+
+class CoverageIndexRegistry:
+    """All coverage indexes, keyed by (org_id, standard_set)."""
+
+    def __init__(self, graph: Any = None, reseed_seconds: float = _RESEED_SECONDS):
+        self._graph = graph
+        self.reseed_seconds = reseed_seconds
+        self._lock = threading.Lock()
+        self._indexes: Dict[Tuple[str, str], CoverageIndex] = {}
+        self._layouts: Dict[str, StandardsLayout] = {}
+        # (org_id, standard_set) -> monotonic time of the last successful seed
+        self._loaded: Dict[Tuple[str, str], float] = {}
+
+    @property
+    def graph(self) -> Any:
+        if self._graph is None:
+            from .standards_graph import standards_graph
+            self._graph = standards_graph
+        return self._graph
+
+    def _layout(self, standard_set: str) -> StandardsLayout:
+        revision = getattr(self.graph, "revision", 0)
+        layout = self._layouts.get(standard_set)
+        if layout is None or layout.revision != revision:
+            layout = StandardsLayout(self.graph, standard_set)
+            self._layouts[standard_set] = layout
+        return layout
+
+    def get(self, org_id: Any, standard_set: str) -> CoverageIndex:
+        key = (str(org_id), standard_set)
+        with self._lock:
+            layout = self._layout(standard_set)
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = CoverageIndex(layout)
+        if index.layout is not layout:
+            index.relayout(layout)
+        return index
+
+    def is_loaded(self, org_id: Any, standard_set: str) -> bool:
+        """Whether the index was ever seeded successfully."""
+        return (str(org_id), standard_set) in self._loaded
+
+    def is_stale(self, org_id: Any, standard_set: str) -> bool:
+        """True when the index needs a (re-)seed before it can be trusted."""
+        loaded_at = self._loaded.get((str(org_id), standard_set))
+        return loaded_at is None or time.monotonic() - loaded_at >= self.reseed_seconds
+
+    def load(self, org_id: Any, standard_set: str, links: Iterable[Any]) -> CoverageIndex:
+        """Seed an index from the current ``evidence_links`` rows.
+
+        Only call this with a successful read: an empty ``links`` replaces
+        whatever the index held.
+        """
+        index = self.get(org_id, standard_set)
+        index.replace(links)
+        self._loaded[(str(org_id), standard_set)] = time.monotonic()
+        return index
+
+    def invalidate(self, org_id: Any = None, standard_set: Optional[str] = None) -> None:
+        """Force a re-seed on the next read (all indexes when no org is given)."""
+        with self._lock:
+            for key in list(self._loaded):
+                if (org_id is None or key[0] == str(org_id)) and standard_set in (None, key[1]):
+                    # Keep the key: the last seed is still served if the re-seed fails
+                    self._loaded[key] = float("-inf")
+
+    def apply_links(self, links: Iterable[Any]) -> int:
+        """Route freshly upserted links to their indexes."""
+        grouped: Dict[Tuple[str, str], List[Any]] = {}
+        for link in links:
+            grouped.setdefault((str(link.org_id), link.standard_set), []).append(link)
+        changed = 0
+        for (org_id, standard_set), batch in grouped.items():
+            changed += self.get(org_id, standard_set).apply(batch)
+        return changed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+            self._layouts.clear()
+            self._loaded.clear()
+
+
+_registry: Optional[CoverageIndexRegistry] = None
+
+
+def get_coverage_indexes() -> CoverageIndexRegistry:
+    global _registry
+    if _registry is None:
+        _registry = CoverageIndexRegistry()
+    return _registry
@@ -7,7 +7,7 @@ Handles all CRUD operations for institutions, evidence, standards, and workflows
 
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Union
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Union
 from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy import text, select, insert, update, delete, and_, or_
@@ -372,11 +372,21 @@ class DatabaseService:
             logger.error(f"Error getting evidence {evidence_id}: {e}")
             return None
     
-    async def create_evidence(self, evidence_data: Dict[str, Any]) -> Evidence:
-        """Create new evidence"""
+    async def create_evidence(
+        self,
+        evidence_data: Dict[str, Any],
+        before_commit: Optional[Callable[[AsyncSession, Evidence], Awaitable[Any]]] = None
+    ) -> Evidence:
+        """Create new evidence
+
+        ``before_commit(session, evidence)`` runs inside the same transaction,
+        e.g. to queue webhook events that must publish with the insert.
+        """
         try:
             evidence = Evidence(**evidence_data)
             self.session.add(evidence)
+            if before_commit is not None:
+                await before_commit(self.session, evidence)
             await self.session.commit()
             await self.session.refresh(evidence)
             return evidence
@@ -819,8 +829,16 @@ class DatabaseService:
             logger.error(f"Failed to list institution workflows: {e}")
             return []
     
-    async def save_workflow_results(self, results: Dict[str, Any], user_id: str):
-        """Save complete workflow results to database"""
+    async def save_workflow_results(
+        self,
+        results: Dict[str, Any],
+        user_id: str,
+        before_commit: Optional[Callable[[AsyncSession], Awaitable[Any]]] = None
+    ):
+        """Save complete workflow results to database
+
+        ``before_commit(session)`` runs inside the same transaction.
+        """
         try:
             async with self.async_session() as session:
                 # Update workflow record
@@ -875,6 +893,8 @@ class DatabaseService:
                     )
                     session.add(narrative_obj)
                 
+                if before_commit is not None:
+                    await before_commit(session)
                 await session.commit()
                 logger.info(f"Saved workflow results for {workflow_id}")
                 
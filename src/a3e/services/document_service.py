@@ -6,10 +6,11 @@ Supports PDF, DOCX, XLSX, CSV, TXT, and MD files.
 """
 
 import asyncio
+import importlib.util
 import logging
 import tempfile
 import os
-from typing import Dict, Any, Optional, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from pathlib import Path
 import mimetypes
 from datetime import datetime
@@ -22,21 +23,19 @@ logger = logging.getLogger(__name__)
 try:
     import pypdf
     import docx
-    import pandas as pd
-    DOCUMENT_PROCESSING_AVAILABLE = True
+    # pandas is only needed for spreadsheets; it is imported on first use
+    DOCUMENT_PROCESSING_AVAILABLE = importlib.util.find_spec("pandas") is not None
 except ImportError:
     DOCUMENT_PROCESSING_AVAILABLE = False
+if not DOCUMENT_PROCESSING_AVAILABLE:
     logger.warning("Document processing libraries not available - limited file support")
-    
-    # Mock pandas for basic functionality
-    class pd:
-        @staticmethod
-        def DataFrame(data):
-            return {"data": data}
-        
-        @staticmethod 
-        def read_excel(file):
-            return {"data": "mock"}
+
+
+def _pandas():
+    import pandas as pd  # deferred: adds ~0.2s to worker boot
+
+    return pd
+
 
 from fastapi import UploadFile
 
@@ -66,9 +65,14 @@ class DocumentService:
         institution_id: str,
         evidence_type: str,
         description: Optional[str] = None,
-        uploaded_by: str = "system"
+        uploaded_by: str = "system",
+        before_commit: Optional[Callable[[Any, Evidence], Awaitable[Any]]] = None
     ) -> Evidence:
-        """Process an uploaded file and create evidence record"""
+        """Process an uploaded file and create evidence record
+
+        ``before_commit(session, evidence)`` runs in the transaction that
+        inserts the evidence row.
+        """
         
         # Validate file type
         mime_type = file.content_type or mimetypes.guess_type(file.filename)[0]
@@ -94,7 +98,7 @@ class DocumentService:
         await db_service.initialize()
         
         try:
-            evidence = await db_service.create_evidence(evidence_data)
+            evidence = await db_service.create_evidence(evidence_data, before_commit=before_commit)
             
             # Process file in background
             asyncio.create_task(
@@ -263,6 +267,7 @@ class DocumentService:
         """Extract data from Excel file"""
         try:
             # Read all sheets
+            pd = _pandas()
             excel_file = pd.ExcelFile(file_path)
             
             text_content = ""
@@ -309,6 +314,7 @@ class DocumentService:
             # Try different encodings
             encodings = ['utf-8', 'latin-1', 'cp1252']
             df = None
+            pd = _pandas()
             
             for encoding in encodings:
                 try:
@@ -7,9 +7,9 @@ import json
 import logging
 from typing import Iterable, List
 
-import httpx
-
 from ..core.config import Settings
+from ..core.instrumentation import timed_stage
+from .http_clients import get_http_clients
 
 try:  # Optional Bedrock dependency
     import boto3  # type: ignore
@@ -41,6 +41,7 @@ class EmbeddingService:
             except Exception as exc:  # pragma: no cover - network/cred errors
                 logger.warning("Bedrock embedding client unavailable: %s", exc)
 
+    @timed_stage("embed")
     async def embed(self, texts: Iterable[str]) -> List[List[float]]:
         payload = [self._truncate(text) for text in texts]
         if not payload:
@@ -76,7 +77,7 @@ class EmbeddingService:
             "Content-Type": "application/json",
         }
         payload = {"model": self._openai_model, "input": texts}
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with get_http_clients().borrow("https://api.openai.com") as client:
             resp = await client.post("https://api.openai.com/v1/embeddings", headers=headers, json=payload)
             resp.raise_for_status()
             data = resp.json()
@@ -1,24 +1,35 @@
 """
 EvidenceMapper™ - Multi-stage evidence to standards mapping with confidence scoring
-Dual-encoder retrieval + cross-encoder reranking + explanation extraction
+Hybrid BM25 + dense retrieval fused with RRF + cross-encoder reranking + explanation extraction
 """
 
 import hashlib
 import json
+import os
 import re
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import logging
 
 from .standards_graph import standards_graph, StandardNode
+from .hybrid_retrieval import BM25Index, DenseIndex, Encoder, HybridRetriever, TfidfIndex, lsa_encoder
+from ..core.lazy_loading import LazyObject
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_weights(raw: str) -> Dict[str, float]:
+    """``"bm25=1.0,dense=0.5"`` -> ``{"bm25": 1.0, "dense": 0.5}``"""
+    weights = {}
+    for part in raw.split(","):
+        name, _, value = part.partition("=")
+        if name.strip() and value.strip():
+            weights[name.strip()] = float(value)
+    return weights
+
+
 @dataclass
 class MappingResult:
     """Result of mapping evidence to a standard"""
@@ -59,16 +70,24 @@ class EvidenceDocument:
 
 class EvidenceMapper:
     """Maps evidence documents to accreditation standards with confidence scoring"""
+
+    # Part of the analysis cache key; bump when mapping output changes
+    VERSION = "hybrid-rrf-2"
     
-    def __init__(self):
+    def __init__(
+        self,
+        retrieval_weights: Optional[Dict[str, float]] = None,
+        dense_encoder: Optional[Encoder] = None
+    ):
         self.graph = standards_graph
-        self.vectorizer = TfidfVectorizer(
-            max_features=5000,
-            ngram_range=(1, 3),
-            min_df=2,
-            stop_words='english'
-        )
-        self.corpus_embeddings = {}
+        self.dense_encoder = dense_encoder
+        self.retrieval_params = {
+            # Weighted RRF over the BM25 and dense legs; a zero weight disables a leg
+            'weights': retrieval_weights or _parse_weights(os.getenv('EVIDENCE_RRF_WEIGHTS', 'bm25=1.0,dense=1.0')),
+            'rrf_k': float(os.getenv('EVIDENCE_RRF_K', '60')),
+            'depth': int(os.getenv('EVIDENCE_RETRIEVAL_DEPTH', '50')),  # per-leg top-k fed to fusion
+            'lsa_dimensions': int(os.getenv('EVIDENCE_LSA_DIMENSIONS', '256')),
+        }
         self.calibration_params = {
             'temperature': 1.5,  # For confidence calibration
             'threshold_exact': 0.85,
@@ -79,7 +98,7 @@ class EvidenceMapper:
         self._build_corpus_index()
     
     def _build_corpus_index(self):
-        """Build TF-IDF index of all standards for fast retrieval"""
+        """Build the BM25 and dense indexes over all standards"""
         corpus = []
         node_ids = []
         
@@ -92,9 +111,19 @@ class EvidenceMapper:
             node_ids.append(node_id)
         
         if corpus:
-            self.corpus_matrix = self.vectorizer.fit_transform(corpus)
+            encoder = self.dense_encoder or lsa_encoder(corpus, self.retrieval_params['lsa_dimensions'])
+            self.retriever = HybridRetriever(
+                {'bm25': BM25Index(corpus), 'dense': DenseIndex(corpus, encoder)},
+                weights=self.retrieval_params['weights'],
+                rrf_k=self.retrieval_params['rrf_k'],
+                depth=self.retrieval_params['depth'],
+            )
+            # Scores the fused shortlist for the rerank blend (not used for ranking)
+            self.relevance_index = TfidfIndex(
+                corpus, max_features=5000, ngram_range=(1, 3), min_df=2, stop_words='english'
+            )
             self.corpus_node_ids = node_ids
-            logger.info(f"Built corpus index with {len(corpus)} standards")
+            logger.info(f"Built hybrid corpus index with {len(corpus)} standards")
     
     def map_evidence(
         self,
@@ -105,13 +134,13 @@ class EvidenceMapper:
         """
         Map evidence document to standards with multi-stage pipeline
         
-        Step 1: Fast candidate retrieval (dual-encoder)
-        Step 2: Cross-encoder reranking
+        Step 1: Hybrid candidate retrieval (BM25 + dense, fused with RRF)
+        Step 2: Cross-encoder reranking of the fused shortlist
         Step 3: Confidence calibration
         Step 4: Rationale extraction
         """
         
-        # Step 1: Retrieve top-K candidates via vector search
+        # Step 1: Fused shortlist from lexical and vector search
         candidates = self._retrieve_candidates(document.text, top_k * 2)
         
         # Step 2: Cross-encode and rerank
@@ -147,22 +176,21 @@ class EvidenceMapper:
         return results
     
     def _retrieve_candidates(self, query_text: str, top_k: int) -> List[Tuple[str, float]]:
-        """Fast candidate retrieval using TF-IDF similarity"""
-        if not hasattr(self, 'corpus_matrix'):
+        """Hybrid shortlist: BM25 and dense top-k run concurrently, fused with RRF.
+
+        Candidates come in fused order, each scored by its TF-IDF cosine to
+        the query. The RRF value is rank-based (the top hit of unrelated text
+        still gets 1.0), so it must not feed the rerank blend as relevance.
+        """
+        if not hasattr(self, 'retriever'):
             return []
         
-        query_vec = self.vectorizer.transform([query_text])
-        similarities = cosine_similarity(query_vec, self.corpus_matrix).flatten()
-        
-        # Get top-k indices
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
-        
-        candidates = []
-        for idx in top_indices:
-            if similarities[idx] > 0:
-                candidates.append((self.corpus_node_ids[idx], float(similarities[idx])))
-        
-        return candidates
+        hits = self.retriever.search(query_text, top_k)
+        relevance = self.relevance_index.similarity(query_text, [hit.doc for hit in hits])
+        return [
+            (self.corpus_node_ids[hit.doc], float(score))
+            for hit, score in zip(hits, relevance.tolist())
+        ]
     
     def _cross_encode_rerank(
         self,
@@ -380,5 +408,5 @@ class EvidenceMapper:
         return stats
 
 
-# Global instance
-evidence_mapper = EvidenceMapper()
\ No newline at end of file
+# Global instance; the retrieval indexes are built on first use
+evidence_mapper = LazyObject(EvidenceMapper, "EvidenceMapper hybrid index")
\ No newline at end of file
@@ -1,6 +1,6 @@
 """
 Enhanced Evidence Mapper with LLM Integration
-Combines TF-IDF retrieval with LLM-powered analysis for better mapping accuracy
+Combines hybrid BM25 + dense retrieval with LLM-powered analysis for better mapping accuracy
 """
 
 import json
@@ -13,12 +13,16 @@ import asyncio
 from .evidence_mapper import EvidenceMapper, EvidenceDocument, MappingResult
 from .llm_service import LLMService
 from ..core.config import get_settings
+from ..core.lazy_loading import LazyObject
 
 logger = logging.getLogger(__name__)
 
 
 class EnhancedEvidenceMapper(EvidenceMapper):
     """Enhanced evidence mapper that uses LLM for intelligent analysis"""
+
+    # Part of the analysis cache key; bump when mapping output changes
+    VERSION = "enhanced-3"
     
     def __init__(self):
         super().__init__()
@@ -52,7 +56,7 @@ class EnhancedEvidenceMapper(EvidenceMapper):
         Returns:
             List of mapping results with AI-enhanced confidence and explanations
         """
-        # First, use traditional TF-IDF mapping to get candidates
+        # First, use the hybrid retrieval mapping to get candidates
         initial_mappings = self.map_evidence(document, num_candidates)
         
         if not use_llm or not self.llm_service:
@@ -83,7 +87,7 @@ class EnhancedEvidenceMapper(EvidenceMapper):
                 enhanced_mappings.extend(enhanced_results)
                 
             except Exception as e:
-                logger.warning(f"LLM analysis failed, falling back to TF-IDF: {e}")
+                logger.warning(f"LLM analysis failed, falling back to hybrid retrieval: {e}")
                 enhanced_mappings.extend(batch)
         
         # Sort by AI-enhanced confidence
@@ -188,5 +192,5 @@ Focus on accuracy and compliance requirements. Be conservative with confidence s
             return original_mappings
 
 
-# Create singleton instance
-enhanced_evidence_mapper = EnhancedEvidenceMapper()
+# Create singleton instance; the retrieval indexes are built on first use
+enhanced_evidence_mapper = LazyObject(EnhancedEvidenceMapper, "EnhancedEvidenceMapper hybrid index")
@@ -19,7 +19,10 @@ import secrets
 try:
     import PyPDF2
     from docx import Document
-    import pandas as pd
+    import importlib.util
+    # pandas is imported when a spreadsheet is processed, not at worker boot
+    if importlib.util.find_spec("pandas") is None:
+        raise ImportError("pandas")
     PDF_SUPPORT = True
 except ImportError:
     PDF_SUPPORT = False
@@ -140,6 +143,8 @@ class EvidenceProcessor:
                     text = file.read()
             
             elif ext in ['csv', 'xlsx', 'xls'] and PDF_SUPPORT:
+                import pandas as pd
+
                 df = pd.read_excel(file_path) if ext in ['xlsx', 'xls'] else pd.read_csv(file_path)
                 text = df.to_string()
             
@@ -4,15 +4,25 @@ Evaluates provenance, freshness, completeness, relevance, and alignment
 """
 
 import hashlib
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
+_TRUST_WORKERS = int(os.getenv("TRUST_SCORE_WORKERS", "2"))
+# Below this many uncached documents the pool's start-up cost outweighs the work
+_PARALLEL_MIN_DOCUMENTS = 64
+_FEATURE_CACHE_ENTRIES = 10_000
+
 
 class SourceSystem(Enum):
     """Evidence source system types"""
@@ -39,6 +49,129 @@ class EvidenceType(Enum):
     FACULTY_CREDENTIAL = "faculty_credential"
 
 
+SIGNAL_NAMES = (
+    'provenance', 'freshness', 'completeness', 'relevance', 'alignment', 'reviewer_verification'
+)
+TRUST_LEVELS = ('high', 'medium', 'low', 'critical')
+
+# Base provenance scores by source system
+_SOURCE_SCORES = {
+    SourceSystem.EXTERNAL_AUDIT: 1.0,
+    SourceSystem.ERP: 0.9,
+    SourceSystem.LMS: 0.85,
+    SourceSystem.SIS: 0.85,
+    SourceSystem.INTERNAL_SYSTEM: 0.7,
+    SourceSystem.SURVEY: 0.6,
+    SourceSystem.MANUAL: 0.5
+}
+
+# Minimum expected content lengths by type
+_MIN_LENGTHS = {
+    EvidenceType.POLICY: 1000,
+    EvidenceType.SYLLABUS: 2000,
+    EvidenceType.ASSESSMENT: 500,
+    EvidenceType.REPORT: 3000,
+    EvidenceType.MEETING_MINUTES: 500,
+    EvidenceType.FINANCIAL_STATEMENT: 1000
+}
+
+# Verification states (column values in TrustBatch)
+_PENDING, _APPROVED, _MULTI_REVIEWER, _AUTO_VERIFIED = range(4)
+_VERIFICATION = {
+    _PENDING: (0.3, "Pending review"),
+    _APPROVED: (1.0, "Reviewer approved"),
+    _MULTI_REVIEWER: (1.0, "Multiple reviewers approved"),
+    _AUTO_VERIFIED: (0.7, "Auto-verified by system"),
+}
+
+
+def _verification_state(reviewer_approved: bool, metadata: Dict[str, Any]) -> int:
+    if metadata.get('multi_reviewer_approved'):
+        return _MULTI_REVIEWER
+    if metadata.get('auto_verified'):
+        return _AUTO_VERIFIED
+    return _APPROVED if reviewer_approved else _PENDING
+
+
+def _provenance_explanation(source_system: SourceSystem) -> str:
+    explanation = f"Source: {source_system.value} system"
+    if source_system == SourceSystem.EXTERNAL_AUDIT:
+        explanation += " (highest trust - external verification)"
+    elif source_system == SourceSystem.MANUAL:
+        explanation += " (requires additional verification)"
+    return explanation
+
+
+def _freshness_explanation(age_days: int, score: float) -> str:
+    explanation = f"Document age: {age_days} days"
+    if score >= 0.9:
+        explanation += " (very current)"
+    elif score >= 0.7:
+        explanation += " (acceptably current)"
+    elif score >= 0.5:
+        explanation += " (needs update soon)"
+    else:
+        explanation += " (requires immediate update)"
+    return explanation
+
+
+def _completeness_explanation(content_length: int, score: float) -> str:
+    explanation = f"Content length: {content_length} characters"
+    if score >= 0.8:
+        explanation += " (comprehensive)"
+    elif score >= 0.5:
+        explanation += " (adequate)"
+    else:
+        explanation += " (may be incomplete)"
+    return explanation
+
+
+def _relevance_explanation(mapping_confidence: Optional[float], citations_count: int) -> str:
+    explanation = f"Mapping confidence: {mapping_confidence:.1%}" if mapping_confidence else "No mapping available"
+    if citations_count > 0:
+        explanation += f", cited {citations_count} times"
+    return explanation
+
+
+def _alignment_explanation(conflicts_detected: int, is_duplicate: bool, is_superseded: bool) -> str:
+    explanation = "No conflicts detected" if conflicts_detected == 0 else f"{conflicts_detected} conflicts found"
+    if is_duplicate:
+        explanation += " (duplicate content)"
+    if is_superseded:
+        explanation += " (superseded version)"
+    return explanation
+
+
+def _utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _document_features(texts: List[str], derive_confidence: bool) -> List[Tuple[int, Optional[float]]]:
+    """Text-derived (content length, top mapping confidence) per document.
+
+    Module-level so it can run in a worker process; each worker builds its
+    own mapper index once.
+    """
+    mapper = None
+    if derive_confidence:
+        from .evidence_mapper import EvidenceDocument, evidence_mapper as mapper
+    features = []
+    for text in texts:
+        confidence = None
+        if mapper is not None and text.strip():
+            document = EvidenceDocument(
+                doc_id='trust-features', text=text, metadata={}, doc_type='',
+                source_system=None, upload_date=datetime.utcnow()
+            )
+            mappings = mapper.map_evidence(document, top_k=1, min_confidence=0.0)
+            if mappings:
+                confidence = float(mappings[0].confidence)
+        features.append((len(text), confidence))
+    return features
+
+
 @dataclass
 class TrustSignal:
     """Individual trust signal for evidence"""
@@ -80,10 +213,91 @@ class EvidenceTrustScore:
         }
 
 
+@dataclass
+class TrustBatch:
+    """Columnar trust results for N evidence items.
+
+    Signals are scored as arrays; ``TrustSignal``/``EvidenceTrustScore``
+    objects are only built when a caller asks for them via ``score(i)``.
+    """
+    evidence_ids: List[str]
+    evidence_types: List[EvidenceType]
+    source_systems: List[SourceSystem]
+    signals: np.ndarray  # (N, 6) signal values in SIGNAL_NAMES order
+    overall_score: np.ndarray  # (N,)
+    level_index: np.ndarray  # (N,) index into TRUST_LEVELS
+    age_days: np.ndarray  # (N,)
+    content_length: np.ndarray  # (N,)
+    mapping_confidence: np.ndarray  # (N,) NaN when unknown
+    citations_count: np.ndarray  # (N,)
+    conflicts_detected: np.ndarray  # (N,)
+    is_duplicate: np.ndarray  # (N,) bool
+    is_superseded: np.ndarray  # (N,) bool
+    verification_state: np.ndarray  # (N,)
+    weights: Tuple[float, ...]
+    timestamp: datetime
+    _scorer: 'EvidenceTrustScorer' = field(repr=False, default=None)
+
+    def __len__(self) -> int:
+        return len(self.evidence_ids)
+
+    def signal(self, name: str) -> np.ndarray:
+        return self.signals[:, SIGNAL_NAMES.index(name)]
+
+    def trust_levels(self) -> List[str]:
+        return [TRUST_LEVELS[i] for i in self.level_index.tolist()]
+
+    def trust_signals(self, i: int) -> List[TrustSignal]:
+        values = self.signals[i].tolist()
+        confidence = float(self.mapping_confidence[i])
+        explanations = (
+            _provenance_explanation(self.source_systems[i]),
+            _freshness_explanation(int(self.age_days[i]), values[1]),
+            _completeness_explanation(int(self.content_length[i]), values[2]),
+            _relevance_explanation(None if np.isnan(confidence) else confidence, int(self.citations_count[i])),
+            _alignment_explanation(
+                int(self.conflicts_detected[i]), bool(self.is_duplicate[i]), bool(self.is_superseded[i])
+            ),
+            _VERIFICATION[int(self.verification_state[i])][1],
+        )
+        return [
+            TrustSignal(signal_type=name, value=value, weight=weight, explanation=explanation)
+            for name, value, weight, explanation in zip(SIGNAL_NAMES, values, self.weights, explanations)
+        ]
+
+    def score(self, i: int) -> EvidenceTrustScore:
+        """Materialize the full explainable score for row ``i``."""
+        signals = self.trust_signals(i)
+        overall = float(self.overall_score[i])
+        scorer = self._scorer or evidence_trust_scorer
+        return EvidenceTrustScore(
+            evidence_id=self.evidence_ids[i],
+            overall_score=overall,
+            signals=signals,
+            trust_level=TRUST_LEVELS[int(self.level_index[i])],
+            recommendations=scorer._generate_recommendations(signals, self.evidence_types[i], overall),
+            timestamp=self.timestamp
+        )
+
+    def to_scores(self) -> Dict[str, EvidenceTrustScore]:
+        return {evidence_id: self.score(i) for i, evidence_id in enumerate(self.evidence_ids)}
+
+    def to_columns(self) -> Dict[str, Any]:
+        """Compact columnar representation (no per-signal explanations)."""
+        columns = {
+            'evidence_id': list(self.evidence_ids),
+            'overall_score': np.round(self.overall_score, 3).tolist(),
+            'trust_level': self.trust_levels(),
+        }
+        for j, name in enumerate(SIGNAL_NAMES):
+            columns[name] = np.round(self.signals[:, j], 3).tolist()
+        return columns
+
+
 class EvidenceTrustScorer:
     """Calculates multi-factor trust scores for evidence"""
     
-    def __init__(self):
+    def __init__(self, executor: Optional[Executor] = None, max_workers: int = _TRUST_WORKERS):
         self.weights = {
             'provenance': 0.20,
             'freshness': 0.25,
@@ -105,6 +319,13 @@ class EvidenceTrustScorer:
             EvidenceType.FACULTY_CREDENTIAL: 365 * 5,  # 5 years
             EvidenceType.PROCEDURE: 365 * 2  # 2 years
         }
+        
+        self.max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._lock = threading.Lock()
+        self._features: "OrderedDict[str, Tuple[int, Optional[float]]]" = OrderedDict()
+        self.feature_stats = {'hits': 0, 'misses': 0}
     
     def calculate_trust_score(
         self,
@@ -167,7 +388,7 @@ class EvidenceTrustScorer:
         trust_level = self._determine_trust_level(overall_score)
         
         # Generate recommendations
-        recommendations = self._generate_recommendations(signals, evidence_type)
+        recommendations = self._generate_recommendations(signals, evidence_type, overall_score)
         
         return EvidenceTrustScore(
             evidence_id=evidence_id,
@@ -185,18 +406,7 @@ class EvidenceTrustScorer:
     ) -> TrustSignal:
         """Calculate provenance trust score"""
         
-        # Base scores by source system
-        system_scores = {
-            SourceSystem.EXTERNAL_AUDIT: 1.0,
-            SourceSystem.ERP: 0.9,
-            SourceSystem.LMS: 0.85,
-            SourceSystem.SIS: 0.85,
-            SourceSystem.INTERNAL_SYSTEM: 0.7,
-            SourceSystem.SURVEY: 0.6,
-            SourceSystem.MANUAL: 0.5
-        }
-        
-        base_score = system_scores.get(source_system, 0.5)
+        base_score = _SOURCE_SCORES.get(source_system, 0.5)
         
         # Adjust for additional metadata
         if metadata.get('digital_signature'):
@@ -205,17 +415,11 @@ class EvidenceTrustScorer:
         if metadata.get('audit_trail'):
             base_score = min(1.0, base_score + 0.05)
         
-        explanation = f"Source: {source_system.value} system"
-        if source_system == SourceSystem.EXTERNAL_AUDIT:
-            explanation += " (highest trust - external verification)"
-        elif source_system == SourceSystem.MANUAL:
-            explanation += " (requires additional verification)"
-        
         return TrustSignal(
             signal_type='provenance',
             value=base_score,
             weight=self.weights['provenance'],
-            explanation=explanation
+            explanation=_provenance_explanation(source_system)
         )
     
     def _calculate_freshness_score(
@@ -242,21 +446,11 @@ class EvidenceTrustScorer:
         else:
             score = 0.1  # Very stale
         
-        explanation = f"Document age: {age_days} days"
-        if score >= 0.9:
-            explanation += " (very current)"
-        elif score >= 0.7:
-            explanation += " (acceptably current)"
-        elif score >= 0.5:
-            explanation += " (needs update soon)"
-        else:
-            explanation += " (requires immediate update)"
-        
         return TrustSignal(
             signal_type='freshness',
             value=score,
             weight=self.weights['freshness'],
-            explanation=explanation
+            explanation=_freshness_explanation(age_days, score)
         )
     
     def _calculate_completeness_score(
@@ -267,17 +461,7 @@ class EvidenceTrustScorer:
     ) -> TrustSignal:
         """Calculate completeness score based on content analysis"""
         
-        # Minimum expected lengths by type
-        min_lengths = {
-            EvidenceType.POLICY: 1000,
-            EvidenceType.SYLLABUS: 2000,
-            EvidenceType.ASSESSMENT: 500,
-            EvidenceType.REPORT: 3000,
-            EvidenceType.MEETING_MINUTES: 500,
-            EvidenceType.FINANCIAL_STATEMENT: 1000
-        }
-        
-        min_expected = min_lengths.get(evidence_type, 1000)
+        min_expected = _MIN_LENGTHS.get(evidence_type, 1000)
         
         # Base score from content length
         if content_length >= min_expected * 2:
@@ -297,19 +481,11 @@ class EvidenceTrustScorer:
             field_completeness = len(provided_fields) / len(required_fields)
             base_score = (base_score + field_completeness) / 2
         
-        explanation = f"Content length: {content_length} characters"
-        if base_score >= 0.8:
-            explanation += " (comprehensive)"
-        elif base_score >= 0.5:
-            explanation += " (adequate)"
-        else:
-            explanation += " (may be incomplete)"
-        
         return TrustSignal(
             signal_type='completeness',
             value=base_score,
             weight=self.weights['completeness'],
-            explanation=explanation
+            explanation=_completeness_explanation(content_length, base_score)
         )
     
     def _calculate_relevance_score(
@@ -332,15 +508,11 @@ class EvidenceTrustScorer:
         elif citations_count > 0:
             base_score = min(1.0, base_score + 0.05)
         
-        explanation = f"Mapping confidence: {mapping_confidence:.1%}" if mapping_confidence else "No mapping available"
-        if citations_count > 0:
-            explanation += f", cited {citations_count} times"
-        
         return TrustSignal(
             signal_type='relevance',
             value=base_score,
             weight=self.weights['relevance'],
-            explanation=explanation
+            explanation=_relevance_explanation(mapping_confidence, citations_count)
         )
     
     def _calculate_alignment_score(
@@ -367,17 +539,13 @@ class EvidenceTrustScorer:
         
         score = max(0, score)
         
-        explanation = "No conflicts detected" if conflicts_detected == 0 else f"{conflicts_detected} conflicts found"
-        if metadata.get('is_duplicate'):
-            explanation += " (duplicate content)"
-        if metadata.get('is_superseded'):
-            explanation += " (superseded version)"
-        
         return TrustSignal(
             signal_type='alignment',
             value=score,
             weight=self.weights['alignment'],
-            explanation=explanation
+            explanation=_alignment_explanation(
+                conflicts_detected, bool(metadata.get('is_duplicate')), bool(metadata.get('is_superseded'))
+            )
         )
     
     def _calculate_verification_score(
@@ -387,20 +555,8 @@ class EvidenceTrustScorer:
     ) -> TrustSignal:
         """Calculate verification score based on review status"""
         
-        if reviewer_approved:
-            score = 1.0
-            explanation = "Reviewer approved"
-        else:
-            score = 0.3
-            explanation = "Pending review"
-        
-        # Additional verification signals
-        if metadata.get('multi_reviewer_approved'):
-            score = 1.0
-            explanation = "Multiple reviewers approved"
-        elif metadata.get('auto_verified'):
-            score = 0.7
-            explanation = "Auto-verified by system"
+        # Multi-reviewer approval and auto-verification override the single review flag
+        score, explanation = _VERIFICATION[_verification_state(reviewer_approved, metadata)]
         
         return TrustSignal(
             signal_type='reviewer_verification',
@@ -423,10 +579,14 @@ class EvidenceTrustScorer:
     def _generate_recommendations(
         self,
         signals: List[TrustSignal],
-        evidence_type: EvidenceType
+        evidence_type: EvidenceType,
+        overall_score: Optional[float] = None
     ) -> List[str]:
         """Generate actionable recommendations based on trust signals"""
         
+        if overall_score is None:
+            overall_score = sum(s.weighted_value() for s in signals) / sum(s.weight for s in signals)
+        
         recommendations = []
         
         for signal in signals:
@@ -455,51 +615,227 @@ class EvidenceTrustScorer:
         evidence_list: List[Dict[str, Any]]
     ) -> Dict[str, EvidenceTrustScore]:
         """Batch process multiple evidence items"""
-        scores = {}
-        
-        for evidence in evidence_list:
-            score = self.calculate_trust_score(
-                evidence_id=evidence['id'],
-                evidence_type=EvidenceType(evidence['type']),
-                source_system=SourceSystem(evidence['source']),
-                upload_date=evidence['upload_date'],
-                last_modified=evidence['last_modified'],
-                content_length=evidence.get('content_length', 0),
-                metadata=evidence.get('metadata', {}),
-                mapping_confidence=evidence.get('mapping_confidence'),
-                reviewer_approved=evidence.get('reviewer_approved', False),
-                citations_count=evidence.get('citations_count', 0),
-                conflicts_detected=evidence.get('conflicts_detected', 0)
-            )
-            scores[evidence['id']] = score
+        return self.score_batch(evidence_list).to_scores()
+    
+    def score_batch(
+        self,
+        evidence_list: Sequence[Dict[str, Any]],
+        derive_relevance: bool = True
+    ) -> TrustBatch:
+        """Score many evidence items at once in columnar form.
+        
+        Items take the same keys as ``batch_score_evidence``. An optional
+        ``content`` string supplies text-derived features: its length stands
+        in for a missing ``content_length`` and, when ``mapping_confidence``
+        is missing and ``derive_relevance`` is set, the top standards mapping
+        confidence is used. Those features are computed once per distinct
+        text (cached by content hash), in a process pool for large batches.
+        """
+        n = len(evidence_list)
+        now = datetime.utcnow()
+        types = [EvidenceType(e['type']) for e in evidence_list]
+        sources = [SourceSystem(e['source']) for e in evidence_list]
+        metadata = [e.get('metadata') or {} for e in evidence_list]
+        
+        content_length = np.array([e.get('content_length') or 0 for e in evidence_list], dtype=np.int64)
+        confidence = np.array(
+            [np.nan if e.get('mapping_confidence') is None else e['mapping_confidence'] for e in evidence_list],
+            dtype=float
+        )
+        texts = [(i, e['content']) for i, e in enumerate(evidence_list) if e.get('content')]
+        if texts:
+            derive = derive_relevance and bool(np.isnan(confidence[[i for i, _ in texts]]).any())
+            features = self.document_features([text for _, text in texts], derive)
+            for (i, _), (length, derived) in zip(texts, features):
+                if not evidence_list[i].get('content_length'):
+                    content_length[i] = length
+                if derive and np.isnan(confidence[i]) and derived is not None:
+                    confidence[i] = derived
+        
+        signals = np.empty((n, len(SIGNAL_NAMES)))
+        
+        # Provenance
+        provenance = np.array([_SOURCE_SCORES.get(src, 0.5) for src in sources])
+        signed = np.array([bool(m.get('digital_signature')) for m in metadata], dtype=bool)
+        audited = np.array([bool(m.get('audit_trail')) for m in metadata], dtype=bool)
+        provenance = np.where(signed, np.minimum(1.0, provenance + 0.1), provenance)
+        signals[:, 0] = np.where(audited, np.minimum(1.0, provenance + 0.05), provenance)
+        
+        # Freshness (whole days, floored like timedelta.days)
+        last_modified = np.array(
+            [_utc_naive(e['last_modified']) for e in evidence_list], dtype='datetime64[us]'
+        ).reshape(n)
+        age_days = (np.datetime64(now, 'us') - last_modified) // np.timedelta64(1, 'D')
+        threshold = np.array([self.freshness_thresholds.get(t, 365) for t in types], dtype=float)
+        signals[:, 1] = np.select(
+            [age_days <= threshold / 4, age_days <= threshold / 2, age_days <= threshold,
+             age_days <= threshold * 1.5, age_days <= threshold * 2],
+            [1.0, 0.9, 0.7, 0.5, 0.3],
+            0.1
+        )
         
-        return scores
+        # Completeness
+        min_expected = np.array([_MIN_LENGTHS.get(t, 1000) for t in types], dtype=float)
+        completeness = np.select(
+            [content_length >= min_expected * 2, content_length >= min_expected,
+             content_length >= min_expected * 0.5],
+            [1.0, 0.8, 0.5],
+            0.3
+        )
+        required = np.array([len(m.get('required_fields') or []) for m in metadata], dtype=float)
+        provided = np.array([len(m.get('provided_fields') or []) for m in metadata], dtype=float)
+        has_required = required > 0
+        field_completeness = np.divide(provided, required, out=np.zeros(n), where=has_required)
+        signals[:, 2] = np.where(has_required, (completeness + field_completeness) / 2, completeness)
+        
+        # Relevance
+        citations = np.array([e.get('citations_count', 0) for e in evidence_list], dtype=np.int64)
+        relevance = np.where(np.isnan(confidence), 0.5, confidence)
+        boost = np.select([citations > 10, citations > 5, citations > 0], [0.2, 0.1, 0.05], 0.0)
+        signals[:, 3] = np.where(boost > 0, np.minimum(1.0, relevance + boost), relevance)
+        
+        # Alignment
+        conflicts = np.array([e.get('conflicts_detected', 0) for e in evidence_list], dtype=np.int64)
+        duplicate = np.array([bool(m.get('is_duplicate')) for m in metadata], dtype=bool)
+        superseded = np.array([bool(m.get('is_superseded')) for m in metadata], dtype=bool)
+        alignment = np.where(conflicts > 0, 1.0 - np.minimum(0.5, conflicts * 0.1), 1.0)
+        alignment = np.where(duplicate, alignment - 0.2, alignment)
+        alignment = np.where(superseded, alignment - 0.3, alignment)
+        signals[:, 4] = np.maximum(0, alignment)
+        
+        # Reviewer verification
+        state = np.array(
+            [_verification_state(e.get('reviewer_approved', False), m) for e, m in zip(evidence_list, metadata)],
+            dtype=np.int64
+        )
+        signals[:, 5] = np.array([_VERIFICATION[k][0] for k in range(len(_VERIFICATION))])[state]
+        
+        # Same left-to-right accumulation as calculate_trust_score
+        weights = tuple(self.weights[name] for name in SIGNAL_NAMES)
+        weighted = np.zeros(n)
+        for j, weight in enumerate(weights):
+            weighted = weighted + signals[:, j] * weight
+        overall = weighted / sum(weights)
+        level_index = np.select([overall >= 0.8, overall >= 0.6, overall >= 0.4], [0, 1, 2], 3)
+        
+        return TrustBatch(
+            evidence_ids=[e['id'] for e in evidence_list],
+            evidence_types=types,
+            source_systems=sources,
+            signals=signals,
+            overall_score=overall,
+            level_index=level_index,
+            age_days=age_days.astype(np.int64),
+            content_length=content_length,
+            mapping_confidence=confidence,
+            citations_count=citations,
+            conflicts_detected=conflicts,
+            is_duplicate=duplicate,
+            is_superseded=superseded,
+            verification_state=state,
+            weights=weights,
+            timestamp=now,
+            _scorer=self
+        )
     
-    def get_trust_statistics(self, scores: Dict[str, EvidenceTrustScore]) -> Dict[str, Any]:
+    # -- text features ---------------------------------------------------
+    def document_features(
+        self,
+        texts: Sequence[str],
+        derive_confidence: bool = True
+    ) -> List[Tuple[int, Optional[float]]]:
+        """(content length, top mapping confidence) per text, cached by content hash"""
+        if derive_confidence:
+            from .analysis_cache import corpus_version
+            scope = corpus_version()
+        else:
+            scope = 'length'
+        keys = [f"{scope}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}" for text in texts]
+        
+        results: Dict[str, Tuple[int, Optional[float]]] = {}
+        with self._lock:
+            for key in keys:
+                cached = self._features.get(key)
+                if cached is not None:
+                    self._features.move_to_end(key)
+                    results[key] = cached
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in results:
+                missing.setdefault(key, text)
+        self.feature_stats['hits'] += len(keys) - len(missing)
+        self.feature_stats['misses'] += len(missing)
+        
+        if missing:
+            computed = self._compute_features(list(missing.values()), derive_confidence)
+            with self._lock:
+                for key, value in zip(missing, computed):
+                    results[key] = value
+                    self._features[key] = value
+                while len(self._features) > _FEATURE_CACHE_ENTRIES:
+                    self._features.popitem(last=False)
+        return [results[key] for key in keys]
+    
+    def _compute_features(self, texts: List[str], derive_confidence: bool) -> List[Tuple[int, Optional[float]]]:
+        # Lengths alone are cheap; only mapping is worth shipping to other processes
+        if not derive_confidence or len(texts) < _PARALLEL_MIN_DOCUMENTS or self.max_workers < 2:
+            return _document_features(texts, derive_confidence)
+        chunk = -(-len(texts) // self.max_workers)
+        chunks = [texts[i:i + chunk] for i in range(0, len(texts), chunk)]
+        try:
+            executor = self._executor_or_create()
+            parts = executor.map(_document_features, chunks, [derive_confidence] * len(chunks))
+            return [features for part in parts for features in part]
+        except (BrokenProcessPool, OSError, NotImplementedError) as e:
+            # No usable process pool (restricted sandbox, fork limits): score in-process
+            logger.warning(f"Trust scoring process pool unavailable, computing in-process: {e}")
+            with self._lock:
+                if self._owns_executor:
+                    self._executor = None
+            return _document_features(texts, derive_confidence)
+    
+    def _executor_or_create(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+    
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._owns_executor:
+            executor.shutdown(wait=False)
+    
+    def get_trust_statistics(
+        self,
+        scores: Union[TrustBatch, Dict[str, EvidenceTrustScore]]
+    ) -> Dict[str, Any]:
         """Generate statistics for a set of trust scores"""
-        if not scores:
+        if not len(scores):
             return {'total': 0}
         
-        all_scores = [s.overall_score for s in scores.values()]
-        
-        stats = {
-            'total': len(scores),
-            'average_trust': np.mean(all_scores),
-            'median_trust': np.median(all_scores),
-            'by_level': {
-                'high': sum(1 for s in scores.values() if s.trust_level == 'high'),
-                'medium': sum(1 for s in scores.values() if s.trust_level == 'medium'),
-                'low': sum(1 for s in scores.values() if s.trust_level == 'low'),
-                'critical': sum(1 for s in scores.values() if s.trust_level == 'critical')
-            },
-            'needs_review': sum(1 for s in scores.values() if s.overall_score < 0.6),
-            'needs_update': sum(
-                1 for s in scores.values()
-                if any(sig.signal_type == 'freshness' and sig.value < 0.5 for sig in s.signals)
-            )
+        if isinstance(scores, TrustBatch):
+            overall = scores.overall_score
+            level_index = scores.level_index
+            freshness = scores.signal('freshness')
+        else:
+            values = list(scores.values())
+            overall = np.array([s.overall_score for s in values])
+            level_index = np.array([TRUST_LEVELS.index(s.trust_level) for s in values])
+            freshness = np.array([
+                min((sig.value for sig in s.signals if sig.signal_type == 'freshness'), default=1.0)
+                for s in values
+            ])
+        
+        counts = np.bincount(level_index, minlength=len(TRUST_LEVELS))
+        return {
+            'total': int(overall.size),
+            'average_trust': float(np.mean(overall)),
+            'median_trust': float(np.median(overall)),
+            'by_level': {level: int(count) for level, count in zip(TRUST_LEVELS, counts)},
+            'needs_review': int(np.count_nonzero(overall < 0.6)),
+            'needs_update': int(np.count_nonzero(freshness < 0.5))
         }
-        
-        return stats
 
 
 # Global instance
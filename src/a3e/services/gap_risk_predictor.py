@@ -4,8 +4,9 @@ Predicts likelihood of non-compliance at next review using multiple signals
 """
 
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass, field
+from itertools import chain
 from datetime import datetime, timedelta
 from enum import Enum
 import logging
@@ -69,6 +70,121 @@ class GapRiskScore:
         }
 
 
+FACTOR_NAMES: Tuple[str, ...] = (
+    'coverage', 'trust', 'staleness', 'task_debt',
+    'change_impact', 'review_history', 'complexity', 'volatility',
+)
+_LEVEL_ORDER: Tuple[RiskLevel, ...] = (
+    RiskLevel.CRITICAL, RiskLevel.HIGH, RiskLevel.MEDIUM, RiskLevel.LOW, RiskLevel.MINIMAL,
+)
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+
+def _ragged_mean(rows: Sequence[Sequence[float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-row mean of a ragged list-of-lists in one pass; returns (means, has_values)."""
+    n = len(rows)
+    lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=n)
+    flat = np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=int(lengths.sum()))
+    sums = np.bincount(np.repeat(np.arange(n), lengths), weights=flat, minlength=n)
+    has_values = lengths > 0
+    means = np.divide(sums, lengths, out=np.zeros(n), where=has_values)
+    return means, has_values
+
+
+@dataclass
+class GapRiskBatch:
+    """Columnar risk results for N standards.
+
+    All scoring happens in array form; ``RiskFactor``/``GapRiskScore`` objects
+    are only built when a caller asks for an explanation via ``score(i)``.
+    """
+    standard_ids: List[str]
+    factor_values: np.ndarray  # (N, 8) raw values in FACTOR_NAMES order
+    normalized: np.ndarray  # (N, 8) normalized 0-1 risks
+    contributions: np.ndarray  # (N, 8) weight * normalized
+    risk_score: np.ndarray  # (N,)
+    level_index: np.ndarray  # (N,) index into _LEVEL_ORDER
+    remediation_priority: np.ndarray  # (N,)
+    time_to_review: np.ndarray  # (N,)
+    confidence: np.ndarray  # (N,)
+    average_trust: np.ndarray  # (N,) mean evidence trust (0 when none)
+    weights: np.ndarray  # (8,)
+    _predictor: 'GapRiskPredictor' = field(repr=False, default=None)
+    _index: Optional[Dict[str, int]] = field(repr=False, default=None)
+
+    def __len__(self) -> int:
+        return len(self.standard_ids)
+
+    @staticmethod
+    def level_order() -> Tuple[RiskLevel, ...]:
+        return _LEVEL_ORDER
+
+    def risk_levels(self) -> List[RiskLevel]:
+        return [_LEVEL_ORDER[i] for i in self.level_index.tolist()]
+
+    def index_of(self, standard_id: str) -> Optional[int]:
+        if self._index is None:
+            self._index = {sid: i for i, sid in enumerate(self.standard_ids)}
+        return self._index.get(standard_id)
+
+    def factors(self, i: int) -> List[RiskFactor]:
+        values = self.factor_values[i]
+        norm = self.normalized[i]
+        contrib = self.contributions[i]
+        total_tasks = int(values[len(FACTOR_NAMES)])
+        descriptions = (
+            f"Evidence coverage: {values[0]:.1f}%",
+            f"Average evidence trust: {values[1]:.2f}",
+            f"Average evidence age: {values[2]:.0f} days",
+            f"Overdue tasks: {int(values[3])}/{total_tasks}",
+            f"Recent standard changes: {int(values[4])}",
+            f"Historical findings: {int(values[5])}",
+            "Standard complexity: moderate",
+            f"Update volatility: {'high' if norm[7] > 0.5 else 'low'}",
+        )
+        return [
+            RiskFactor(
+                factor_name=name,
+                value=float(values[k]),
+                normalized_value=float(norm[k]),
+                weight=float(self.weights[k]),
+                contribution=float(contrib[k]),
+                description=descriptions[k],
+            )
+            for k, name in enumerate(FACTOR_NAMES)
+        ]
+
+    def score(self, i: int) -> GapRiskScore:
+        """Materialize the full explainable score for row ``i``."""
+        factors = self.factors(i)
+        risk = float(self.risk_score[i])
+        predictor = self._predictor or gap_risk_predictor
+        return GapRiskScore(
+            standard_id=self.standard_ids[i],
+            risk_score=risk,
+            risk_level=_LEVEL_ORDER[int(self.level_index[i])],
+            factors=factors,
+            predicted_issues=predictor._predict_specific_issues(factors, risk),
+            remediation_priority=int(self.remediation_priority[i]),
+            time_to_review=int(self.time_to_review[i]),
+            confidence=float(self.confidence[i]),
+        )
+
+    def scores(self) -> List[GapRiskScore]:
+        return [self.score(i) for i in range(len(self))]
+
+    def to_columns(self) -> Dict[str, Any]:
+        """Compact columnar representation (no per-factor explanations)."""
+        return {
+            'standard_id': list(self.standard_ids),
+            'risk_score': np.round(self.risk_score, 3).tolist(),
+            'risk_level': [lvl.value for lvl in self.risk_levels()],
+            'remediation_priority': self.remediation_priority.tolist(),
+            'confidence': np.round(self.confidence, 3).tolist(),
+        }
+
+
 class GapRiskPredictor:
     """Predicts compliance gaps before they appear"""
     
@@ -245,6 +361,135 @@ class GapRiskPredictor:
             confidence=confidence
         )
     
+    def predict_risk_batch(
+        self,
+        standard_ids: Sequence[str],
+        coverage_percentage: ArrayLike,
+        evidence_trust_scores: Optional[Sequence[Sequence[float]]] = None,
+        evidence_ages_days: Optional[Sequence[Sequence[float]]] = None,
+        overdue_tasks_count: Optional[ArrayLike] = None,
+        total_tasks_count: Optional[ArrayLike] = None,
+        recent_changes_count: Optional[ArrayLike] = None,
+        historical_findings_count: Optional[ArrayLike] = None,
+        time_to_next_review_days: Optional[ArrayLike] = None,
+        evidence_update_frequency_days: Optional[ArrayLike] = None,
+        *,
+        average_trust: Optional[ArrayLike] = None,
+        average_age_days: Optional[ArrayLike] = None,
+    ) -> GapRiskBatch:
+        """
+        Vectorized equivalent of ``predict_risk`` for N standards in one array pass.
+
+        Per-standard trust scores and evidence ages may be given either as ragged
+        lists (``evidence_trust_scores``/``evidence_ages_days``) or as precomputed
+        means (``average_trust``/``average_age_days``, NaN meaning "no evidence").
+        Omitted count columns default to 0 and review horizon to 180 days.
+        """
+        n = len(standard_ids)
+
+        def _col(values: Optional[ArrayLike], default: float) -> np.ndarray:
+            if values is None:
+                return np.full(n, default, dtype=np.float64)
+            return np.asarray(values, dtype=np.float64).reshape(n)
+
+        coverage = _col(coverage_percentage, 0.0)
+        overdue = _col(overdue_tasks_count, 0)
+        total = _col(total_tasks_count, 0)
+        changes = _col(recent_changes_count, 0)
+        findings = _col(historical_findings_count, 0)
+        days = _col(time_to_next_review_days, 180)
+        freq = _col(evidence_update_frequency_days, np.nan)
+
+        if average_trust is not None:
+            avg_trust = _col(average_trust, np.nan)
+            has_trust = ~np.isnan(avg_trust)
+            avg_trust = np.where(has_trust, avg_trust, 0.0)
+        elif evidence_trust_scores is not None:
+            avg_trust, has_trust = _ragged_mean(evidence_trust_scores)
+        else:
+            avg_trust, has_trust = np.zeros(n), np.zeros(n, dtype=bool)
+
+        if average_age_days is not None:
+            avg_age = _col(average_age_days, np.nan)
+            avg_age = np.where(np.isnan(avg_age), 365.0, avg_age)
+        elif evidence_ages_days is not None:
+            avg_age, has_age = _ragged_mean(evidence_ages_days)
+            avg_age = np.where(has_age, avg_age, 365.0)
+        else:
+            avg_age = np.full(n, 365.0)
+
+        has_freq = ~np.isnan(freq) & (freq != 0)
+        freq_value = np.where(has_freq, freq, 0.0)
+
+        normalized = np.empty((n, len(FACTOR_NAMES)), dtype=np.float64)
+        normalized[:, 0] = 1.0 - coverage / 100.0
+        normalized[:, 1] = 1.0 - avg_trust
+        normalized[:, 2] = np.select(
+            [avg_age <= 90, avg_age <= 180, avg_age <= 365, avg_age <= 730], [0.0, 0.2, 0.4, 0.7], 0.9
+        )
+        normalized[:, 3] = np.minimum(1.0, overdue / np.maximum(total, 1) * 2)
+        normalized[:, 4] = np.select([changes == 0, changes <= 2, changes <= 5], [0.0, 0.3, 0.6], 0.9)
+        normalized[:, 5] = np.select([findings == 0, findings <= 2, findings <= 5], [0.1, 0.4, 0.7], 0.95)
+        normalized[:, 6] = 0.3
+        normalized[:, 7] = np.where(
+            has_freq,
+            np.select(
+                [freq_value <= 30, freq_value <= 90, freq_value <= 180, freq_value <= 365],
+                [0.7, 0.2, 0.3, 0.5],
+                0.8,
+            ),
+            0.2,
+        )
+
+        weights = np.array([self.weights[name] for name in FACTOR_NAMES], dtype=np.float64)
+        contributions = normalized * weights
+        raw_risk = contributions.sum(axis=1)
+
+        # Calibration (mirrors _calibrate_risk_score)
+        multiplier = np.select([days <= 30, days <= 90, days <= 180], [1.3, 1.15, 1.05], 1.0)
+        calibrated = 1 / (1 + np.exp(-10 * (raw_risk * multiplier - 0.5) / 1.5))
+        calibrated = np.minimum(0.95, 0.7 * calibrated + 0.3 * self.historical_base_rate)
+
+        thresholds = [self.risk_thresholds[level] for level in _LEVEL_ORDER[:-1]]
+        level_index = np.select(
+            [calibrated >= t for t in thresholds], list(range(len(thresholds))), len(thresholds)
+        ).astype(np.int8)
+
+        priority = np.select(
+            [
+                (calibrated > 0.7) & (days < 60),
+                (calibrated > 0.5) & (days < 90),
+                (calibrated > 0.5) | (days < 60),
+                calibrated > 0.3,
+            ],
+            [1, 2, 3, 4],
+            5,
+        ).astype(np.int8)
+
+        confidence = 0.7 + np.where(has_trust, avg_trust * 0.2, 0.0)
+        confidence = confidence + np.where(normalized.std(axis=1) < 0.2, 0.1, 0.0)
+        confidence = np.minimum(0.95, confidence)
+
+        # Raw factor values, plus total tasks as a trailing column for descriptions
+        factor_values = np.column_stack(
+            [coverage, avg_trust, avg_age, overdue, changes, findings, normalized[:, 6], freq_value, total]
+        )
+
+        return GapRiskBatch(
+            standard_ids=[str(s) for s in standard_ids],
+            factor_values=factor_values,
+            normalized=normalized,
+            contributions=contributions,
+            risk_score=calibrated,
+            level_index=level_index,
+            remediation_priority=priority,
+            time_to_review=days.astype(np.int64),
+            confidence=confidence,
+            average_trust=avg_trust,
+            weights=weights,
+            _predictor=self,
+        )
+
     def _calculate_staleness_risk(self, avg_age_days: float) -> float:
         """Calculate risk from evidence age using decay function"""
         # Exponential decay: risk increases as evidence gets older
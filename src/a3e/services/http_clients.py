@@ -0,0 +1,386 @@
+"""
+Process-wide outbound HTTP client registry.
+
+Service code used to open a fresh ``httpx.AsyncClient``/``httpx.Client``/
+``aiohttp.ClientSession`` per call, paying TCP + TLS setup every time. This
+registry hands out long-lived clients instead:
+
+- ``client(url)``: one ``httpx.AsyncClient`` per host (per event loop), with
+  that host's timeout, connection limits, keep-alive and HTTP/2 policy;
+- ``sync_client(url)``: the same for synchronous callers (thread-safe);
+- ``aiohttp_session(url)``: one ``aiohttp.ClientSession`` per host (per event
+  loop) with that host's policy; without a URL it returns a router that sends
+  each request through the session of the host it targets.
+
+Callers must not close what they get back; ``main.py``'s lifespan closes
+everything on shutdown via ``aclose()``. ``metrics()`` reports per-host pool
+utilisation (open/idle connections, in-flight and total requests) and, when
+prometheus_client is installed, mirrors it into gauges.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import Gauge  # type: ignore
+
+    HTTP_POOL_CONNECTIONS = Gauge(
+        "outbound_http_pool_connections", "Pooled outbound connections", ["host", "state"]
+    )
+    HTTP_POOL_IN_FLIGHT = Gauge(
+        "outbound_http_in_flight_requests", "Outbound requests awaiting a response", ["host"]
+    )
+except Exception:  # pragma: no cover - optional dependency / duplicate registration
+    HTTP_POOL_CONNECTIONS = None
+    HTTP_POOL_IN_FLIGHT = None
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    timeout: float = 30.0
+    connect_timeout: float = 10.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+
+
+DEFAULT_POLICY = HostPolicy()
+HOST_POLICIES: Dict[str, HostPolicy] = {
+    "api.openai.com": HostPolicy(timeout=60.0, max_connections=50, max_keepalive=20, http2=True),
+    "api.anthropic.com": HostPolicy(timeout=60.0, max_connections=50, max_keepalive=20, http2=True),
+    "login.microsoftonline.com": HostPolicy(timeout=15.0),
+    "graph.microsoft.com": HostPolicy(timeout=30.0, max_connections=30, http2=True),
+}
+
+
+def _host(url_or_host: str) -> str:
+    if "://" in url_or_host:
+        return (urlsplit(url_or_host).hostname or url_or_host).lower()
+    return url_or_host.lower()
+
+
+class _PoolStats:
+    __slots__ = ("requests", "errors", "in_flight", "peak_in_flight")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def start(self) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self, failed: bool) -> None:
+        self.in_flight -= 1
+        if failed:
+            self.errors += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _pool_connections(transport: Any) -> Tuple[int, int]:
+    """(open, idle) connections in an httpx transport's httpcore pool."""
+    pool = getattr(transport, "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    idle = 0
+    for conn in connections:
+        try:
+            idle += bool(conn.is_idle())
+        except Exception:
+            pass
+    return len(connections), idle
+
+
+class _MeteredAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncHTTPTransport, stats: _PoolStats):
+        self.inner = inner
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats.start()
+        failed = True
+        try:
+            response = await self.inner.handle_async_request(request)
+            failed = False
+            return response
+        finally:
+            self.stats.finish(failed)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class _MeteredSyncTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.HTTPTransport, stats: _PoolStats):
+        self.inner = inner
+        self.stats = stats
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.stats.start()
+        failed = True
+        try:
+            response = self.inner.handle_request(request)
+            failed = False
+            return response
+        finally:
+            with self._lock:
+                self.stats.finish(failed)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class HttpClientRegistry:
+    """Shared, per-host outbound HTTP clients."""
+
+    def __init__(self, policies: Optional[Dict[str, HostPolicy]] = None, default: HostPolicy = DEFAULT_POLICY):
+        self.policies = dict(HOST_POLICIES if policies is None else policies)
+        self.default = default
+        self._lock = threading.Lock()
+        # (host, loop id) -> (loop, client, pooled transport)
+        self._async: Dict[Tuple[str, int], Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient, Any]] = {}
+        self._sync: Dict[str, Tuple[httpx.Client, Any]] = {}
+        self._aiohttp: Dict[Tuple[str, int], Tuple[asyncio.AbstractEventLoop, Any]] = {}
+        self._stats: Dict[str, _PoolStats] = {}
+
+    def policy(self, url_or_host: str) -> HostPolicy:
+        return self.policies.get(_host(url_or_host), self.default)
+
+    def configure(self, host: str, **overrides: Any) -> HostPolicy:
+        """Override policy fields for a host (applies to clients created afterwards)."""
+        host = _host(host)
+        policy = replace(self.policies.get(host, self.default), **overrides)
+        self.policies[host] = policy
+        return policy
+
+    def _stats_for(self, key: str) -> _PoolStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _PoolStats()
+        return stats
+
+    @staticmethod
+    def _httpx_options(policy: HostPolicy) -> Dict[str, Any]:
+        return {
+            "limits": httpx.Limits(
+                max_connections=policy.max_connections,
+                max_keepalive_connections=policy.max_keepalive,
+                keepalive_expiry=policy.keepalive_expiry,
+            ),
+            "http2": policy.http2 and _HTTP2_AVAILABLE,
+        }
+
+    @staticmethod
+    def _timeout(policy: HostPolicy) -> httpx.Timeout:
+        return httpx.Timeout(policy.timeout, connect=policy.connect_timeout)
+
+    # -- httpx ---------------------------------------------------------
+    def client(self, url_or_host: str) -> httpx.AsyncClient:
+        """Shared async client for a host, bound to the running event loop."""
+        host = _host(url_or_host)
+        loop = asyncio.get_running_loop()
+        key = (host, id(loop))
+        with self._lock:
+            entry = self._async.get(key)
+            if entry is not None and entry[0] is loop and not entry[1].is_closed:
+                return entry[1]
+            self._drop_closed_loops()
+            policy = self.policy(host)
+            transport = _MeteredAsyncTransport(
+                httpx.AsyncHTTPTransport(**self._httpx_options(policy)), self._stats_for(host)
+            )
+            client = httpx.AsyncClient(transport=transport, timeout=self._timeout(policy))
+            self._async[key] = (loop, client, transport.inner)
+            return client
+
+    def sync_client(self, url_or_host: str) -> httpx.Client:
+        """Shared synchronous client for a host (httpx.Client is thread-safe)."""
+        host = _host(url_or_host)
+        with self._lock:
+            entry = self._sync.get(host)
+            if entry is not None and not entry[0].is_closed:
+                return entry[0]
+            policy = self.policy(host)
+            transport = _MeteredSyncTransport(
+                httpx.HTTPTransport(**self._httpx_options(policy)), self._stats_for(f"{host} (sync)")
+            )
+            client = httpx.Client(transport=transport, timeout=self._timeout(policy))
+            self._sync[host] = (client, transport.inner)
+            return client
+
+    @asynccontextmanager
+    async def borrow(self, url_or_host: str) -> AsyncIterator[httpx.AsyncClient]:
+        """Drop-in for ``async with httpx.AsyncClient() as client`` that leaves the pool open."""
+        yield self.client(url_or_host)
+
+    @contextmanager
+    def borrow_sync(self, url_or_host: str) -> Iterator[httpx.Client]:
+        yield self.sync_client(url_or_host)
+
+    def _drop_closed_loops(self) -> None:
+        # Clients of finished loops cannot be awaited closed; forget them
+        for key, (loop, _, _) in list(self._async.items()):
+            if loop.is_closed():
+                del self._async[key]
+        for key, (loop, _) in list(self._aiohttp.items()):
+            if loop.is_closed():
+                del self._aiohttp[key]
+
+    # -- aiohttp -------------------------------------------------------
+    def aiohttp_session(self, url_or_host: Optional[str] = None):
+        """Shared aiohttp session for a host, or a per-host router when no host is given."""
+        if url_or_host is None:
+            return _AiohttpRouter(self)
+        import aiohttp
+
+        host = _host(url_or_host)
+        loop = asyncio.get_running_loop()
+        key = (host, id(loop))
+        with self._lock:
+            entry = self._aiohttp.get(key)
+            if entry is not None and entry[0] is loop and not entry[1].closed:
+                return entry[1]
+            self._drop_closed_loops()
+            stats = self._stats_for(f"{host} (aiohttp)")
+            trace = aiohttp.TraceConfig()
+
+            async def on_start(session, ctx, params):
+                stats.start()
+
+            async def on_end(session, ctx, params):
+                stats.finish(False)
+
+            async def on_error(session, ctx, params):
+                stats.finish(True)
+
+            trace.on_request_start.append(on_start)
+            trace.on_request_end.append(on_end)
+            trace.on_request_exception.append(on_error)
+            policy = self.policy(host)
+            connector = aiohttp.TCPConnector(
+                limit=policy.max_connections,
+                limit_per_host=policy.max_connections,
+                keepalive_timeout=policy.keepalive_expiry,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=policy.timeout, connect=policy.connect_timeout),
+                trace_configs=[trace],
+            )
+            self._aiohttp[key] = (loop, session)
+            return session
+
+    # -- lifecycle / metrics -------------------------------------------
+    async def aclose(self) -> None:
+        with self._lock:
+            async_clients = [client for _, client, _ in self._async.values()]
+            sessions = [session for _, session in self._aiohttp.values()]
+            sync_clients = [client for client, _ in self._sync.values()]
+            self._async.clear()
+            self._aiohttp.clear()
+            self._sync.clear()
+        for client in async_clients:
+            try:
+                await client.aclose()
+            except Exception as e:  # clients of another loop cannot be closed here
+                logger.debug(f"HTTP client close skipped: {e}")
+        for session in sessions:
+            try:
+                await session.close()
+            except Exception as e:
+                logger.debug(f"aiohttp session close skipped: {e}")
+        for client in sync_clients:
+            client.close()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host pool utilisation: connections (open/idle/active) and request counters."""
+        with self._lock:
+            transports: Dict[str, list] = {}
+            for (host, _), (_, _, transport) in self._async.items():
+                transports.setdefault(host, []).append(transport)
+            for host, (_, transport) in self._sync.items():
+                transports.setdefault(f"{host} (sync)", []).append(transport)
+            sessions: Dict[str, list] = {}
+            for (host, _), (_, session) in self._aiohttp.items():
+                sessions.setdefault(f"{host} (aiohttp)", []).append(session)
+        report: Dict[str, Dict[str, Any]] = {}
+        for key, stats in list(self._stats.items()):
+            row: Dict[str, Any] = stats.as_dict()
+            open_, idle = 0, 0
+            for transport in transports.get(key, []):
+                o, i = _pool_connections(transport)
+                open_, idle = open_ + o, idle + i
+            for session in sessions.get(key, []):
+                connector = session.connector
+                pooled = getattr(connector, "_conns", {}) or {}
+                idle += sum(len(v) for v in pooled.values())
+                open_ += sum(len(v) for v in pooled.values()) + len(getattr(connector, "_acquired", ()) or ())
+            row.update({"open_connections": open_, "idle_connections": idle, "active_connections": open_ - idle})
+            if not key.endswith(("(sync)", "(aiohttp)")):
+                policy = self.policy(key)
+                row["max_connections"] = policy.max_connections
+                row["http2"] = policy.http2 and _HTTP2_AVAILABLE
+            report[key] = row
+            if HTTP_POOL_CONNECTIONS is not None:
+                HTTP_POOL_CONNECTIONS.labels(host=key, state="idle").set(idle)
+                HTTP_POOL_CONNECTIONS.labels(host=key, state="active").set(open_ - idle)
+                HTTP_POOL_IN_FLIGHT.labels(host=key).set(stats.in_flight)
+        return report
+
+
+class _AiohttpRouter:
+    """``ClientSession``-like facade that routes each request to its host's session."""
+
+    closed = False
+
+    def __init__(self, registry: HttpClientRegistry):
+        self._registry = registry
+
+    def request(self, method: str, url: Any, **kwargs: Any):
+        return self._registry.aiohttp_session(str(url)).request(method, url, **kwargs)
+
+    def get(self, url: Any, **kwargs: Any):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: Any, **kwargs: Any):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: Any, **kwargs: Any):
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: Any, **kwargs: Any):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: Any, **kwargs: Any):
+        return self.request("DELETE", url, **kwargs)
+
+
+_registry: Optional[HttpClientRegistry] = None
+
+
+def get_http_clients() -> HttpClientRegistry:
+    global _registry
+    if _registry is None:
+        _registry = HttpClientRegistry()
+    return _registry
@@ -0,0 +1,202 @@
+"""
+Hybrid lexical + dense retrieval with reciprocal rank fusion.
+
+Each leg ranks the same document list independently: ``BM25Index`` scores
+exact term overlap, and ``DenseIndex`` scores cosine similarity in an
+embedding space. ``HybridRetriever`` runs the legs concurrently and fuses
+their rankings with weighted reciprocal rank fusion::
+
+    score(d) = sum_leg weight_leg / (k + rank_leg(d))
+
+RRF needs no score normalisation between legs, so a document that is
+mid-ranked by both signals can beat one that only a single leg likes. Only
+the fused shortlist is handed to the (expensive) reranker.
+
+The default dense encoder is LSA (TF-IDF projected onto a truncated SVD) so
+the index can be built offline with no embedding provider. Any
+``texts -> array`` callable can be supplied instead.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Encoder = Callable[[Sequence[str]], np.ndarray]
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-retrieval")
+    return _executor
+
+
+class RetrievalLeg(Protocol):
+    """Ranks corpus positions for a query, best first."""
+
+    def search(self, query: str, top_k: int) -> List[Tuple[int, float]]: ...
+
+
+def _top_k(scores: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+    if top_k <= 0 or scores.size == 0:
+        return []
+    top_k = min(top_k, scores.size)
+    idx = np.argpartition(-scores, top_k - 1)[:top_k]
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return [(int(i), float(scores[i])) for i in idx if scores[i] > 0]
+
+
+class BM25Index:
+    """Okapi BM25 over a sparse term matrix; document weights are precomputed at build time."""
+
+    def __init__(self, corpus: Sequence[str], k1: float = 1.2, b: float = 0.75):
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        self.analyzer = CountVectorizer(stop_words="english", lowercase=True)
+        counts = self.analyzer.fit_transform(corpus).tocsc().astype(np.float64)
+        doc_len = np.asarray(counts.sum(axis=1)).ravel()
+        avg_len = doc_len.mean() if doc_len.size else 0.0
+        df = np.diff(counts.indptr)
+        n = counts.shape[0]
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+
+        # Per non-zero: idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avg))
+        weights = counts.tocoo()
+        norm = k1 * (1 - b + b * doc_len[weights.row] / max(avg_len, 1e-9))
+        weights.data = idf[weights.col] * weights.data * (k1 + 1) / (weights.data + norm)
+        self.weights = weights.tocsc()
+
+    def search(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        terms = self.analyzer.transform([query])
+        if terms.nnz == 0:
+            return []
+        scores = np.asarray((self.weights @ terms.T).todense()).ravel()
+        return _top_k(scores, top_k)
+
+
+class TfidfIndex:
+    """Cosine similarity over TF-IDF vectors (the pre-hybrid EvidenceMapper retriever)."""
+
+    def __init__(self, corpus: Sequence[str], **vectorizer_args):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.vectorizer = TfidfVectorizer(**(vectorizer_args or {"stop_words": "english"}))
+        self.matrix = self.vectorizer.fit_transform(corpus)
+
+    def search(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        # Rows are L2-normalised, so the dot product is the cosine
+        scores = np.asarray((self.matrix @ self.vectorizer.transform([query]).T).todense()).ravel()
+        return _top_k(scores, top_k)
+
+    def similarity(self, query: str, docs: Sequence[int]) -> np.ndarray:
+        """Cosine similarity of ``query`` to the given documents only."""
+        if not len(docs):
+            return np.zeros(0)
+        rows = self.matrix[np.asarray(docs, dtype=np.int64)]
+        return np.asarray((rows @ self.vectorizer.transform([query]).T).todense()).ravel()
+
+
+def lsa_encoder(corpus: Sequence[str], dimensions: int = 256) -> Encoder:
+    """Fit a TF-IDF + truncated-SVD projection on ``corpus`` and return its encoder."""
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True, ngram_range=(1, 2))
+    matrix = vectorizer.fit_transform(corpus)
+    svd = TruncatedSVD(n_components=max(1, min(dimensions, matrix.shape[0] - 1, matrix.shape[1] - 1)),
+                       random_state=0)
+    svd.fit(matrix)
+
+    def encode(texts: Sequence[str]) -> np.ndarray:
+        return svd.transform(vectorizer.transform(list(texts)))
+
+    return encode
+
+
+class DenseIndex:
+    """Cosine top-k over precomputed corpus embeddings."""
+
+    def __init__(self, corpus: Sequence[str], encoder: Encoder):
+        self.encoder = encoder
+        self.embeddings = self._normalise(np.asarray(encoder(list(corpus)), dtype=np.float32))
+
+    @staticmethod
+    def _normalise(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def search(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        query_vec = self._normalise(np.asarray(self.encoder([query]), dtype=np.float32))[0]
+        return _top_k(self.embeddings @ query_vec, top_k)
+
+
+def reciprocal_rank_fusion(
+    rankings: Mapping[str, Sequence[Tuple[int, float]]],
+    weights: Optional[Mapping[str, float]] = None,
+    k: float = 60.0,
+) -> List[Tuple[int, float]]:
+    """Weighted RRF over best-first rankings; ties keep first-seen order."""
+    fused: Dict[int, float] = {}
+    for leg, ranking in rankings.items():
+        weight = 1.0 if weights is None else weights.get(leg, 0.0)
+        if weight <= 0:
+            continue
+        for rank, (doc, _) in enumerate(ranking, start=1):
+            fused[doc] = fused.get(doc, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+@dataclass
+class HybridResult:
+    doc: int
+    score: float  # fused score scaled to [0, 1] (1 = ranked first by every weighted leg)
+    ranks: Dict[str, int] = field(default_factory=dict)
+
+
+class HybridRetriever:
+    """Run every leg's top-``depth`` search concurrently and fuse with weighted RRF."""
+
+    def __init__(
+        self,
+        legs: Mapping[str, RetrievalLeg],
+        weights: Optional[Mapping[str, float]] = None,
+        rrf_k: float = 60.0,
+        depth: int = 50,
+    ):
+        self.legs = dict(legs)
+        self.weights = {name: 1.0 for name in self.legs}
+        self.weights.update(weights or {})
+        self.rrf_k = rrf_k
+        self.depth = depth
+
+    def rankings(self, query: str) -> Dict[str, List[Tuple[int, float]]]:
+        active = [name for name in self.legs if self.weights.get(name, 0.0) > 0]
+        if not active:
+            return {}
+        # The first leg runs on the calling thread while the others run in the pool
+        futures = {name: _get_executor().submit(self.legs[name].search, query, self.depth)
+                   for name in active[1:]}
+        results = {active[0]: self.legs[active[0]].search(query, self.depth)}
+        for name, future in futures.items():
+            results[name] = future.result()
+        return results
+
+    def search(self, query: str, top_k: int) -> List[HybridResult]:
+        rankings = self.rankings(query)
+        best = sum(self.weights.get(name, 0.0) for name in rankings) / (self.rrf_k + 1) or 1.0
+        positions = {name: {doc: rank for rank, (doc, _) in enumerate(ranking, start=1)}
+                     for name, ranking in rankings.items()}
+        return [
+            HybridResult(doc=doc, score=score / best,
+                         ranks={name: pos[doc] for name, pos in positions.items() if doc in pos})
+            for doc, score in reciprocal_rank_fusion(rankings, self.weights, self.rrf_k)[:top_k]
+        ]
@@ -13,6 +13,8 @@ import logging
 from abc import ABC, abstractmethod
 
 from ..core.config import settings
+from .http_clients import get_http_clients
+from .integration_sync import ConnectorSyncEngine, DocumentHandler, SyncPage
 
 logger = logging.getLogger(__name__)
 # settings imported from config module
@@ -21,15 +23,25 @@ class BaseIntegrationService(ABC):
     """Base class for all integration services."""
     
     def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Explicitly assigned session, else the process-wide per-host keep-alive sessions."""
+        if self._session is not None and not self._session.closed:
+            return self._session
+        return get_http_clients().aiohttp_session()
+    
+    @session.setter
+    def session(self, value: Optional[aiohttp.ClientSession]) -> None:
+        self._session = value
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The shared session outlives the context; main.py's lifespan closes it
+        pass
     
     @abstractmethod
     async def authenticate(self) -> bool:
@@ -142,6 +154,43 @@ class CanvasLMSService(BaseIntegrationService):
             logger.error(f"Error getting courses: {e}")
             return []
     
+    async def _get_page(self, url: str, params: Optional[Dict[str, Any]] = None, etag: Optional[str] = None) -> SyncPage:
+        """Fetch one page, following Canvas ``Link: rel="next"`` pagination."""
+        headers = {'Authorization': f'Bearer {self.access_token}'}
+        if etag:
+            headers['If-None-Match'] = etag
+        async with self.session.get(url, headers=headers, params=params) as response:
+            if response.status == 304:
+                return SyncPage(etag=etag, not_modified=True)
+            response.raise_for_status()
+            next_link = response.links.get('next')
+            return SyncPage(
+                items=await response.json(),
+                next_token=str(next_link['url']) if next_link else None,
+                etag=response.headers.get('ETag'),
+            )
+    
+    async def get_courses_page(self, page_token: Optional[str] = None, etag: Optional[str] = None,
+                               enrollment_type: str = 'teacher') -> SyncPage:
+        """Get one page of courses; ``page_token`` is the next-page URL."""
+        if page_token:
+            return await self._get_page(page_token, etag=etag)
+        params = {'enrollment_type': enrollment_type, 'include[]': ['total_students', 'syllabus_body'], 'per_page': 100}
+        return await self._get_page(f"{self.api_base}/courses", params, etag)
+    
+    async def get_course_outcomes_page(self, course_id: Any, page_token: Optional[str] = None,
+                                       etag: Optional[str] = None) -> SyncPage:
+        if page_token:
+            return await self._get_page(page_token, etag=etag)
+        return await self._get_page(f"{self.api_base}/courses/{course_id}/outcome_groups", {'per_page': 100}, etag)
+    
+    async def get_assignments_page(self, course_id: Any, page_token: Optional[str] = None,
+                                   etag: Optional[str] = None) -> SyncPage:
+        if page_token:
+            return await self._get_page(page_token, etag=etag)
+        params = {'include[]': ['rubric', 'assignment_visibility'], 'per_page': 100}
+        return await self._get_page(f"{self.api_base}/courses/{course_id}/assignments", params, etag)
+    
     async def get_course_outcomes(self, course_id: int) -> List[Dict[str, Any]]:
         """Get learning outcomes for a specific course."""
         try:
@@ -284,6 +333,30 @@ class BannerSISService(BaseIntegrationService):
             return []
 
 
+    async def get_page(self, resource: str, page_token: Optional[int] = None, etag: Optional[str] = None,
+                       limit: int = 500) -> SyncPage:
+        """Get one offset/limit page of an Ethos resource (empty for the database method)."""
+        if not self.ethos_token:
+            return SyncPage()
+        offset = page_token or 0
+        headers = {'Authorization': f'Bearer {self.ethos_token}'}
+        if etag:
+            headers['If-None-Match'] = etag
+        params = {'offset': offset, 'limit': limit}
+        async with self.session.get(f"{self.ethos_base_url}/{resource}", headers=headers, params=params) as response:
+            if response.status == 304:
+                return SyncPage(etag=etag, not_modified=True)
+            response.raise_for_status()
+            items = await response.json()
+            total = response.headers.get('x-total-count')
+            has_more = offset + len(items) < int(total) if total else len(items) == limit
+            return SyncPage(
+                items=items,
+                next_token=offset + len(items) if has_more and items else None,
+                etag=response.headers.get('ETag'),
+            )
+
+
 class GoogleDriveService(BaseIntegrationService):
     """Google Drive integration service for document import and sync."""
     
@@ -538,6 +611,19 @@ class SharePointService(BaseIntegrationService):
             logger.error(f"Error getting documents: {e}")
             return []
     
+    async def get_drive_delta_page(self, site_id: str, link: Optional[str] = None) -> SyncPage:
+        """Get one page of drive changes; start from a saved delta link to fetch only changes."""
+        headers = {'Authorization': f'Bearer {self.access_token}'}
+        url = link or f"{self.base_url}/sites/{site_id}/drive/root/delta"
+        async with self.session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            data = await response.json()
+            return SyncPage(
+                items=data.get('value', []),
+                next_token=data.get('@odata.nextLink'),
+                delta_token=data.get('@odata.deltaLink'),
+            )
+    
     async def download_document(self, site_id: str, item_id: str) -> Optional[bytes]:
         """Download a document from SharePoint."""
         try:
@@ -644,10 +730,15 @@ class IntegrationManager:
         
         return results
     
-    async def sync_all_data(self) -> Dict[str, Any]:
-        """Sync data from all integrated systems."""
+    async def sync_all_data(self, on_document: Optional[DocumentHandler] = None, store=None) -> Dict[str, Any]:
+        """Incrementally sync all integrated systems.
+        
+        Connectors run concurrently; only items that are new or changed since
+        the previous sync are returned, and new documents are passed to
+        ``on_document`` as they are discovered.
+        """
         sync_results = {
-            'canvas': {'courses': [], 'outcomes': []},
+            'canvas': {'courses': [], 'outcomes': [], 'assignments': []},
             'banner': {'students': [], 'courses': []},
             'sharepoint': {'sites': [], 'documents': []},
             'google_drive': {'files': [], 'folders': []},
@@ -655,37 +746,12 @@ class IntegrationManager:
         }
         
         try:
-            # Sync Canvas data
-            async with self.canvas:
-                if await self.canvas.authenticate():
-                    courses = await self.canvas.get_courses()
-                    sync_results['canvas']['courses'] = courses
-                    
-                    # Get outcomes for each course
-                    for course in courses[:5]:  # Limit for demo
-                        outcomes = await self.canvas.get_course_outcomes(course['id'])
-                        sync_results['canvas']['outcomes'].extend(outcomes)
-            
-            # Sync Banner data
-            async with self.banner:
-                if await self.banner.authenticate():
-                    students = await self.banner.get_students()
-                    courses = await self.banner.get_courses()
-                    sync_results['banner']['students'] = students
-                    sync_results['banner']['courses'] = courses
-            
-            # Sync SharePoint data
-            async with self.sharepoint:
-                if await self.sharepoint.authenticate():
-                    sites = await self.sharepoint.get_sites()
-                    sync_results['sharepoint']['sites'] = sites
-                    
-                    # Get documents from first site
-                    if sites:
-                        site_id = sites[0]['id']
-                        documents = await self.sharepoint.get_site_documents(site_id)
-                        sync_results['sharepoint']['documents'] = documents
-        
+            engine = ConnectorSyncEngine(self, store=store, on_document=on_document)
+            results = await engine.sync()
+            for name in ('canvas', 'banner', 'sharepoint'):
+                sync_results[name].update(results.get(name) or {})
+            sync_results['errors'].extend(results['errors'])
+            sync_results['stats'] = results['stats']
         except Exception as e:
             sync_results['errors'].append(str(e))
             logger.error(f"Sync error: {e}")
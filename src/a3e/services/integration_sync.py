@@ -0,0 +1,418 @@
+"""
+Incremental sync engine for LMS, SIS and document connectors.
+
+``ConnectorSyncEngine`` runs every configured connector concurrently and,
+within a connector, fans per-course fetches out concurrently. Each provider
+gets its own ``ProviderLimiter`` (max in-flight requests plus a minimum
+spacing between request starts) so concurrency never exceeds what the
+upstream API tolerates.
+
+Connectors expose paged fetches returning ``SyncPage``. The engine follows
+``next_token`` until it is exhausted and persists per-source state in the
+user KV store (namespace ``integration_sync``):
+
+- ETags per page, sent back as ``If-None-Match`` so unchanged pages cost a
+  304 and no body,
+- the item ids seen on each page, so a 304 courses page can still drive the
+  per-course fan-out,
+- a fingerprint per item, so only new or changed items are reported,
+- delta links (SharePoint), so repeat syncs ask only for changes.
+
+New documents are pushed onto a bounded queue as they are discovered and
+handed to ``on_document`` by worker tasks, so analysis overlaps fetching.
+A document's fingerprint is recorded only once its handler succeeds; on
+failure the page ETag or delta link that reported it is dropped as well, so
+the next sync fetches it again. State is saved after the queue has drained.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .user_kv_store import UserKVStore, get_user_kv_store
+
+logger = logging.getLogger(__name__)
+
+SYNC_STATE_NAMESPACE = "integration_sync"
+_MAX_PAGES = int(os.getenv("INTEGRATION_SYNC_MAX_PAGES", "500"))
+_DOCUMENT_WORKERS = int(os.getenv("INTEGRATION_SYNC_DOCUMENT_WORKERS", "4"))
+
+# provider -> (max concurrent requests, min seconds between request starts)
+DEFAULT_PROVIDER_LIMITS: Dict[str, Tuple[int, float]] = {
+    "canvas": (8, 0.0),
+    "banner": (4, 0.0),
+    "sharepoint": (4, 0.05),
+}
+
+
+@dataclass
+class SyncPage:
+    """One page from a connector; ``not_modified`` means the ETag matched."""
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_token: Optional[Any] = None
+    etag: Optional[str] = None
+    not_modified: bool = False
+    delta_token: Optional[str] = None
+
+
+@dataclass
+class SyncedDocument:
+    """A new or changed document discovered by a connector."""
+
+    source: str
+    item_id: str
+    name: str
+    content: bytes
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    # Sync-state key whose fingerprint is committed once the handler succeeds
+    state_key: Optional[str] = None
+
+
+DocumentHandler = Callable[[SyncedDocument], Awaitable[Any]]
+
+
+def content_etag(items: Any) -> str:
+    """Weak ETag for connectors that do not provide one (mock/offline sources)."""
+    raw = json.dumps(items, sort_keys=True, default=str).encode("utf-8")
+    return 'W/"' + hashlib.sha1(raw).hexdigest() + '"'
+
+
+def item_fingerprint(item: Dict[str, Any]) -> str:
+    for key in ("updated_at", "lastModifiedDateTime", "cTag", "eTag"):
+        if item.get(key):
+            return str(item[key])
+    return hashlib.sha1(json.dumps(item, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ProviderLimiter:
+    """Bound in-flight requests and request rate for one provider."""
+
+    def __init__(self, max_concurrency: int, min_interval: float = 0.0):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._min_interval = min_interval
+        self._next_start = 0.0
+        self._spacing = asyncio.Lock()
+        self.requests = 0
+
+    async def __aenter__(self) -> "ProviderLimiter":
+        await self._semaphore.acquire()
+        if self._min_interval:
+            async with self._spacing:
+                now = time.monotonic()
+                wait = self._next_start - now
+                self._next_start = max(now, self._next_start) + self._min_interval
+            if wait > 0:
+                await asyncio.sleep(wait)
+        self.requests += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._semaphore.release()
+
+
+class _SourceState:
+    """Mutable view of one source's persisted sync state."""
+
+    def __init__(self, data: Optional[Dict[str, Any]]):
+        data = data or {}
+        self.pages: Dict[str, Dict[str, Any]] = data.get("pages", {})
+        self.seen: Dict[str, str] = data.get("seen", {})
+        self.delta: Dict[str, str] = data.get("delta", {})
+        self.stats = {"pages": 0, "not_modified": 0, "changed": 0, "unchanged": 0}
+        # Fingerprints waiting for their document handler, and what reported them
+        self._pending: Dict[str, str] = {}
+        self._cursors: Dict[str, Tuple[str, str]] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "seen": self.seen,
+            "delta": self.delta,
+            "synced_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def is_changed(self, key: str, item: Dict[str, Any], cursor: Tuple[str, str],
+                   defer: bool = False) -> bool:
+        """Whether ``item`` is new or changed; deferred fingerprints wait for ``commit``.
+
+        ``cursor`` is ``("pages", page cache key)`` or ``("delta", site id)``:
+        what to forget if a deferred item's handler fails.
+        """
+        fingerprint = item_fingerprint(item)
+        if self.seen.get(key) == fingerprint:
+            self.stats["unchanged"] += 1
+            return False
+        self.stats["changed"] += 1
+        if defer:
+            self._pending[key] = fingerprint
+            self._cursors[key] = cursor
+        else:
+            self.seen[key] = fingerprint
+        return True
+
+    def commit(self, key: str) -> None:
+        fingerprint = self._pending.pop(key, None)
+        self._cursors.pop(key, None)
+        if fingerprint is not None:
+            self.seen[key] = fingerprint
+
+    def retry(self, key: str) -> None:
+        """Leave ``key`` unseen and make the next sync fetch it again."""
+        self._pending.pop(key, None)
+        cursor = self._cursors.pop(key, None)
+        if cursor is not None:
+            kind, name = cursor
+            (self.pages if kind == "pages" else self.delta).pop(name, None)
+
+
+class ConnectorSyncEngine:
+    """Concurrent, incremental sync across an integration manager's connectors."""
+
+    def __init__(
+        self,
+        manager: Any,
+        store: Optional[UserKVStore] = None,
+        on_document: Optional[DocumentHandler] = None,
+        provider_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+        document_workers: int = _DOCUMENT_WORKERS,
+    ):
+        self.manager = manager
+        self.store = store or get_user_kv_store()
+        self.on_document = on_document
+        self.provider_limits = dict(DEFAULT_PROVIDER_LIMITS)
+        self.provider_limits.update(provider_limits or {})
+        self.limiters: Dict[str, ProviderLimiter] = {}
+        self.document_workers = document_workers
+        self._documents: Optional[asyncio.Queue] = None
+        self._states: Dict[str, _SourceState] = {}
+        self.documents_emitted = 0
+
+    # ------------------------------------------------------------------
+    # Orchestration
+    # ------------------------------------------------------------------
+    async def sync(self) -> Dict[str, Any]:
+        results: Dict[str, Any] = {"errors": [], "stats": {}}
+        # Built per run so asyncio primitives belong to the running loop
+        self.limiters = {name: ProviderLimiter(*limit) for name, limit in self.provider_limits.items()}
+        connectors = [
+            (name, runner)
+            for name, runner in (
+                ("canvas", self._sync_canvas),
+                ("banner", self._sync_banner),
+                ("sharepoint", self._sync_sharepoint),
+            )
+            if getattr(self.manager, name, None) is not None
+        ]
+        self._documents = asyncio.Queue(maxsize=max(1, self.document_workers) * 4)
+        self._states = {}
+        workers = [asyncio.create_task(self._document_worker()) for _ in range(max(1, self.document_workers))]
+        try:
+            outcomes = await asyncio.gather(
+                *(self._run_connector(name, runner) for name, runner in connectors),
+                return_exceptions=True,
+            )
+            completed = []
+            for (name, _), outcome in zip(connectors, outcomes):
+                if isinstance(outcome, BaseException):
+                    results["errors"].append(f"{name}: {outcome}")
+                    logger.error(f"{name} sync failed: {outcome}")
+                    continue
+                data, stats = outcome
+                results[name] = data
+                results["stats"][name] = stats
+                if name in self._states:
+                    completed.append(name)
+            # Handlers commit or retry their fingerprints; only then is state saved
+            await self._documents.join()
+            for name in completed:
+                self.store.put(SYNC_STATE_NAMESPACE, name, self._states[name].to_dict())
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        results["stats"]["documents"] = self.documents_emitted
+        return results
+
+    async def _run_connector(self, name: str, runner: Callable[[Any, _SourceState], Awaitable[Dict[str, Any]]]):
+        service = getattr(self.manager, name)
+        async with contextlib.AsyncExitStack() as stack:
+            if hasattr(service, "__aenter__"):
+                await stack.enter_async_context(service)
+            if not await service.authenticate():
+                return {}, {"skipped": "not authenticated"}
+            state = _SourceState(self.store.get(SYNC_STATE_NAMESPACE, name))
+            data = await runner(service, state)
+            self._states[name] = state
+            return data, state.stats
+
+    async def _emit(self, state: _SourceState, document: SyncedDocument) -> None:
+        if self.on_document is None or self._documents is None:
+            if document.state_key:
+                state.commit(document.state_key)
+            return
+        self.documents_emitted += 1
+        await self._documents.put((state, document))
+
+    async def _document_worker(self) -> None:
+        assert self._documents is not None
+        while True:
+            state, document = await self._documents.get()
+            try:
+                await self.on_document(document)
+            except Exception as e:
+                logger.error(f"Synced document {document.source}:{document.item_id} failed analysis: {e}")
+                if document.state_key:
+                    state.retry(document.state_key)
+            else:
+                if document.state_key:
+                    state.commit(document.state_key)
+            finally:
+                self._documents.task_done()
+
+    async def _paginate(
+        self,
+        provider: str,
+        state: _SourceState,
+        page_key: str,
+        fetch: Callable[[Optional[Any], Optional[str]], Awaitable[SyncPage]],
+        defer: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Follow a paged listing; returns (changed items, ids of every item).
+
+        With ``defer`` the caller commits each changed item's fingerprint
+        (``_SourceState.commit``) once it has been handled.
+        """
+        changed: List[Dict[str, Any]] = []
+        ids: List[str] = []
+        token: Optional[Any] = None
+        for index in range(_MAX_PAGES):
+            key = f"{page_key}#{index}"
+            cached = state.pages.get(key, {})
+            async with self.limiters[provider]:
+                page = await fetch(token, cached.get("etag"))
+            state.stats["pages"] += 1
+            if page.not_modified and cached:
+                state.stats["not_modified"] += 1
+                ids.extend(cached.get("ids", []))
+                token = cached.get("next")
+            else:
+                page_ids = [str(item.get("id")) for item in page.items]
+                for item, item_id in zip(page.items, page_ids):
+                    if state.is_changed(f"{page_key}:{item_id}", item, ("pages", key), defer):
+                        changed.append(item)
+                ids.extend(page_ids)
+                state.pages[key] = {"etag": page.etag, "ids": page_ids, "next": page.next_token}
+                token = page.next_token
+            if token is None:
+                break
+        return changed, ids
+
+    # ------------------------------------------------------------------
+    # Connectors
+    # ------------------------------------------------------------------
+    async def _sync_canvas(self, canvas: Any, state: _SourceState) -> Dict[str, Any]:
+        courses, course_ids = await self._paginate("canvas", state, "courses", canvas.get_courses_page, defer=True)
+        for course in courses:
+            key = f"courses:{course.get('id')}"
+            if not course.get("syllabus_body"):
+                state.commit(key)
+                continue
+            await self._emit(state, SyncedDocument(
+                source="canvas",
+                item_id=f"course-{course['id']}-syllabus",
+                name=f"{course.get('course_code') or course['id']} syllabus.html",
+                content=course["syllabus_body"].encode("utf-8"),
+                metadata={"course_id": course["id"], "course_name": course.get("name")},
+                state_key=key,
+            ))
+
+        async def per_course(course_id: str):
+            outcomes, _ = await self._paginate(
+                "canvas", state, f"courses/{course_id}/outcomes",
+                lambda token, etag: canvas.get_course_outcomes_page(course_id, token, etag),
+            )
+            assignments, _ = await self._paginate(
+                "canvas", state, f"courses/{course_id}/assignments",
+                lambda token, etag: canvas.get_assignments_page(course_id, token, etag),
+            )
+            return outcomes, assignments
+
+        per_course_results = await asyncio.gather(*(per_course(cid) for cid in course_ids))
+        return {
+            "courses": courses,
+            "outcomes": [o for outcomes, _ in per_course_results for o in outcomes],
+            "assignments": [a for _, assignments in per_course_results for a in assignments],
+        }
+
+    async def _sync_banner(self, banner: Any, state: _SourceState) -> Dict[str, Any]:
+        (students, _), (courses, _) = await asyncio.gather(
+            self._paginate("banner", state, "students",
+                           lambda token, etag: banner.get_page("student-enrollments", token, etag)),
+            self._paginate("banner", state, "courses",
+                           lambda token, etag: banner.get_page("courses", token, etag)),
+        )
+        return {"students": students, "courses": courses}
+
+    async def _sync_sharepoint(self, sharepoint: Any, state: _SourceState) -> Dict[str, Any]:
+        async with self.limiters["sharepoint"]:
+            sites = await sharepoint.get_sites()
+
+        async def per_site(site: Dict[str, Any]) -> List[Dict[str, Any]]:
+            site_id = site["id"]
+            link: Optional[str] = state.delta.get(site_id)
+            changed: List[Dict[str, Any]] = []
+            for _ in range(_MAX_PAGES):
+                async with self.limiters["sharepoint"]:
+                    page = await sharepoint.get_drive_delta_page(site_id, link)
+                state.stats["pages"] += 1
+                for item in page.items:
+                    if "deleted" in item:
+                        state.seen.pop(f"{site_id}:{item.get('id')}", None)
+                        continue
+                    if "file" in item and state.is_changed(f"{site_id}:{item.get('id')}", item,
+                                                           ("delta", site_id), defer=True):
+                        changed.append(item)
+                if page.delta_token:
+                    state.delta[site_id] = page.delta_token
+                if not page.next_token:
+                    break
+                link = page.next_token
+            await asyncio.gather(*(self._download_and_emit(state, sharepoint, site_id, item) for item in changed))
+            return changed
+
+        documents = await asyncio.gather(*(per_site(site) for site in sites))
+        return {"sites": sites, "documents": [d for site_docs in documents for d in site_docs]}
+
+    async def _download_and_emit(self, state: _SourceState, sharepoint: Any, site_id: str,
+                                 item: Dict[str, Any]) -> None:
+        key = f"{site_id}:{item.get('id')}"
+        if self.on_document is None:
+            state.commit(key)
+            return
+        try:
+            async with self.limiters["sharepoint"]:
+                content = await sharepoint.download_document(site_id, item["id"])
+        except Exception:
+            state.retry(key)
+            raise
+        if not content:
+            state.commit(key)
+            return
+        await self._emit(state, SyncedDocument(
+            source="sharepoint",
+            item_id=item["id"],
+            name=item.get("name") or item["id"],
+            content=content,
+            metadata={"site_id": site_id, "web_url": item.get("webUrl")},
+            state_key=key,
+        ))
@@ -12,8 +12,9 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 import os
 
-import httpx
 from ..core.config import Settings
+from ..core.instrumentation import timed_stage
+from .http_clients import get_http_clients
 
 # Optional AWS imports
 try:  # Optional AWS
@@ -82,6 +83,7 @@ class LLMService:
         if self.settings.anthropic_api_key:
             logger.info("✅ Anthropic HTTP enabled")
     
+    @timed_stage("llm")
     async def generate_response(
         self,
         prompt: str,
@@ -219,8 +221,10 @@ class LLMService:
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
+        async with get_http_clients().borrow("https://api.openai.com") as client:
+            resp = await client.post(
+                "https://api.openai.com/v1/chat/completions", headers=headers, json=payload, timeout=30.0
+            )
             resp.raise_for_status()
             data = resp.json()
             content = data["choices"][0]["message"]["content"]
@@ -268,7 +272,7 @@ class LLMService:
                     }
                 ],
             }
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with get_http_clients().borrow("https://api.anthropic.com") as client:
                 resp = await client.post(
                     "https://api.anthropic.com/v1/messages",
                     headers=headers,
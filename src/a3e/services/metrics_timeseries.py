@@ -1,73 +1,391 @@
+"""
+Append-only, downsampled storage for dashboard metrics snapshots.
+
+Series are keyed by (tenant, accreditor). Each key owns a directory of
+fixed-width binary segment files, one family per resolution:
+
+    data/metrics_timeseries/<tenant-hash>/<ACCREDITOR>/raw-202510.bin
+                                                      hourly-202510.bin
+                                                      daily-2025.bin
+                                                      weekly-2025.bin
+
+Records are sorted by an epoch-seconds timestamp, so range queries only
+open the segments overlapping the window and binary-search inside them.
+Every raw append also folds the point into the hourly/daily/weekly rollups,
+and whole segments are dropped once they age past their resolution's
+retention. Writers take an exclusive ``flock`` per key so multiple Gunicorn
+workers can snapshot concurrently; readers take a shared one so they never
+see a rollup record half-rewritten.
+
+The old whole-file JSON store had no tenant, so it is imported once into the
+global series. Tenant reads fall back to that history for anything older
+than the tenant's own first point.
+"""
+
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
+import hashlib
 import json
+import mmap
+import os
+import struct
 import threading
+import time
+
+try:  # POSIX advisory locks; on other platforms we rely on the in-process lock only
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+_LOCK = threading.RLock()
+_DATA_DIR = Path(__file__).resolve().parents[3] / 'data'
+_ROOT = Path(os.getenv('METRICS_TIMESERIES_DIR', str(_DATA_DIR / 'metrics_timeseries')))
+_LEGACY_FILE_PATH = _DATA_DIR / 'metrics_timeseries.json'
+_GLOBAL_TENANT = 'global'
+
+# t, samples, coverage_percentage, compliance_score, average_trust, average_risk,
+# documents_analyzed, standards_mapped, total_standards
+_RECORD = struct.Struct('<qIddddIII')
+_FLOAT_FIELDS = ('coverage_percentage', 'compliance_score', 'average_trust', 'average_risk')
+_INT_FIELDS = ('documents_analyzed', 'standards_mapped', 'total_standards')
+
+_HOUR = 3600
+_DAY = 24 * _HOUR
+_WEEK = 7 * _DAY
+
+# resolution -> (bucket seconds, segment period, retention seconds)
+_RESOLUTIONS: Dict[str, Tuple[int, str, int]] = {
+    'raw': (0, 'month', int(os.getenv('METRICS_RETENTION_RAW_DAYS', '90')) * _DAY),
+    'hourly': (_HOUR, 'month', int(os.getenv('METRICS_RETENTION_HOURLY_DAYS', '180')) * _DAY),
+    'daily': (_DAY, 'year', int(os.getenv('METRICS_RETENTION_DAILY_DAYS', str(5 * 365))) * _DAY),
+    'weekly': (_WEEK, 'year', int(os.getenv('METRICS_RETENTION_WEEKLY_DAYS', str(10 * 365))) * _DAY),
+}
+_ROLLUPS = ('hourly', 'daily', 'weekly')
+
+
+# ------------------------------------------------------------------
+# Keys, paths and time helpers
+# ------------------------------------------------------------------
+def _tenant_dir(tenant: Optional[str]) -> str:
+    if not tenant:
+        return _GLOBAL_TENANT
+    return hashlib.sha256(str(tenant).encode('utf-8')).hexdigest()[:16]
+
+
+def _key_dir(tenant: Optional[str], accreditor: str) -> Path:
+    safe = ''.join(ch for ch in accreditor if ch.isalnum() or ch in '-_') or 'GLOBAL'
+    return _ROOT / _tenant_dir(tenant) / safe
+
+
+def _now_epoch() -> int:
+    return int(time.time())
+
+
+def _to_epoch(ts: Any) -> Optional[int]:
+    if isinstance(ts, (int, float)):
+        return int(ts)
+    if isinstance(ts, datetime):
+        dt = ts
+    elif isinstance(ts, str) and ts:
+        try:
+            dt = datetime.fromisoformat(ts[:-1] + '+00:00' if ts.endswith('Z') else ts)
+        except ValueError:
+            return None
+    else:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
 
-_LOCK = threading.Lock()
-_STORE: Dict[str, List[Dict[str, Any]]] = {}
-_FILE_PATH = Path(__file__).resolve().parents[3] / 'data' / 'metrics_timeseries.json'
-_MAX_PER_ACCREDITOR = 365  # retain last N snapshots per accreditor
+def _to_iso(epoch: int) -> str:
+    return datetime.utcfromtimestamp(epoch).isoformat()
+
+
+def _bucket_start(epoch: int, resolution: str) -> int:
+    width = _RESOLUTIONS[resolution][0]
+    if resolution == 'weekly':
+        # Weeks start on Monday 00:00 UTC (the epoch was a Thursday)
+        day = epoch // _DAY
+        return (day - (day + 3) % 7) * _DAY
+    return epoch - epoch % width if width else epoch
+
+
+def _segment_name(epoch: int, resolution: str) -> str:
+    dt = datetime.utcfromtimestamp(epoch)
+    period = dt.strftime('%Y%m') if _RESOLUTIONS[resolution][1] == 'month' else dt.strftime('%Y')
+    return f'{resolution}-{period}.bin'
+
+
+def _segment_bounds(name: str) -> Tuple[int, int]:
+    """Return the [start, end) epoch range covered by a segment filename."""
+    period = name.rsplit('-', 1)[-1].split('.', 1)[0]
+    if len(period) == 6:
+        year, month = int(period[:4]), int(period[4:])
+        start = datetime(year, month, 1, tzinfo=timezone.utc)
+        end = datetime(year + (month == 12), month % 12 + 1, 1, tzinfo=timezone.utc)
+    else:
+        year = int(period)
+        start = datetime(year, 1, 1, tzinfo=timezone.utc)
+        end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def _segments(key_dir: Path, resolution: str) -> List[Path]:
+    if not key_dir.exists():
+        return []
+    return sorted(p for p in key_dir.glob(f'{resolution}-*.bin'))
+
+
+class _KeyLock:
+    """In-process + cross-process lock for one series key (shared for readers)."""
+
+    def __init__(self, key_dir: Path, shared: bool = False):
+        self._path = key_dir / '.lock'
+        self._fh = None
+        self._mode = getattr(fcntl, 'LOCK_SH' if shared else 'LOCK_EX', None)
+
+    def __enter__(self) -> '_KeyLock':
+        _LOCK.acquire()
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self._path, 'a+b')
+            if fcntl is not None:
+                fcntl.flock(self._fh.fileno(), self._mode)
+        except Exception:
+            _LOCK.release()
+            raise
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        try:
+            if self._fh is not None:
+                if fcntl is not None:
+                    fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+                self._fh.close()
+        finally:
+            _LOCK.release()
+
+
+# ------------------------------------------------------------------
+# Segment record I/O
+# ------------------------------------------------------------------
+def _pack(t: int, samples: int, values: Dict[str, Any]) -> bytes:
+    return _RECORD.pack(
+        int(t),
+        int(samples),
+        *(float(values.get(f, 0.0) or 0.0) for f in _FLOAT_FIELDS),
+        *(max(0, int(values.get(f, 0) or 0)) for f in _INT_FIELDS),
+    )
+
+
+def _unpack(buf: Any, offset: int = 0) -> Tuple[int, int, Dict[str, Any]]:
+    rec = _RECORD.unpack_from(buf, offset)
+    values: Dict[str, Any] = dict(zip(_FLOAT_FIELDS, rec[2:6]))
+    values.update(zip(_INT_FIELDS, rec[6:9]))
+    return rec[0], rec[1], values
+
+
+def _bisect(buf: Any, count: int, t: int) -> int:
+    """Index of the first record whose timestamp is >= t."""
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if struct.unpack_from('<q', buf, mid * _RECORD.size)[0] < t:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
 
 
-def _ensure_loaded() -> None:
-    global _STORE
-    if _STORE:
+def _read_range(path: Path, start: int, end: int) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    size = path.stat().st_size if path.exists() else 0
+    count = size // _RECORD.size
+    if not count:
         return
-    try:
-        if _FILE_PATH.exists():
-            data = json.loads(_FILE_PATH.read_text(encoding='utf-8'))
-            if isinstance(data, dict):
-                _STORE = {str(k): list(v) for k, v in data.items() if isinstance(v, list)}
-    except Exception:
-        _STORE = {}
+    with path.open('rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        i = _bisect(mm, count, start)
+        while i < count:
+            rec = _unpack(mm, i * _RECORD.size)
+            if rec[0] >= end:
+                break
+            yield rec
+            i += 1
 
 
-def _persist() -> None:
-    try:
-        _FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with _FILE_PATH.open('w', encoding='utf-8') as f:
-            json.dump(_STORE, f, ensure_ascii=False)
-    except Exception:
-        # Silent failure acceptable for non-critical telemetry persistence
-        pass
+def _last_record(path: Path) -> Optional[Tuple[int, int, Dict[str, Any]]]:
+    size = path.stat().st_size if path.exists() else 0
+    count = size // _RECORD.size
+    if not count:
+        return None
+    with path.open('rb') as fh:
+        fh.seek((count - 1) * _RECORD.size)
+        return _unpack(fh.read(_RECORD.size))
+
+
+def _insert_sorted(path: Path, t: int, record: bytes, merge_equal: bool) -> Optional[int]:
+    """Place ``record`` in timestamp order.
+
+    The common case (t at or after the last record) is an append or, when
+    ``merge_equal`` is set and the last record shares the timestamp, an
+    in-place overwrite. Out-of-order points rewrite the segment atomically.
+    Returns the byte offset of an existing equal-timestamp record when
+    ``merge_equal`` is set and one exists, so the caller can merge into it.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    size = path.stat().st_size if path.exists() else 0
+    count = size // _RECORD.size
+    last_t = None
+    if count:
+        with path.open('rb') as fh:
+            fh.seek((count - 1) * _RECORD.size)
+            last_t = struct.unpack('<q', fh.read(8))[0]
+    if last_t is None or t > last_t or (t == last_t and not merge_equal):
+        with path.open('ab') as fh:
+            fh.write(record)
+        return None
+    data = bytearray(path.read_bytes()[: count * _RECORD.size])
+    idx = _bisect(data, count, t)
+    if merge_equal and idx < count and struct.unpack_from('<q', data, idx * _RECORD.size)[0] == t:
+        return idx * _RECORD.size
+    if not merge_equal:
+        idx = _bisect(data, count, t + 1)
+    data[idx * _RECORD.size:idx * _RECORD.size] = record
+    tmp = path.with_suffix('.tmp')
+    tmp.write_bytes(bytes(data))
+    os.replace(tmp, path)
+    return None
+
+
+def _fold_into_rollup(key_dir: Path, resolution: str, t: int, values: Dict[str, Any]) -> None:
+    bucket = _bucket_start(t, resolution)
+    path = key_dir / _segment_name(bucket, resolution)
+    offset = _insert_sorted(path, bucket, _pack(bucket, 1, values), merge_equal=True)
+    if offset is None:
+        return
+    with path.open('r+b') as fh:
+        fh.seek(offset)
+        _, samples, prev = _unpack(fh.read(_RECORD.size))
+        merged: Dict[str, Any] = {
+            f: (prev[f] * samples + float(values.get(f, 0.0) or 0.0)) / (samples + 1) for f in _FLOAT_FIELDS
+        }
+        # Counters are gauges of cumulative totals; keep the most recent reading
+        merged.update({f: values.get(f, prev[f]) for f in _INT_FIELDS})
+        fh.seek(offset)
+        fh.write(_pack(bucket, samples + 1, merged))
+
+
+def _prune(key_dir: Path, now: int) -> None:
+    for resolution, (_, _, retention) in _RESOLUTIONS.items():
+        for seg in _segments(key_dir, resolution):
+            if _segment_bounds(seg.name)[1] < now - retention:
+                try:
+                    seg.unlink()
+                except OSError:
+                    pass
+
+
+def _append(tenant: Optional[str], key: str, t: int, values: Dict[str, Any]) -> None:
+    key_dir = _key_dir(tenant, key)
+    _insert_sorted(key_dir / _segment_name(t, 'raw'), t, _pack(t, 1, values), merge_equal=False)
+    for resolution in _ROLLUPS:
+        _fold_into_rollup(key_dir, resolution, t, values)
+    _prune(key_dir, _now_epoch())
+
+
+def _first_raw_epoch(tenant: Optional[str], key: str) -> Optional[int]:
+    for seg in _segments(_key_dir(tenant, key), 'raw'):
+        if seg.stat().st_size >= _RECORD.size:
+            with seg.open('rb') as fh:
+                return struct.unpack('<q', fh.read(8))[0]
+    return None
 
 
-def _now_iso() -> str:
-    return datetime.utcnow().isoformat()
+def _last_raw(tenant: Optional[str], key: str) -> Optional[Tuple[int, int, Dict[str, Any]]]:
+    segs = _segments(_key_dir(tenant, key), 'raw')
+    for seg in reversed(segs):
+        rec = _last_record(seg)
+        if rec:
+            return rec
+    return None
 
 
-def _parse_iso(ts: str) -> Optional[datetime]:
+def _to_snapshot(key: str, rec: Tuple[int, int, Dict[str, Any]], resolution: str) -> Dict[str, Any]:
+    t, samples, values = rec
+    snap: Dict[str, Any] = {"timestamp": _to_iso(t), "accreditor": key}
+    snap.update(values)
+    if resolution != 'raw':
+        snap["resolution"] = resolution
+        snap["samples"] = samples
+    return snap
+
+
+# ------------------------------------------------------------------
+# Legacy JSON import
+# ------------------------------------------------------------------
+_legacy_checked = False
+
+
+def _ensure_legacy_imported() -> None:
+    """Import the old whole-file JSON store once into the global tenant."""
+    global _legacy_checked
+    if _legacy_checked:
+        return
+    _legacy_checked = True
+    marker = _ROOT / '.legacy_imported'
+    if marker.exists() or not _LEGACY_FILE_PATH.exists():
+        return
     try:
-        return datetime.fromisoformat(ts)
+        data = json.loads(_LEGACY_FILE_PATH.read_text(encoding='utf-8'))
     except Exception:
-        return None
+        return
+    if not isinstance(data, dict):
+        return
+    with _KeyLock(_ROOT):
+        if marker.exists():
+            return
+        for key, series in data.items():
+            if not isinstance(series, list):
+                continue
+            key = str(key).upper()
+            with _KeyLock(_key_dir(None, key)):
+                for snap in sorted(series, key=lambda s: str(s.get('timestamp', ''))):
+                    t = _to_epoch(snap.get('timestamp'))
+                    if t is not None:
+                        _append(None, key, t, snap)
+        marker.write_text(_to_iso(_now_epoch()), encoding='utf-8')
 
 
+# ------------------------------------------------------------------
+# Public API
+# ------------------------------------------------------------------
 def maybe_snapshot(
     accreditor: str,
     payload: Dict[str, Any],
     *,
+    tenant: Optional[str] = None,
     min_interval_hours: int = 6,
     force: bool = False,
 ) -> Dict[str, Any]:
     """Store a metrics snapshot, throttled by min_interval_hours unless force=True.
 
     Payload expected keys: coverage_percentage, compliance_score, average_trust, average_risk,
-    documents_analyzed, standards_mapped, total_standards. Additional keys are preserved.
+    documents_analyzed, standards_mapped, total_standards. Snapshots are scoped to ``tenant``
+    (None means the shared/global series).
     """
-    _ensure_loaded()
-    with _LOCK:
-        key = (accreditor or 'GLOBAL').upper()
-        series = _STORE.setdefault(key, [])
-        if series and not force:
-            last_ts = _parse_iso(series[-1].get('timestamp', '') or _now_iso())
-            if last_ts and datetime.utcnow() - last_ts < timedelta(hours=min_interval_hours):
-                return {"stored": False, "reason": "throttled", "last_timestamp": series[-1].get('timestamp')}
+    _ensure_legacy_imported()
+    key = (accreditor or 'GLOBAL').upper()
+    now = _now_epoch()
+    t = _to_epoch(payload.get('timestamp')) or now
+    with _KeyLock(_key_dir(tenant, key)):
+        last = _last_raw(tenant, key)
+        if last and not force and now - last[0] < min_interval_hours * _HOUR:
+            return {"stored": False, "reason": "throttled", "last_timestamp": _to_iso(last[0])}
         snap = {
-            "timestamp": payload.get('timestamp') or _now_iso(),
+            "timestamp": _to_iso(t),
             "accreditor": key,
             "coverage_percentage": float(payload.get('coverage_percentage', 0.0)),
             "compliance_score": float(payload.get('compliance_score', 0.0)),
@@ -77,43 +395,85 @@ def maybe_snapshot(
             "standards_mapped": int(payload.get('standards_mapped', 0)),
             "total_standards": int(payload.get('total_standards', 0)),
         }
-        series.append(snap)
-        # Enforce per-accreditor max length
-        if len(series) > _MAX_PER_ACCREDITOR:
-            _STORE[key] = series[-_MAX_PER_ACCREDITOR:]
-        _persist()
+        _append(tenant, key, t, snap)
         return {"stored": True, "snapshot": snap}
 
 
-def get_series(accreditor: Optional[str] = None, days: int = 30, limit: int = 200) -> List[Dict[str, Any]]:
+def _pick_resolution(days: int) -> str:
+    for resolution in ('raw', 'hourly', 'daily'):
+        if days * _DAY <= _RESOLUTIONS[resolution][2]:
+            return resolution
+    return 'weekly'
+
+
+def get_series(
+    accreditor: Optional[str] = None,
+    days: int = 30,
+    limit: int = 200,
+    *,
+    tenant: Optional[str] = None,
+    resolution: str = 'auto',
+) -> List[Dict[str, Any]]:
     """Return snapshots for an accreditor within the last N days (default 30).
     If accreditor is None, return combined series across all (tagged by accreditor).
+
+    ``resolution`` selects raw points or an hourly/daily/weekly rollup; 'auto' picks the
+    finest resolution whose retention covers the requested window.
     """
-    _ensure_loaded()
-    cutoff = datetime.utcnow() - timedelta(days=max(1, days))
+    _ensure_legacy_imported()
+    days = max(1, days)
+    if resolution not in _RESOLUTIONS:
+        resolution = _pick_resolution(days)
+    end = _now_epoch() + 1
+    start = end - days * _DAY
+    if accreditor:
+        keys = [accreditor.upper()]
+    else:
+        keys = sorted(set(_series_keys(tenant)) | (set(_series_keys(None)) if tenant else set()))
     out: List[Dict[str, Any]] = []
-    with _LOCK:
-        if accreditor:
-            key = accreditor.upper()
-            series = _STORE.get(key, [])
-            for s in series:
-                ts = _parse_iso(s.get('timestamp', ''))
-                if ts and ts >= cutoff:
-                    out.append(s)
-        else:
-            for key, series in _STORE.items():
-                for s in series:
-                    ts = _parse_iso(s.get('timestamp', ''))
-                    if ts and ts >= cutoff:
-                        out.append(s)
+    for key in keys:
+        own_start = None
+        if tenant:
+            own_start = _read_key(tenant, key, resolution, start, end, out)
+        if not tenant or own_start is None or own_start > start:
+            # Legacy/global history only up to where the tenant's own series begins
+            cutoff = end if own_start is None else _bucket_start(own_start, resolution)
+            _read_key(None, key, resolution, start, cutoff, out)
     out.sort(key=lambda x: x.get('timestamp', ''))
     if limit and len(out) > limit:
         out = out[-limit:]
     return out
 
 
-def last_snapshot(accreditor: str) -> Optional[Dict[str, Any]]:
-    _ensure_loaded()
-    with _LOCK:
-        series = _STORE.get(accreditor.upper(), [])
-        return series[-1] if series else None
+def _series_keys(tenant: Optional[str]) -> List[str]:
+    root = _ROOT / _tenant_dir(tenant)
+    return [p.name for p in root.iterdir() if p.is_dir()] if root.exists() else []
+
+
+def _read_key(tenant: Optional[str], key: str, resolution: str, start: int, end: int,
+              out: List[Dict[str, Any]]) -> Optional[int]:
+    """Append one key's records in [start, end) to ``out``; returns its first raw timestamp."""
+    key_dir = _key_dir(tenant, key)
+    if not key_dir.exists():
+        return None
+    with _KeyLock(key_dir, shared=True):
+        for seg in _segments(key_dir, resolution):
+            seg_start, seg_end = _segment_bounds(seg.name)
+            if seg_end <= start or seg_start >= end:
+                continue
+            out.extend(_to_snapshot(key, rec, resolution) for rec in _read_range(seg, start, end))
+        return _first_raw_epoch(tenant, key)
+
+
+def last_snapshot(accreditor: str, tenant: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    _ensure_legacy_imported()
+    key = accreditor.upper()
+    for scope in ((tenant, None) if tenant else (None,)):
+        key_dir = _key_dir(scope, key)
+        if not key_dir.exists():
+            continue
+        with _KeyLock(key_dir, shared=True):
+            rec = _last_raw(scope, key)
+        if rec:
+            return _to_snapshot(key, rec, 'raw')
+    return None
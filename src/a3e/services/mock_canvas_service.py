@@ -9,6 +9,7 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import logging
 from ..core.config import settings
+from .integration_sync import ConnectorSyncEngine, DocumentHandler, SyncPage, content_etag
 
 logger = logging.getLogger(__name__)
 # settings imported from config module
@@ -21,6 +22,7 @@ class MockCanvasLMSService:
         self.api_base = "https://canvas.instructure.com/api/v1"
         self.base_url = "https://canvas.instructure.com"
         self.authenticated = False
+        self.page_size = 2
         
         # Mock user data
         self.current_user = {
@@ -290,6 +292,27 @@ class MockCanvasLMSService:
             }
         ]
 
+    def _page(self, items: List[Dict[str, Any]], page_token: Optional[int], etag: Optional[str]) -> SyncPage:
+        """Slice ``items`` into Canvas-style pages with content ETags."""
+        start = page_token or 0
+        chunk = items[start:start + self.page_size]
+        next_token = start + self.page_size if start + self.page_size < len(items) else None
+        page_etag = content_etag([chunk, next_token])
+        if etag == page_etag:
+            return SyncPage(etag=etag, not_modified=True)
+        return SyncPage(items=chunk, next_token=next_token, etag=page_etag)
+    
+    async def get_courses_page(self, page_token: Optional[int] = None, etag: Optional[str] = None) -> SyncPage:
+        return self._page(await self.get_courses(), page_token, etag)
+    
+    async def get_course_outcomes_page(self, course_id: Any, page_token: Optional[int] = None,
+                                       etag: Optional[str] = None) -> SyncPage:
+        return self._page(await self.get_course_outcomes(int(course_id)), page_token, etag)
+    
+    async def get_assignments_page(self, course_id: Any, page_token: Optional[int] = None,
+                                   etag: Optional[str] = None) -> SyncPage:
+        return self._page(await self.get_assignments(int(course_id)), page_token, etag)
+
 # Mock Canvas integration for the integration manager
 class MockIntegrationManager:
     """Mock integration manager with Canvas data."""
@@ -305,8 +328,8 @@ class MockIntegrationManager:
             'sharepoint': False  # Not mocked
         }
     
-    async def sync_all_data(self) -> Dict[str, Any]:
-        """Sync mock Canvas data."""
+    async def sync_all_data(self, on_document: Optional[DocumentHandler] = None, store=None) -> Dict[str, Any]:
+        """Incrementally sync mock Canvas data through the real sync engine."""
         sync_results = {
             'canvas': {'courses': [], 'outcomes': [], 'assignments': []},
             'banner': {'students': [], 'courses': []},
@@ -315,20 +338,11 @@ class MockIntegrationManager:
         }
         
         try:
-            if await self.canvas.authenticate():
-                # Get courses
-                courses = await self.canvas.get_courses()
-                sync_results['canvas']['courses'] = courses
-                
-                # Get outcomes and assignments for each course
-                for course in courses:
-                    course_id = course['id']
-                    outcomes = await self.canvas.get_course_outcomes(course_id)
-                    assignments = await self.canvas.get_assignments(course_id)
-                    
-                    sync_results['canvas']['outcomes'].extend(outcomes)
-                    sync_results['canvas']['assignments'].extend(assignments)
-        
+            engine = ConnectorSyncEngine(self, store=store, on_document=on_document)
+            results = await engine.sync()
+            sync_results['canvas'].update(results.get('canvas') or {})
+            sync_results['errors'].extend(results['errors'])
+            sync_results['stats'] = results['stats']
         except Exception as e:
             sync_results['errors'].append(str(e))
             logger.error(f"Mock sync error: {e}")
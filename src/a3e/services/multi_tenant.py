@@ -14,6 +14,8 @@ import uuid
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from .tenant_metering import TenantMeter, get_tenant_meter
+
 logger = logging.getLogger(__name__)
 
 
@@ -130,12 +132,35 @@ class TenantUsage:
 class MultiTenantService:
     """Service for managing multi-tenant architecture and organization isolation"""
     
-    def __init__(self):
+    # resource_type (check_tenant_limits) -> (meter, TenantConfiguration limit attribute)
+    METERED_RESOURCES = {
+        "documents": ("documents", "max_documents"),
+        "storage": ("storage_gb", "max_storage_gb"),
+        "api_requests": ("api_requests", "api_rate_limit"),
+    }
+    # usage_type (record_tenant_usage) -> meter
+    USAGE_METERS = {
+        "api_request": "api_requests",
+        "document_processed": "documents",
+        "storage_used": "storage_gb",
+        "compute_time": "compute_hours",
+        "bandwidth": "bandwidth_gb",
+    }
+
+    def __init__(self, meter: Optional[TenantMeter] = None):
         self.tenants: Dict[str, TenantConfiguration] = {}
-        self.tenant_usage: Dict[str, List[TenantUsage]] = {}
+        # Current period only; metered counters live in the shared TenantMeter
+        self.tenant_usage: Dict[str, TenantUsage] = {}
+        self._meter = meter
         self.tenant_cache: Dict[str, Dict[str, Any]] = {}
         self._initialize_default_configurations()
     
+    @property
+    def meter(self) -> TenantMeter:
+        if self._meter is None:
+            self._meter = get_tenant_meter()
+        return self._meter
+
     def _initialize_default_configurations(self):
         """Initialize default tenant configurations for different tiers"""
         
@@ -210,7 +235,7 @@ class MultiTenantService:
         self,
         organization_name: str,
         domain: str,
-        tier: TenantTier = TenantTier.TRIAL,
+        tier: TenantTier = TenantTier.BASIC,  # trial tenants start on BASIC
         admin_email: str = None,
         custom_config: Dict[str, Any] = None
     ) -> str:
@@ -248,9 +273,6 @@ class MultiTenantService:
         # Initialize tenant database schema
         await self._initialize_tenant_database(tenant_config)
         
-        # Initialize usage tracking
-        self.tenant_usage[tenant_id] = []
-        
         # Create initial admin user if provided
         if admin_email:
             await self._create_tenant_admin(tenant_config, admin_email)
@@ -434,19 +456,37 @@ class MultiTenantService:
         if not tenant:
             return False
         
-        # Get current usage
-        current_usage = await self.get_tenant_current_usage(tenant_id)
-        
         if resource_type == "users":
+            current_usage = await self.get_tenant_current_usage(tenant_id)
             return current_usage.total_users + requested_amount <= tenant.max_users
-        elif resource_type == "documents":
-            return current_usage.documents_processed + requested_amount <= tenant.max_documents
-        elif resource_type == "storage":
-            return current_usage.storage_used_gb + requested_amount <= tenant.max_storage_gb
-        elif resource_type == "api_requests":
-            return current_usage.api_requests + requested_amount <= tenant.api_rate_limit
+        if resource_type not in self.METERED_RESOURCES:
+            return True
         
-        return True
+        meter_name, limit_attr = self.METERED_RESOURCES[resource_type]
+        if resource_type == "api_requests":
+            # api_rate_limit is per hour: compare against the sliding hourly window
+            current = await asyncio.to_thread(self.meter.window_usage, tenant_id, meter_name)
+        else:
+            current = (await asyncio.to_thread(self.meter.usage, tenant_id))[meter_name]
+        return current + requested_amount <= getattr(tenant, limit_attr)
+    
+    async def consume_tenant_quota(self, tenant_id: str, resource_type: str, amount: float = 1) -> bool:
+        """Check and record usage in one step, enforced atomically across workers"""
+        
+        tenant = await self.get_tenant(tenant_id)
+        if not tenant:
+            return False
+        
+        if resource_type not in self.METERED_RESOURCES:
+            return await self.check_tenant_limits(tenant_id, resource_type, amount)
+        
+        meter_name, limit_attr = self.METERED_RESOURCES[resource_type]
+        allowed = await asyncio.to_thread(
+            self.meter.consume, tenant_id, meter_name, amount, getattr(tenant, limit_attr)
+        )
+        if allowed:
+            tenant.last_accessed = datetime.utcnow()
+        return allowed
     
     async def record_tenant_usage(
         self,
@@ -457,20 +497,10 @@ class MultiTenantService:
     ):
         """Record tenant resource usage"""
         
-        # Get or create current usage period
-        current_usage = await self.get_tenant_current_usage(tenant_id)
-        
-        # Update usage metrics
-        if usage_type == "api_request":
-            current_usage.api_requests += int(amount)
-        elif usage_type == "document_processed":
-            current_usage.documents_processed += int(amount)
-        elif usage_type == "storage_used":
-            current_usage.storage_used_gb += amount
-        elif usage_type == "compute_time":
-            current_usage.compute_hours += amount
-        elif usage_type == "bandwidth":
-            current_usage.bandwidth_gb += amount
+        # Batched: reaches the shared counters on the meter's next flush
+        meter_name = self.USAGE_METERS.get(usage_type)
+        if meter_name and self.meter.record(tenant_id, meter_name, amount, flush=False):
+            await asyncio.to_thread(self.meter.flush)
         
         # Update tenant last accessed time
         if tenant_id in self.tenants:
@@ -479,28 +509,25 @@ class MultiTenantService:
     async def get_tenant_current_usage(self, tenant_id: str) -> TenantUsage:
         """Get current usage period for tenant"""
         
-        if tenant_id not in self.tenant_usage:
-            self.tenant_usage[tenant_id] = []
-        
-        usage_list = self.tenant_usage[tenant_id]
-        
-        # Check if current period exists
         now = datetime.utcnow()
         current_period_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         
-        for usage in usage_list:
-            if usage.period_start == current_period_start:
-                return usage
-        
-        # Create new usage period
-        new_usage = TenantUsage(
-            tenant_id=tenant_id,
-            period_start=current_period_start,
-            period_end=current_period_start + timedelta(days=32)  # Next month
-        )
-        
-        usage_list.append(new_usage)
-        return new_usage
+        usage = self.tenant_usage.get(tenant_id)
+        if usage is None or usage.period_start != current_period_start:
+            usage = self.tenant_usage[tenant_id] = TenantUsage(
+                tenant_id=tenant_id,
+                period_start=current_period_start,
+                period_end=(current_period_start + timedelta(days=32)).replace(day=1)  # Next month
+            )
+        
+        # Metered fields come from the shared monthly rollups (one read)
+        metered = await asyncio.to_thread(self.meter.usage, tenant_id)
+        usage.api_requests = int(metered["api_requests"])
+        usage.documents_processed = int(metered["documents"])
+        usage.storage_used_gb = metered["storage_gb"]
+        usage.compute_hours = metered["compute_hours"]
+        usage.bandwidth_gb = metered["bandwidth_gb"]
+        return usage
     
     async def get_tenant_analytics(self, tenant_id: str, days: int = 30) -> Dict[str, Any]:
         """Get tenant analytics and usage insights"""
@@ -543,6 +570,7 @@ class MultiTenantService:
                 },
                 "api_requests": {
                     "current": current_usage.api_requests,
+                    "last_hour": await asyncio.to_thread(self.meter.window_usage, tenant_id, "api_requests"),
                     "limit": tenant.api_rate_limit
                 }
             },
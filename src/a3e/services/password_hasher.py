@@ -0,0 +1,245 @@
+"""
+Bounded, off-loop password hashing.
+
+bcrypt at the default cost takes a few hundred milliseconds of CPU per call.
+Run inline in an async handler that stalls every other request on the worker,
+so all hashing goes through ``PasswordHasher``:
+
+* jobs run on a small dedicated thread pool (bcrypt releases the GIL), never
+  on the event loop or the shared default executor;
+* admission control caps the jobs one worker accepts (running + queued).
+  Past the cap callers get ``HashingOverloaded`` with status 429, and a job
+  that sat in the queue longer than ``max_wait`` is dropped with status 503
+  instead of being hashed for a client that has likely given up;
+* ``verify_and_upgrade`` re-hashes on a successful check when the stored hash
+  uses a different bcrypt cost (or the legacy PBKDF2 ``salt:hash`` format)
+  than ``PASSWORD_HASH_ROUNDS``, in the same job.
+
+``metrics()`` reports queue depth, rejections and queue wait, and mirrors
+them into gauges when prometheus_client is installed.
+
+Settings: ``PASSWORD_HASH_ROUNDS`` (12), ``PASSWORD_HASH_WORKERS``
+(min(4, cpus)), ``PASSWORD_HASH_QUEUE`` (8 x workers) and
+``PASSWORD_HASH_MAX_WAIT_SECONDS`` (2.0).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import Counter, Gauge  # type: ignore
+
+    PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+        "password_hash_queue_depth", "Password hashing jobs waiting for a worker thread"
+    )
+    PASSWORD_HASH_RUNNING = Gauge(
+        "password_hash_running", "Password hashing jobs currently on a worker thread"
+    )
+    PASSWORD_HASH_REJECTED = Counter(
+        "password_hash_rejected_total", "Password hashing jobs refused by admission control", ["reason"]
+    )
+except Exception:  # pragma: no cover - optional dependency / duplicate registration
+    PASSWORD_HASH_QUEUE_DEPTH = None
+    PASSWORD_HASH_RUNNING = None
+    PASSWORD_HASH_REJECTED = None
+
+_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", str(8 * _WORKERS)))
+_MAX_WAIT = float(os.getenv("PASSWORD_HASH_MAX_WAIT_SECONDS", "2.0"))
+
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+_PBKDF2_ITERATIONS = 100000
+
+
+class HashingOverloaded(Exception):
+    """Raised instead of queueing more hashing work than the worker can absorb."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class _Shed(Exception):
+    pass
+
+
+def bcrypt_cost(hashed: str) -> Optional[int]:
+    """Cost factor of a bcrypt hash, or None for anything else."""
+    if not hashed or not hashed.startswith(_BCRYPT_PREFIXES):
+        return None
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def check_password(password: str, stored: str) -> bool:
+    """Check ``password`` against a bcrypt hash or a legacy PBKDF2 ``salt:hash`` (blocking)."""
+    if not stored:
+        return False
+    if stored.startswith(_BCRYPT_PREFIXES):
+        try:
+            return bcrypt.checkpw(password.encode("utf-8"), stored.encode("utf-8"))
+        except ValueError:
+            return False
+    salt, sep, digest = stored.partition(":")
+    if not sep:
+        return False
+    computed = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), _PBKDF2_ITERATIONS)
+    return hmac.compare_digest(digest, computed.hex())
+
+
+class PasswordHasher:
+    """Dedicated hashing pool with per-worker admission control."""
+
+    def __init__(
+        self,
+        rounds: int = _ROUNDS,
+        max_workers: int = _WORKERS,
+        max_queue: int = _QUEUE,
+        max_wait: float = _MAX_WAIT,
+    ):
+        self.rounds = rounds
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._admitted = 0  # event-loop side: running + queued
+        self._running = 0  # worker side
+        self._peak_queued = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self.stats = {"completed": 0, "rejected": 0, "shed": 0, "rehashed": 0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def hash_sync(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(self.rounds)).decode("utf-8")
+
+    def needs_rehash(self, stored: str) -> bool:
+        return bcrypt_cost(stored) != self.rounds
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(self.hash_sync, password)
+
+    async def verify(self, password: str, stored: str) -> bool:
+        return await self._submit(check_password, password, stored)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run another password-hashing function (e.g. argon2) under the same pool and limits."""
+        return await self._submit(fn, *args)
+
+    async def verify_and_upgrade(self, password: str, stored: str) -> Tuple[bool, Optional[str]]:
+        """Check a password; on success also return a fresh hash if ``stored`` is outdated."""
+        ok, new_hash = await self._submit(self._verify_and_upgrade, password, stored)
+        if new_hash:
+            self.stats["rehashed"] += 1
+        return ok, new_hash
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            running = self._running
+            completed = self.stats["completed"]
+            wait_avg = self._wait_total / completed if completed else 0.0
+            wait_max = self._wait_max
+        queued = max(0, self._admitted - running)
+        return {
+            "rounds": self.rounds,
+            "workers": self.max_workers,
+            "capacity": self.max_workers + self.max_queue,
+            "running": running,
+            "queued": queued,
+            "peak_queued": self._peak_queued,
+            "wait_ms_avg": round(wait_avg * 1000, 2),
+            "wait_ms_max": round(wait_max * 1000, 2),
+            **self.stats,
+        }
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _verify_and_upgrade(self, password: str, stored: str) -> Tuple[bool, Optional[str]]:
+        if not check_password(password, stored):
+            return False, None
+        return True, self.hash_sync(password) if self.needs_rehash(stored) else None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    def _reject(self, status_code: int, reason: str, detail: str) -> HashingOverloaded:
+        self.stats["rejected" if reason == "queue_full" else "shed"] += 1
+        if PASSWORD_HASH_REJECTED is not None:
+            PASSWORD_HASH_REJECTED.labels(reason=reason).inc()
+        return HashingOverloaded(status_code, detail, retry_after=max(1, int(self.max_wait)))
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._admitted >= self.max_workers + self.max_queue:
+            raise self._reject(429, "queue_full", "Too many concurrent sign-in attempts, please retry shortly")
+        self._admitted += 1
+        self._peak_queued = max(self._peak_queued, self._admitted - self._running)
+        self._publish()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._pool(), self._job, fn, time.monotonic(), args)
+        except _Shed:
+            raise self._reject(503, "queue_timeout", "Authentication is busy, please retry shortly") from None
+        finally:
+            self._admitted -= 1
+            self._publish()
+
+    def _job(self, fn: Callable[..., Any], enqueued: float, args: Tuple[Any, ...]) -> Any:
+        waited = time.monotonic() - enqueued
+        if waited > self.max_wait:
+            raise _Shed()
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self.stats["completed"] += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def _publish(self) -> None:
+        if PASSWORD_HASH_QUEUE_DEPTH is None:
+            return
+        running = self._running
+        PASSWORD_HASH_RUNNING.set(running)
+        PASSWORD_HASH_QUEUE_DEPTH.set(max(0, self._admitted - running))
+
+
+_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _hasher
+    if _hasher is None:
+        _hasher = PasswordHasher()
+    return _hasher
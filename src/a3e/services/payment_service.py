@@ -4,7 +4,7 @@ Handles Stripe payments, subscriptions, and trial management
 """
 
 import os
-import stripe
+import importlib
 import asyncio  # Added to allow background task for non-critical DB/email work
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -12,7 +12,12 @@ import traceback
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from ..core.config import get_settings
+from ..core.lazy_loading import LazyObject
 from ..services.database_service import DatabaseService
+from ..services.stripe_mirror import get_stripe_mirror, to_plain_dict
+# The Stripe SDK takes ~1s to import; load it on first use, not at worker import
+stripe = LazyObject(lambda: importlib.import_module("stripe"), "stripe")
+
 try:
     from ..services.email_service import EmailService  # type: ignore
     _email_available = True
@@ -301,16 +306,21 @@ class PaymentService:
     async def cancel_subscription(self, customer_id: str) -> Dict[str, Any]:
         """Cancel a subscription"""
         try:
-            # Get customer's subscription
-            subscriptions = stripe.Subscription.list(customer=customer_id, status="active")
-            
-            if subscriptions.data:
-                subscription = subscriptions.data[0]
+            # Get customer's subscription from the local mirror
+            mirror = get_stripe_mirror()
+            subscriptions = [
+                s for s in await mirror.active_subscriptions(customer_id) if s.get("status") == "active"
+            ]
+            
+            if subscriptions:
+                subscription = subscriptions[0]
                 # Cancel at period end
-                stripe.Subscription.modify(
-                    subscription.id,
+                updated = await asyncio.to_thread(
+                    stripe.Subscription.modify,
+                    subscription["id"],
                     cancel_at_period_end=True
                 )
+                await asyncio.to_thread(mirror.store, "subscription", [to_plain_dict(updated)])
                 
                 # Update account status
                 await self._downgrade_account(customer_id)
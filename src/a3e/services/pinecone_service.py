@@ -7,10 +7,11 @@ import logging
 import json
 import hashlib
 import numpy as np
-import httpx
 from typing import List, Dict, Any, Optional
 from pinecone import Pinecone, ServerlessSpec
 
+from .http_clients import get_http_clients
+
 logger = logging.getLogger(__name__)
 
 # Embedding backends
@@ -78,7 +79,7 @@ class _OpenAIEmbedder:
             if self._project:
                 headers["OpenAI-Project"] = self._project
             payload = {"model": self._model, "input": texts}
-            with httpx.Client(timeout=30.0) as client:
+            with get_http_clients().borrow_sync("https://api.openai.com") as client:
                 r = client.post("https://api.openai.com/v1/embeddings", headers=headers, json=payload)
                 if r.status_code in (401, 403):
                     # Disable further attempts this process to avoid log spam
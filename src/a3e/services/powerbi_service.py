@@ -1,22 +1,42 @@
 """
 Advanced Power BI Integration Service
 Handles real Power BI API connections, embed token management, and RLS
+
+One process-wide client (``get_powerbi_service()``) is shared by all
+requests, so it can cache three things:
+
+- the Azure AD access token, reused until ``POWERBI_AAD_REFRESH_MARGIN_SECONDS``
+  (300) before it expires;
+- report metadata (report -> dataset, embed URL) per workspace, for
+  ``POWERBI_METADATA_TTL_SECONDS`` (300);
+- embed tokens per (username, roles, reports, datasets, identity), until
+  ``POWERBI_EMBED_TOKEN_MARGIN_SECONDS`` (120) before the JWT's ``exp``,
+  capped at ``POWERBI_EMBED_TOKEN_CACHE_SIZE`` (1024) entries.
+
+Concurrent misses for the same key share one upstream call (single-flight).
+Requests go through the shared aiohttp session from ``http_clients``.
 """
 
 import os
 import json
 import logging
 import asyncio
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
 from dataclasses import dataclass
-import aiohttp
 import jwt
 from cryptography.x509 import load_pem_x509_certificate
 from cryptography.hazmat.primitives import serialization
 
+from .http_clients import get_http_clients
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_API_URL = "https://api.powerbi.com/v1.0/myorg"
+DEFAULT_AUTHORITY_URL = "https://login.microsoftonline.com"
+
 
 @dataclass
 class PowerBICredentials:
@@ -50,19 +70,69 @@ class PowerBIReport:
     modified_date: datetime
 
 
+class _SingleFlight:
+    """Concurrent callers with the same key await one shared task."""
+
+    def __init__(self):
+        self._calls: Dict[Any, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Any, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        task = self._calls.get(key)
+        if task is not None and task.get_loop() is loop:
+            self.coalesced += 1
+        else:
+            task = loop.create_task(fn())
+            self._calls[key] = task
+
+            def _forget(done: asyncio.Task, key: Any = key) -> None:
+                if self._calls.get(key) is done:
+                    del self._calls[key]
+
+            task.add_done_callback(_forget)
+        # shield: a cancelled caller must not cancel the call others are waiting on
+        return await asyncio.shield(task)
+
+
 class PowerBIService:
     """
     Advanced Power BI integration service
     Handles authentication, embed tokens, and data operations
     """
     
-    def __init__(self, credentials: PowerBICredentials):
+    def __init__(
+        self,
+        credentials: PowerBICredentials,
+        api_url: Optional[str] = None,
+        authority_url: Optional[str] = None
+    ):
         self.credentials = credentials
-        self.base_url = "https://api.powerbi.com/v1.0/myorg"
-        self.auth_url = f"https://login.microsoftonline.com/{credentials.tenant_id}/oauth2/v2.0/token"
+        self.base_url = (api_url or os.getenv("POWERBI_API_URL") or DEFAULT_API_URL).rstrip("/")
+        authority = (authority_url or os.getenv("POWERBI_AUTHORITY_URL") or DEFAULT_AUTHORITY_URL).rstrip("/")
+        self.auth_url = f"{authority}/{credentials.tenant_id}/oauth2/v2.0/token"
         self.access_token: Optional[str] = None
         self.token_expiry: Optional[datetime] = None
-        
+        self.aad_refresh_margin = timedelta(seconds=float(os.getenv("POWERBI_AAD_REFRESH_MARGIN_SECONDS", "300")))
+        self.metadata_ttl = float(os.getenv("POWERBI_METADATA_TTL_SECONDS", "300"))
+        self.embed_token_margin = timedelta(seconds=float(os.getenv("POWERBI_EMBED_TOKEN_MARGIN_SECONDS", "120")))
+        self.embed_token_cache_size = int(os.getenv("POWERBI_EMBED_TOKEN_CACHE_SIZE", "1024"))
+        # workspace -> (monotonic expiry, reports)
+        self._reports: Dict[str, Tuple[float, List[PowerBIReport]]] = {}
+        self._embed_tokens: "OrderedDict[Tuple, EmbedToken]" = OrderedDict()
+        self._flights = _SingleFlight()
+        self.stats = {
+            "aad_token_fetches": 0,
+            "metadata_hits": 0,
+            "metadata_misses": 0,
+            "embed_token_hits": 0,
+            "embed_token_misses": 0,
+        }
+
+    @staticmethod
+    def _session():
+        return get_http_clients().aiohttp_session()
+
     async def authenticate(self) -> str:
         """
         Authenticate with Azure AD and get access token
@@ -70,7 +140,14 @@ class PowerBIService:
         """
         if self.access_token and self.token_expiry and datetime.utcnow() < self.token_expiry:
             return self.access_token
-            
+        return await self._flights.do("aad", self._fetch_access_token)
+
+    def invalidate_access_token(self) -> None:
+        """Force the next call to re-authenticate (e.g. after a 401)."""
+        self.access_token = None
+        self.token_expiry = None
+
+    async def _fetch_access_token(self) -> str:
         try:
             # Service Principal authentication (recommended for production)
             if self.credentials.client_secret:
@@ -92,19 +169,19 @@ class PowerBIService:
             else:
                 raise ValueError("Either client_secret or user credentials must be provided")
                 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.auth_url, data=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        self.access_token = result['access_token']
-                        expires_in = result.get('expires_in', 3600)
-                        self.token_expiry = datetime.utcnow() + timedelta(seconds=expires_in - 300)  # 5 min buffer
-                        logger.info("Successfully authenticated with Power BI")
-                        return self.access_token
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Authentication failed: {response.status} - {error_text}")
-                        raise Exception(f"Authentication failed: {response.status}")
+            async with self._session().post(self.auth_url, data=data) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    self.stats["aad_token_fetches"] += 1
+                    expires_in = int(result.get('expires_in', 3600))
+                    self.token_expiry = datetime.utcnow() + timedelta(seconds=expires_in) - self.aad_refresh_margin
+                    self.access_token = result['access_token']
+                    logger.info("Successfully authenticated with Power BI")
+                    return self.access_token
+                else:
+                    error_text = await response.text()
+                    logger.error(f"Authentication failed: {response.status} - {error_text}")
+                    raise Exception(f"Authentication failed: {response.status}")
                         
         except Exception as e:
             logger.error(f"Power BI authentication error: {str(e)}")
@@ -122,42 +199,60 @@ class PowerBIService:
         """Get all available workspaces"""
         headers = await self.get_headers()
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}/groups", headers=headers) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result.get('value', [])
-                else:
-                    logger.error(f"Failed to get workspaces: {response.status}")
-                    return []
+        async with self._session().get(f"{self.base_url}/groups", headers=headers) as response:
+            if response.status == 200:
+                result = await response.json()
+                return result.get('value', [])
+            else:
+                self._check_unauthorized(response.status)
+                logger.error(f"Failed to get workspaces: {response.status}")
+                return []
                     
     async def get_reports(self, workspace_id: Optional[str] = None) -> List[PowerBIReport]:
-        """Get reports from workspace"""
-        headers = await self.get_headers()
+        """Get reports from workspace (cached for ``metadata_ttl`` seconds)"""
         workspace_id = workspace_id or self.credentials.workspace_id
-        
+        cached = self._reports.get(workspace_id or "")
+        if cached and time.monotonic() < cached[0]:
+            self.stats["metadata_hits"] += 1
+            return list(cached[1])
+        reports = await self._flights.do(("reports", workspace_id), lambda: self._fetch_reports(workspace_id))
+        return list(reports)
+
+    def invalidate_metadata(self) -> None:
+        """Drop cached report metadata (e.g. after publishing reports)."""
+        self._reports.clear()
+
+    async def _fetch_reports(self, workspace_id: Optional[str]) -> List[PowerBIReport]:
+        self.stats["metadata_misses"] += 1
+        headers = await self.get_headers()
         url = f"{self.base_url}/groups/{workspace_id}/reports" if workspace_id else f"{self.base_url}/reports"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    reports = []
-                    for report_data in result.get('value', []):
-                        reports.append(PowerBIReport(
-                            id=report_data['id'],
-                            name=report_data['name'],
-                            embed_url=report_data['embedUrl'],
-                            dataset_id=report_data.get('datasetId', ''),
-                            is_owned_by_me=report_data.get('isOwnedByMe', False),
-                            modified_date=datetime.fromisoformat(
-                                report_data.get('modifiedDateTime', '').replace('Z', '+00:00')
-                            ) if report_data.get('modifiedDateTime') else datetime.utcnow()
-                        ))
-                    return reports
-                else:
-                    logger.error(f"Failed to get reports: {response.status}")
-                    return []
+        async with self._session().get(url, headers=headers) as response:
+            if response.status == 200:
+                result = await response.json()
+                reports = []
+                for report_data in result.get('value', []):
+                    reports.append(PowerBIReport(
+                        id=report_data['id'],
+                        name=report_data['name'],
+                        embed_url=report_data['embedUrl'],
+                        dataset_id=report_data.get('datasetId', ''),
+                        is_owned_by_me=report_data.get('isOwnedByMe', False),
+                        modified_date=datetime.fromisoformat(
+                            report_data.get('modifiedDateTime', '').replace('Z', '+00:00')
+                        ) if report_data.get('modifiedDateTime') else datetime.utcnow()
+                    ))
+                # Failures below are not cached, so the next request retries
+                self._reports[workspace_id or ""] = (time.monotonic() + self.metadata_ttl, reports)
+                return reports
+            else:
+                self._check_unauthorized(response.status)
+                logger.error(f"Failed to get reports: {response.status}")
+                return []
+
+    def _check_unauthorized(self, status: int) -> None:
+        if status == 401:
+            self.invalidate_access_token()
                     
     async def get_datasets(self, workspace_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get datasets from workspace"""
@@ -166,14 +261,14 @@ class PowerBIService:
         
         url = f"{self.base_url}/groups/{workspace_id}/datasets" if workspace_id else f"{self.base_url}/datasets"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result.get('value', [])
-                else:
-                    logger.error(f"Failed to get datasets: {response.status}")
-                    return []
+        async with self._session().get(url, headers=headers) as response:
+            if response.status == 200:
+                result = await response.json()
+                return result.get('value', [])
+            else:
+                self._check_unauthorized(response.status)
+                logger.error(f"Failed to get datasets: {response.status}")
+                return []
                     
     async def generate_embed_token(
         self, 
@@ -185,7 +280,37 @@ class PowerBIService:
     ) -> EmbedToken:
         """
         Generate embed token for reports with optional RLS
+        Tokens are reused per (user, roles, report set) until shortly before they expire
         """
+        key = (
+            username or "",
+            tuple(sorted(roles or [])),
+            tuple(sorted(report_ids)),
+            tuple(sorted(dataset_ids)),
+            json.dumps(identity_blob, sort_keys=True) if identity_blob else "",
+        )
+        cached = self._embed_tokens.get(key)
+        if cached is not None:
+            if datetime.utcnow() < cached.expiration - self.embed_token_margin:
+                self._embed_tokens.move_to_end(key)
+                self.stats["embed_token_hits"] += 1
+                return cached
+            del self._embed_tokens[key]
+        return await self._flights.do(
+            ("embed", key),
+            lambda: self._fetch_embed_token(key, report_ids, dataset_ids, username, roles, identity_blob),
+        )
+
+    async def _fetch_embed_token(
+        self,
+        key: Tuple,
+        report_ids: List[str],
+        dataset_ids: List[str],
+        username: Optional[str],
+        roles: Optional[List[str]],
+        identity_blob: Optional[Dict[str, Any]]
+    ) -> EmbedToken:
+        self.stats["embed_token_misses"] += 1
         headers = await self.get_headers()
         workspace_id = self.credentials.workspace_id
         
@@ -211,32 +336,59 @@ class PowerBIService:
             
         url = f"{self.base_url}/groups/{workspace_id}/GenerateToken"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=token_request) as response:
-                if response.status == 200:
-                    result = await response.json()
+        async with self._session().post(url, headers=headers, json=token_request) as response:
+            if response.status == 200:
+                result = await response.json()
+                
+                # Parse the JWT token to get expiration
+                token = result['token']
+                try:
+                    # Decode without verification to get expiration
+                    decoded = jwt.decode(token, options={"verify_signature": False})
+                    expiration = datetime.utcfromtimestamp(decoded['exp'])
+                except Exception:
+                    # Power BI also reports expiry alongside the token; else assume 1 hour
+                    expiration = self._parse_expiration(result.get('expiration'))
                     
-                    # Parse the JWT token to get expiration
-                    token = result['token']
-                    try:
-                        # Decode without verification to get expiration
-                        decoded = jwt.decode(token, options={"verify_signature": False})
-                        expiration = datetime.fromtimestamp(decoded.get('exp', 0))
-                    except:
-                        # Fallback to 1 hour from now
-                        expiration = datetime.utcnow() + timedelta(hours=1)
-                        
-                    return EmbedToken(
-                        token=token,
-                        token_id=result.get('tokenId', ''),
-                        expiration=expiration,
-                        reports=[{"id": rid} for rid in report_ids],
-                        datasets=[{"id": did} for did in dataset_ids]
-                    )
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Failed to generate embed token: {response.status} - {error_text}")
-                    raise Exception(f"Failed to generate embed token: {response.status}")
+                embed_token = EmbedToken(
+                    token=token,
+                    token_id=result.get('tokenId', ''),
+                    expiration=expiration,
+                    reports=[{"id": rid} for rid in report_ids],
+                    datasets=[{"id": did} for did in dataset_ids]
+                )
+                if datetime.utcnow() < expiration - self.embed_token_margin:
+                    self._embed_tokens[key] = embed_token
+                    while len(self._embed_tokens) > self.embed_token_cache_size:
+                        self._embed_tokens.popitem(last=False)
+                return embed_token
+            else:
+                self._check_unauthorized(response.status)
+                error_text = await response.text()
+                logger.error(f"Failed to generate embed token: {response.status} - {error_text}")
+                raise Exception(f"Failed to generate embed token: {response.status}")
+
+    @staticmethod
+    def _parse_expiration(value: Optional[str]) -> datetime:
+        if value:
+            try:
+                parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+                if parsed.tzinfo is not None:
+                    parsed = datetime.utcfromtimestamp(parsed.timestamp())
+                return parsed
+            except ValueError:
+                pass
+        return datetime.utcnow() + timedelta(hours=1)
+
+    def cache_metrics(self) -> Dict[str, Any]:
+        """Cache hit/miss counters and sizes"""
+        return {
+            **self.stats,
+            "coalesced_calls": self._flights.coalesced,
+            "cached_embed_tokens": len(self._embed_tokens),
+            "cached_workspaces": len(self._reports),
+            "aad_token_valid": bool(self.access_token and self.token_expiry and datetime.utcnow() < self.token_expiry),
+        }
                     
     async def refresh_dataset(self, dataset_id: str, notify_option: str = "MailOnCompletion") -> str:
         """
@@ -251,17 +403,17 @@ class PowerBIService:
         
         url = f"{self.base_url}/groups/{workspace_id}/datasets/{dataset_id}/refreshes"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=refresh_request) as response:
-                if response.status == 202:  # Accepted
-                    # Get the request ID from the response
-                    request_id = response.headers.get('RequestId', '')
-                    logger.info(f"Dataset refresh initiated: {request_id}")
-                    return request_id
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Failed to refresh dataset: {response.status} - {error_text}")
-                    raise Exception(f"Failed to refresh dataset: {response.status}")
+        async with self._session().post(url, headers=headers, json=refresh_request) as response:
+            if response.status == 202:  # Accepted
+                # Get the request ID from the response
+                request_id = response.headers.get('RequestId', '')
+                logger.info(f"Dataset refresh initiated: {request_id}")
+                return request_id
+            else:
+                self._check_unauthorized(response.status)
+                error_text = await response.text()
+                logger.error(f"Failed to refresh dataset: {response.status} - {error_text}")
+                raise Exception(f"Failed to refresh dataset: {response.status}")
                     
     async def get_refresh_history(self, dataset_id: str, top: int = 10) -> List[Dict[str, Any]]:
         """
@@ -272,14 +424,14 @@ class PowerBIService:
         
         url = f"{self.base_url}/groups/{workspace_id}/datasets/{dataset_id}/refreshes?$top={top}"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result.get('value', [])
-                else:
-                    logger.error(f"Failed to get refresh history: {response.status}")
-                    return []
+        async with self._session().get(url, headers=headers) as response:
+            if response.status == 200:
+                result = await response.json()
+                return result.get('value', [])
+            else:
+                self._check_unauthorized(response.status)
+                logger.error(f"Failed to get refresh history: {response.status}")
+                return []
                     
     async def test_connection(self) -> bool:
         """
@@ -302,14 +454,14 @@ class PowerBIService:
         
         url = f"{self.base_url}/groups/{workspace_id}/users"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result
-                else:
-                    logger.error(f"Failed to get user permissions: {response.status}")
-                    return {}
+        async with self._session().get(url, headers=headers) as response:
+            if response.status == 200:
+                result = await response.json()
+                return result
+            else:
+                self._check_unauthorized(response.status)
+                logger.error(f"Failed to get user permissions: {response.status}")
+                return {}
 
 
 def create_powerbi_service() -> Optional[PowerBIService]:
@@ -339,3 +491,27 @@ def create_powerbi_service() -> Optional[PowerBIService]:
     except Exception as e:
         logger.error(f"Failed to create Power BI service: {str(e)}")
         return None
+
+
+_powerbi_service: Optional[PowerBIService] = None
+
+
+def get_powerbi_service() -> Optional[PowerBIService]:
+    """
+    Process-wide Power BI client, so the AAD token and caches are shared across requests
+    Rebuilt when the configured credentials change; None when Power BI is not configured
+    """
+    global _powerbi_service
+    service = _powerbi_service
+    if service is not None:
+        current = (
+            os.getenv("POWERBI_CLIENT_ID", ""),
+            os.getenv("POWERBI_CLIENT_SECRET", ""),
+            os.getenv("POWERBI_TENANT_ID", ""),
+            os.getenv("POWERBI_WORKSPACE_ID", ""),
+        )
+        creds = service.credentials
+        if current == (creds.client_id, creds.client_secret, creds.tenant_id, creds.workspace_id):
+            return service
+    _powerbi_service = create_powerbi_service()
+    return _powerbi_service
@@ -11,18 +11,12 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from pathlib import Path
+import tempfile
 import uuid
 
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import (
-    SimpleDocTemplate, Table, TableStyle, Paragraph,
-    Spacer, PageBreak, Image, KeepTogether
+from .report_renderer import (
+    Section, get_report_renderer, page_break, para, spacer, table
 )
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-from reportlab.pdfgen import canvas
 
 logger = logging.getLogger(__name__)
 
@@ -32,43 +26,18 @@ class ReportGenerationService:
     Service for generating professional accreditation reports
     """
     
+    # Bump when a report's layout changes so cached PDFs are not reused
+    TEMPLATE_VERSIONS = {
+        "comprehensive": 1,
+        "gap_analysis": 1,
+        "qep": 1,
+        "evidence_mapping": 2,
+    }
+    
     def __init__(self):
-        self.styles = self._initialize_styles()
+        self.renderer = get_report_renderer()
         self.report_templates = self._load_report_templates()
         
-    def _initialize_styles(self):
-        """Initialize report styles"""
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        styles.add(ParagraphStyle(
-            name='CoverTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1e3c72'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='SectionHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#1e3c72'),
-            spaceAfter=12,
-            spaceBefore=12
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='MetricHighlight',
-            parent=styles['Normal'],
-            fontSize=14,
-            textColor=colors.HexColor('#10b981'),
-            alignment=TA_CENTER
-        ))
-        
-        return styles
-    
     def _load_report_templates(self):
         """Load report templates"""
         return {
@@ -114,9 +83,18 @@ class ReportGenerationService:
             # Fetch data for report
             report_data = await self._fetch_report_data(report_type, institution_id, parameters)
             
-            # Generate report using appropriate template
-            report_generator = self.report_templates[report_type]
-            file_path = await report_generator(report_id, report_data, parameters)
+            # Build sections (cached per section) and render off the event loop;
+            # the data snapshot excludes per-request ids, so unchanged inputs hit
+            build_sections = self.report_templates[report_type]
+            path, cache_hit = await self.renderer.render_sections(
+                report_type,
+                self.TEMPLATE_VERSIONS[report_type],
+                report_data,
+                lambda: build_sections(report_data),
+            )
+            file_path = str(self.renderer.materialize(
+                path, Path(tempfile.gettempdir()) / f"{report_type}_{report_id}.pdf"
+            ))
             
             # Return report metadata
             return {
@@ -126,6 +104,7 @@ class ReportGenerationService:
                 "file_path": file_path,
                 "generated_at": parameters["generated_at"],
                 "status": "completed",
+                "cache_hit": cache_hit,
                 "parameters": parameters,
                 "summary": report_data.get("summary", {})
             }
@@ -309,239 +288,146 @@ class ReportGenerationService:
         
         return summaries.get(report_type, {})
     
-    async def _generate_comprehensive_report(
-        self,
-        report_id: str,
-        data: Dict[str, Any],
-        parameters: Dict[str, Any]
-    ) -> str:
-        """Generate comprehensive compliance report"""
-        file_path = f"/tmp/report_{report_id}.pdf"
-        doc = SimpleDocTemplate(file_path, pagesize=letter)
-        
-        story = []
-        
-        # Cover page
-        story.append(Paragraph(
-            "COMPREHENSIVE COMPLIANCE REPORT",
-            self.styles['CoverTitle']
-        ))
-        story.append(Spacer(1, 0.5*inch))
-        story.append(Paragraph(
-            data['institution']['name'],
-            self.styles['Heading2']
-        ))
-        story.append(Paragraph(
-            f"Accreditor: {data['institution']['accreditor']}",
-            self.styles['Normal']
-        ))
-        story.append(Paragraph(
-            f"Generated: {data['generated_date']}",
-            self.styles['Normal']
-        ))
-        story.append(PageBreak())
-        
-        # Executive Summary
-        story.append(Paragraph("Executive Summary", self.styles['SectionHeading']))
-        story.append(Paragraph(
-            f"This comprehensive compliance report provides a detailed analysis of "
-            f"{data['institution']['name']}'s compliance with {data['institution']['accreditor']} "
-            f"accreditation standards.",
-            self.styles['Normal']
-        ))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Key Metrics
-        story.append(Paragraph("Key Metrics", self.styles['SectionHeading']))
-        metrics_data = [
-            ["Metric", "Value"],
-            ["Overall Compliance Score", f"{data['compliance_score']}%"],
-            ["Standards Addressed", f"{data['standards_addressed']} of {data['total_standards']}"],
-            ["Documents Processed", str(data['documents_processed'])],
-            ["Evidence Items", str(data['evidence_items'])]
+    def _generate_comprehensive_report(self, data: Dict[str, Any]) -> List[Section]:
+        """Sections of the comprehensive compliance report"""
+        institution = data['institution']
+        section = self.renderer.section
+        return [
+            section("comprehensive.cover", 1, [institution, data['generated_date']], lambda: [
+                para("COMPREHENSIVE COMPLIANCE REPORT", 'CoverTitle'),
+                spacer(0.5),
+                para(institution['name'], 'Heading2'),
+                para(f"Accreditor: {institution['accreditor']}"),
+                para(f"Generated: {data['generated_date']}"),
+                page_break(),
+            ]),
+            section("comprehensive.executive_summary", 1, institution, lambda: [
+                para("Executive Summary", 'SectionHeading'),
+                para(
+                    f"This comprehensive compliance report provides a detailed analysis of "
+                    f"{institution['name']}'s compliance with {institution['accreditor']} "
+                    f"accreditation standards."
+                ),
+                spacer(0.2),
+            ]),
+            section("comprehensive.key_metrics", 1,
+                    [data[k] for k in ('compliance_score', 'standards_addressed', 'total_standards',
+                                       'documents_processed', 'evidence_items')], lambda: [
+                para("Key Metrics", 'SectionHeading'),
+                table([
+                    ["Metric", "Value"],
+                    ["Overall Compliance Score", f"{data['compliance_score']}%"],
+                    ["Standards Addressed", f"{data['standards_addressed']} of {data['total_standards']}"],
+                    ["Documents Processed", str(data['documents_processed'])],
+                    ["Evidence Items", str(data['evidence_items'])]
+                ], [3, 2], '#1e3c72', body_color='beige', header_font_size=12),
+                spacer(0.3),
+            ]),
+            section("comprehensive.category_scores", 1, data['category_scores'], lambda: [
+                para("Compliance by Category", 'SectionHeading'),
+                table([["Category", "Score"]] + [
+                    [category, f"{score}%"] for category, score in data['category_scores'].items()
+                ], [3, 2], '#1e3c72'),
+                page_break(),
+            ]),
+            section("comprehensive.strengths", 1, [data['strengths'], data['improvements_needed']], lambda: [
+                para("Institutional Strengths", 'SectionHeading'),
+                *[para(f"• {strength}") for strength in data['strengths']],
+                spacer(0.2),
+                para("Areas for Improvement", 'SectionHeading'),
+                *[para(f"• {improvement}") for improvement in data['improvements_needed']],
+            ]),
         ]
-        
-        metrics_table = Table(metrics_data, colWidths=[3*inch, 2*inch])
-        metrics_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e3c72')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(metrics_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Category Scores
-        story.append(Paragraph("Compliance by Category", self.styles['SectionHeading']))
-        category_data = [["Category", "Score"]]
-        for category, score in data['category_scores'].items():
-            category_data.append([category, f"{score}%"])
-        
-        category_table = Table(category_data, colWidths=[3*inch, 2*inch])
-        category_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e3c72')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(category_table)
-        story.append(PageBreak())
-        
-        # Strengths and Improvements
-        story.append(Paragraph("Institutional Strengths", self.styles['SectionHeading']))
-        for strength in data['strengths']:
-            story.append(Paragraph(f"• {strength}", self.styles['Normal']))
-        story.append(Spacer(1, 0.2*inch))
-        
-        story.append(Paragraph("Areas for Improvement", self.styles['SectionHeading']))
-        for improvement in data['improvements_needed']:
-            story.append(Paragraph(f"• {improvement}", self.styles['Normal']))
-        
-        # Build PDF
-        doc.build(story)
-        logger.info(f"Generated comprehensive report: {file_path}")
-        
-        return file_path
     
-    async def _generate_gap_analysis_report(
-        self,
-        report_id: str,
-        data: Dict[str, Any],
-        parameters: Dict[str, Any]
-    ) -> str:
-        """Generate gap analysis report"""
-        file_path = f"/tmp/gap_analysis_{report_id}.pdf"
-        doc = SimpleDocTemplate(file_path, pagesize=letter)
-        
-        story = []
-        
-        # Title
-        story.append(Paragraph("GAP ANALYSIS REPORT", self.styles['CoverTitle']))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Summary
-        story.append(Paragraph("Gap Summary", self.styles['SectionHeading']))
-        gap_summary = [
-            ["Severity", "Count"],
-            ["Critical", str(data['critical_gaps'])],
-            ["Major", str(data['major_gaps'])],
-            ["Minor", str(data['minor_gaps'])],
-            ["Total", str(data['total_gaps'])]
+    def _generate_gap_analysis_report(self, data: Dict[str, Any]) -> List[Section]:
+        """Sections of the gap analysis report"""
+        section = self.renderer.section
+        counts = [data[k] for k in ('critical_gaps', 'major_gaps', 'minor_gaps', 'total_gaps')]
+        top_gaps = data['detailed_gaps'][:5]  # Show top 5 gaps
+        return [
+            section("gap_analysis.summary", 1, counts, lambda: [
+                para("GAP ANALYSIS REPORT", 'CoverTitle'),
+                spacer(0.3),
+                para("Gap Summary", 'SectionHeading'),
+                table([
+                    ["Severity", "Count"],
+                    ["Critical", str(data['critical_gaps'])],
+                    ["Major", str(data['major_gaps'])],
+                    ["Minor", str(data['minor_gaps'])],
+                    ["Total", str(data['total_gaps'])]
+                ], [2, 1], '#ef4444', align='CENTER', footer_color='grey'),
+                spacer(0.3),
+            ]),
+            section("gap_analysis.detailed_gaps", 1, top_gaps, lambda: [
+                para("Detailed Gap Analysis", 'SectionHeading'),
+                *[instruction for gap in top_gaps for instruction in (
+                    para(f"<b>{gap['standard']} - {gap['title']}</b>"),
+                    para(f"Severity: {gap['severity']}"),
+                    para(f"Description: {gap['description']}"),
+                    para(f"Recommendation: {gap['recommendation']}"),
+                    spacer(0.2),
+                )],
+            ]),
         ]
-        
-        gap_table = Table(gap_summary, colWidths=[2*inch, 1*inch])
-        gap_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ef4444')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.grey)
-        ]))
-        story.append(gap_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Detailed Gaps
-        story.append(Paragraph("Detailed Gap Analysis", self.styles['SectionHeading']))
-        for gap in data['detailed_gaps'][:5]:  # Show top 5 gaps
-            story.append(Paragraph(f"<b>{gap['standard']} - {gap['title']}</b>", self.styles['Normal']))
-            story.append(Paragraph(f"Severity: {gap['severity']}", self.styles['Normal']))
-            story.append(Paragraph(f"Description: {gap['description']}", self.styles['Normal']))
-            story.append(Paragraph(f"Recommendation: {gap['recommendation']}", self.styles['Normal']))
-            story.append(Spacer(1, 0.2*inch))
-        
-        doc.build(story)
-        logger.info(f"Generated gap analysis report: {file_path}")
-        
-        return file_path
     
-    async def _generate_qep_report(
-        self,
-        report_id: str,
-        data: Dict[str, Any],
-        parameters: Dict[str, Any]
-    ) -> str:
-        """Generate QEP impact assessment report"""
-        file_path = f"/tmp/qep_{report_id}.pdf"
-        doc = SimpleDocTemplate(file_path, pagesize=letter)
-        
-        story = []
-        
-        # Title
-        story.append(Paragraph("QEP IMPACT ASSESSMENT", self.styles['CoverTitle']))
-        story.append(Paragraph(data['qep_title'], self.styles['Heading2']))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Metrics
-        story.append(Paragraph("Assessment Metrics", self.styles['SectionHeading']))
-        metrics_data = [["Metric", "Score"]]
-        for metric, score in data['assessment_metrics'].items():
-            metrics_data.append([metric, f"{score}%"])
-        
-        metrics_table = Table(metrics_data, colWidths=[3*inch, 1.5*inch])
-        metrics_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#10b981')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(metrics_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Outcomes
-        story.append(Paragraph("Outcomes Achieved", self.styles['SectionHeading']))
-        for outcome in data['outcomes_achieved']:
-            story.append(Paragraph(f"• {outcome}", self.styles['Normal']))
-        
-        doc.build(story)
-        logger.info(f"Generated QEP report: {file_path}")
-        
-        return file_path
+    def _generate_qep_report(self, data: Dict[str, Any]) -> List[Section]:
+        """Sections of the QEP impact assessment report"""
+        section = self.renderer.section
+        return [
+            section("qep.title", 1, data['qep_title'], lambda: [
+                para("QEP IMPACT ASSESSMENT", 'CoverTitle'),
+                para(data['qep_title'], 'Heading2'),
+                spacer(0.3),
+            ]),
+            section("qep.metrics", 1, data['assessment_metrics'], lambda: [
+                para("Assessment Metrics", 'SectionHeading'),
+                table([["Metric", "Score"]] + [
+                    [metric, f"{score}%"] for metric, score in data['assessment_metrics'].items()
+                ], [3, 1.5], '#10b981'),
+                spacer(0.3),
+            ]),
+            section("qep.outcomes", 1, data['outcomes_achieved'], lambda: [
+                para("Outcomes Achieved", 'SectionHeading'),
+                *[para(f"• {outcome}") for outcome in data['outcomes_achieved']],
+            ]),
+        ]
     
-    async def _generate_evidence_mapping_report(
-        self,
-        report_id: str,
-        data: Dict[str, Any],
-        parameters: Dict[str, Any]
-    ) -> str:
-        """Generate evidence mapping summary report"""
-        file_path = f"/tmp/evidence_mapping_{report_id}.pdf"
-        doc = SimpleDocTemplate(file_path, pagesize=letter)
-        
-        story = []
-        
-        # Title
-        story.append(Paragraph("EVIDENCE MAPPING SUMMARY", self.styles['CoverTitle']))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Summary Stats
-        story.append(Paragraph("Mapping Overview", self.styles['SectionHeading']))
-        overview_data = [
-            ["Metric", "Value"],
-            ["Total Documents", str(data['total_documents'])],
-            ["Mapped Standards", str(data['mapped_standards'])],
-            ["Unmapped Standards", str(data['unmapped_standards'])],
-            ["Mapping Confidence", f"{data['mapping_confidence']}%"]
+    def _generate_evidence_mapping_report(self, data: Dict[str, Any]) -> List[Section]:
+        """Sections of the evidence mapping summary report"""
+        section = self.renderer.section
+        overview = [data[k] for k in ('total_documents', 'mapped_standards', 'unmapped_standards', 'mapping_confidence')]
+        return [
+            section("evidence_mapping.overview", 1, overview, lambda: [
+                para("EVIDENCE MAPPING SUMMARY", 'CoverTitle'),
+                spacer(0.3),
+                para("Mapping Overview", 'SectionHeading'),
+                table([
+                    ["Metric", "Value"],
+                    ["Total Documents", str(data['total_documents'])],
+                    ["Mapped Standards", str(data['mapped_standards'])],
+                    ["Unmapped Standards", str(data['unmapped_standards'])],
+                    ["Mapping Confidence", f"{data['mapping_confidence']}%"]
+                ], [3, 2], '#6366f1'),
+                spacer(0.3),
+            ]),
+            section("evidence_mapping.standards_coverage", 1, data['top_mapped_standards'], lambda: [
+                para("Standards Coverage", 'SectionHeading'),
+                table([["Standard", "Documents", "Confidence"]] + [
+                    [s['standard'], s['documents'], s['confidence']] for s in data['top_mapped_standards']
+                ], [2, 1.5, 1.5], '#6366f1'),
+                spacer(0.3),
+            ]),
+            section("evidence_mapping.evidence_appendix", 1,
+                    [data['evidence_by_category'], data['unmapped_standards_list']], lambda: [
+                para("Evidence Appendix", 'SectionHeading'),
+                table([["Evidence Category", "Items"]] + [
+                    [category, count] for category, count in data['evidence_by_category'].items()
+                ], [3, 2], '#6366f1'),
+                spacer(0.2),
+                para("Standards Without Evidence", 'SectionHeading'),
+                *[para(f"• {standard}") for standard in data['unmapped_standards_list']],
+            ]),
         ]
-        
-        overview_table = Table(overview_data, colWidths=[3*inch, 2*inch])
-        overview_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#6366f1')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(overview_table)
-        
-        doc.build(story)
-        logger.info(f"Generated evidence mapping report: {file_path}")
-        
-        return file_path
 
 
 # Singleton instance
@@ -0,0 +1,308 @@
+"""
+Process-pool report rendering with a content-addressed cache.
+
+Reports are described as a list of sections, each a small JSON-serialisable
+list of drawing instructions (paragraphs, tables, spacers, page breaks).
+That keeps rendering inputs picklable, so reportlab layout runs in a worker
+process instead of on the API event loop, and it makes every level cacheable:
+
+- whole documents are stored as ``<digest>.pdf`` where the digest covers the
+  report type, template version and input data snapshot, so regenerating an
+  unchanged report is a file lookup;
+- section fragments are cached by (section name, section version, section
+  inputs), so when one input changes only that section's instructions are
+  rebuilt before the document is laid out again.
+
+Concurrent requests for the same digest share one render.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_DIR = Path(os.getenv("REPORT_CACHE_DIR", "reports_generated/cache"))
+_RENDER_WORKERS = int(os.getenv("REPORT_RENDER_WORKERS", "2"))
+_SECTION_MEMORY_ENTRIES = 512
+
+Instruction = List[Any]
+Section = Tuple[str, List[Instruction]]
+
+
+def digest(*parts: Any) -> str:
+    """Stable sha256 over JSON-serialisable parts."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Instruction helpers (used by report builders)
+# ----------------------------------------------------------------------
+def para(text: str, style: str = "Normal") -> Instruction:
+    return ["para", text, style]
+
+
+def spacer(height_inches: float) -> Instruction:
+    return ["spacer", height_inches]
+
+
+def page_break() -> Instruction:
+    return ["page_break"]
+
+
+def table(rows: Sequence[Sequence[Any]], col_widths_inches: Sequence[float], header_color: str,
+          align: str = "LEFT", body_color: Optional[str] = None, footer_color: Optional[str] = None,
+          header_font_size: Optional[int] = None) -> Instruction:
+    return ["table", [[str(c) for c in row] for row in rows], list(col_widths_inches), {
+        "header_color": header_color,
+        "align": align,
+        "body_color": body_color,
+        "footer_color": footer_color,
+        "header_font_size": header_font_size,
+    }]
+
+
+# ----------------------------------------------------------------------
+# Rendering (runs in the worker process)
+# ----------------------------------------------------------------------
+def build_styles():
+    """Report paragraph styles (sample sheet plus the A3E cover/section styles)."""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name='CoverTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1e3c72'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    ))
+    styles.add(ParagraphStyle(
+        name='SectionHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#1e3c72'),
+        spaceAfter=12,
+        spaceBefore=12
+    ))
+    styles.add(ParagraphStyle(
+        name='MetricHighlight',
+        parent=styles['Normal'],
+        fontSize=14,
+        textColor=colors.HexColor('#10b981'),
+        alignment=TA_CENTER
+    ))
+    return styles
+
+
+def _flowables(instructions: Sequence[Instruction], styles) -> List[Any]:
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.platypus import PageBreak, Paragraph, Spacer, Table, TableStyle
+
+    story: List[Any] = []
+    for kind, *args in instructions:
+        if kind == "para":
+            story.append(Paragraph(args[0], styles[args[1]]))
+        elif kind == "spacer":
+            story.append(Spacer(1, args[0] * inch))
+        elif kind == "page_break":
+            story.append(PageBreak())
+        elif kind == "table":
+            rows, widths, opts = args
+            commands: List[Tuple[Any, ...]] = [
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(opts["header_color"])),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), opts["align"]),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ]
+            if opts.get("header_font_size"):
+                commands += [
+                    ('FONTSIZE', (0, 0), (-1, 0), opts["header_font_size"]),
+                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ]
+            if opts.get("body_color"):
+                commands.append(('BACKGROUND', (0, 1), (-1, -1), getattr(colors, opts["body_color"])))
+            commands.append(('GRID', (0, 0), (-1, -1), 1, colors.black))
+            if opts.get("footer_color"):
+                commands.append(('BACKGROUND', (0, -1), (-1, -1), getattr(colors, opts["footer_color"])))
+            flowable = Table(rows, colWidths=[w * inch for w in widths])
+            flowable.setStyle(TableStyle(commands))
+            story.append(flowable)
+        else:
+            raise ValueError(f"Unknown report instruction: {kind}")
+    return story
+
+
+def render_pdf(sections: Sequence[Section], output_path: str) -> str:
+    """Lay out ``sections`` into a PDF at ``output_path`` (atomic replace)."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate
+
+    styles = build_styles()
+    story: List[Any] = []
+    for _, instructions in sections:
+        story.extend(_flowables(instructions, styles))
+    tmp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+    SimpleDocTemplate(tmp_path, pagesize=letter).build(story)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+# ----------------------------------------------------------------------
+# Cache + pool
+# ----------------------------------------------------------------------
+class ReportRenderer:
+    """Content-addressed report cache in front of a rendering process pool."""
+
+    def __init__(self, cache_dir: Path = REPORT_CACHE_DIR, max_workers: int = _RENDER_WORKERS,
+                 executor: Optional[Executor] = None):
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._lock = threading.Lock()
+        self._sections: "OrderedDict[str, List[Instruction]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "section_hits": 0, "section_misses": 0}
+
+    def _executor_or_create(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._owns_executor:
+            executor.shutdown(wait=False)
+
+    def document_path(self, key: str, suffix: str = ".pdf") -> Path:
+        return self.cache_dir / "documents" / f"{key}{suffix}"
+
+    @staticmethod
+    def materialize(cached: Path, destination: Path) -> Path:
+        """Give a report its own file (hard link when possible) so deleting it keeps the cache."""
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if destination.exists():
+            destination.unlink()
+        try:
+            os.link(cached, destination)
+        except OSError:
+            shutil.copyfile(cached, destination)
+        return destination
+
+    # -- sections ------------------------------------------------------
+    def section(self, name: str, version: int, inputs: Any,
+                build: Callable[[], List[Instruction]]) -> Section:
+        """Return a section's instructions, rebuilding only if its inputs changed."""
+        key = digest("section", name, version, inputs)
+        with self._lock:
+            cached = self._sections.get(key)
+            if cached is not None:
+                self._sections.move_to_end(key)
+                self.stats["section_hits"] += 1
+                return name, cached
+        path = self.cache_dir / "sections" / f"{key}.json"
+        instructions: Optional[List[Instruction]] = None
+        if path.exists():
+            try:
+                instructions = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                instructions = None
+        if instructions is None:
+            instructions = build()
+            self.stats["section_misses"] += 1
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            tmp.write_text(json.dumps(instructions), encoding="utf-8")
+            os.replace(tmp, path)
+        else:
+            self.stats["section_hits"] += 1
+        with self._lock:
+            self._sections[key] = instructions
+            while len(self._sections) > _SECTION_MEMORY_ENTRIES:
+                self._sections.popitem(last=False)
+        return name, instructions
+
+    # -- documents -----------------------------------------------------
+    async def get_or_render(self, key: str, render: Callable[..., Any], *args: Any,
+                            suffix: str = ".pdf") -> Tuple[Path, bool]:
+        """Return ``(path, cache_hit)``; on a miss run ``render(*args, path)`` in the pool.
+
+        ``render`` must be a module-level (picklable) function.
+        """
+        path = self.document_path(key, suffix)
+        if path.exists():
+            self.stats["hits"] += 1
+            return path, True
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending), True
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            self.stats["misses"] += 1
+            path.parent.mkdir(parents=True, exist_ok=True)
+            await self._run(render, *args, str(path))
+            future.set_result(path)
+            return path, False
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters (if any) see the exception; avoid "never retrieved" noise
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor_or_create(), fn, *args)
+        except (BrokenProcessPool, OSError, NotImplementedError) as e:
+            # No usable process pool (restricted sandbox, fork limits): keep the loop free anyway
+            logger.warning(f"Report process pool unavailable, rendering in a thread: {e}")
+            with self._lock:
+                if self._owns_executor:
+                    self._executor = None
+            return await asyncio.to_thread(fn, *args)
+
+    async def render_sections(self, report_type: str, template_version: int, snapshot: Any,
+                              build_sections: Callable[[], List[Section]]) -> Tuple[Path, bool]:
+        """Render a sectioned report, reusing the cached PDF if inputs are unchanged."""
+        key = digest("report", report_type, template_version, snapshot)
+        path = self.document_path(key)
+        if path.exists():
+            self.stats["hits"] += 1
+            return path, True
+        return await self.get_or_render(key, render_pdf, build_sections())
+
+
+_renderer: Optional[ReportRenderer] = None
+
+
+def get_report_renderer() -> ReportRenderer:
+    global _renderer
+    if _renderer is None:
+        _renderer = ReportRenderer()
+    return _renderer
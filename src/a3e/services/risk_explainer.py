@@ -7,14 +7,21 @@ Design Goals:
 - No heavy database dependency: accept injected / cached lightweight structures
 - Deterministic, explainable outputs with factor weights & raw inputs
 - Aggregations for dashboard: distribution buckets, avg trust, top factors
+- Columnar scoring: whole standard sets are scored in one vectorized pass and
+  explanation objects are only built on demand
+- Per-tenant bounded caches of the most recent scores
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass
-from statistics import mean
 import logging
-from .gap_risk_predictor import gap_risk_predictor, GapRiskScore
+import threading
+
+import numpy as np
+
+from .gap_risk_predictor import gap_risk_predictor, GapRiskScore, GapRiskBatch, FACTOR_NAMES
 
 logger = logging.getLogger(__name__)
 
@@ -45,20 +52,80 @@ class StandardEvidenceSnapshot:
         )
 
 
+_DEFAULT_TENANT = "global"
+
+
 class RiskExplainer:
-    def __init__(self):
-        self._last_scores: Dict[str, GapRiskScore] = {}
+    def __init__(self, max_tenants: int = 1024, max_standards_per_tenant: int = 5000):
+        self.max_tenants = max_tenants
+        self.max_standards_per_tenant = max_standards_per_tenant
+        self._lock = threading.Lock()
+        # tenant -> standard_id -> (batch, row) ; both levels kept in LRU order
+        self._tenants: "OrderedDict[str, OrderedDict[str, Tuple[GapRiskBatch, int]]]" = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # Cache management
+    # ------------------------------------------------------------------
+    def _remember(self, batch: GapRiskBatch, tenant: Optional[str]) -> None:
+        key = tenant or _DEFAULT_TENANT
+        with self._lock:
+            cache = self._tenants.get(key)
+            if cache is None:
+                cache = self._tenants[key] = OrderedDict()
+                while len(self._tenants) > self.max_tenants:
+                    self._tenants.popitem(last=False)
+            else:
+                self._tenants.move_to_end(key)
+            for i, sid in enumerate(batch.standard_ids):
+                cache[sid] = (batch, i)
+                cache.move_to_end(sid)
+            while len(cache) > self.max_standards_per_tenant:
+                cache.popitem(last=False)
+
+    def _entries(self, tenant: Optional[str]) -> List[Tuple[GapRiskBatch, int]]:
+        with self._lock:
+            cache = self._tenants.get(tenant or _DEFAULT_TENANT)
+            return list(cache.values()) if cache else []
 
-    def compute_standard_risk(self, snapshot: StandardEvidenceSnapshot) -> GapRiskScore:
-        score = gap_risk_predictor.predict_risk(**snapshot.to_inputs())
-        self._last_scores[score.standard_id] = score
-        return score
+    def reset(self, tenant: Optional[str] = None) -> None:
+        with self._lock:
+            self._tenants.pop(tenant or _DEFAULT_TENANT, None)
 
-    def compute_bulk(self, snapshots: List[StandardEvidenceSnapshot]) -> List[GapRiskScore]:
-        return [self.compute_standard_risk(s) for s in snapshots]
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+    def compute_batch(self, standard_ids: List[str], coverage_percentage: Any, *, tenant: Optional[str] = None, **columns: Any) -> GapRiskBatch:
+        """Score N standards from columnar inputs (see ``GapRiskPredictor.predict_risk_batch``)."""
+        batch = gap_risk_predictor.predict_risk_batch(standard_ids, coverage_percentage, **columns)
+        self._remember(batch, tenant)
+        return batch
 
-    def aggregate(self) -> Dict[str, Any]:
-        if not self._last_scores:
+    def compute_snapshots(self, snapshots: List[StandardEvidenceSnapshot], *, tenant: Optional[str] = None) -> GapRiskBatch:
+        return self.compute_batch(
+            [s.standard_id for s in snapshots],
+            [s.coverage_percent for s in snapshots],
+            tenant=tenant,
+            evidence_trust_scores=[s.trust_scores for s in snapshots],
+            evidence_ages_days=[s.evidence_ages_days for s in snapshots],
+            overdue_tasks_count=[s.overdue_tasks for s in snapshots],
+            total_tasks_count=[s.total_tasks for s in snapshots],
+            recent_changes_count=[s.recent_changes for s in snapshots],
+            historical_findings_count=[s.historical_findings for s in snapshots],
+            time_to_next_review_days=[s.days_to_review for s in snapshots],
+        )
+
+    def compute_standard_risk(self, snapshot: StandardEvidenceSnapshot, tenant: Optional[str] = None) -> GapRiskScore:
+        return self.compute_snapshots([snapshot], tenant=tenant).score(0)
+
+    def compute_bulk(self, snapshots: List[StandardEvidenceSnapshot], tenant: Optional[str] = None) -> List[GapRiskScore]:
+        return self.compute_snapshots(snapshots, tenant=tenant).scores()
+
+    # ------------------------------------------------------------------
+    # Aggregation / explanation
+    # ------------------------------------------------------------------
+    def aggregate(self, tenant: Optional[str] = None) -> Dict[str, Any]:
+        entries = self._entries(tenant)
+        if not entries:
             return {
                 "standards_scored": 0,
                 "average_risk": 0.0,
@@ -66,43 +133,44 @@ class RiskExplainer:
                 "average_trust": 0.0,
                 "top_risk_factors": [],
             }
-        scores = list(self._last_scores.values())
-        risk_values = [s.risk_score for s in scores]
-        avg_risk = sum(risk_values)/len(risk_values)
-        # Distribution by level
-        dist: Dict[str, int] = {}
-        factor_contrib: Dict[str, float] = {}
-        trust_vals: List[float] = []
-        for s in scores:
-            dist[s.risk_level.value] = dist.get(s.risk_level.value, 0) + 1
-            for f in s.factors:
-                factor_contrib[f.factor_name] = factor_contrib.get(f.factor_name, 0.0) + f.contribution
-                if f.factor_name == 'trust':
-                    trust_vals.append(1.0 - f.normalized_value)  # original avg trust value
-        # Normalize factor contributions
-        total_contrib = sum(factor_contrib.values()) or 1.0
+        # Gather rows batch-by-batch so each source array is indexed once
+        rows_by_batch: Dict[int, Tuple[GapRiskBatch, List[int]]] = {}
+        for batch, row in entries:
+            rows_by_batch.setdefault(id(batch), (batch, []))[1].append(row)
+        risk = np.concatenate([b.risk_score[rows] for b, rows in rows_by_batch.values()])
+        levels = np.concatenate([b.level_index[rows] for b, rows in rows_by_batch.values()])
+        trust = np.concatenate([b.average_trust[rows] for b, rows in rows_by_batch.values()])
+        contrib = np.concatenate([b.contributions[rows] for b, rows in rows_by_batch.values()]).sum(axis=0)
+
+        level_names = [lvl.value for lvl in GapRiskBatch.level_order()]
+        counts = np.bincount(levels.astype(np.int64), minlength=len(level_names))
+        dist = {level_names[i]: int(c) for i, c in enumerate(counts) if c}
+        total_contrib = float(contrib.sum()) or 1.0
         top_factors = sorted(
             [
                 {
-                    "factor": k,
-                    "aggregate_contribution": round(v, 4),
-                    "percent_of_total": round((v/total_contrib)*100, 2),
+                    "factor": name,
+                    "aggregate_contribution": round(float(v), 4),
+                    "percent_of_total": round((float(v)/total_contrib)*100, 2),
                 }
-                for k, v in factor_contrib.items()
+                for name, v in zip(FACTOR_NAMES, contrib)
             ], key=lambda x: x["aggregate_contribution"], reverse=True
         )[:5]
         return {
-            "standards_scored": len(scores),
-            "average_risk": round(avg_risk, 4),
+            "standards_scored": int(risk.size),
+            "average_risk": round(float(risk.mean()), 4),
             "risk_distribution": dist,
-            "average_trust": round(mean(trust_vals), 4) if trust_vals else 0.0,
+            "average_trust": round(float(trust.mean()), 4),
             "top_risk_factors": top_factors,
         }
 
-    def explain_standard(self, standard_id: str) -> Dict[str, Any]:
-        score = self._last_scores.get(standard_id)
-        if not score:
+    def explain_standard(self, standard_id: str, tenant: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            cache = self._tenants.get(tenant or _DEFAULT_TENANT) or {}
+            entry = cache.get(standard_id)
+        if not entry:
             return {"standard_id": standard_id, "status": "not_scored"}
+        score = entry[0].score(entry[1])
         return {
             "standard_id": standard_id,
             "risk_score": score.risk_score,
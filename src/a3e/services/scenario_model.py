@@ -0,0 +1,206 @@
+"""
+ROI scenario model shared by the single-point calculator and the sweep API.
+
+``scenario_metrics`` is plain arithmetic over its inputs, so it accepts Python
+scalars (``/scenarios/calculate``) or NumPy arrays (``/scenarios/sweep``) and
+both paths produce the same numbers. The sweep helpers evaluate a full grid or
+a Monte Carlo sample in one array pass and reduce it to percentiles, tornado
+sensitivity and a two-parameter break-even surface.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+TIME_REDUCTION_FACTOR = 0.75  # MapMyStandards reduces report time by 70-80%
+SUBSCRIPTION_COST = 199 * 12  # $199/month
+TEAM_HOURS_PER_YEAR = 2000
+TEAM_EFFICIENCY_GAIN = 0.5
+RISK_BUDGET_RATE = 0.002  # 0.2% of budget as potential penalty avoidance
+NO_PAYBACK_MONTHS = 999
+
+# Inputs the model actually depends on (and therefore the ones worth sweeping)
+SWEEPABLE = ("reports_per_year", "hours_per_report", "avg_hourly_rate", "compliance_team_size", "annual_budget")
+METRICS = (
+    "current_annual_cost",
+    "projected_annual_cost",
+    "annual_savings",
+    "five_year_savings",
+    "roi_percentage",
+    "payback_period_months",
+    "time_saved_hours",
+    "risk_reduction_value",
+)
+
+
+def scenario_metrics(reports_per_year, hours_per_report, avg_hourly_rate, compliance_team_size,
+                     annual_budget) -> Dict[str, Any]:
+    """Core ROI formulas; scalar in -> scalar out, arrays in -> arrays out."""
+    report_costs = reports_per_year * hours_per_report * avg_hourly_rate
+    team_costs = compliance_team_size * avg_hourly_rate * TEAM_HOURS_PER_YEAR
+    current_annual_cost = report_costs + team_costs
+
+    time_saved_hours = reports_per_year * hours_per_report * TIME_REDUCTION_FACTOR
+    reduced_report_costs = reports_per_year * hours_per_report * (1 - TIME_REDUCTION_FACTOR) * avg_hourly_rate
+    efficient_team_costs = compliance_team_size * avg_hourly_rate * TEAM_HOURS_PER_YEAR * TEAM_EFFICIENCY_GAIN
+    projected_annual_cost = SUBSCRIPTION_COST + reduced_report_costs + efficient_team_costs
+
+    annual_savings = current_annual_cost - projected_annual_cost
+    five_year_savings = annual_savings * 5 - SUBSCRIPTION_COST * 4  # Subtract 4 years of subscription
+    roi_percentage = (annual_savings / SUBSCRIPTION_COST) * 100
+
+    if isinstance(annual_savings, np.ndarray):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            months = np.floor((SUBSCRIPTION_COST / annual_savings) * 12)
+        payback_period_months = np.where(annual_savings > 0, months, NO_PAYBACK_MONTHS)
+    else:
+        payback_period_months = (
+            int((SUBSCRIPTION_COST / annual_savings) * 12) if annual_savings > 0 else NO_PAYBACK_MONTHS
+        )
+
+    return {
+        "current_annual_cost": current_annual_cost,
+        "projected_annual_cost": projected_annual_cost,
+        "annual_savings": annual_savings,
+        "five_year_savings": five_year_savings,
+        "roi_percentage": roi_percentage,
+        "payback_period_months": payback_period_months,
+        "time_saved_hours": time_saved_hours,
+        "risk_reduction_value": annual_budget * RISK_BUDGET_RATE,
+    }
+
+
+def evaluate(base: Mapping[str, float], overrides: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Evaluate the model with some inputs replaced by (broadcastable) arrays."""
+    columns = {name: np.asarray(overrides.get(name, base[name]), dtype=np.float64) for name in SWEEPABLE}
+    shape = np.broadcast_shapes(*(c.shape for c in columns.values()))
+    metrics = scenario_metrics(**columns)
+    return {name: np.broadcast_to(np.asarray(value, dtype=np.float64), shape) for name, value in metrics.items()}
+
+
+# ----------------------------------------------------------------------
+# Parameter specs
+# ----------------------------------------------------------------------
+def grid_values(spec: Mapping[str, Any]) -> np.ndarray:
+    if spec.get("values"):
+        return np.asarray(spec["values"], dtype=np.float64)
+    return np.linspace(float(spec["min"]), float(spec["max"]), int(spec.get("steps") or 10))
+
+
+def sample_values(spec: Mapping[str, Any], size: int, rng: np.random.Generator) -> np.ndarray:
+    kind = spec.get("distribution") or "uniform"
+    if spec.get("values") and kind == "uniform":
+        return rng.choice(np.asarray(spec["values"], dtype=np.float64), size=size)
+    if kind == "uniform":
+        values = rng.uniform(spec["min"], spec["max"], size)
+    elif kind == "triangular":
+        values = rng.triangular(spec["min"], spec.get("mode", (spec["min"] + spec["max"]) / 2), spec["max"], size)
+    elif kind == "normal":
+        values = rng.normal(spec["mean"], spec["std"], size)
+    elif kind == "lognormal":
+        # mean/std describe the distribution itself, not the underlying normal
+        mean, std = float(spec["mean"]), float(spec["std"])
+        sigma2 = np.log1p((std / mean) ** 2)
+        values = rng.lognormal(np.log(mean) - sigma2 / 2, np.sqrt(sigma2), size)
+    else:
+        raise ValueError(f"Unknown distribution: {kind}")
+    low, high = spec.get("min"), spec.get("max")
+    if low is not None or high is not None:
+        values = np.clip(values, low, high)
+    return np.maximum(values, 0.0)
+
+
+def bounds(spec: Mapping[str, Any], rng: Optional[np.random.Generator] = None) -> Tuple[float, float]:
+    """Low/high used for tornado bars and break-even axes."""
+    if spec.get("values"):
+        values = np.asarray(spec["values"], dtype=np.float64)
+        return float(values.min()), float(values.max())
+    if spec.get("distribution") in ("normal", "lognormal"):
+        draws = sample_values(spec, 20000, rng or np.random.default_rng(0))
+        low, high = np.percentile(draws, [5, 95])
+        return float(low), float(high)
+    return float(spec["min"]), float(spec["max"])
+
+
+# ----------------------------------------------------------------------
+# Sweeps
+# ----------------------------------------------------------------------
+def summarize(results: Mapping[str, np.ndarray], percentiles: Sequence[float]) -> Dict[str, Dict[str, float]]:
+    pct = np.asarray(percentiles, dtype=np.float64)
+    summary: Dict[str, Dict[str, float]] = {}
+    for name in METRICS:
+        column = np.asarray(results[name]).ravel()
+        values = np.percentile(column, pct)
+        row = {f"p{p:g}": round(float(v), 2) for p, v in zip(pct, values)}
+        row["mean"] = round(float(column.mean()), 2)
+        row["min"] = round(float(column.min()), 2)
+        row["max"] = round(float(column.max()), 2)
+        summary[name] = row
+    savings = np.asarray(results["annual_savings"]).ravel()
+    summary["annual_savings"]["probability_positive"] = round(float((savings > 0).mean()), 4)
+    return summary
+
+
+def tornado(base: Mapping[str, float], ranges: Mapping[str, Tuple[float, float]],
+            metric: str = "annual_savings") -> List[Dict[str, float]]:
+    """One-at-a-time sensitivity of ``metric`` to each parameter's low/high."""
+    names = list(ranges)
+    if not names:
+        return []
+    lows = np.array([ranges[n][0] for n in names])
+    highs = np.array([ranges[n][1] for n in names])
+    # Row i of each column holds the base value except parameter i at its bound
+    eye = np.eye(len(names), dtype=bool)
+    base_row = np.array([float(base[n]) for n in names])
+
+    def _at(bound: np.ndarray) -> np.ndarray:
+        grid = np.where(eye, bound[None, :], base_row[None, :])
+        return evaluate(base, {n: grid[:, i] for i, n in enumerate(names)})[metric]
+
+    low_values, high_values = _at(lows), _at(highs)
+    base_value = float(evaluate(base, {})[metric])
+    bars = [
+        {
+            "parameter": name,
+            "low_input": float(lows[i]),
+            "high_input": float(highs[i]),
+            "low": round(float(low_values[i]), 2),
+            "high": round(float(high_values[i]), 2),
+            "base": round(base_value, 2),
+            "swing": round(float(abs(high_values[i] - low_values[i])), 2),
+        }
+        for i, name in enumerate(names)
+    ]
+    bars.sort(key=lambda bar: bar["swing"], reverse=True)
+    return bars
+
+
+def break_even_surface(base: Mapping[str, float], x: str, x_range: Tuple[float, float], y: str,
+                       y_range: Tuple[float, float], resolution: int = 25,
+                       metric: str = "annual_savings") -> Dict[str, Any]:
+    """``metric`` over an x/y grid plus, per x, the interpolated y where it crosses zero."""
+    xs = np.linspace(x_range[0], x_range[1], resolution)
+    ys = np.linspace(y_range[0], y_range[1], resolution)
+    surface = evaluate(base, {x: xs[None, :], y: ys[:, None]})[metric]  # rows = y, cols = x
+
+    line: List[Optional[float]] = []
+    sign = surface > 0
+    for col in range(resolution):
+        flips = np.flatnonzero(sign[1:, col] != sign[:-1, col])
+        if not flips.size:
+            line.append(None)
+            continue
+        i = flips[0]
+        z0, z1 = surface[i, col], surface[i + 1, col]
+        t = z0 / (z0 - z1) if z0 != z1 else 0.0
+        line.append(round(float(ys[i] + t * (ys[i + 1] - ys[i])), 4))
+
+    return {
+        "metric": metric,
+        "x": {"parameter": x, "values": np.round(xs, 4).tolist()},
+        "y": {"parameter": y, "values": np.round(ys, 4).tolist()},
+        "values": np.round(surface, 2).tolist(),
+        "break_even": line,
+    }
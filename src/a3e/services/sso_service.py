@@ -10,7 +10,6 @@ import json
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, Tuple
 from urllib.parse import urlencode
-import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import logging
@@ -20,6 +19,7 @@ from ..models.user import User
 from ..database.enterprise_models import Team, SessionSecurity
 from ..services.team_service import TeamService
 from ..core.config import get_settings
+from .http_clients import get_http_clients
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -58,7 +58,7 @@ class GoogleOAuthProvider(SSOProvider):
         return f"{self.auth_endpoint}?{urlencode(params)}"
     
     async def exchange_code(self, code: str, redirect_uri: str) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
+        async with get_http_clients().borrow(self.token_endpoint) as client:
             # Exchange code for token
             token_response = await client.post(
                 self.token_endpoint,
@@ -71,25 +71,26 @@ class GoogleOAuthProvider(SSOProvider):
                 }
             )
             token_data = token_response.json()
-            
-            if "error" in token_data:
-                raise ValueError(f"OAuth error: {token_data.get('error_description', token_data['error'])}")
-            
-            # Get user info
+        
+        if "error" in token_data:
+            raise ValueError(f"OAuth error: {token_data.get('error_description', token_data['error'])}")
+        
+        # Get user info
+        async with get_http_clients().borrow(self.userinfo_endpoint) as client:
             userinfo_response = await client.get(
                 self.userinfo_endpoint,
                 headers={"Authorization": f"Bearer {token_data['access_token']}"}
             )
             userinfo = userinfo_response.json()
-            
-            return {
-                "provider": "google",
-                "email": userinfo["email"],
-                "name": userinfo.get("name"),
-                "picture": userinfo.get("picture"),
-                "provider_id": userinfo["id"],
-                "verified": userinfo.get("verified_email", False)
-            }
+        
+        return {
+            "provider": "google",
+            "email": userinfo["email"],
+            "name": userinfo.get("name"),
+            "picture": userinfo.get("picture"),
+            "provider_id": userinfo["id"],
+            "verified": userinfo.get("verified_email", False)
+        }
 
 class MicrosoftOAuthProvider(SSOProvider):
     """Microsoft/Azure AD OAuth 2.0 provider"""
@@ -114,7 +115,7 @@ class MicrosoftOAuthProvider(SSOProvider):
         return f"{self.auth_endpoint}?{urlencode(params)}"
     
     async def exchange_code(self, code: str, redirect_uri: str) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
+        async with get_http_clients().borrow(self.token_endpoint) as client:
             # Exchange code for token
             token_response = await client.post(
                 self.token_endpoint,
@@ -127,24 +128,25 @@ class MicrosoftOAuthProvider(SSOProvider):
                 }
             )
             token_data = token_response.json()
-            
-            if "error" in token_data:
-                raise ValueError(f"OAuth error: {token_data.get('error_description', token_data['error'])}")
-            
-            # Get user info
+        
+        if "error" in token_data:
+            raise ValueError(f"OAuth error: {token_data.get('error_description', token_data['error'])}")
+        
+        # Get user info
+        async with get_http_clients().borrow(self.userinfo_endpoint) as client:
             userinfo_response = await client.get(
                 self.userinfo_endpoint,
                 headers={"Authorization": f"Bearer {token_data['access_token']}"}
             )
             userinfo = userinfo_response.json()
-            
-            return {
-                "provider": "microsoft",
-                "email": userinfo.get("mail") or userinfo.get("userPrincipalName"),
-                "name": userinfo.get("displayName"),
-                "provider_id": userinfo["id"],
-                "verified": True
-            }
+        
+        return {
+            "provider": "microsoft",
+            "email": userinfo.get("mail") or userinfo.get("userPrincipalName"),
+            "name": userinfo.get("displayName"),
+            "provider_id": userinfo["id"],
+            "verified": True
+        }
 
 class OktaOAuthProvider(SSOProvider):
     """Okta OAuth 2.0 provider"""
@@ -168,7 +170,7 @@ class OktaOAuthProvider(SSOProvider):
         return f"{self.auth_endpoint}?{urlencode(params)}"
     
     async def exchange_code(self, code: str, redirect_uri: str) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
+        async with get_http_clients().borrow(self.token_endpoint) as client:
             # Exchange code for token
             auth_header = base64.b64encode(
                 f"{self.client_id}:{self.client_secret}".encode()
@@ -184,24 +186,25 @@ class OktaOAuthProvider(SSOProvider):
                 }
             )
             token_data = token_response.json()
-            
-            if "error" in token_data:
-                raise ValueError(f"OAuth error: {token_data.get('error_description', token_data['error'])}")
-            
-            # Get user info
+        
+        if "error" in token_data:
+            raise ValueError(f"OAuth error: {token_data.get('error_description', token_data['error'])}")
+        
+        # Get user info
+        async with get_http_clients().borrow(self.userinfo_endpoint) as client:
             userinfo_response = await client.get(
                 self.userinfo_endpoint,
                 headers={"Authorization": f"Bearer {token_data['access_token']}"}
             )
             userinfo = userinfo_response.json()
-            
-            return {
-                "provider": "okta",
-                "email": userinfo["email"],
-                "name": userinfo.get("name"),
-                "provider_id": userinfo["sub"],
-                "verified": userinfo.get("email_verified", False)
-            }
+        
+        return {
+            "provider": "okta",
+            "email": userinfo["email"],
+            "name": userinfo.get("name"),
+            "provider_id": userinfo["sub"],
+            "verified": userinfo.get("email_verified", False)
+        }
 
 class SSOService:
     """Main SSO service for handling authentication flows"""
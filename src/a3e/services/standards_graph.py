@@ -8,6 +8,8 @@ from datetime import datetime
 from dataclasses import dataclass
 import logging
 
+from ..core.lazy_loading import LazyObject
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +54,8 @@ class StandardsGraph:
         self.nodes: Dict[str, StandardNode] = {}
         self.accreditor_roots: Dict[str, List[str]] = {}
         self.keyword_index: Dict[str, Set[str]] = {}
+        # Bumped on reload so derived structures (coverage index layouts) can rebuild
+        self.revision = 0
         self._initialize_graph()
 
     # ------------------------ Initialization ------------------------
@@ -92,6 +96,7 @@ class StandardsGraph:
         - fallback_to_seed: if no corpus found, optionally repopulate seed data
         """
         # Clear existing graph
+        self.revision += 1
         self.nodes.clear()
         self.accreditor_roots.clear()
         self.keyword_index.clear()
@@ -528,5 +533,5 @@ class StandardsGraph:
         }
 
 
-# Global instance
-standards_graph = StandardsGraph()
+# Global instance; the corpus is loaded on first use
+standards_graph = LazyObject(StandardsGraph, "StandardsGraph corpus")
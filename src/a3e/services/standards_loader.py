@@ -4,6 +4,9 @@ Standards corpus loader
 Loads accreditor standards from YAML or JSON files under data/standards/.
 Normalizes IDs to include the accreditor prefix and returns a list of
 standard dicts compatible with StandardsGraph._add_standard_hierarchy.
+
+The normalized result is cached as a compiled snapshot (see
+core.standards_snapshot) that is reused until a source file changes.
 """
 from __future__ import annotations
 
@@ -12,6 +15,8 @@ from pathlib import Path
 import json
 import logging
 
+from ..core.standards_snapshot import load_with_snapshot, snapshot_path
+
 try:
     import yaml  # type: ignore
 except Exception:  # pragma: no cover - pyyaml is in requirements
@@ -19,6 +24,10 @@ except Exception:  # pragma: no cover - pyyaml is in requirements
 
 logger = logging.getLogger(__name__)
 
+CORPUS_SUFFIXES = {".yaml", ".yml", ".json"}
+# Bump when normalization output changes so existing snapshots are rebuilt
+CORPUS_LOADER_VERSION = "1"
+
 
 def _ensure_prefix(accreditor: str, raw_id: str) -> str:
     up = accreditor.upper()
@@ -47,25 +56,19 @@ def _normalize_entry(accreditor: str, entry: Dict[str, Any], defaults: Dict[str,
     return norm
 
 
-def load_corpus(dir_path: str | Path) -> Dict[str, List[Dict[str, Any]]]:
-    """Load all corpus files returning {accreditor: [standards...]}
-
-    NOTE: Extended metadata capture now also stored on a private attribute
-    standards_loader._corpus_metadata for later API exposure. This preserves
-    backward compatibility of the original return shape.
-    """
+def corpus_sources(dir_path: str | Path) -> List[Path]:
+    """Corpus files under ``dir_path`` in load order."""
     base = Path(dir_path)
-    if not base.exists():
-        logger.warning("Standards corpus directory not found: %s", base)
-        return {}
+    return sorted(
+        path for path in base.iterdir()
+        if path.is_file() and path.suffix.lower() in CORPUS_SUFFIXES
+    )
+
 
+def _parse_corpus(sources: List[Path]) -> Dict[str, Any]:
     results: Dict[str, List[Dict[str, Any]]] = {}
     corpus_metadata: Dict[str, Dict[str, Any]] = {}
-    for path in base.iterdir():
-        if not path.is_file():
-            continue
-        if path.suffix.lower() not in {".yaml", ".yml", ".json"}:
-            continue
+    for path in sources:
         try:
             if path.suffix.lower() in {".yaml", ".yml"}:
                 if yaml is None:
@@ -104,12 +107,35 @@ def load_corpus(dir_path: str | Path) -> Dict[str, List[Dict[str, Any]]]:
         except Exception as e:
             logger.exception("Failed normalizing %s: %s", path.name, e)
             continue
+    return {"standards": results, "metadata": corpus_metadata}
+
+
+def load_corpus(dir_path: str | Path, use_snapshot: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+    """Load all corpus files returning {accreditor: [standards...]}
+
+    NOTE: Extended metadata capture now also stored on a private attribute
+    standards_loader._corpus_metadata for later API exposure. This preserves
+    backward compatibility of the original return shape.
+    """
+    base = Path(dir_path)
+    if not base.exists():
+        logger.warning("Standards corpus directory not found: %s", base)
+        return {}
+
+    sources = corpus_sources(base)
+    if use_snapshot:
+        corpus = load_with_snapshot(
+            snapshot_path(base, "corpus"), "corpus", sources, CORPUS_LOADER_VERSION,
+            lambda: _parse_corpus(sources),
+        )
+    else:
+        corpus = _parse_corpus(sources)
     # Store for later external access (e.g., API endpoint) without changing signature
     try:
-        globals()["_corpus_metadata_cache"] = corpus_metadata
+        globals()["_corpus_metadata_cache"] = corpus["metadata"]
     except Exception:  # pragma: no cover
         pass
-    return results
+    return corpus["standards"]
 
 
 def get_corpus_metadata() -> Dict[str, Dict[str, Any]]:
@@ -0,0 +1,477 @@
+"""
+Local mirror of Stripe customers, subscriptions, prices and checkout sessions.
+
+Request handlers used to call Stripe synchronously (``Session.retrieve``,
+``Customer.retrieve``, ``Subscription.list``, ``Price.retrieve``), holding the
+event loop for a network round-trip each time. The mirror keeps that state in
+the database instead:
+
+* ``apply_event`` upserts the object carried by a Stripe webhook event;
+  every row remembers the ``created`` time of the event that last wrote it
+  so out-of-order deliveries never roll a row back. The event id goes into
+  ``stripe_events`` only via ``record_event``, which the webhook route calls
+  after its handler succeeded, so a failed handler is retried by Stripe and
+  a redelivery of a handled event is a no-op.
+* ``reconcile`` (run periodically by ``start()``) pages through customers,
+  subscriptions and prices with the Stripe client and overwrites the mirror,
+  covering missed or failed webhook deliveries.
+* The async readers serve from the mirror and, on a miss, fetch the object
+  once through the client in a worker thread and store it.
+
+The Stripe client is injectable (see ``StripeClient``) so the mirror can be
+exercised offline against recorded webhook fixtures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol
+
+import sqlalchemy as sa
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_RECONCILE_INTERVAL = float(os.getenv("STRIPE_RECONCILE_INTERVAL", "3600"))
+ACTIVE_SUBSCRIPTION_STATUSES = ("active", "trialing", "past_due")
+
+_mirror_metadata = sa.MetaData()
+
+stripe_events = sa.Table(
+    "stripe_events",
+    _mirror_metadata,
+    sa.Column("id", sa.String(255), primary_key=True),
+    sa.Column("type", sa.String(100), nullable=False),
+    sa.Column("created", sa.BigInteger, nullable=True),
+    sa.Column("processed_at", sa.DateTime(timezone=True), nullable=False),
+)
+
+stripe_customers = sa.Table(
+    "stripe_customers",
+    _mirror_metadata,
+    sa.Column("id", sa.String(255), primary_key=True),
+    sa.Column("email", sa.String(255), nullable=True, index=True),
+    sa.Column("name", sa.String(255), nullable=True),
+    sa.Column("deleted", sa.Boolean, nullable=False, default=False),
+    sa.Column("data", sa.Text, nullable=False),
+    sa.Column("stripe_version", sa.BigInteger, nullable=False),
+    sa.Column("synced_at", sa.DateTime(timezone=True), nullable=False),
+)
+
+stripe_subscriptions = sa.Table(
+    "stripe_subscriptions",
+    _mirror_metadata,
+    sa.Column("id", sa.String(255), primary_key=True),
+    sa.Column("customer_id", sa.String(255), nullable=True, index=True),
+    sa.Column("status", sa.String(40), nullable=False),
+    sa.Column("price_id", sa.String(255), nullable=True),
+    sa.Column("cancel_at_period_end", sa.Boolean, nullable=False, default=False),
+    sa.Column("current_period_end", sa.BigInteger, nullable=True),
+    sa.Column("data", sa.Text, nullable=False),
+    sa.Column("stripe_version", sa.BigInteger, nullable=False),
+    sa.Column("synced_at", sa.DateTime(timezone=True), nullable=False),
+)
+
+stripe_prices = sa.Table(
+    "stripe_prices",
+    _mirror_metadata,
+    sa.Column("id", sa.String(255), primary_key=True),
+    sa.Column("active", sa.Boolean, nullable=False, default=True),
+    sa.Column("currency", sa.String(10), nullable=True),
+    sa.Column("unit_amount", sa.BigInteger, nullable=True),
+    sa.Column("data", sa.Text, nullable=False),
+    sa.Column("stripe_version", sa.BigInteger, nullable=False),
+    sa.Column("synced_at", sa.DateTime(timezone=True), nullable=False),
+)
+
+stripe_checkout_sessions = sa.Table(
+    "stripe_checkout_sessions",
+    _mirror_metadata,
+    sa.Column("id", sa.String(255), primary_key=True),
+    sa.Column("customer_id", sa.String(255), nullable=True),
+    sa.Column("email", sa.String(255), nullable=True),
+    sa.Column("payment_status", sa.String(40), nullable=True),
+    sa.Column("subscription_id", sa.String(255), nullable=True),
+    sa.Column("data", sa.Text, nullable=False),
+    sa.Column("stripe_version", sa.BigInteger, nullable=False),
+    sa.Column("synced_at", sa.DateTime(timezone=True), nullable=False),
+)
+
+
+def ensure_mirror_tables(bind: Any) -> None:
+    """Create the mirror tables if migrations have not (SQLite/dev setups)."""
+    _mirror_metadata.create_all(bind=bind, checkfirst=True)
+
+
+def to_plain_dict(obj: Any) -> Dict[str, Any]:
+    """Stripe objects are dict subclasses; reduce them to JSON-native dicts."""
+    return json.loads(json.dumps(obj, default=str))
+
+
+def _price_id(subscription: Dict[str, Any]) -> Optional[str]:
+    items = (subscription.get("items") or {}).get("data") or []
+    if not items:
+        return None
+    price = items[0].get("price") or {}
+    return price.get("id") if isinstance(price, dict) else price
+
+
+def _period_end(subscription: Dict[str, Any]) -> Optional[int]:
+    # Newer API versions moved the billing period onto the subscription items
+    end = subscription.get("current_period_end")
+    if end is None:
+        items = (subscription.get("items") or {}).get("data") or []
+        end = items[0].get("current_period_end") if items else None
+    return end
+
+
+def _customer_id(value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        return value.get("id")
+    return value
+
+
+def _customer_row(obj: Dict[str, Any]) -> Dict[str, Any]:
+    return {"email": (obj.get("email") or "").lower() or None, "name": obj.get("name"),
+            "deleted": bool(obj.get("deleted", False))}
+
+
+def _subscription_row(obj: Dict[str, Any]) -> Dict[str, Any]:
+    return {"customer_id": _customer_id(obj.get("customer")), "status": obj.get("status") or "unknown",
+            "price_id": _price_id(obj), "cancel_at_period_end": bool(obj.get("cancel_at_period_end")),
+            "current_period_end": _period_end(obj)}
+
+
+def _price_row(obj: Dict[str, Any]) -> Dict[str, Any]:
+    return {"active": bool(obj.get("active", True)) and not obj.get("deleted", False),
+            "currency": obj.get("currency"), "unit_amount": obj.get("unit_amount")}
+
+
+def _session_row(obj: Dict[str, Any]) -> Dict[str, Any]:
+    details = obj.get("customer_details") or {}
+    email = details.get("email") or obj.get("customer_email")
+    return {"customer_id": _customer_id(obj.get("customer")), "email": email.lower() if email else None,
+            "payment_status": obj.get("payment_status"), "subscription_id": _customer_id(obj.get("subscription"))}
+
+
+# Stripe object type -> (table, column extractor)
+_OBJECTS = {
+    "customer": (stripe_customers, _customer_row),
+    "subscription": (stripe_subscriptions, _subscription_row),
+    "price": (stripe_prices, _price_row),
+    "checkout.session": (stripe_checkout_sessions, _session_row),
+}
+
+
+class StripeClient(Protocol):
+    """The Stripe calls the mirror makes; every method returns plain dicts."""
+
+    def retrieve_checkout_session(self, session_id: str) -> Dict[str, Any]: ...
+
+    def retrieve_customer(self, customer_id: str) -> Dict[str, Any]: ...
+
+    def retrieve_price(self, price_id: str) -> Dict[str, Any]: ...
+
+    def list_subscriptions(self, customer: Optional[str] = None) -> Iterable[Dict[str, Any]]: ...
+
+    def list_customers(self) -> Iterable[Dict[str, Any]]: ...
+
+    def list_prices(self) -> Iterable[Dict[str, Any]]: ...
+
+
+class StripeSDKClient:
+    """``StripeClient`` backed by the ``stripe`` package and ``STRIPE_SECRET_KEY``."""
+
+    def __init__(self, api_key: Optional[str] = None):
+        import stripe
+
+        self._stripe = stripe
+        if api_key:
+            stripe.api_key = api_key
+
+    def retrieve_checkout_session(self, session_id: str) -> Dict[str, Any]:
+        return to_plain_dict(self._stripe.checkout.Session.retrieve(session_id))
+
+    def retrieve_customer(self, customer_id: str) -> Dict[str, Any]:
+        return to_plain_dict(self._stripe.Customer.retrieve(customer_id))
+
+    def retrieve_price(self, price_id: str) -> Dict[str, Any]:
+        return to_plain_dict(self._stripe.Price.retrieve(price_id))
+
+    def list_subscriptions(self, customer: Optional[str] = None) -> Iterable[Dict[str, Any]]:
+        params = {"status": "all", "limit": 100}
+        if customer:
+            params["customer"] = customer
+        for obj in self._stripe.Subscription.list(**params).auto_paging_iter():
+            yield to_plain_dict(obj)
+
+    def list_customers(self) -> Iterable[Dict[str, Any]]:
+        for obj in self._stripe.Customer.list(limit=100).auto_paging_iter():
+            yield to_plain_dict(obj)
+
+    def list_prices(self) -> Iterable[Dict[str, Any]]:
+        for obj in self._stripe.Price.list(limit=100).auto_paging_iter():
+            yield to_plain_dict(obj)
+
+
+class StripeMirror:
+    """Database-backed view of the Stripe objects the request paths need."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        client: Optional[StripeClient] = None,
+        reconcile_interval: float = _RECONCILE_INTERVAL,
+    ):
+        self._session_factory = session_factory
+        self._client = client
+        self.reconcile_interval = reconcile_interval
+        self._tables_ready = False
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"events": 0, "duplicates": 0, "stale": 0, "hits": 0, "misses": 0, "reconciled": 0}
+
+    # ------------------------------------------------------------------
+    # Plumbing
+    # ------------------------------------------------------------------
+    @property
+    def client(self) -> StripeClient:
+        if self._client is None:
+            from ..core.config import get_settings
+
+            self._client = StripeSDKClient(get_settings().STRIPE_SECRET_KEY)
+        return self._client
+
+    def _sessions(self) -> Callable[[], Session]:
+        factory = self._session_factory
+        if factory is None:
+            from ..database.connection import db_manager
+
+            factory = db_manager.SessionLocal
+        if factory is None:
+            raise RuntimeError("Database not initialized")
+        if not self._tables_ready:
+            with factory() as session:
+                ensure_mirror_tables(session.get_bind())
+            self._tables_ready = True
+        return factory
+
+    def _upsert(self, session: Session, kind: str, obj: Dict[str, Any], version: int) -> bool:
+        """Write ``obj`` unless the row was written by a newer event; returns True if written."""
+        table, extract = _OBJECTS[kind]
+        values = dict(extract(obj), data=json.dumps(obj), stripe_version=version,
+                      synced_at=datetime.now(timezone.utc))
+        updated = session.execute(
+            table.update()
+            .where(table.c.id == obj["id"], table.c.stripe_version <= version)
+            .values(**values)
+        ).rowcount
+        if updated:
+            return True
+        exists = session.execute(sa.select(table.c.id).where(table.c.id == obj["id"])).first()
+        if exists:
+            self.stats["stale"] += 1
+            return False
+        session.execute(table.insert().values(id=obj["id"], **values))
+        return True
+
+    def store(self, kind: str, objects: Iterable[Dict[str, Any]], version: Optional[int] = None) -> int:
+        """Upsert objects fetched from Stripe directly (current as of ``version``, default now)."""
+        version = int(time.time()) if version is None else version
+        objects = list(objects)  # page through Stripe before holding a connection
+        written = 0
+        with self._sessions()() as session:
+            for obj in objects:
+                written += self._upsert(session, kind, obj, version)
+            session.commit()
+        return written
+
+    # ------------------------------------------------------------------
+    # Webhook events
+    # ------------------------------------------------------------------
+    def apply_event(self, event: Dict[str, Any], record: bool = True) -> bool:
+        """Mirror the object in a webhook event; False if the event id was already recorded.
+
+        With ``record=False`` the id is not stored; call ``record_event`` once
+        the event's business handling has succeeded.
+        """
+        obj = (event.get("data") or {}).get("object") or {}
+        kind = obj.get("object")
+        event_id = event.get("id")
+        version = int(event.get("created") or time.time())
+        with self._sessions()() as session:
+            if event_id:
+                seen = session.execute(
+                    sa.select(stripe_events.c.id).where(stripe_events.c.id == event_id)
+                ).first()
+                if seen:
+                    self.stats["duplicates"] += 1
+                    return False
+            if kind in _OBJECTS and obj.get("id"):
+                if (event.get("type") or "").endswith(".deleted") and kind == "customer":
+                    obj = dict(obj, deleted=True)
+                self._upsert(session, kind, obj, version)
+            if record and event_id and not self._insert_event(session, event):
+                self.stats["duplicates"] += 1
+                return False
+            session.commit()
+        self.stats["events"] += 1
+        return True
+
+    def _insert_event(self, session: Session, event: Dict[str, Any]) -> bool:
+        try:
+            with session.begin_nested():
+                session.execute(stripe_events.insert().values(
+                    id=event["id"], type=event.get("type") or "", created=event.get("created"),
+                    processed_at=datetime.now(timezone.utc),
+                ))
+        except IntegrityError:
+            # A concurrent delivery of the same event got there first
+            return False
+        return True
+
+    def record_event(self, event: Dict[str, Any]) -> bool:
+        """Mark a handled event as processed; False if it already was."""
+        if not event.get("id"):
+            return False
+        with self._sessions()() as session:
+            inserted = self._insert_event(session, event)
+            session.commit()
+        return inserted
+
+    async def apply_event_async(self, event: Dict[str, Any], record: bool = True) -> bool:
+        return await asyncio.to_thread(self.apply_event, event, record)
+
+    async def record_event_async(self, event: Dict[str, Any]) -> bool:
+        return await asyncio.to_thread(self.record_event, event)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def _load(self, kind: str, ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        table = _OBJECTS[kind][0]
+        ids = [i for i in ids if i]
+        if not ids:
+            return {}
+        with self._sessions()() as session:
+            rows = session.execute(
+                sa.select(table.c.id, table.c.data).where(table.c.id.in_(ids))
+            ).all()
+        return {row.id: json.loads(row.data) for row in rows}
+
+    def _subscriptions_for(self, customer_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Mirrored subscriptions for a customer, or None if the customer was never synced."""
+        with self._sessions()() as session:
+            rows = session.execute(
+                sa.select(stripe_subscriptions.c.data).where(stripe_subscriptions.c.customer_id == customer_id)
+            ).scalars().all()
+            if rows:
+                return [json.loads(r) for r in rows]
+            known = session.execute(
+                sa.select(stripe_customers.c.id).where(stripe_customers.c.id == customer_id)
+            ).first()
+        return [] if known else None
+
+    async def _read_through(self, kind: str, ids: List[str], fetch: Callable[[str], Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        found = await asyncio.to_thread(self._load, kind, ids)
+        missing = [i for i in dict.fromkeys(ids) if i and i not in found]
+        self.stats["hits"] += len(found)
+        if not missing:
+            return found
+        self.stats["misses"] += len(missing)
+        fetched = await asyncio.gather(*(asyncio.to_thread(fetch, i) for i in missing))
+        await asyncio.to_thread(self.store, kind, fetched)
+        found.update((obj["id"], obj) for obj in fetched)
+        return found
+
+    async def get_checkout_session(self, session_id: str) -> Dict[str, Any]:
+        """Checkout session by id; Stripe errors from a miss propagate to the caller."""
+        found = await self._read_through("checkout.session", [session_id], self.client.retrieve_checkout_session)
+        return found[session_id]
+
+    async def get_customer(self, customer_id: str) -> Dict[str, Any]:
+        found = await self._read_through("customer", [customer_id], self.client.retrieve_customer)
+        return found[customer_id]
+
+    async def get_prices(self, price_ids: List[str]) -> Dict[str, Any]:
+        """Prices by id. A price Stripe does not know maps to the exception it raised."""
+        results: Dict[str, Any] = await asyncio.to_thread(self._load, "price", price_ids)
+        self.stats["hits"] += len(results)
+        missing = [i for i in dict.fromkeys(price_ids) if i and i not in results]
+        if not missing:
+            return results
+        self.stats["misses"] += len(missing)
+        fetched = await asyncio.gather(
+            *(asyncio.to_thread(self.client.retrieve_price, i) for i in missing), return_exceptions=True
+        )
+        found = [obj for obj in fetched if not isinstance(obj, BaseException)]
+        if found:
+            await asyncio.to_thread(self.store, "price", found)
+        results.update(zip(missing, fetched))
+        return results
+
+    async def active_subscriptions(self, customer_id: str) -> List[Dict[str, Any]]:
+        subscriptions = await asyncio.to_thread(self._subscriptions_for, customer_id)
+        if subscriptions is None:
+            self.stats["misses"] += 1
+            subscriptions = await asyncio.to_thread(lambda: list(self.client.list_subscriptions(customer=customer_id)))
+            await asyncio.to_thread(self.store, "subscription", subscriptions)
+        else:
+            self.stats["hits"] += 1
+        return [s for s in subscriptions if s.get("status") in ACTIVE_SUBSCRIPTION_STATUSES]
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+    def reconcile(self) -> Dict[str, int]:
+        """Overwrite the mirror with Stripe's current customers, subscriptions and prices."""
+        version = int(time.time())
+        counts = {
+            "customers": self.store("customer", self.client.list_customers(), version),
+            "subscriptions": self.store("subscription", self.client.list_subscriptions(), version),
+            "prices": self.store("price", self.client.list_prices(), version),
+        }
+        self.stats["reconciled"] += 1
+        logger.info("Stripe mirror reconciled: %s", counts)
+        return counts
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        await asyncio.to_thread(self._sessions)
+        self._task = asyncio.create_task(self._run(), name="stripe-mirror-reconcile")
+        logger.info("✅ Stripe mirror reconcile loop started")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.reconcile)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Stripe mirror reconcile failed: {e}")
+            await asyncio.sleep(self.reconcile_interval)
+
+
+_mirror: Optional[StripeMirror] = None
+
+
+def get_stripe_mirror() -> StripeMirror:
+    global _mirror
+    if _mirror is None:
+        _mirror = StripeMirror()
+    return _mirror
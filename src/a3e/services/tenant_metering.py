@@ -0,0 +1,494 @@
+"""
+Shared per-tenant usage metering.
+
+``MultiTenantService`` used to keep usage in a per-process list of
+``TenantUsage`` periods, so every worker enforced limits against its own
+partial count and a restart forgot everything. ``TenantMeter`` keeps the
+counters in a store every worker shares:
+
+* ``RedisCounterBackend`` (``INCRBYFLOAT`` in a MULTI pipeline),
+* ``SqlCounterBackend`` (an upserted ``tenant_usage_counters`` table), or
+* ``MemoryCounterBackend`` when neither is reachable (single process only).
+
+Every meter has a fixed set of counter keys per tenant, so reads are O(1):
+
+    tenant_usage:{tenant}:{meter}:m{YYYYMM}       calendar-month rollup
+    tenant_usage:{tenant}:{meter}:total           running total (storage)
+    tenant_usage:{tenant}:{meter}:w{secs}:{n}     sliding-window bucket n
+
+The sliding window is estimated from the current and previous fixed buckets,
+``curr + prev * (1 - elapsed / window)``, i.e. two reads however busy the
+tenant is.
+
+``record()`` is the hot path: it only adds to a local pending map, which is
+flushed to the backend in one round-trip every ``flush_interval`` seconds (by
+the ``start()`` loop, which whatever meters requests must start) or once
+``flush_batch`` records are pending. Reads add the local pending deltas, so a
+worker always sees its own usage. A failed flush keeps its deltas for the next
+attempt.
+
+``consume()`` is for hard limits: it increments the limited counter in the
+backend only if the result stays within the limit, atomically across workers
+(a Lua script on Redis, a conditional ``UPDATE`` on the database).
+
+Configuration:
+    TENANT_METERING_BACKEND        redis | database | memory (default: first available)
+    TENANT_METERING_REDIS_URL      defaults to REDIS_URL
+    TENANT_METERING_FLUSH_SECONDS  default 1.0
+    TENANT_METERING_FLUSH_BATCH    pending records that force a flush, default 500
+    TENANT_METERING_RETENTION_DAYS how long monthly counters are kept, default 400
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+import sqlalchemy as sa
+
+logger = logging.getLogger(__name__)
+
+_FLUSH_SECONDS = float(os.getenv("TENANT_METERING_FLUSH_SECONDS", "1.0"))
+_FLUSH_BATCH = int(os.getenv("TENANT_METERING_FLUSH_BATCH", "500"))
+_RETENTION_SECONDS = int(float(os.getenv("TENANT_METERING_RETENTION_DAYS", "400")) * 86400)
+_EPSILON = 1e-9  # float counters: tolerate rounding when comparing against a limit
+
+
+@dataclass(frozen=True)
+class MeterSpec:
+    period: str  # "month" (resets each calendar month) or "total" (never resets)
+    window_seconds: int = 0  # > 0 also keeps a sliding-window rate
+
+
+METERS: Dict[str, MeterSpec] = {
+    "api_requests": MeterSpec("month", window_seconds=3600),
+    "documents": MeterSpec("month"),
+    "storage_gb": MeterSpec("total"),
+    "compute_hours": MeterSpec("month"),
+    "bandwidth_gb": MeterSpec("month"),
+}
+
+# key -> (delta, ttl seconds; 0 = no expiry)
+Deltas = Mapping[str, Tuple[float, int]]
+
+
+def _spec(meter: str) -> MeterSpec:
+    try:
+        return METERS[meter]
+    except KeyError:
+        raise ValueError(f"Unknown meter: {meter}") from None
+
+
+def period_key(tenant_id: str, meter: str, now: Optional[float] = None) -> str:
+    if _spec(meter).period == "total":
+        return f"tenant_usage:{tenant_id}:{meter}:total"
+    month = datetime.fromtimestamp(time.time() if now is None else now, tz=timezone.utc)
+    return f"tenant_usage:{tenant_id}:{meter}:m{month:%Y%m}"
+
+
+def window_keys(tenant_id: str, meter: str, now: Optional[float] = None) -> Tuple[str, str, float]:
+    """Current and previous bucket keys plus the fraction of the current bucket elapsed."""
+    window = _spec(meter).window_seconds
+    if not window:
+        raise ValueError(f"Meter {meter} has no sliding window")
+    now = time.time() if now is None else now
+    bucket, elapsed = divmod(now, window)
+    prefix = f"tenant_usage:{tenant_id}:{meter}:w{window}"
+    return f"{prefix}:{int(bucket)}", f"{prefix}:{int(bucket) - 1}", elapsed / window
+
+
+def _period_ttl(meter: str) -> int:
+    return 0 if _spec(meter).period == "total" else _RETENTION_SECONDS
+
+
+def _window_ttl(meter: str) -> int:
+    return _spec(meter).window_seconds * 2 + 60  # the previous bucket is still read
+
+
+# ----------------------------------------------------------------------
+# Backends
+# ----------------------------------------------------------------------
+class CounterBackend(Protocol):
+    name: str
+
+    def increment(self, deltas: Deltas) -> None:
+        """Apply every delta atomically."""
+
+    def read(self, keys: Sequence[str]) -> List[float]:
+        """Current values, 0.0 for missing keys."""
+
+    def increment_if(self, key: str, amount: float, ceiling: float, ttl: int) -> Optional[float]:
+        """Add ``amount`` if the result stays <= ``ceiling``; the new value, or None if refused."""
+
+
+class MemoryCounterBackend:
+    """Process-local counters; limits are only per worker with this backend."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._values: Dict[str, float] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str, now: float) -> float:
+        expires = self._expires.get(key)
+        if expires is not None and expires <= now:
+            self._values.pop(key, None)
+            self._expires.pop(key, None)
+        return self._values.get(key, 0.0)
+
+    def _add(self, key: str, amount: float, ttl: int, now: float) -> float:
+        value = self._values[key] = self._live(key, now) + amount
+        if ttl:
+            self._expires[key] = now + ttl
+        return value
+
+    def increment(self, deltas: Deltas) -> None:
+        now = time.time()
+        with self._lock:
+            for key, (amount, ttl) in deltas.items():
+                self._add(key, amount, ttl, now)
+
+    def read(self, keys: Sequence[str]) -> List[float]:
+        now = time.time()
+        with self._lock:
+            return [self._live(key, now) for key in keys]
+
+    def increment_if(self, key: str, amount: float, ceiling: float, ttl: int) -> Optional[float]:
+        now = time.time()
+        with self._lock:
+            if self._live(key, now) + amount > ceiling + _EPSILON:
+                return None
+            return self._add(key, amount, ttl, now)
+
+
+_INCREMENT_IF = """
+local value = tonumber(redis.call('GET', KEYS[1]) or '0')
+if value + tonumber(ARGV[1]) > tonumber(ARGV[2]) then
+    return false
+end
+local updated = redis.call('INCRBYFLOAT', KEYS[1], ARGV[1])
+if tonumber(ARGV[3]) > 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return updated
+"""
+
+
+class RedisCounterBackend:
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, client: Any = None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+            client.ping()
+        self.client = client
+        self._increment_if = client.register_script(_INCREMENT_IF)
+
+    def increment(self, deltas: Deltas) -> None:
+        pipe = self.client.pipeline(transaction=True)
+        for key, (amount, ttl) in deltas.items():
+            pipe.incrbyfloat(key, amount)
+            if ttl:
+                pipe.expire(key, ttl)
+        pipe.execute()
+
+    def read(self, keys: Sequence[str]) -> List[float]:
+        return [float(value) if value is not None else 0.0 for value in self.client.mget(list(keys))]
+
+    def increment_if(self, key: str, amount: float, ceiling: float, ttl: int) -> Optional[float]:
+        result = self._increment_if(keys=[key], args=[amount, ceiling + _EPSILON, ttl])
+        return None if result is None else float(result)
+
+
+_metering_metadata = sa.MetaData()
+
+tenant_usage_counters = sa.Table(
+    "tenant_usage_counters",
+    _metering_metadata,
+    sa.Column("counter_key", sa.String(255), primary_key=True),
+    sa.Column("value", sa.Float, nullable=False, default=0.0),
+    sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True, index=True),
+)
+
+
+def ensure_metering_table(bind: Any) -> None:
+    """Create the counter table for scratch databases; deployed ones get it from Alembic."""
+    _metering_metadata.create_all(bind=bind, checkfirst=True)
+
+
+class SqlCounterBackend:
+    """Counters as rows upserted with ``ON CONFLICT DO UPDATE`` (PostgreSQL and SQLite)."""
+
+    name = "database"
+    purge_every = 100  # flushes between deletes of expired rows
+
+    def __init__(self, engine: Any = None):
+        if engine is None:
+            from ..database.connection import db_manager
+
+            engine = db_manager.engine
+        if engine is None:
+            raise RuntimeError("Database not initialized")
+        self.engine = engine
+        if engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif engine.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise RuntimeError(f"Unsupported metering dialect: {engine.dialect.name}")
+        self._insert = insert
+        self._flushes = 0
+
+    @staticmethod
+    def _expires_at(ttl: int) -> Optional[datetime]:
+        return datetime.now(timezone.utc) + timedelta(seconds=ttl) if ttl else None
+
+    def increment(self, deltas: Deltas) -> None:
+        table = tenant_usage_counters
+        with self.engine.begin() as conn:
+            # Sorted so concurrent flushes lock rows in the same order
+            for key in sorted(deltas):
+                amount, ttl = deltas[key]
+                stmt = self._insert(table).values(counter_key=key, value=amount, expires_at=self._expires_at(ttl))
+                conn.execute(stmt.on_conflict_do_update(
+                    index_elements=[table.c.counter_key],
+                    set_={"value": table.c.value + stmt.excluded.value, "expires_at": stmt.excluded.expires_at},
+                ))
+        self._flushes += 1
+        if self._flushes % self.purge_every == 0:
+            self.purge_expired()
+
+    def read(self, keys: Sequence[str]) -> List[float]:
+        table = tenant_usage_counters
+        with self.engine.connect() as conn:
+            rows = dict(conn.execute(
+                sa.select(table.c.counter_key, table.c.value).where(table.c.counter_key.in_(list(keys)))
+            ).all())
+        return [float(rows.get(key, 0.0)) for key in keys]
+
+    def increment_if(self, key: str, amount: float, ceiling: float, ttl: int) -> Optional[float]:
+        table = tenant_usage_counters
+        with self.engine.begin() as conn:
+            conn.execute(self._insert(table).values(counter_key=key, value=0.0, expires_at=self._expires_at(ttl))
+                         .on_conflict_do_nothing(index_elements=[table.c.counter_key]))
+            # A single conditional UPDATE: the row lock makes check-and-add atomic across workers
+            return conn.execute(
+                sa.update(table)
+                .where(table.c.counter_key == key, table.c.value + amount <= ceiling + _EPSILON)
+                .values(value=table.c.value + amount)
+                .returning(table.c.value)
+            ).scalar()
+
+    def purge_expired(self) -> int:
+        table = tenant_usage_counters
+        with self.engine.begin() as conn:
+            return conn.execute(sa.delete(table).where(table.c.expires_at < datetime.now(timezone.utc))).rowcount
+
+
+def create_backend(kind: Optional[str] = None) -> CounterBackend:
+    """Build the configured backend, or the first available one; memory if none can be reached."""
+    kind = (kind or os.getenv("TENANT_METERING_BACKEND", "")).strip().lower()
+    redis_url = os.getenv("TENANT_METERING_REDIS_URL") or os.getenv("REDIS_URL")
+    candidates = [kind] if kind else (["redis"] if redis_url else []) + ["database"]
+    for candidate in candidates:
+        try:
+            if candidate == "redis":
+                return RedisCounterBackend(redis_url)
+            if candidate == "database":
+                return SqlCounterBackend()
+            if candidate == "memory":
+                return MemoryCounterBackend()
+            logger.warning(f"Unknown TENANT_METERING_BACKEND: {candidate}")
+        except Exception as e:
+            logger.warning(f"⚠️ Tenant metering backend {candidate} unavailable: {e}")
+    logger.warning("⚠️ Tenant metering is process-local (in-memory counters)")
+    return MemoryCounterBackend()
+
+
+# ----------------------------------------------------------------------
+# Meter
+# ----------------------------------------------------------------------
+class TenantMeter:
+    """Batched usage recording and O(1) rollup reads over a shared counter backend."""
+
+    def __init__(
+        self,
+        backend: Optional[CounterBackend] = None,
+        flush_interval: float = _FLUSH_SECONDS,
+        flush_batch: int = _FLUSH_BATCH,
+    ):
+        self._backend = backend
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self._pending: Dict[str, List[float]] = {}  # key -> [delta, ttl]
+        self._pending_records = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"recorded": 0, "flushes": 0, "flushed_keys": 0, "flush_errors": 0,
+                      "consumed": 0, "refused": 0}
+
+    @property
+    def backend(self) -> CounterBackend:
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = create_backend()
+        return self._backend
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def _keys(self, tenant_id: str, meter: str, now: float) -> List[Tuple[str, int]]:
+        keys = [(period_key(tenant_id, meter, now), _period_ttl(meter))]
+        if _spec(meter).window_seconds:
+            keys.append((window_keys(tenant_id, meter, now)[0], _window_ttl(meter)))
+        return keys
+
+    def _add_pending(self, keys: Sequence[Tuple[str, int]], amount: float) -> bool:
+        with self._lock:
+            for key, ttl in keys:
+                entry = self._pending.get(key)
+                if entry is None:
+                    self._pending[key] = [amount, ttl]
+                else:
+                    entry[0] += amount
+            self._pending_records += 1
+            self.stats["recorded"] += 1
+            return self._pending_records >= self.flush_batch
+
+    def record(self, tenant_id: str, meter: str, amount: float = 1.0, now: Optional[float] = None,
+               flush: bool = True) -> bool:
+        """Count usage; it reaches the shared backend with the next flush.
+
+        Returns True once ``flush_batch`` records are pending, after flushing
+        them unless ``flush`` is False (async callers flush off the event loop).
+        """
+        full = self._add_pending(self._keys(tenant_id, meter, time.time() if now is None else now), amount)
+        if full and flush:
+            self.flush()
+        return full
+
+    def flush(self) -> int:
+        """Write pending deltas to the backend in one batch; returns the number of keys written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending, self._pending_records = self._pending, {}, 0
+            if not batch:
+                return 0
+            try:
+                self.backend.increment({key: (delta, int(ttl)) for key, (delta, ttl) in batch.items()})
+            except Exception as e:
+                with self._lock:
+                    for key, (delta, ttl) in batch.items():
+                        entry = self._pending.setdefault(key, [0.0, ttl])
+                        entry[0] += delta
+                self.stats["flush_errors"] += 1
+                logger.warning(f"Tenant usage flush failed ({len(batch)} counters kept for retry): {e}")
+                return 0
+            self.stats["flushes"] += 1
+            self.stats["flushed_keys"] += len(batch)
+            return len(batch)
+
+    def consume(self, tenant_id: str, meter: str, amount: float, limit: float,
+                now: Optional[float] = None) -> bool:
+        """Atomically count ``amount`` only if the limited rollup stays within ``limit``.
+
+        The limit applies to the sliding window for windowed meters and to the
+        period rollup otherwise. Unflushed local deltas for the limited counter
+        are flushed first so they are counted against the limit.
+        """
+        now = time.time() if now is None else now
+        spec = _spec(meter)
+        if spec.window_seconds:
+            key, previous, elapsed = window_keys(tenant_id, meter, now)
+            ceiling = limit - self._read([previous])[0] * (1.0 - elapsed)
+            ttl, others = _window_ttl(meter), [(period_key(tenant_id, meter, now), _period_ttl(meter))]
+        else:
+            key, ceiling, ttl, others = period_key(tenant_id, meter, now), limit, _period_ttl(meter), []
+        with self._lock:
+            unflushed = key in self._pending
+        if unflushed:
+            self.flush()
+        if self.backend.increment_if(key, amount, ceiling, ttl) is None:
+            self.stats["refused"] += 1
+            return False
+        self.stats["consumed"] += 1
+        if others:
+            self._add_pending(others, amount)
+        return True
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def _read(self, keys: Sequence[str]) -> List[float]:
+        values = self.backend.read(keys)
+        with self._lock:
+            return [value + (self._pending[key][0] if key in self._pending else 0.0)
+                    for key, value in zip(keys, values)]
+
+    def usage(self, tenant_id: str, now: Optional[float] = None) -> Dict[str, float]:
+        """Current-period rollup of every meter in one backend read."""
+        now = time.time() if now is None else now
+        return dict(zip(METERS, self._read([period_key(tenant_id, meter, now) for meter in METERS])))
+
+    def window_usage(self, tenant_id: str, meter: str, now: Optional[float] = None) -> float:
+        """Sliding-window estimate for a windowed meter (e.g. API requests in the last hour)."""
+        current, previous, elapsed = window_keys(tenant_id, meter, now)
+        current_value, previous_value = self._read([current, previous])
+        return current_value + previous_value * (1.0 - elapsed)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {"backend": self.backend.name, "pending_counters": pending, **self.stats}
+
+    # ------------------------------------------------------------------
+    # Background flushing
+    # ------------------------------------------------------------------
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        backend = await asyncio.to_thread(lambda: self.backend)
+        self._task = asyncio.create_task(self._run(), name="tenant-metering-flush")
+        logger.info(f"✅ Tenant metering flush loop started ({backend.name} backend)")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.to_thread(self.flush)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Tenant usage flush loop failed: {e}")
+
+
+_meter: Optional[TenantMeter] = None
+
+
+def get_tenant_meter() -> TenantMeter:
+    global _meter
+    if _meter is None:
+        _meter = TenantMeter()
+    return _meter
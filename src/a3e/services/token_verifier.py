@@ -0,0 +1,290 @@
+"""
+JWT verification with key-id routing and a verified-claims cache.
+
+Tokens carrying a ``kid`` header are checked against exactly one key. Tokens
+without one (issued before key ids existed) fall back to the legacy secret
+ring, tried in order. Successful verifications are cached by token digest
+until the token's ``exp``; failures are cached briefly so a replayed bad
+token does not pay for the whole ring again.
+
+Each caller gets its own verifier (``get_token_verifier(scope)``) whose ring
+holds only the configured secrets that caller accepted before key ids
+existed. Key ids default to a short fingerprint of each ring secret, so
+issuers only need ``signing_headers(secret)`` to opt in. Explicit rotation
+keys can be supplied via ``JWT_SIGNING_KEYS`` (``kid1:secret1,kid2:secret2``
+or a JSON object).
+
+Revocation is per worker process: ``revoke_token``/``revoke_jti`` only affect
+the process that handled the request. Deployments that need logout to apply
+across workers must register a shared lookup with ``add_revocation_check``
+and keep token lifetimes short.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import jwt
+
+logger = logging.getLogger(__name__)
+
+_CACHE_MAX = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+_NO_EXP_TTL = float(os.getenv("TOKEN_CACHE_NO_EXP_TTL_SECONDS", "300"))
+_NEGATIVE_TTL = float(os.getenv("TOKEN_CACHE_NEGATIVE_TTL_SECONDS", "30"))
+_NEGATIVE_MAX = 1024
+
+
+def key_id_for(secret: str) -> str:
+    """Stable, non-reversible key id for a shared secret."""
+    return hashlib.sha256(b"a3e-kid:" + secret.encode("utf-8")).hexdigest()[:12]
+
+
+def _parse_signing_keys(raw: Optional[str]) -> Dict[str, str]:
+    if not raw:
+        return {}
+    raw = raw.strip()
+    try:
+        if raw.startswith("{"):
+            data = json.loads(raw)
+            return {str(k): str(v) for k, v in data.items() if v}
+        keys: Dict[str, str] = {}
+        for part in raw.split(","):
+            kid, _, secret = part.strip().partition(":")
+            if kid and secret:
+                keys[kid] = secret
+        return keys
+    except Exception as e:
+        logger.warning(f"Ignoring malformed JWT_SIGNING_KEYS: {e}")
+        return {}
+
+
+class TokenVerifier:
+    """Verify HMAC JWTs and cache the verified claims.
+
+    ``keys`` maps key id to secret; ``legacy_secrets`` is the ordered ring
+    used for tokens without a ``kid``. Revocation checks registered with
+    ``add_revocation_check`` run on cache misses; ``revoke_token`` and
+    ``revoke_jti`` also evict cached entries immediately, in this process
+    only.
+    """
+
+    def __init__(
+        self,
+        keys: Optional[Dict[str, str]] = None,
+        legacy_secrets: Sequence[str] = (),
+        algorithms: Sequence[str] = ("HS256",),
+        max_entries: int = _CACHE_MAX,
+    ):
+        self.keys: Dict[str, str] = dict(keys or {})
+        self.legacy_secrets: List[str] = list(dict.fromkeys(s for s in legacy_secrets if s))
+        for secret in self.legacy_secrets:
+            self.keys.setdefault(key_id_for(secret), secret)
+        self.algorithms = list(algorithms)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # digest -> (claims, expires_at)
+        self._cache: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._negative: "OrderedDict[bytes, float]" = OrderedDict()
+        self._revoked_jti: Dict[str, float] = {}
+        self._revoked_tokens: Dict[bytes, float] = {}
+        self._revocation_checks: List[Callable[[Dict[str, Any]], bool]] = []
+        self.stats = {"hits": 0, "misses": 0, "failures": 0}
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the verified claims, or ``None``."""
+        if not token:
+            return None
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        now = time.time()
+        with self._lock:
+            entry = self._cache.get(digest)
+            if entry is not None:
+                claims, expires_at = entry
+                if expires_at > now and not (self._revoked_jti and claims.get("jti") in self._revoked_jti):
+                    self._cache.move_to_end(digest)
+                    self.stats["hits"] += 1
+                    return dict(claims)
+                del self._cache[digest]
+            failed_until = self._negative.get(digest)
+            if failed_until is not None:
+                if failed_until > now:
+                    self.stats["failures"] += 1
+                    return None
+                del self._negative[digest]
+            if digest in self._revoked_tokens:
+                self.stats["failures"] += 1
+                return None
+            self.stats["misses"] += 1
+
+        claims = self._decode(token)
+        if claims is None or self._is_revoked(claims):
+            self._remember_failure(digest, now)
+            return None
+        self._remember(digest, claims, now)
+        return dict(claims)
+
+    def _decode(self, token: str) -> Optional[Dict[str, Any]]:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except Exception:
+            return None
+        if kid:
+            secret = self.keys.get(kid)
+            if not secret:
+                logger.warning("Token signed with unknown key id %s", kid)
+                return None
+            return self._try_decode(token, (secret,))
+        return self._try_decode(token, self.legacy_secrets)
+
+    def _try_decode(self, token: str, secrets: Iterable[str]) -> Optional[Dict[str, Any]]:
+        for secret in secrets:
+            try:
+                return jwt.decode(token, secret, algorithms=self.algorithms)
+            except jwt.ExpiredSignatureError:
+                # Signature matched; trying other secrets cannot help
+                return None
+            except Exception:
+                continue
+        logger.warning("Token verification failed for all candidate secrets")
+        return None
+
+    def _is_revoked(self, claims: Dict[str, Any]) -> bool:
+        jti = claims.get("jti")
+        if jti and jti in self._revoked_jti:
+            return True
+        for check in self._revocation_checks:
+            try:
+                if check(claims):
+                    return True
+            except Exception as e:
+                logger.warning(f"Token revocation check failed: {e}")
+        return False
+
+    def _remember(self, digest: bytes, claims: Dict[str, Any], now: float) -> None:
+        exp = claims.get("exp")
+        expires_at = float(exp) if isinstance(exp, (int, float)) else now + _NO_EXP_TTL
+        with self._lock:
+            self._cache[digest] = (claims, expires_at)
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _remember_failure(self, digest: bytes, now: float) -> None:
+        with self._lock:
+            self._negative[digest] = now + _NEGATIVE_TTL
+            while len(self._negative) > _NEGATIVE_MAX:
+                self._negative.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Issuing / revocation
+    # ------------------------------------------------------------------
+    def signing_headers(self, secret: str) -> Dict[str, str]:
+        """JWT headers to pass to ``jwt.encode`` so the token is kid-routed.
+
+        Secrets outside the key ring get no ``kid``: other workers would not
+        know the key and must treat the token as legacy.
+        """
+        for kid, candidate in self.keys.items():
+            if candidate == secret:
+                return {"kid": kid}
+        return {}
+
+    def add_revocation_check(self, check: Callable[[Dict[str, Any]], bool]) -> None:
+        """Register ``check(claims) -> bool``; consulted before claims are cached."""
+        self._revocation_checks.append(check)
+
+    def revoke_token(self, token: str) -> None:
+        """Reject ``token`` in this process until it would have expired anyway."""
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        now = time.time()
+        try:
+            exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        except Exception:
+            exp = None
+        with self._lock:
+            self._cache.pop(digest, None)
+            self._revoked_tokens[digest] = float(exp) if isinstance(exp, (int, float)) else now + 86400
+            self._prune_revocations(now)
+
+    def revoke_jti(self, jti: str, expires_at: Optional[float] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._revoked_jti[jti] = expires_at or now + 86400
+            self._prune_revocations(now)
+
+    def _prune_revocations(self, now: float) -> None:
+        # Expired tokens fail verification anyway, so their revocations can go
+        for revoked in (self._revoked_jti, self._revoked_tokens):
+            for stale in [k for k, v in revoked.items() if v <= now]:
+                del revoked[stale]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._negative.clear()
+
+
+# Where each caller looked for secrets before key ids existed
+_RING_SOURCES: Dict[str, Tuple[str, ...]] = {
+    # api/routes/auth_impl.py
+    "auth": ("settings:jwt_secret_key", "settings:secret_key", "env:JWT_SECRET_KEY", "env:SECRET_KEY"),
+    # api/routes/user_intelligence_simple.py
+    "simple": (
+        "settings:jwt_secret_key",
+        "settings:secret_key",
+        "env:JWT_SECRET_KEY",
+        "env:JWT_SECRET",
+        "env:SECRET_KEY",
+        "env:ONBOARDING_SHARED_SECRET",
+    ),
+}
+
+
+def legacy_secret_ring(scope: str) -> List[str]:
+    """Configured secrets that ``scope`` accepted for tokens without a ``kid``."""
+    from ..core.config import get_settings
+
+    try:
+        settings = get_settings()
+    except Exception:
+        settings = None
+    candidates: List[Optional[str]] = []
+    for source in _RING_SOURCES[scope]:
+        kind, _, name = source.partition(":")
+        candidates.append(getattr(settings, name, None) if kind == "settings" else os.getenv(name))
+    return [c for c in candidates if c]
+
+
+_verifiers: Dict[str, TokenVerifier] = {}
+_verifier_lock = threading.Lock()
+
+
+def get_token_verifier(scope: str) -> TokenVerifier:
+    """Return the process-wide verifier for ``scope``, building its ring once."""
+    verifier = _verifiers.get(scope)
+    if verifier is None:
+        with _verifier_lock:
+            verifier = _verifiers.get(scope)
+            if verifier is None:
+                verifier = TokenVerifier(
+                    keys=_parse_signing_keys(os.getenv("JWT_SIGNING_KEYS")),
+                    legacy_secrets=legacy_secret_ring(scope),
+                )
+                _verifiers[scope] = verifier
+    return verifier
+
+
+def revoke_token(token: str) -> None:
+    """Revoke ``token`` in every verifier of this worker process."""
+    for scope in _RING_SOURCES:
+        get_token_verifier(scope).revoke_token(token)
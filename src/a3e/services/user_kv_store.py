@@ -0,0 +1,321 @@
+"""
+Embedded per-user key-value store for lightweight dashboard state.
+
+Replaces the whole-file JSON stores (settings, org charts, tasks, reviews,
+uploads and sessions) used by the simplified dashboard API. Each
+(namespace, user_key) pair is a single SQLite row in WAL mode, so reads and
+writes touch only that user's data and concurrent workers cannot lose
+updates: writers go through a versioned compare-and-set.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DB_PATH = os.getenv("USER_KV_STORE_PATH", "user_kv_store.sqlite3")
+_MAX_CAS_RETRIES = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_kv (
+    namespace   TEXT    NOT NULL,
+    user_key    TEXT    NOT NULL,
+    value       TEXT    NOT NULL,
+    version     INTEGER NOT NULL,
+    updated_at  TEXT    NOT NULL,
+    PRIMARY KEY (namespace, user_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS user_kv_migrations (
+    namespace    TEXT PRIMARY KEY,
+    source_path  TEXT,
+    imported     INTEGER NOT NULL,
+    migrated_at  TEXT NOT NULL
+);
+"""
+
+
+class ConcurrentUpdateError(RuntimeError):
+    """Raised when a compare-and-set update keeps losing to other writers."""
+
+
+class UserKVStore:
+    """SQLite-backed store holding one JSON document per (namespace, user_key).
+
+    Every row carries a monotonically increasing ``version``. ``update`` reads
+    the current version, applies a mutator and writes back only if the
+    version is unchanged, retrying on conflict. Reads are served from an
+    in-process cache that is dropped whenever SQLite reports that another
+    worker process has committed.
+
+    Each instance owns a single connection guarded by a lock; per-user
+    operations are a single indexed statement, so serialising them within a
+    process is cheaper than keeping per-thread caches coherent.
+    """
+
+    def __init__(self, db_path: str = _DEFAULT_DB_PATH):
+        self.db_path = str(db_path)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version = 0
+        self._cache: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        self._legacy_sources: Dict[str, str] = {}
+        self._migrated: set = set()
+
+    # ------------------------------------------------------------------
+    # Connection management
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        """Return the instance connection; callers must hold ``self._lock``."""
+        if self._conn is not None:
+            return self._conn
+        parent = Path(self.db_path).parent
+        if str(parent) not in ("", "."):
+            parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.executescript(_SCHEMA)
+        self._conn = conn
+        self._data_version = self._read_data_version(conn)
+        return conn
+
+    @staticmethod
+    def _read_data_version(conn: sqlite3.Connection) -> int:
+        return int(conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def _sync_cache(self, conn: sqlite3.Connection) -> None:
+        """Drop cached rows if another process has committed since our last check."""
+        current = self._read_data_version(conn)
+        if current != self._data_version:
+            self._cache.clear()
+            self._data_version = current
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Legacy JSON migration
+    # ------------------------------------------------------------------
+    def register_legacy_source(self, namespace: str, path: str) -> None:
+        """Associate a namespace with the JSON file it replaces.
+
+        The file is imported once, the first time the namespace is touched.
+        """
+        self._legacy_sources[namespace] = str(path)
+
+    def _ensure_migrated(self, namespace: str) -> None:
+        if namespace in self._migrated:
+            return
+        source = self._legacy_sources.get(namespace)
+        if source:
+            try:
+                self.import_legacy_json(namespace, source)
+            except Exception as e:
+                logger.warning(f"Failed to migrate legacy store {source} into '{namespace}': {e}")
+                return
+        self._migrated.add(namespace)
+
+    def import_legacy_json(self, namespace: str, path: str, *, force: bool = False) -> int:
+        """Import a ``{user_key: value}`` JSON file into ``namespace``.
+
+        Existing rows are never overwritten, so the import is idempotent and
+        safe to run from several workers at once. Returns the number of rows
+        inserted.
+        """
+        with self._lock:
+            return self._import_legacy_json_locked(namespace, path, force)
+
+    def _import_legacy_json_locked(self, namespace: str, path: str, force: bool) -> int:
+        conn = self._connect()
+        if not force:
+            done = conn.execute(
+                "SELECT 1 FROM user_kv_migrations WHERE namespace = ?", (namespace,)
+            ).fetchone()
+            if done:
+                return 0
+        data: Dict[str, Any] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                loaded = json.load(f) or {}
+            if isinstance(loaded, dict):
+                data = loaded
+        now = datetime.utcnow().isoformat()
+        imported = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for user_key, value in data.items():
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO user_kv (namespace, user_key, value, version, updated_at) "
+                    "VALUES (?, ?, ?, 1, ?)",
+                    (namespace, str(user_key), json.dumps(value, ensure_ascii=False), now),
+                )
+                imported += cur.rowcount
+            conn.execute(
+                "INSERT OR REPLACE INTO user_kv_migrations (namespace, source_path, imported, migrated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (namespace, str(path), imported, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if imported:
+            logger.info(f"Imported {imported} rows from {path} into user KV namespace '{namespace}'")
+        return imported
+
+    # ------------------------------------------------------------------
+    # Core operations
+    # ------------------------------------------------------------------
+    def get_versioned(self, namespace: str, user_key: str) -> Tuple[Any, int]:
+        """Return ``(value, version)``; version 0 means the row does not exist."""
+        self._ensure_migrated(namespace)
+        cache_key = (namespace, user_key)
+        with self._lock:
+            conn = self._connect()
+            self._sync_cache(conn)
+            cached = self._cache.get(cache_key)
+            if cached is None:
+                row = conn.execute(
+                    "SELECT version, value FROM user_kv WHERE namespace = ? AND user_key = ?",
+                    (namespace, user_key),
+                ).fetchone()
+                cached = (int(row[0]), row[1]) if row else (0, "null")
+                self._cache[cache_key] = cached
+        version, raw = cached
+        return json.loads(raw), version
+
+    def get(self, namespace: str, user_key: str, default: Any = None) -> Any:
+        value, version = self.get_versioned(namespace, user_key)
+        if version == 0 or value is None:
+            return copy.deepcopy(default) if default is not None else {}
+        return value
+
+    def compare_and_set(self, namespace: str, user_key: str, value: Any, expected_version: int) -> Optional[int]:
+        """Write ``value`` only if the row is still at ``expected_version``.
+
+        Returns the new version on success or ``None`` if another writer got
+        there first.
+        """
+        self._ensure_migrated(namespace)
+        raw = json.dumps(value, ensure_ascii=False)
+        now = datetime.utcnow().isoformat()
+        cache_key = (namespace, user_key)
+        with self._lock:
+            conn = self._connect()
+            # Pick up foreign commits first so our own write cannot mask them
+            self._sync_cache(conn)
+            if expected_version == 0:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO user_kv (namespace, user_key, value, version, updated_at) "
+                    "VALUES (?, ?, ?, 1, ?)",
+                    (namespace, user_key, raw, now),
+                )
+            else:
+                cur = conn.execute(
+                    "UPDATE user_kv SET value = ?, version = version + 1, updated_at = ? "
+                    "WHERE namespace = ? AND user_key = ? AND version = ?",
+                    (raw, now, namespace, user_key, expected_version),
+                )
+            if cur.rowcount == 1:
+                self._cache[cache_key] = (expected_version + 1, raw)
+                return expected_version + 1
+            self._cache.pop(cache_key, None)
+            return None
+
+    def update(self, namespace: str, user_key: str, mutator: Callable[[Any], Any], default: Any = None) -> Any:
+        """Atomically read-modify-write a user's value.
+
+        ``mutator`` receives a private copy of the current value (or
+        ``default``/``{}`` if absent) and may either mutate it in place and
+        return ``None`` or return the replacement value.
+        """
+        for _ in range(_MAX_CAS_RETRIES):
+            current, version = self.get_versioned(namespace, user_key)
+            if version == 0 or current is None:
+                current = copy.deepcopy(default) if default is not None else {}
+            result = mutator(current)
+            new_value = current if result is None else result
+            if self.compare_and_set(namespace, user_key, new_value, version) is not None:
+                return new_value
+        raise ConcurrentUpdateError(f"Too much contention updating {namespace}/{user_key}")
+
+    def put(self, namespace: str, user_key: str, value: Any) -> Any:
+        """Unconditionally replace a user's value (still versioned)."""
+        return self.update(namespace, user_key, lambda _current: value)
+
+    def delete(self, namespace: str, user_key: str) -> bool:
+        self._ensure_migrated(namespace)
+        with self._lock:
+            conn = self._connect()
+            self._sync_cache(conn)
+            cur = conn.execute(
+                "DELETE FROM user_kv WHERE namespace = ? AND user_key = ?", (namespace, user_key)
+            )
+            self._cache.pop((namespace, user_key), None)
+            return cur.rowcount > 0
+
+    def touch(self, namespace: str, user_key: str) -> bool:
+        """Mark a row as recently used without changing its value or version."""
+        with self._lock:
+            conn = self._connect()
+            cur = conn.execute(
+                "UPDATE user_kv SET updated_at = ? WHERE namespace = ? AND user_key = ?",
+                (datetime.utcnow().isoformat(), namespace, user_key),
+            )
+            return cur.rowcount > 0
+
+    def prune(self, namespace: str, max_entries: Optional[int] = None,
+              updated_before: Optional[datetime] = None) -> int:
+        """Delete rows last written or touched before ``updated_before`` and,
+        beyond ``max_entries``, the least recently updated ones.
+
+        Returns the number of rows deleted.
+        """
+        with self._lock:
+            conn = self._connect()
+            self._sync_cache(conn)
+            deleted = 0
+            if updated_before is not None:
+                deleted += conn.execute(
+                    "DELETE FROM user_kv WHERE namespace = ? AND updated_at < ?",
+                    (namespace, updated_before.isoformat()),
+                ).rowcount
+            if max_entries is not None:
+                deleted += conn.execute(
+                    "DELETE FROM user_kv WHERE namespace = ? AND user_key IN ("
+                    "SELECT user_key FROM user_kv WHERE namespace = ? "
+                    "ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                    (namespace, namespace, max(0, int(max_entries))),
+                ).rowcount
+            if deleted:
+                for cache_key in [k for k in self._cache if k[0] == namespace]:
+                    del self._cache[cache_key]
+            return deleted
+
+
+_store_instance: Optional[UserKVStore] = None
+_store_lock = threading.Lock()
+
+
+def get_user_kv_store() -> UserKVStore:
+    """Return the process-wide store instance."""
+    global _store_instance
+    if _store_instance is None:
+        with _store_lock:
+            if _store_instance is None:
+                _store_instance = UserKVStore()
+    return _store_instance
@@ -0,0 +1,541 @@
+"""
+Background dispatcher for the webhook outbox.
+
+Drains due ``webhook_outbox`` rows with one pooled HTTP client:
+- event rows are fanned out into one row per matching endpoint,
+- deliveries run concurrently, bounded per endpoint by a semaphore,
+- endpoints that keep failing trip a circuit breaker and are skipped
+  (rescheduled, not counted as attempts) until the cooldown passes,
+- failures are rescheduled with exponential backoff and jitter, and give up
+  as ``dead`` after ``max_attempts``,
+- outbox updates and ``webhook_deliveries`` log rows are written once per
+  batch,
+- claimed rows are leased for the longest a batch can take (every row to
+  one endpoint, ``per_endpoint_concurrency`` at a time, each hitting the
+  request timeout) plus a margin, so no other worker re-claims rows that
+  are still being delivered.
+
+Database work is synchronous SQLAlchemy and runs in a worker thread so the
+event loop only ever awaits HTTP.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .webhook_service import (
+    WEBHOOK_OUTBOX_STATUS_DEAD,
+    WEBHOOK_OUTBOX_STATUS_DELIVERED,
+    WEBHOOK_OUTBOX_STATUS_FANNED_OUT,
+    WEBHOOK_OUTBOX_STATUS_PENDING,
+    ensure_outbox_table,
+    webhook_outbox,
+    webhook_service,
+)
+
+logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = int(os.getenv("WEBHOOK_DISPATCH_BATCH_SIZE", "100"))
+_POLL_INTERVAL = float(os.getenv("WEBHOOK_DISPATCH_POLL_SECONDS", "1.0"))
+_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+_PER_ENDPOINT_CONCURRENCY = int(os.getenv("WEBHOOK_PER_ENDPOINT_CONCURRENCY", "4"))
+_BREAKER_THRESHOLD = int(os.getenv("WEBHOOK_BREAKER_THRESHOLD", "5"))
+_BREAKER_COOLDOWN = float(os.getenv("WEBHOOK_BREAKER_COOLDOWN_SECONDS", "60"))
+_BACKOFF_BASE = float(os.getenv("WEBHOOK_BACKOFF_BASE_SECONDS", "2"))
+_BACKOFF_MAX = float(os.getenv("WEBHOOK_BACKOFF_MAX_SECONDS", "3600"))
+_REQUEST_TIMEOUT = float(os.getenv("WEBHOOK_REQUEST_TIMEOUT_SECONDS", "30"))
+_LEASE_MARGIN = 60.0
+_ENDPOINT_CACHE_TTL = 30.0
+
+
+@dataclass
+class CircuitBreaker:
+    """Consecutive-failure breaker for one endpoint."""
+
+    threshold: int = _BREAKER_THRESHOLD
+    cooldown: float = _BREAKER_COOLDOWN
+    failures: int = 0
+    open_until: float = 0.0
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        # Once the cooldown passes the next call is a half-open probe
+        return (now or time.monotonic()) >= self.open_until
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self, now: Optional[float] = None) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.open_until = (now or time.monotonic()) + self.cooldown
+
+
+@dataclass
+class _Job:
+    outbox_id: str
+    webhook_id: str
+    event: str
+    payload: Dict[str, Any]
+    attempts: int
+    endpoint: Optional[Dict[str, Any]]
+
+
+@dataclass
+class _Outcome:
+    job: _Job
+    status: str
+    attempts: int
+    next_attempt_at: Optional[datetime] = None
+    error: Optional[str] = None
+    response_status: Optional[int] = None
+    response_body: Optional[str] = None
+    delivered_at: Optional[datetime] = None
+    logged: bool = True
+
+
+@dataclass
+class DispatchStats:
+    delivered: int = 0
+    retried: int = 0
+    dead: int = 0
+    short_circuited: int = 0
+    batches: int = 0
+
+
+def backoff_delay(attempts: int, base: float = _BACKOFF_BASE, cap: float = _BACKOFF_MAX) -> float:
+    """Seconds to wait after ``attempts`` failures (full jitter on the top half)."""
+    delay = min(cap, base * (2 ** max(0, attempts - 1)))
+    return delay * (0.5 + random.random() / 2)
+
+
+def _normalize_events(raw: Any) -> List[str]:
+    if raw is None:
+        return []
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            raw = [e.strip() for e in raw.strip("{}").split(",") if e.strip()]
+    return [str(e) for e in raw]
+
+
+def _normalize_headers(raw: Any) -> Dict[str, str]:
+    if not raw:
+        return {}
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return {}
+    return {str(k): str(v) for k, v in dict(raw).items()}
+
+
+class WebhookDispatcher:
+    """Drain the webhook outbox; see the module docstring for semantics."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        batch_size: int = _BATCH_SIZE,
+        poll_interval: float = _POLL_INTERVAL,
+        max_attempts: int = _MAX_ATTEMPTS,
+        per_endpoint_concurrency: int = _PER_ENDPOINT_CONCURRENCY,
+        breaker_threshold: int = _BREAKER_THRESHOLD,
+        breaker_cooldown: float = _BREAKER_COOLDOWN,
+        request_timeout: float = _REQUEST_TIMEOUT,
+    ):
+        self._session_factory = session_factory
+        self._client = client
+        self._owns_client = client is None
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.per_endpoint_concurrency = per_endpoint_concurrency
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.request_timeout = request_timeout
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._endpoints: Optional[List[Dict[str, Any]]] = None
+        self._endpoints_loaded_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.stats = DispatchStats()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.request_timeout),
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                headers={"User-Agent": "MapMyStandards-Webhook/1.0"},
+            )
+        return self._client
+
+    @property
+    def lease_seconds(self) -> float:
+        """Upper bound on one batch: its rows queue behind one endpoint's semaphore."""
+        rounds = math.ceil(self.batch_size / max(1, self.per_endpoint_concurrency))
+        return rounds * self.request_timeout + _LEASE_MARGIN
+
+    def _sessions(self) -> Callable[[], Session]:
+        factory = self._session_factory
+        if factory is None:
+            from ..database.connection import db_manager
+
+            factory = db_manager.SessionLocal
+        if factory is None:
+            raise RuntimeError("Database not initialized")
+        return factory
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        factory = self._sessions()
+        with factory() as session:
+            ensure_outbox_table(session.get_bind())
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="webhook-dispatcher")
+        logger.info("✅ Webhook dispatcher started")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def wake(self) -> None:
+        """Skip the rest of the current poll interval."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def invalidate_endpoints(self) -> None:
+        self._endpoints = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                drained = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Webhook dispatch cycle failed: {e}")
+                drained = 0
+            if drained >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    # ------------------------------------------------------------------
+    # One dispatch cycle
+    # ------------------------------------------------------------------
+    async def run_once(self) -> int:
+        """Claim and process one batch of due rows; returns rows claimed."""
+        token = str(uuid.uuid4())
+        claimed = await asyncio.to_thread(self._claim, token)
+        if not claimed:
+            return 0
+        endpoints = await self._load_endpoints()
+        jobs = await asyncio.to_thread(self._expand, token, claimed, endpoints)
+        outcomes = await asyncio.gather(*(self._attempt(job) for job in jobs))
+        await asyncio.to_thread(self._record, outcomes)
+        self.stats.batches += 1
+        return len(claimed)
+
+    def _claim(self, token: str) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        due = sa.and_(
+            webhook_outbox.c.status == WEBHOOK_OUTBOX_STATUS_PENDING,
+            webhook_outbox.c.next_attempt_at <= now,
+            sa.or_(webhook_outbox.c.locked_until.is_(None), webhook_outbox.c.locked_until < now),
+        )
+        with self._sessions()() as session:
+            ids = session.execute(
+                sa.select(webhook_outbox.c.id)
+                .where(due)
+                .order_by(webhook_outbox.c.next_attempt_at)
+                .limit(self.batch_size)
+            ).scalars().all()
+            if not ids:
+                return []
+            # Re-check ``due`` so a concurrent dispatcher cannot claim the same row
+            session.execute(
+                webhook_outbox.update()
+                .where(webhook_outbox.c.id.in_(ids), due)
+                .values(claim_token=token, locked_until=now + timedelta(seconds=self.lease_seconds))
+            )
+            session.commit()
+            rows = session.execute(
+                sa.select(webhook_outbox).where(webhook_outbox.c.claim_token == token)
+            ).mappings().all()
+            return [dict(r) for r in rows]
+
+    async def _load_endpoints(self) -> List[Dict[str, Any]]:
+        if self._endpoints is None or time.monotonic() - self._endpoints_loaded_at > _ENDPOINT_CACHE_TTL:
+            self._endpoints = await asyncio.to_thread(self._fetch_endpoints)
+            self._endpoints_loaded_at = time.monotonic()
+        return self._endpoints
+
+    def _fetch_endpoints(self) -> List[Dict[str, Any]]:
+        with self._sessions()() as session:
+            rows = session.execute(text("""
+                SELECT id, url, secret, headers, events, institution_id
+                FROM webhook_configs
+                WHERE active = true
+            """)).mappings().all()
+        return [
+            {
+                "id": str(r["id"]),
+                "url": r["url"],
+                "secret": r["secret"],
+                "headers": _normalize_headers(r["headers"]),
+                "events": set(_normalize_events(r["events"])),
+                "institution_id": r["institution_id"],
+            }
+            for r in rows
+        ]
+
+    def _expand(self, token: str, claimed: List[Dict[str, Any]], endpoints: List[Dict[str, Any]]) -> List[_Job]:
+        """Fan event rows out to endpoint rows (claimed by this batch) and build jobs."""
+        by_id = {e["id"]: e for e in endpoints}
+        now = datetime.now(timezone.utc)
+        jobs: List[_Job] = []
+        children: List[Dict[str, Any]] = []
+        fanned_out: List[str] = []
+        for row in claimed:
+            payload = json.loads(row["payload"])
+            if row["webhook_id"] is not None:
+                jobs.append(_Job(row["id"], row["webhook_id"], row["event"], payload,
+                                 row["attempts"], by_id.get(row["webhook_id"])))
+                continue
+            fanned_out.append(row["id"])
+            for endpoint in endpoints:
+                if row["event"] not in endpoint["events"]:
+                    continue
+                if endpoint["institution_id"] is not None and endpoint["institution_id"] != row["institution_id"]:
+                    continue
+                child_id = str(uuid.uuid4())
+                children.append({
+                    "id": child_id,
+                    "event": row["event"],
+                    "payload": row["payload"],
+                    "institution_id": row["institution_id"],
+                    "webhook_id": endpoint["id"],
+                    "parent_id": row["id"],
+                    "status": WEBHOOK_OUTBOX_STATUS_PENDING,
+                    "attempts": 0,
+                    "next_attempt_at": now,
+                    "locked_until": now + timedelta(seconds=self.lease_seconds),
+                    "claim_token": token,
+                    "created_at": now,
+                })
+                jobs.append(_Job(child_id, endpoint["id"], row["event"], payload, 0, endpoint))
+        if fanned_out:
+            with self._sessions()() as session:
+                if children:
+                    session.execute(webhook_outbox.insert(), children)
+                session.execute(
+                    webhook_outbox.update()
+                    .where(webhook_outbox.c.id.in_(fanned_out))
+                    .values(status=WEBHOOK_OUTBOX_STATUS_FANNED_OUT, locked_until=None,
+                            claim_token=None, updated_at=now)
+                )
+                session.commit()
+        return jobs
+
+    def _semaphore(self, webhook_id: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(webhook_id)
+        if sem is None:
+            sem = self._semaphores[webhook_id] = asyncio.Semaphore(self.per_endpoint_concurrency)
+        return sem
+
+    def _breaker(self, webhook_id: str) -> CircuitBreaker:
+        breaker = self._breakers.get(webhook_id)
+        if breaker is None:
+            breaker = self._breakers[webhook_id] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+        return breaker
+
+    def _failed(self, job: _Job, error: str, **extra: Any) -> _Outcome:
+        attempts = job.attempts + 1
+        if attempts >= self.max_attempts:
+            self.stats.dead += 1
+            return _Outcome(job, WEBHOOK_OUTBOX_STATUS_DEAD, attempts, error=error, **extra)
+        self.stats.retried += 1
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=backoff_delay(attempts))
+        return _Outcome(job, WEBHOOK_OUTBOX_STATUS_PENDING, attempts, next_attempt_at=retry_at, error=error, **extra)
+
+    async def _attempt(self, job: _Job) -> _Outcome:
+        endpoint = job.endpoint
+        if endpoint is None:
+            # Endpoint deactivated or deleted since the event was fanned out
+            return _Outcome(job, WEBHOOK_OUTBOX_STATUS_DEAD, job.attempts, error="webhook inactive", logged=False)
+
+        breaker = self._breaker(job.webhook_id)
+        if not breaker.allow():
+            self.stats.short_circuited += 1
+            reopen_in = max(0.0, breaker.open_until - time.monotonic())
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=reopen_in + random.random())
+            return _Outcome(job, WEBHOOK_OUTBOX_STATUS_PENDING, job.attempts, next_attempt_at=retry_at,
+                            error="circuit open", logged=False)
+
+        # Sign exactly the bytes that are sent
+        body = json.dumps(job.payload, separators=(",", ":"), sort_keys=True)
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Event": job.event,
+            "X-Webhook-Delivery": job.outbox_id,
+            **endpoint["headers"],
+        }
+        if endpoint["secret"]:
+            headers["X-Webhook-Signature"] = webhook_service._generate_signature(endpoint["secret"], job.payload)
+
+        async with self._semaphore(job.webhook_id):
+            try:
+                response = await self.client.post(endpoint["url"], content=body, headers=headers,
+                                                  timeout=self.request_timeout)
+            except Exception as e:
+                breaker.record_failure()
+                logger.warning(f"Webhook delivery to {endpoint['url']} failed: {e}")
+                return self._failed(job, str(e) or type(e).__name__)
+
+        if 200 <= response.status_code < 300:
+            breaker.record_success()
+            self.stats.delivered += 1
+            return _Outcome(job, WEBHOOK_OUTBOX_STATUS_DELIVERED, job.attempts + 1,
+                            response_status=response.status_code, response_body=response.text[:1000],
+                            delivered_at=datetime.now(timezone.utc))
+        breaker.record_failure()
+        return self._failed(job, f"HTTP {response.status_code}",
+                            response_status=response.status_code, response_body=response.text[:1000])
+
+    def _record(self, outcomes: List[_Outcome]) -> None:
+        """Write every outcome of the batch in one transaction."""
+        if not outcomes:
+            return
+        now = datetime.now(timezone.utc)
+        updates = [
+            {
+                "b_id": o.job.outbox_id,
+                "b_status": o.status,
+                "b_attempts": o.attempts,
+                "b_next_attempt_at": o.next_attempt_at or now,
+                "b_last_error": o.error,
+            }
+            for o in outcomes
+        ]
+        deliveries = [
+            {
+                "id": str(uuid.uuid4()),
+                "webhook_id": o.job.webhook_id,
+                "event": o.job.event,
+                "payload": json.dumps(o.job.payload, default=str),
+                "status": "delivered" if o.status == WEBHOOK_OUTBOX_STATUS_DELIVERED else "failed",
+                "response_status": o.response_status,
+                "response_body": o.response_body,
+                "error_message": o.error,
+                "attempts": o.attempts,
+                "created_at": now,
+                "delivered_at": o.delivered_at,
+            }
+            for o in outcomes
+            if o.logged
+        ]
+        with self._sessions()() as session:
+            session.execute(
+                webhook_outbox.update()
+                .where(webhook_outbox.c.id == sa.bindparam("b_id"))
+                .values(
+                    status=sa.bindparam("b_status"),
+                    attempts=sa.bindparam("b_attempts"),
+                    next_attempt_at=sa.bindparam("b_next_attempt_at"),
+                    last_error=sa.bindparam("b_last_error"),
+                    locked_until=None,
+                    claim_token=None,
+                    updated_at=now,
+                ),
+                updates,
+            )
+            if deliveries:
+                session.execute(text("""
+                    INSERT INTO webhook_deliveries (
+                        id, webhook_id, event, payload, status,
+                        response_status, response_body, error_message,
+                        attempts, created_at, delivered_at
+                    ) VALUES (
+                        :id, :webhook_id, :event, :payload, :status,
+                        :response_status, :response_body, :error_message,
+                        :attempts, :created_at, :delivered_at
+                    )
+                """), deliveries)
+            session.commit()
+        self._record_endpoint_stats(outcomes, now)
+
+    def _record_endpoint_stats(self, outcomes: List[_Outcome], now: datetime) -> None:
+        # Best effort and in its own transaction: config schemas vary by deployment
+        delivered = sorted({o.job.webhook_id for o in outcomes if o.status == WEBHOOK_OUTBOX_STATUS_DELIVERED})
+        dead: Dict[str, int] = defaultdict(int)
+        for o in outcomes:
+            if o.status == WEBHOOK_OUTBOX_STATUS_DEAD and o.logged:
+                dead[o.job.webhook_id] += 1
+        if not delivered and not dead:
+            return
+        try:
+            with self._sessions()() as session:
+                if delivered:
+                    session.execute(
+                        text("UPDATE webhook_configs SET last_triggered_at = :at WHERE id = :id"),
+                        [{"id": w, "at": now} for w in delivered],
+                    )
+                if dead:
+                    session.execute(
+                        text("""
+                            UPDATE webhook_configs
+                            SET failure_count = failure_count + :n, last_failure_at = :at
+                            WHERE id = :id
+                        """),
+                        [{"id": w, "n": n, "at": now} for w, n in dead.items()],
+                    )
+                session.commit()
+        except Exception as e:
+            logger.debug(f"Webhook endpoint stats not updated: {e}")
+
+
+_dispatcher: Optional[WebhookDispatcher] = None
+
+
+def get_webhook_dispatcher() -> WebhookDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = WebhookDispatcher()
+    return _dispatcher
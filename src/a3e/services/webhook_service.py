@@ -2,11 +2,9 @@
 Webhook service for real-time event notifications to external systems.
 """
 
-import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime, timezone
-import httpx
 import hashlib
 import hmac
 import json
@@ -14,7 +12,9 @@ from enum import Enum
 from pydantic import BaseModel, HttpUrl
 import uuid
 
-from sqlalchemy.orm import Session
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, registry
 from sqlalchemy import text
 
 from ..core.config import settings
@@ -53,230 +53,156 @@ class WebhookEvent(str, Enum):
     TEAM_MEMBER_REMOVED = "team.member_removed"
 
 
+WEBHOOK_OUTBOX_STATUS_PENDING = "pending"
+WEBHOOK_OUTBOX_STATUS_FANNED_OUT = "fanned_out"
+WEBHOOK_OUTBOX_STATUS_DELIVERED = "delivered"
+WEBHOOK_OUTBOX_STATUS_DEAD = "dead"
+
+_outbox_metadata = sa.MetaData()
+
+# One row per event (webhook_id NULL) until the dispatcher fans it out into
+# one row per matching endpoint; each endpoint row retries independently.
+webhook_outbox = sa.Table(
+    "webhook_outbox",
+    _outbox_metadata,
+    sa.Column("id", sa.String(36), primary_key=True),
+    sa.Column("event", sa.String(100), nullable=False),
+    sa.Column("payload", sa.Text, nullable=False),
+    sa.Column("institution_id", sa.String(255), nullable=True),
+    sa.Column("webhook_id", sa.String(255), nullable=True),
+    sa.Column("parent_id", sa.String(36), nullable=True),
+    sa.Column("status", sa.String(20), nullable=False, default=WEBHOOK_OUTBOX_STATUS_PENDING),
+    sa.Column("attempts", sa.Integer, nullable=False, default=0),
+    sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+    sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+    sa.Column("claim_token", sa.String(36), nullable=True),
+    sa.Column("last_error", sa.Text, nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    sa.Index("ix_webhook_outbox_due", "status", "next_attempt_at"),
+    sa.Index("ix_webhook_outbox_claim_token", "claim_token"),
+)
+
+
+class WebhookOutboxEntry:
+    """ORM handle on a ``webhook_outbox`` row, so callers can ``add()`` it."""
+
+    def __init__(self, **values: Any):
+        for key, value in values.items():
+            setattr(self, key, value)
+
+
+registry(metadata=_outbox_metadata).map_imperatively(WebhookOutboxEntry, webhook_outbox)
+
+
+def ensure_outbox_table(bind: Any) -> None:
+    """Create ``webhook_outbox`` if migrations have not (SQLite/dev setups)."""
+    webhook_outbox.create(bind=bind, checkfirst=True)
+
+
+def _default_session_factory() -> Optional[Callable[[], AsyncSession]]:
+    try:
+        from ..database.connection import db_manager
+    except Exception:
+        return None
+    return db_manager.AsyncSessionLocal
+
+
 class WebhookService:
-    """Service for managing webhooks and triggering events."""
+    """Service for managing webhooks and triggering events.
+
+    Triggering only writes to the ``webhook_outbox`` table; delivery, retries
+    and delivery logging happen in ``WebhookDispatcher``.
+    """
     
-    def __init__(self):
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0),
-            follow_redirects=True,
-            headers={
-                "User-Agent": "MapMyStandards-Webhook/1.0"
-            }
-        )
+    def __init__(self, session_factory: Optional[Callable[[], AsyncSession]] = None):
+        self._session_factory = session_factory
+    
+    async def __aenter__(self) -> "WebhookService":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
     
     async def trigger_webhook(
         self, 
-        db: Session,
+        db: AsyncSession,
         event: WebhookEvent, 
         data: Dict[str, Any],
-        institution_id: Optional[str] = None
+        institution_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
     ) -> List[str]:
         """
-        Trigger webhooks for a specific event.
+        Queue an event for delivery in the caller's transaction.
+        
+        The row is ``add()``-ed to ``db`` and becomes visible to the
+        dispatcher when the caller commits, so an event is published if and
+        only if the business change is.
         
         Args:
-            db: Database session
+            db: The caller's session (not flushed or committed here)
             event: The webhook event type
             data: The event data payload
             institution_id: Optional institution ID to filter webhooks
+            metadata: Optional extra envelope fields (e.g. ``{"test": True}``)
         
         Returns:
-            List of webhook IDs that were triggered
+            IDs of the queued outbox rows
         """
+        now = datetime.now(timezone.utc)
+        payload = {
+            "event": WebhookEvent(event).value,
+            "timestamp": now.isoformat(),
+            "data": data
+        }
+        if metadata:
+            payload["metadata"] = metadata
+        entry = WebhookOutboxEntry(
+            id=str(uuid.uuid4()),
+            event=payload["event"],
+            payload=json.dumps(payload, default=str),
+            institution_id=institution_id,
+            status=WEBHOOK_OUTBOX_STATUS_PENDING,
+            attempts=0,
+            next_attempt_at=now,
+            created_at=now,
+        )
+        db.add(entry)
+        return [entry.id]
+    
+    async def trigger_event(
+        self,
+        event: WebhookEvent,
+        data: Dict[str, Any],
+        institution_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        db: Optional[AsyncSession] = None
+    ) -> List[str]:
+        """Queue an event in ``db``'s transaction.
+
+        Without ``db`` the event is the only write, so it is committed in its
+        own async session.
+        """
+        if db is not None:
+            return await self.trigger_webhook(db, event, data, institution_id, metadata)
+        factory = self._session_factory or _default_session_factory()
+        if factory is None:
+            logger.debug(f"Webhook outbox unavailable; dropping event {event}")
+            return []
         try:
-            # Get active webhooks for this event
-            query = text("""
-                SELECT id, url, secret, headers
-                FROM webhook_configs
-                WHERE active = true
-                AND :event = ANY(events)
-                AND (institution_id IS NULL OR institution_id = :institution_id)
-            """)
-            
-            result = db.execute(
-                query,
-                {"event": event, "institution_id": institution_id}
-            )
-            webhooks = result.fetchall()
-            
-            if not webhooks:
-                logger.debug(f"No active webhooks found for event {event}")
-                return []
-            
-            # Prepare the payload
-            payload = {
-                "event": event,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "data": data
-            }
-            
-            # Trigger webhooks concurrently
-            tasks = []
-            for webhook in webhooks:
-                task = self._deliver_webhook(
-                    db=db,
-                    webhook_id=webhook.id,
-                    url=webhook.url,
-                    secret=webhook.secret,
-                    headers=webhook.headers or {},
-                    payload=payload
-                )
-                tasks.append(task)
-            
-            await asyncio.gather(*tasks, return_exceptions=True)
-            
-            return [w.id for w in webhooks]
-            
+            async with factory() as session:
+                outbox_ids = await self.trigger_webhook(session, event, data, institution_id, metadata)
+                await session.commit()
+                return outbox_ids
         except Exception as e:
-            logger.error(f"Error triggering webhooks: {e}")
+            logger.error(f"Error queueing webhook event {event}: {e}")
             return []
     
-    async def _deliver_webhook(
-        self,
-        db: Session,
-        webhook_id: str,
-        url: str,
-        secret: Optional[str],
-        headers: Dict[str, str],
-        payload: Dict[str, Any]
-    ) -> bool:
-        """Deliver a webhook with retry logic."""
-        delivery_id = str(uuid.uuid4())
+    async def load_webhooks(self) -> None:
+        """Drop cached endpoint configs so edits apply on the next dispatch."""
+        from .webhook_dispatcher import get_webhook_dispatcher
         
-        # Create delivery record
-        create_query = text("""
-            INSERT INTO webhook_deliveries (
-                id, webhook_id, event, payload, 
-                status, created_at
-            ) VALUES (
-                :id, :webhook_id, :event, :payload,
-                'pending', :created_at
-            )
-        """)
-        
-        db.execute(
-            create_query,
-            {
-                "id": delivery_id,
-                "webhook_id": webhook_id,
-                "event": payload["event"],
-                "payload": json.dumps(payload),
-                "created_at": datetime.now(timezone.utc)
-            }
-        )
-        db.commit()
-        
-        # Prepare headers
-        request_headers = {
-            "Content-Type": "application/json",
-            "X-Webhook-Event": payload["event"],
-            "X-Webhook-Delivery": delivery_id,
-            **headers
-        }
-        
-        # Add signature if secret is provided
-        if secret:
-            signature = self._generate_signature(secret, payload)
-            request_headers["X-Webhook-Signature"] = signature
-        
-        # Attempt delivery with retries
-        max_retries = 3
-        retry_delay = 1
-        
-        for attempt in range(max_retries):
-            try:
-                response = await self.client.post(
-                    url,
-                    json=payload,
-                    headers=request_headers
-                )
-                
-                # Update delivery record with success
-                update_query = text("""
-                    UPDATE webhook_deliveries
-                    SET status = 'delivered',
-                        response_status = :status,
-                        response_headers = :headers,
-                        response_body = :body,
-                        delivered_at = :delivered_at,
-                        attempts = :attempts
-                    WHERE id = :id
-                """)
-                
-                db.execute(
-                    update_query,
-                    {
-                        "id": delivery_id,
-                        "status": response.status_code,
-                        "headers": json.dumps(dict(response.headers)),
-                        "body": response.text[:1000],  # Limit response body size
-                        "delivered_at": datetime.now(timezone.utc),
-                        "attempts": attempt + 1
-                    }
-                )
-                
-                # Update webhook last triggered
-                webhook_update_query = text("""
-                    UPDATE webhook_configs
-                    SET last_triggered_at = :triggered_at
-                    WHERE id = :id
-                """)
-                
-                db.execute(
-                    webhook_update_query,
-                    {
-                        "id": webhook_id,
-                        "triggered_at": datetime.now(timezone.utc)
-                    }
-                )
-                db.commit()
-                
-                return True
-                
-            except Exception as e:
-                logger.warning(f"Webhook delivery attempt {attempt + 1} failed: {e}")
-                
-                if attempt == max_retries - 1:
-                    # Final attempt failed
-                    failure_query = text("""
-                        UPDATE webhook_deliveries
-                        SET status = 'failed',
-                            error_message = :error,
-                            attempts = :attempts
-                        WHERE id = :id
-                    """)
-                    
-                    db.execute(
-                        failure_query,
-                        {
-                            "id": delivery_id,
-                            "error": str(e),
-                            "attempts": attempt + 1
-                        }
-                    )
-                    
-                    # Update webhook failure count
-                    webhook_fail_query = text("""
-                        UPDATE webhook_configs
-                        SET failure_count = failure_count + 1,
-                            last_failure_at = :failure_at
-                        WHERE id = :id
-                    """)
-                    
-                    db.execute(
-                        webhook_fail_query,
-                        {
-                            "id": webhook_id,
-                            "failure_at": datetime.now(timezone.utc)
-                        }
-                    )
-                    db.commit()
-                    
-                    return False
-                
-                # Wait before retry
-                await asyncio.sleep(retry_delay * (attempt + 1))
+        get_webhook_dispatcher().invalidate_endpoints()
     
     def _generate_signature(self, secret: str, payload: Dict[str, Any]) -> str:
         """Generate HMAC signature for webhook payload."""
@@ -297,9 +223,13 @@ class WebhookService:
         institution_id: Optional[str] = None,
         secret: Optional[str] = None,
         headers: Optional[Dict[str, str]] = None,
-        active: bool = True
+        active: bool = True,
+        commit: bool = True
     ) -> str:
-        """Create a new webhook configuration."""
+        """Create a new webhook configuration.
+
+        Pass ``commit=False`` to leave the insert in the caller's transaction.
+        """
         webhook_id = str(uuid.uuid4())
         
         if not secret:
@@ -321,7 +251,7 @@ class WebhookService:
                 "id": webhook_id,
                 "name": name,
                 "url": url,
-                "events": events,
+                "events": json.dumps(events),
                 "secret": secret,
                 "headers": json.dumps(headers) if headers else None,
                 "institution_id": institution_id,
@@ -329,7 +259,8 @@ class WebhookService:
                 "created_at": datetime.now(timezone.utc)
             }
         )
-        db.commit()
+        if commit:
+            db.commit()
         
         return webhook_id
     
@@ -389,4 +320,4 @@ class WebhookService:
 
 
 # Create a global instance
-webhook_service = WebhookService()
\ No newline at end of file
+webhook_service = WebhookService()
@@ -37,5 +37,7 @@ def ensure_standards_loaded():
         logger.error(f"Error loading standards on startup: {e}")
         logger.info("Continuing with seed data")
 
-# Run on import
-ensure_standards_loaded()
+# Run on import unless the graph is still deferred; building StandardsGraph
+# performs the same corpus load on first use.
+if getattr(standards_graph, "is_loaded", True):
+    ensure_standards_loaded()
@@ -0,0 +1,83 @@
+import asyncio
+import os
+
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret")
+
+from src.a3e.api.routes import user_intelligence_simple as uis
+from src.a3e.services import analysis_cache
+from src.a3e.services.analysis_cache import AnalysisCache, corpus_version
+from src.a3e.services.user_kv_store import UserKVStore
+
+POLICY = (
+    b"Mission statement approved by the board of trustees. The institution evaluates student "
+    b"learning outcomes annually and uses assessment results for continuous improvement."
+)
+
+
+def test_reanalysis_is_served_from_cache_until_corpus_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis_cache, "_cache", AnalysisCache(UserKVStore(str(tmp_path / "kv.sqlite3"))))
+    monkeypatch.setattr(uis, "USE_ENHANCED_MAPPER", False)
+    monkeypatch.setattr(uis, "_get_user_reviews", lambda claims, filename: {})
+
+    async def no_user(identifier):
+        return None
+
+    async def no_record(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(uis, "get_user_uuid_from_email", no_user)
+    monkeypatch.setattr(uis, "_record_user_upload", no_record)
+
+    runs = []
+    pipeline = uis._run_analysis_pipeline
+
+    async def counting_pipeline(*args, **kwargs):
+        runs.append(args[0])
+        return await pipeline(*args, **kwargs)
+
+    monkeypatch.setattr(uis, "_run_analysis_pipeline", counting_pipeline)
+    user = {"sub": "analyst@example.edu"}
+
+    first = asyncio.run(uis._analyze_evidence_from_bytes("policy.txt", POLICY, "policy", user))
+    again = asyncio.run(uis._analyze_evidence_from_bytes("renamed.txt", POLICY, "policy", user))
+    assert runs == ["policy.txt"]
+    assert first["cached"] is False and again["cached"] is True
+    assert first["analysis"]["mappings"] and again["analysis"]["mappings"] == first["analysis"]["mappings"]
+    assert again["analysis"]["trust_score"] == first["analysis"]["trust_score"]
+
+    # Different bytes or a different tenant miss
+    asyncio.run(uis._analyze_evidence_from_bytes("policy.txt", POLICY + b" Revised.", "policy", user))
+    asyncio.run(uis._analyze_evidence_from_bytes("policy.txt", POLICY, "policy", {"sub": "other@example.edu"}))
+    assert len(runs) == 3
+
+    # A new standards corpus invalidates every key
+    monkeypatch.setattr(uis, "corpus_version", lambda: corpus_version() + "-next")
+    assert asyncio.run(uis._analyze_evidence_from_bytes("policy.txt", POLICY, "policy", user))["cached"] is False
+    assert len(runs) == 4
+
+
+def test_cache_expires_entries_and_evicts_least_recently_used(tmp_path, monkeypatch):
+    store = UserKVStore(str(tmp_path / "kv.sqlite3"))
+    cache = AnalysisCache(store, ttl_seconds=3600, max_entries=2)
+
+    async def run():
+        await cache.put("a", {"v": "a"})
+        await cache.put("b", {"v": "b"})
+        assert await cache.get("a") == {"v": "a"}  # "a" is now more recently used than "b"
+        await cache.put("c", {"v": "c"})
+        assert await cache.get("b") is None
+        assert await cache.get("a") == {"v": "a"} and await cache.get("c") == {"v": "c"}
+
+        stale = store.get(analysis_cache.ANALYSIS_CACHE_NAMESPACE, "c")
+        stale["cached_at"] = "2000-01-01T00:00:00"
+        store.put(analysis_cache.ANALYSIS_CACHE_NAMESPACE, "c", stale)
+        assert await cache.get("c") is None
+
+    asyncio.run(run())
+    assert cache.stats["evicted"] == 1 and cache.stats["expired"] == 1
+    assert cache.stats["misses"] == 2
+    rows = store._connect().execute(
+        "SELECT user_key FROM user_kv WHERE namespace = ?", (analysis_cache.ANALYSIS_CACHE_NAMESPACE,)
+    ).fetchall()
+    assert rows == [("a",)]
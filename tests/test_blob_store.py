@@ -0,0 +1,218 @@
+import asyncio
+import concurrent.futures
+import importlib.util
+import sqlite3
+from datetime import timedelta
+from pathlib import Path
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import event
+
+from src.a3e.api.routes import uploads_db
+from src.a3e.database import services
+from src.a3e.database.connection import DatabaseManager
+from src.a3e.services import blob_store as blob_store_module
+from src.a3e.services.blob_store import BlobStore, LocalBlobBackend, content_sha256
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _create_schema(path):
+    with sqlite3.connect(path) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE files (file_id TEXT PRIMARY KEY, user_id TEXT, filename TEXT, original_filename TEXT,
+                                content_type TEXT, file_size INTEGER, file_content BLOB, content_sha256 TEXT,
+                                created_at TIMESTAMP, updated_at TIMESTAMP);
+            CREATE TABLE file_blobs (sha256 TEXT PRIMARY KEY, size INTEGER NOT NULL, mime_type TEXT,
+                                     refcount INTEGER NOT NULL, created_at TIMESTAMP NOT NULL,
+                                     last_referenced_at TIMESTAMP NOT NULL);
+            """
+        )
+
+
+def _blob_rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT sha256, size, refcount FROM file_blobs").fetchall()
+
+
+def test_duplicate_uploads_share_one_blob_and_metadata_reads_skip_the_bytes(tmp_path, monkeypatch):
+    path = tmp_path / "app.db"
+    _create_schema(path)
+    manager = DatabaseManager(f"sqlite:///{path}", pool_size=2, max_overflow=0, pool_timeout=5,
+                              pool_recycle=60, bootstrap=False)
+    store = BlobStore(LocalBlobBackend(tmp_path / "blobs"))
+    monkeypatch.setattr(services, "db_manager", manager)
+    monkeypatch.setattr(blob_store_module, "_blob_store", store)
+    pdf = b"%PDF-1.4 self-study narrative" * 100
+    statements = []
+
+    async def run():
+        await manager.initialize()
+        try:
+            first = await services.FileService.create_file("u1", "plan.pdf", pdf, "application/pdf")
+            second = await services.FileService.create_file("u2", "copy.pdf", pdf, "application/pdf")
+            other = await services.FileService.create_file("u1", "notes.txt", b"notes", "text/plain")
+            event.listen(manager.async_engine.sync_engine, "before_cursor_execute",
+                         lambda conn, cursor, statement, *args: statements.append(statement))
+            meta = await services.FileService.get_file(second.file_id, "u2")
+            content = await services.FileService.get_file_content(second.file_id, "u2")
+
+            async with manager.get_session() as session:
+                assert await store.release(session, first.content_sha256) == 1
+                assert await store.release(session, second.content_sha256) == 0
+                await session.commit()
+                kept = await store.collect_garbage(session, grace=timedelta(hours=1))
+                collected = await store.collect_garbage(session, grace=timedelta(0))
+            return first, second, other, meta, content, kept, collected
+        finally:
+            await manager.close()
+
+    first, second, other, meta, content, kept, collected = asyncio.run(run())
+    sha = content_sha256(pdf)
+    assert first.content_sha256 == second.content_sha256 == sha
+    assert other.content_sha256 != sha
+    assert store.stats["deduplicated"] == 1 and store.stats["bytes_written"] == len(pdf) + 5
+
+    assert not hasattr(meta, "file_content") and meta.file_size == len(pdf)
+    assert statements and not any("file_content" in s for s in statements)
+    assert content == pdf
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM files WHERE file_content IS NOT NULL").fetchone()[0] == 0
+
+    assert kept == [] and collected == [sha]
+    assert not store.backend.exists(sha) and store.backend.exists(other.content_sha256)
+    assert _blob_rows(path) == [(other.content_sha256, 5, 1)]
+
+
+def test_migration_script_moves_legacy_rows_and_reports_savings(tmp_path, capsys):
+    spec = importlib.util.spec_from_file_location("migrate_file_blobs", REPO_ROOT / "scripts" / "migrate_file_blobs.py")
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+
+    db = tmp_path / "legacy.db"
+    script.build_demo_corpus(db, files=30, duplicate_ratio=0.5)
+    with sqlite3.connect(db) as conn:
+        before = dict(conn.execute("SELECT file_id, file_content FROM files").fetchall())
+    store = BlobStore(LocalBlobBackend(tmp_path / "blobs"))
+
+    assert asyncio.run(script.run(f"sqlite:///{db}", store, batch_size=7, repeat=1)) == 0
+    assert "saved" in capsys.readouterr().out
+
+    with sqlite3.connect(db) as conn:
+        rows = conn.execute("SELECT file_id, content_sha256, file_content FROM files").fetchall()
+        refcounts = dict(conn.execute("SELECT sha256, refcount FROM file_blobs").fetchall())
+    assert all(content is None for _, _, content in rows)
+    assert all(store.backend.get(sha) == before[file_id] for file_id, sha, _ in rows)
+    distinct = {bytes(c) for c in before.values()}
+    assert len(refcounts) == len(distinct) < len(before)
+    assert sum(refcounts.values()) == len(before)
+    assert store.stats["bytes_written"] == sum(len(c) for c in distinct)
+
+    async def rerun():
+        engine = script.create_async_engine(f"sqlite+aiosqlite:///{db}")
+        try:
+            return await script.migrate(script.async_sessionmaker(engine), store, 7)
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(rerun())["rows"] == 0  # resumable: nothing left to move
+
+
+def test_delete_releases_blob_and_gc_sweeps_rolled_back_uploads(tmp_path, monkeypatch):
+    path = tmp_path / "app.db"
+    _create_schema(path)
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE jobs (job_id TEXT PRIMARY KEY, file_id TEXT)")
+    manager = DatabaseManager(f"sqlite:///{path}", pool_size=2, max_overflow=0, pool_timeout=5,
+                              pool_recycle=60, bootstrap=False)
+    store = BlobStore(LocalBlobBackend(tmp_path / "blobs"))
+    monkeypatch.setattr(services, "db_manager", manager)
+    monkeypatch.setattr(blob_store_module, "_blob_store", store)
+    monkeypatch.setattr(store, "get", None)  # downloads must stream, never read the whole blob
+    report = b"evidence " * 300_000  # several chunks
+
+    async def run():
+        await manager.initialize()
+        try:
+            kept = await services.FileService.create_file("u1", "report.pdf", report, "application/pdf")
+            response = await uploads_db.download_file(kept.file_id, current_user={"user_id": "u1"})
+            chunks = [c async for c in response.body_iterator]
+
+            async with manager.get_session() as session:
+                rolled_back = await store.put(session, b"never committed")
+                await session.rollback()
+            assert store.backend.exists(rolled_back)
+
+            assert not await services.FileService.delete_file(kept.file_id, "someone-else")
+            assert await services.FileService.delete_file(kept.file_id, "u1")
+            async with manager.get_session() as session:
+                collected = await store.collect_garbage(session, grace=timedelta(0))
+            return kept.content_sha256, response, chunks, rolled_back, collected
+        finally:
+            await manager.close()
+
+    sha, response, chunks, rolled_back, collected = asyncio.run(run())
+    assert isinstance(response, StreamingResponse)
+    assert response.headers["content-length"] == str(len(report))
+    assert len(chunks) > 1 and b"".join(chunks) == report
+    assert sorted(collected) == sorted([sha, rolled_back])
+    assert not store.backend.exists(sha) and not store.backend.exists(rolled_back)
+    assert _blob_rows(path) == [] and store.stats["orphans"] == 1
+
+
+def test_gc_never_deletes_bytes_under_a_concurrent_put(tmp_path, monkeypatch):
+    path = tmp_path / "app.db"
+    _create_schema(path)
+    manager = DatabaseManager(f"sqlite:///{path}", pool_size=3, max_overflow=0, pool_timeout=5,
+                              pool_recycle=60, bootstrap=False)
+    monkeypatch.setattr(services, "db_manager", manager)
+    released, orphaned = b"released then re-uploaded", b"rolled back then re-uploaded"
+    racing, reuploads = {}, []
+
+    class RacingBackend(LocalBlobBackend):
+        def delete(self, sha256):
+            # Re-upload the same bytes from another session while GC is mid-delete
+            future = asyncio.run_coroutine_threadsafe(reupload(racing[sha256]), loop)
+            reuploads.append(future)
+            try:
+                future.result(timeout=0.5)  # returns only if put was not held off
+            except concurrent.futures.TimeoutError:
+                pass
+            super().delete(sha256)
+
+    store = BlobStore(RacingBackend(tmp_path / "blobs"))
+    monkeypatch.setattr(blob_store_module, "_blob_store", store)
+
+    async def reupload(data):
+        async with manager.get_session() as session:
+            await store.put(session, data)
+            await session.commit()
+
+    async def run():
+        await manager.initialize()
+        try:
+            async with manager.get_session() as session:
+                racing[await store.put(session, released)] = released
+                await session.commit()
+                await store.release(session, content_sha256(released))
+                await session.commit()
+                racing[await store.put(session, orphaned)] = orphaned
+                await session.rollback()
+            async with manager.get_session() as session:
+                collected = await store.collect_garbage(session, grace=timedelta(0))
+            await asyncio.gather(*map(asyncio.wrap_future, reuploads))
+            return collected
+        finally:
+            await manager.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        collected = loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert sorted(collected) == sorted(racing)
+    for sha, data in racing.items():
+        assert store.backend.get(sha) == data
+    assert sorted(_blob_rows(path)) == sorted((sha, len(data), 1) for sha, data in racing.items())
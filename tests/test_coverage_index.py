@@ -0,0 +1,169 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.a3e.services import coverage_index
+from src.a3e.services.coverage_index import CoverageIndexRegistry
+
+ORG = "00000000-0000-0000-0000-000000000001"
+
+
+class TinyGraph:
+    """Two standards: S1 -> (C1 -> I1, I2), (C2 -> I3); S2 without children."""
+
+    def __init__(self):
+        self.revision = 0
+        self.accreditor_roots = {"ACC": ["S1", "S2"]}
+        spec = [
+            ("S1", "standard", None), ("C1", "clause", "S1"), ("C1_ind_1", "indicator", "C1"),
+            ("C1_ind_2", "indicator", "C1"), ("C2", "clause", "S1"), ("C2_ind_1", "indicator", "C2"),
+            ("S2", "standard", None),
+        ]
+        self.nodes = {
+            node_id: SimpleNamespace(node_id=node_id, title=node_id, level=level, parent_id=parent, accreditor="ACC")
+            for node_id, level, parent in spec
+        }
+
+    def get_nodes_by_accreditor(self, accreditor):
+        return [n for n in self.nodes.values() if n.accreditor == accreditor]
+
+
+def _link(artifact, code, score=0.8, trust=None, age_days=0):
+    return SimpleNamespace(
+        org_id=ORG, standard_set="ACC", artifact_id=artifact, standard_code=code, score=score,
+        evidence_trust=trust, computed_at=datetime.now(timezone.utc) - timedelta(days=age_days),
+    )
+
+
+def test_incremental_rollup_gaps_and_heatmap():
+    graph = TinyGraph()
+    registry = CoverageIndexRegistry(graph)
+    registry.apply_links([_link("a1", "C1_ind_1", trust=0.9, age_days=10)])
+    index = registry.get(ORG, "ACC")
+
+    s1, s2 = index.standards()
+    assert s1["coverage_percentage"] == pytest.approx(33.3) and s1["evidence_count"] == 1
+    assert s1["average_trust"] == 0.9 and s1["average_age_days"] == pytest.approx(10, abs=0.1)
+    assert s2["coverage_percentage"] == 0 and s2["average_trust"] is None
+
+    # A clause-level link covers the clause's indicators; upserting the same key replaces it
+    registry.apply_links([_link("a2", "C2", trust=0.5), _link("a1", "C1_ind_1", trust=0.7)])
+    s1 = index.standards()[0]
+    assert s1["coverage_percentage"] == pytest.approx(66.7) and s1["evidence_count"] == 2
+    assert s1["average_trust"] == pytest.approx(0.6)
+    assert index.heatmap() == {"S1": {"C1": 50.0, "C2": 100.0}, "S2": {}}
+    gaps = {g["standard_id"]: g["uncovered"] for g in index.gap_summary()}
+    assert gaps == {"S1": ["C1_ind_2"], "S2": ["S2"]}
+
+    # Unchanged rows are no-ops; graph reloads stay consistent
+    unchanged = _link("a2", "C2", trust=0.5)
+    unchanged.computed_at = datetime.fromtimestamp(index._links[("a2", "C2")][2], timezone.utc)
+    assert registry.apply_links([unchanged]) == 0
+    del graph.nodes["C1_ind_2"]
+    graph.revision += 1
+    assert registry.get(ORG, "ACC").standards()[0]["coverage_percentage"] == 100.0
+
+
+def _members(monkeypatch, memberships):
+    """Answer the org membership lookup from ``{(api_key, org_id)}``."""
+    from src.a3e.database.connection import db_manager
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, stmt, params):
+            member = (params["api_key"], str(params["org_id"])) in memberships
+            return SimpleNamespace(scalar=lambda: 1 if member else None)
+
+    monkeypatch.setattr(db_manager, "get_session", lambda: FakeSession())
+
+
+def test_compliance_status_reads_index(monkeypatch):
+    from fastapi import HTTPException
+
+    from src.a3e.api.routes.compliance_intelligence import (
+        ComplianceStatusRequest,
+        get_compliance_status,
+        get_coverage_gaps,
+        get_coverage_heatmap,
+    )
+
+    registry = CoverageIndexRegistry(TinyGraph())
+    registry.load(ORG, "ACC", [_link("a1", "C1", trust=0.8), _link("a2", "C2_ind_1", trust=0.6)])
+    monkeypatch.setattr(coverage_index, "_registry", registry)
+    _members(monkeypatch, {("k", ORG)})
+
+    # Keys whose user is not in the org cannot read its coverage
+    for read in (lambda: get_compliance_status(ComplianceStatusRequest(accreditor="ACC", org_id=ORG), api_key="other"),
+                 lambda: get_coverage_gaps(ORG, "ACC", api_key="other"),
+                 lambda: get_coverage_heatmap(ORG, "ACC", api_key="other")):
+        with pytest.raises(HTTPException) as denied:
+            asyncio.run(read())
+        assert denied.value.status_code == 403
+    assert asyncio.run(get_coverage_heatmap(ORG, "ACC", api_key="k"))["heatmap"]["S1"]["C1"] == 100.0
+
+    status = asyncio.run(get_compliance_status(ComplianceStatusRequest(accreditor="ACC", org_id=ORG), api_key="k"))
+    s1, s2 = status["standards"]
+    assert (s1["coverage_percentage"], s1["evidence_count"], s1["average_trust"]) == (100.0, 2, 0.7)
+    assert s2["coverage_percentage"] == 0 and s2["risk_score"] > s1["risk_score"]
+    assert status["overall_metrics"]["average_coverage"] == 50.0
+
+
+def test_seed_failures_are_not_cached_and_stale_indexes_reseed(monkeypatch):
+    from fastapi import HTTPException
+
+    from src.a3e.api.routes import compliance_intelligence
+    from src.a3e.database import ai_repositories
+    from src.a3e.database.connection import db_manager
+
+    registry = CoverageIndexRegistry(TinyGraph(), reseed_seconds=3600)
+    monkeypatch.setattr(coverage_index, "_registry", registry)
+    rows = {"links": None}
+
+    class FakeRepository:
+        def __init__(self, session):
+            pass
+
+        async def get_latest(self, *, org_id, standard_set):
+            if rows["links"] is None:
+                raise ConnectionError("database down")
+            return rows["links"]
+
+    class FakeSession:
+        async def __aenter__(self):
+            return None
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(ai_repositories, "EvidenceLinkRepository", FakeRepository)
+    monkeypatch.setattr(db_manager, "get_session", lambda: FakeSession())
+
+    with pytest.raises(HTTPException) as bad_org:
+        asyncio.run(compliance_intelligence._coverage_index("not-a-uuid", "ACC"))
+    assert bad_org.value.status_code == 400
+    with pytest.raises(HTTPException) as down:
+        asyncio.run(compliance_intelligence._coverage_index(ORG, "ACC"))
+    assert down.value.status_code == 503 and not registry.is_loaded(ORG, "ACC")
+
+    rows["links"] = [_link("a1", "C1"), _link("a2", "C2")]
+    index = asyncio.run(compliance_intelligence._coverage_index(ORG, "ACC"))
+    assert index.standards()[0]["coverage_percentage"] == 100.0
+
+    # Another worker removed a2; once invalidated the next read re-seeds from the table
+    rows["links"] = [_link("a1", "C1")]
+    assert asyncio.run(compliance_intelligence._coverage_index(ORG, "ACC")).standards()[0]["evidence_count"] == 2
+    registry.invalidate(ORG)
+    index = asyncio.run(compliance_intelligence._coverage_index(ORG, "ACC"))
+    assert index.standards()[0]["evidence_count"] == 1
+
+    # A failed re-seed keeps serving the last good seed
+    rows["links"] = None
+    registry.invalidate()
+    assert asyncio.run(compliance_intelligence._coverage_index(ORG, "ACC")).standards()[0]["evidence_count"] == 1
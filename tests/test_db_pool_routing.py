@@ -0,0 +1,70 @@
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.a3e.database.connection import DatabaseManager
+
+
+def _marker_db(path, origin):
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS db_origin (name TEXT)")
+        conn.execute("INSERT INTO db_origin VALUES (?)", (origin,))
+
+
+async def _origin(manager, read_only):
+    async with manager.get_session(read_only=read_only) as session:
+        return (await session.execute(text("SELECT name FROM db_origin"))).scalar()
+
+
+def test_read_only_sessions_use_the_replica_when_configured(tmp_path):
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    _marker_db(primary, "primary")
+    _marker_db(replica, "replica")
+
+    async def run(replica_url):
+        manager = DatabaseManager(f"sqlite:///{primary}", read_replica_url=replica_url, pool_size=3,
+                                  max_overflow=1, pool_timeout=1, pool_recycle=60, bootstrap=False)
+        await manager.initialize()
+        try:
+            routed = (await _origin(manager, False), await _origin(manager, True))
+            return routed, manager.pool_metrics()
+        finally:
+            await manager.close()
+
+    (writes, reads), metrics = asyncio.run(run(f"sqlite:///{replica}"))
+    assert (writes, reads) == ("primary", "replica")
+    assert set(metrics) == {"primary", "replica"}
+    assert metrics["primary"]["size"] == 3 and metrics["primary"]["checkouts"] == 1
+    assert metrics["replica"]["checkouts"] == 1 and metrics["replica"]["checked_out"] == 0
+
+    (writes, reads), metrics = asyncio.run(run(None))
+    assert (writes, reads) == ("primary", "primary")
+    assert set(metrics) == {"primary"} and metrics["primary"]["checkouts"] == 2
+
+
+def test_pool_exhaustion_times_out_and_is_counted(tmp_path):
+    _marker_db(tmp_path / "primary.db", "primary")
+
+    async def run():
+        manager = DatabaseManager(f"sqlite:///{tmp_path / 'primary.db'}", pool_size=2, max_overflow=1,
+                                  pool_timeout=0.2, pool_recycle=60, bootstrap=False)
+        await manager.initialize()
+        held = [manager.get_session() for _ in range(3)]
+        try:
+            for cm in held:
+                await cm.__aenter__()
+            busy = manager.pool_metrics()["primary"]
+            with pytest.raises(PoolTimeoutError):
+                await _origin(manager, False)
+            return busy, manager.pool_metrics()["primary"]
+        finally:
+            for cm in held:
+                await cm.__aexit__(None, None, None)
+            await manager.close()
+
+    busy, after = asyncio.run(run())
+    assert busy["checked_out"] == 3 and busy["overflow"] == 1
+    assert after["checkout_timeouts"] == 1 and after["checkouts"] == 3
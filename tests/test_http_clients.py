@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.a3e.services.http_clients import HostPolicy, HttpClientRegistry
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections = 0
+
+    def setup(self):
+        type(self).connections += 1
+        super().setup()
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.connections = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_clients_are_shared_and_reuse_connections(server):
+    registry = HttpClientRegistry(policies={"127.0.0.1": HostPolicy(timeout=5.0, max_connections=4)})
+
+    async def run():
+        client = registry.client(server)
+        assert registry.client(f"{server}/other") is client
+        for _ in range(3):
+            async with registry.borrow(server) as borrowed:
+                assert (await borrowed.get(f"{server}/ping")).text == "ok"
+        assert not client.is_closed
+
+        session = registry.aiohttp_session(server)
+        router = registry.aiohttp_session()
+        for _ in range(2):
+            async with router.get(f"{server}/ping") as resp:
+                assert await resp.text() == "ok"
+
+        with registry.borrow_sync(server) as sync_client:
+            for _ in range(2):
+                assert sync_client.get(f"{server}/ping").status_code == 200
+
+        metrics = registry.metrics()
+        await registry.aclose()
+        assert client.is_closed and session.closed
+        return metrics
+
+    metrics = asyncio.run(run())
+    # One connection per pool (httpx async, aiohttp, httpx sync) for 7 requests
+    assert _Handler.connections == 3
+    host = metrics["127.0.0.1"]
+    assert host["requests"] == 3 and host["in_flight"] == 0 and host["errors"] == 0
+    assert host["open_connections"] == 1 and host["idle_connections"] == 1
+    assert host["max_connections"] == 4
+    assert metrics["127.0.0.1 (aiohttp)"]["requests"] == 2
+    assert metrics["127.0.0.1 (sync)"]["requests"] == 2
+
+
+def test_new_event_loop_gets_a_fresh_client(server):
+    registry = HttpClientRegistry()
+
+    async def fetch():
+        client = registry.client(server)
+        await client.get(f"{server}/ping")
+        return client
+
+    first = asyncio.run(fetch())
+    second = asyncio.run(fetch())
+    assert first is not second
+    assert registry.metrics()["127.0.0.1"]["requests"] == 2
+
+
+def test_aiohttp_sessions_follow_host_policies():
+    registry = HttpClientRegistry(
+        policies={"slow.example": HostPolicy(timeout=90.0, max_connections=7)},
+        default=HostPolicy(timeout=12.0, max_connections=3),
+    )
+
+    async def run():
+        slow = registry.aiohttp_session("https://slow.example/api")
+        other = registry.aiohttp_session("https://other.example")
+        assert registry.aiohttp_session("slow.example") is slow and other is not slow
+        assert slow.timeout.total == 90.0 and slow.connector.limit_per_host == 7
+        assert other.timeout.total == 12.0 and other.connector.limit_per_host == 3
+        await registry.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,75 @@
+import importlib.util
+import threading
+from pathlib import Path
+
+from src.a3e.services.evidence_mapper import EvidenceDocument, EvidenceMapper
+from src.a3e.services.hybrid_retrieval import HybridRetriever, reciprocal_rank_fusion
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+class _FakeLeg:
+    def __init__(self, ranking, barrier=None):
+        self.ranking = ranking
+        self.barrier = barrier
+        self.threads = []
+
+    def search(self, query, top_k):
+        self.threads.append(threading.get_ident())
+        if self.barrier:
+            self.barrier.wait(timeout=5)  # both legs must be in flight at once
+        return self.ranking[:top_k]
+
+
+def test_rrf_prefers_documents_both_legs_rank_and_honours_weights():
+    lexical = [(1, 9.0), (7, 8.0), (3, 7.0)]
+    dense = [(2, 0.9), (3, 0.8), (7, 0.7)]
+
+    fused = [doc for doc, _ in reciprocal_rank_fusion({"bm25": lexical, "dense": dense})]
+    assert fused[:2] == [7, 3]  # mid-ranked by both beats top-ranked by one
+    assert set(fused) == {1, 2, 3, 7}
+
+    lexical_only = reciprocal_rank_fusion({"bm25": lexical, "dense": dense}, {"bm25": 1.0, "dense": 0.0})
+    assert [doc for doc, _ in lexical_only] == [1, 7, 3]
+
+
+def test_hybrid_retriever_runs_legs_concurrently_and_scales_scores():
+    barrier = threading.Barrier(2)
+    bm25, dense = _FakeLeg([(4, 3.0), (5, 2.0)], barrier), _FakeLeg([(4, 0.9), (6, 0.5)], barrier)
+    retriever = HybridRetriever({"bm25": bm25, "dense": dense}, depth=10)
+
+    hits = retriever.search("anything", top_k=2)
+    assert bm25.threads != dense.threads
+    assert [h.doc for h in hits] == [4, 5]
+    assert hits[0].score == 1.0 and hits[0].ranks == {"bm25": 1, "dense": 1}
+    assert 0 < hits[1].score < 1 and hits[1].ranks == {"bm25": 2}
+
+
+def test_hybrid_recall_beats_either_leg_on_the_labelled_fixture():
+    spec = importlib.util.spec_from_file_location("evidence_retrieval_eval",
+                                                  REPO_ROOT / "scripts" / "evidence_retrieval_eval.py")
+    harness = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(harness)
+
+    mapper = EvidenceMapper()
+    cases = harness.load_cases(harness.DEFAULT_FIXTURE)
+    report = harness.evaluate(mapper, cases, ks=[10, 20], repeat=1)
+
+    for k in ("recall@10", "recall@20"):
+        assert report["hybrid"][k] >= max(report["bm25"][k], report["dense"][k])
+        assert report["hybrid+rerank"][k] >= report["tfidf+rerank"][k]
+    assert all(row["p50_ms"] > 0 for row in report.values())
+
+    # map_evidence serves the reranked fused shortlist
+    case = cases[0]
+    doc = EvidenceDocument(doc_id=case["id"], text=case["text"], metadata={}, doc_type=case["doc_type"],
+                           source_system="manual", upload_date=None)
+    results = mapper.map_evidence(doc, top_k=5, min_confidence=0.0)
+    assert results and all(0 <= r.confidence <= 1 for r in results)
+    assert any(r.standard_id.startswith(tuple(case["relevant"])) for r in results)
+
+    # The rerank blend sees relevance, not the rank-scaled RRF value (1.0 for any top hit)
+    unrelated = mapper._retrieve_candidates("Our library has new chairs.", 10)
+    assert unrelated and max(score for _, score in unrelated) < 0.5
+    related = mapper._retrieve_candidates(case["text"], 10)
+    assert max(score for _, score in related) > max(score for _, score in unrelated)
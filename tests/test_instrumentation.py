@@ -0,0 +1,71 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.a3e.core import instrumentation
+from src.a3e.core.instrumentation import (
+    begin_request_timings,
+    end_request_timings,
+    format_server_timing,
+    route_template,
+    server_timing_requested,
+    timed_stage,
+)
+
+
+def _app():
+    app = FastAPI()
+    seen = {}
+
+    @app.middleware("http")
+    async def _mw(request, call_next):
+        token = begin_request_timings()
+        try:
+            response = await call_next(request)
+        finally:
+            timings = end_request_timings(token)
+        seen["route"] = route_template(request.scope)
+        response.headers["Server-Timing"] = format_server_timing(timings, 0.01)
+        return response
+
+    @timed_stage("embed")
+    async def _embed():
+        await asyncio.sleep(0)
+
+    @app.get("/documents/{document_id}/analysis")
+    async def analysis(document_id: str):
+        with timed_stage("extract"):
+            pass
+        await _embed()
+        await _embed()
+        return {"id": document_id}
+
+    return app, seen
+
+
+def test_route_template_and_server_timing_header():
+    app, seen = _app()
+    client = TestClient(app)
+
+    response = client.get("/documents/abc-123/analysis")
+    assert response.status_code == 200
+    assert seen["route"] == "/documents/{document_id}/analysis"
+    header = response.headers["Server-Timing"]
+    assert header.startswith("extract;dur=")
+    assert 'embed;dur=' in header and 'desc="x2"' in header
+    assert header.endswith("total;dur=10.0")
+
+    client.get("/no/such/path")
+    assert seen["route"] == instrumentation.UNMATCHED_ROUTE
+
+
+def test_server_timing_modes(monkeypatch):
+    monkeypatch.setattr(instrumentation, "SERVER_TIMING_MODE", "off")
+    assert not server_timing_requested({"x-server-timing": "1"})
+    monkeypatch.setattr(instrumentation, "SERVER_TIMING_MODE", "header")
+    assert server_timing_requested({"x-server-timing": "1"})
+    assert not server_timing_requested({})
+    monkeypatch.setattr(instrumentation, "SERVER_TIMING_MODE", "on")
+    assert server_timing_requested({})
+    assert format_server_timing([("db write", 0.0015)]) == "db_write;dur=1.5"
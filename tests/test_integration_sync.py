@@ -0,0 +1,126 @@
+import asyncio
+
+from src.a3e.services.integration_sync import ConnectorSyncEngine, ProviderLimiter, SyncPage
+from src.a3e.services.mock_canvas_service import MockCanvasLMSService, MockIntegrationManager
+from src.a3e.services.user_kv_store import UserKVStore
+
+
+def test_repeat_sync_fetches_only_changes(tmp_path):
+    store = UserKVStore(str(tmp_path / "kv.sqlite3"))
+    manager = MockIntegrationManager()
+    documents = []
+
+    async def on_document(doc):
+        documents.append(doc.item_id)
+
+    first = asyncio.run(manager.sync_all_data(on_document=on_document, store=store))
+    assert first["errors"] == []
+    # Three courses over two pages: the second page is followed
+    assert [c["id"] for c in first["canvas"]["courses"]] == [101, 102, 103]
+    assert len(first["canvas"]["outcomes"]) > 2 and first["canvas"]["assignments"]
+    assert sorted(documents) == ["course-101-syllabus", "course-102-syllabus", "course-103-syllabus"]
+
+    documents.clear()
+    second = asyncio.run(manager.sync_all_data(on_document=on_document, store=store))
+    stats = second["stats"]["canvas"]
+    assert second["canvas"]["courses"] == [] and second["canvas"]["outcomes"] == []
+    assert stats["changed"] == 0 and stats["not_modified"] == stats["pages"]
+    assert documents == []
+
+    original = MockCanvasLMSService.get_courses
+
+    async def renamed_courses(self, enrollment_type="teacher"):
+        courses = await original(self, enrollment_type)
+        courses[2]["syllabus_body"] = "<p>Revised capstone syllabus</p>"
+        return courses
+
+    manager.canvas.get_courses = renamed_courses.__get__(manager.canvas)
+    third = asyncio.run(manager.sync_all_data(on_document=on_document, store=store))
+    assert [c["id"] for c in third["canvas"]["courses"]] == [103]
+    assert documents == ["course-103-syllabus"]
+
+
+def test_per_course_fetches_run_concurrently_within_provider_limit(tmp_path):
+    in_flight = {"now": 0, "max": 0}
+
+    class SlowCanvas:
+        async def authenticate(self):
+            return True
+
+        async def get_courses_page(self, token, etag):
+            return SyncPage(items=[{"id": i} for i in range(6)])
+
+        async def _slow(self):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return SyncPage(items=[])
+
+        async def get_course_outcomes_page(self, course_id, token, etag):
+            return await self._slow()
+
+        async def get_assignments_page(self, course_id, token, etag):
+            return await self._slow()
+
+    class Manager:
+        canvas = SlowCanvas()
+
+    engine = ConnectorSyncEngine(
+        Manager(), store=UserKVStore(str(tmp_path / "kv.sqlite3")), provider_limits={"canvas": (3, 0.0)}
+    )
+    results = asyncio.run(engine.sync())
+    assert results["errors"] == []
+    assert in_flight["max"] == 3
+    assert engine.limiters["canvas"].requests == 13
+    assert isinstance(engine.limiters["canvas"], ProviderLimiter)
+
+
+def test_failed_documents_are_offered_again_until_handled(tmp_path):
+    store = UserKVStore(str(tmp_path / "kv.sqlite3"))
+    manager = MockIntegrationManager()
+    attempts, failing = [], {"course-102-syllabus"}
+
+    async def on_document(doc):
+        attempts.append(doc.item_id)
+        if doc.item_id in failing:
+            raise RuntimeError("analysis unavailable")
+
+    asyncio.run(manager.sync_all_data(on_document=on_document, store=store))
+    assert sorted(attempts) == ["course-101-syllabus", "course-102-syllabus", "course-103-syllabus"]
+
+    # Only the failed document comes back, although its page is otherwise unchanged
+    attempts.clear()
+    asyncio.run(manager.sync_all_data(on_document=on_document, store=store))
+    assert attempts == ["course-102-syllabus"]
+
+    failing.clear()
+    attempts.clear()
+    asyncio.run(manager.sync_all_data(on_document=on_document, store=store))
+    assert attempts == ["course-102-syllabus"]
+    attempts.clear()
+    asyncio.run(manager.sync_all_data(on_document=on_document, store=store))
+    assert attempts == []
+
+
+def test_synced_documents_are_analyzed_as_the_sync_owner(monkeypatch):
+    import pytest
+
+    from src.a3e.api.routes import integrations, user_intelligence_simple
+    from src.a3e.services.integration_sync import SyncedDocument
+
+    calls = []
+
+    async def fake_analyze(filename, content, doc_type, current_user, document_id=None):
+        calls.append((filename, doc_type, current_user))
+        return {"status": "success", "document_id": "doc-1" if len(calls) == 1 else None}
+
+    monkeypatch.setattr(user_intelligence_simple, "_analyze_evidence_from_bytes", fake_analyze)
+    owner = {"sub": "registrar@example.edu", "user_id": "u-1"}
+    document = SyncedDocument(source="canvas", item_id="course-1-syllabus", name="BIO101 syllabus.html",
+                              content=b"<p>syllabus</p>")
+
+    assert asyncio.run(integrations.analyze_synced_document(document, owner)) == "doc-1"
+    assert calls == [("BIO101 syllabus.html", "canvas_sync", owner)]
+    with pytest.raises(RuntimeError):  # not persisted: the engine must retry it
+        asyncio.run(integrations.analyze_synced_document(document, owner))
@@ -0,0 +1,69 @@
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.a3e.core.lazy_loading import LazyObject, include_lazy_router, pending_lazy_routers
+
+_ROUTER_MODULE = '''
+from fastapi import APIRouter
+
+router = APIRouter(prefix="/heavy")
+
+
+@router.get("/items/{item_id}")
+async def get_item(item_id: int):
+    return {"item_id": item_id}
+'''
+
+
+def test_lazy_object_builds_once_on_first_access():
+    calls = []
+
+    class Expensive:
+        def __init__(self):
+            calls.append(1)
+            self.value = 42
+
+    proxy = LazyObject(Expensive, "expensive")
+    assert not proxy.is_loaded and calls == []
+    assert proxy.value == 42
+    proxy.value = 7
+    assert proxy.value == 7 and calls == [1]
+
+
+def test_lazy_router_imports_on_first_request(tmp_path, monkeypatch):
+    (tmp_path / "lazy_heavy_router.py").write_text(_ROUTER_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop("lazy_heavy_router", None)
+
+    app = FastAPI()
+
+    @app.get("/light")
+    async def light():
+        return {"ok": True}
+
+    include_lazy_router(app, "/heavy", "lazy_heavy_router")
+
+    @app.get("/{path:path}")
+    async def catch_all(path: str):
+        return {"catch_all": path}
+
+    client = TestClient(app)
+    assert client.get("/light").json() == {"ok": True}
+    assert "lazy_heavy_router" not in sys.modules
+    assert pending_lazy_routers(app) == ["lazy_heavy_router"]
+
+    # Spliced in ahead of the catch-all that was registered after it
+    assert client.get("/heavy/items/3").json() == {"item_id": 3}
+    assert pending_lazy_routers(app) == []
+    assert client.get("/heavy/items/4").json() == {"item_id": 4}
+    assert "/heavy/items/{item_id}" in client.get("/openapi.json").json()["paths"]
+
+
+def test_failed_lazy_router_is_unmounted(monkeypatch):
+    app = FastAPI()
+    include_lazy_router(app, "/missing", "no_such_module_for_lazy_router")
+    client = TestClient(app)
+    assert client.get("/missing/x").status_code == 404
+    assert pending_lazy_routers(app) == []
@@ -0,0 +1,72 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.a3e.services import metrics_timeseries as mts
+
+
+@pytest.fixture(autouse=True)
+def isolated_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(mts, "_ROOT", tmp_path / "metrics_timeseries")
+    monkeypatch.setattr(mts, "_LEGACY_FILE_PATH", tmp_path / "metrics_timeseries.json")
+    monkeypatch.setattr(mts, "_legacy_checked", False)
+    yield tmp_path
+
+
+def _payload(ts, coverage):
+    return {"timestamp": ts.isoformat(), "coverage_percentage": coverage, "documents_analyzed": 3}
+
+
+def test_snapshots_are_throttled_and_tenant_scoped():
+    first = mts.maybe_snapshot("hlc", {"coverage_percentage": 10.0}, tenant="a@example.com")
+    assert first["stored"] is True
+    again = mts.maybe_snapshot("HLC", {"coverage_percentage": 12.0}, tenant="a@example.com")
+    assert again == {"stored": False, "reason": "throttled", "last_timestamp": first["snapshot"]["timestamp"]}
+
+    assert len(mts.get_series("HLC", tenant="a@example.com")) == 1
+    assert mts.get_series("HLC", tenant="b@example.com") == []
+    assert mts.last_snapshot("hlc", tenant="a@example.com")["coverage_percentage"] == 10.0
+
+
+def test_range_query_and_rollups_with_out_of_order_points():
+    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    points = [now - timedelta(hours=h) for h in (50, 2, 30, 1)]
+    for i, ts in enumerate(points):
+        mts.maybe_snapshot("SACSCOC", _payload(ts, 10.0 * (i + 1)), tenant="t1", force=True)
+    mts.maybe_snapshot("SACSCOC", _payload(now - timedelta(hours=1, minutes=-30), 50.0), tenant="t1", force=True)
+
+    raw = mts.get_series("SACSCOC", days=1, tenant="t1", resolution="raw")
+    stamps = [s["timestamp"] for s in raw]
+    assert stamps == sorted(stamps) and len(raw) == 3
+
+    hourly = mts.get_series("SACSCOC", days=3, tenant="t1", resolution="hourly")
+    merged = [h for h in hourly if h["samples"] == 2]
+    assert len(merged) == 1 and merged[0]["coverage_percentage"] == pytest.approx(45.0)
+
+    daily = mts.get_series("SACSCOC", days=3, tenant="t1", resolution="daily")
+    assert sum(d["samples"] for d in daily) == 5
+
+
+def test_legacy_json_imported_into_global_tenant(isolated_store):
+    ts = (datetime.utcnow() - timedelta(days=2)).isoformat()
+    (isolated_store / "metrics_timeseries.json").write_text(
+        json.dumps({"HLC": [{"timestamp": ts, "accreditor": "HLC", "coverage_percentage": 40.0}]})
+    )
+    series = mts.get_series(None, days=7)
+    assert [s["accreditor"] for s in series] == ["HLC"]
+    assert series[0]["coverage_percentage"] == 40.0
+
+
+def test_tenant_reads_fall_back_to_legacy_history(isolated_store):
+    now = datetime.utcnow().replace(microsecond=0)
+    legacy = [{"timestamp": (now - timedelta(days=d)).isoformat(), "coverage_percentage": 10.0 * d} for d in (5, 3, 1)]
+    (isolated_store / "metrics_timeseries.json").write_text(json.dumps({"HLC": legacy}))
+    mts.maybe_snapshot("HLC", _payload(now - timedelta(days=2), 99.0), tenant="a@example.com", force=True)
+
+    series = mts.get_series("HLC", days=7, tenant="a@example.com", resolution="raw")
+    # legacy points before the tenant's first snapshot, then only the tenant's own
+    assert [s["coverage_percentage"] for s in series] == [50.0, 30.0, 99.0]
+    assert [s["coverage_percentage"] for s in mts.get_series(None, days=7, tenant="b@example.com")] == [50.0, 30.0, 10.0]
+    assert mts.last_snapshot("HLC", tenant="b@example.com")["coverage_percentage"] == 10.0
+    assert mts.last_snapshot("HLC", tenant="a@example.com")["coverage_percentage"] == 99.0
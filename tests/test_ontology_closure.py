@@ -0,0 +1,62 @@
+from src.a3e.core.accreditation_ontology import AccreditationDomain, AccreditationOntology
+
+
+def _reference_related(ontology, concept_id, max_distance):
+    """The original per-call BFS, kept as the behavioural reference."""
+    related, visited, queue = [], set(), [(concept_id, 0)]
+    while queue:
+        current_id, distance = queue.pop(0)
+        if current_id in visited or distance > max_distance:
+            continue
+        visited.add(current_id)
+        if distance > 0:
+            related.append((current_id, distance))
+        node = ontology.nodes[current_id]
+        if distance < max_distance:
+            if node.parent_id:
+                queue.append((node.parent_id, distance + 1))
+            queue.extend((child, distance + 1) for child in node.children_ids)
+            queue.extend((rel, distance + 1) for rel in node.related_concepts)
+    return related
+
+
+def _reference_hierarchy(ontology, concept_id):
+    hierarchy, current = [concept_id], ontology.nodes[concept_id]
+    while current.parent_id:
+        hierarchy.insert(0, current.parent_id)
+        current = ontology.nodes[current.parent_id]
+    return hierarchy
+
+
+def test_closure_matches_graph_walks():
+    ontology = AccreditationOntology()
+    ontology.nodes["cognitive_outcomes"].related_concepts.append("program_assessment")
+    ontology.invalidate_closure()
+
+    for concept_id in ontology.nodes:
+        assert ontology.get_concept_hierarchy(concept_id) == _reference_hierarchy(ontology, concept_id)
+        for max_distance in (0, 1, 2, 3):
+            assert ontology.find_related_concepts(concept_id, max_distance) == \
+                _reference_related(ontology, concept_id, max_distance)
+    assert ontology.find_related_concepts("unknown") == []
+
+    closure = ontology.closure()
+    assert closure is ontology.closure()
+    assert closure.is_ancestor("learning_outcomes", "cognitive_outcomes")
+    assert closure.distance("cognitive_outcomes", "program_assessment") == 1
+    assert closure.hierarchy_distance("cognitive_outcomes", "cognitive_outcomes") == 0
+    assert closure.hierarchy_distance("cognitive_outcomes", "learning_outcomes") == 1
+    assert closure.hierarchy_distance("cognitive_outcomes", "mission_statement") is None
+    mask = closure.related_mask("learning_outcomes") & closure.mask(["cognitive_outcomes", "title_ix"])
+    assert closure.concepts(mask) == ["cognitive_outcomes"]
+
+
+def test_adding_a_node_rebuilds_the_closure():
+    ontology = AccreditationOntology()
+    before = ontology.closure()
+    ontology._add_ontology_node("retention_analytics", "Retention Analytics",
+                                AccreditationDomain.STUDENT_SUCCESS, "student_retention")
+    after = ontology.closure()
+    assert after is not before
+    assert ontology.get_concept_hierarchy("retention_analytics") == ["student_retention", "retention_analytics"]
+    assert ("retention_analytics", 1) in ontology.find_related_concepts("student_retention")
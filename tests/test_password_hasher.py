@@ -0,0 +1,95 @@
+import asyncio
+import hashlib
+import time
+
+import bcrypt
+
+from src.a3e.services.password_hasher import HashingOverloaded, PasswordHasher, bcrypt_cost
+
+
+def test_verify_rehashes_outdated_hashes():
+    hasher = PasswordHasher(rounds=5, max_workers=2)
+    old = bcrypt.hashpw(b"correct horse", bcrypt.gensalt(4)).decode()
+    legacy = "pepper:" + hashlib.pbkdf2_hmac("sha256", b"correct horse", b"pepper", 100000).hex()
+
+    async def run():
+        return (
+            await hasher.verify_and_upgrade("correct horse", old),
+            await hasher.verify_and_upgrade("wrong", old),
+            await hasher.verify_and_upgrade("correct horse", legacy),
+            await hasher.verify_and_upgrade("correct horse", await hasher.hash("correct horse")),
+        )
+
+    (ok, new), (bad, none), (legacy_ok, from_legacy), (current_ok, unchanged) = asyncio.run(run())
+    hasher.shutdown()
+    assert ok and bcrypt_cost(new) == 5 and bcrypt.checkpw(b"correct horse", new.encode())
+    assert not bad and none is None
+    assert legacy_ok and bcrypt_cost(from_legacy) == 5
+    assert current_ok and unchanged is None
+    assert hasher.stats["rehashed"] == 2
+
+
+def test_login_burst_is_shed_without_stalling_the_loop():
+    hasher = PasswordHasher(rounds=10, max_workers=1, max_queue=3, max_wait=0.15)
+    stored = bcrypt.hashpw(b"pw", bcrypt.gensalt(10)).decode()
+
+    async def login():
+        try:
+            return (await hasher.verify_and_upgrade("pw", stored))[0]
+        except HashingOverloaded as e:
+            return e.status_code
+
+    async def run():
+        lags = []
+
+        async def ticker():
+            # Stand-in for unrelated requests: how late does the loop wake us?
+            for _ in range(40):
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lags.append(time.perf_counter() - start - 0.01)
+
+        outcomes, _ = await asyncio.gather(asyncio.gather(*(login() for _ in range(12))), ticker())
+        return outcomes, sorted(lags)
+
+    outcomes, lags = asyncio.run(run())
+    metrics = hasher.metrics()
+    hasher.shutdown()
+
+    # 1 running + 3 queued admitted, the rest refused up front; queued jobs past max_wait are shed
+    assert outcomes.count(429) == 8
+    assert outcomes.count(True) >= 1 and outcomes.count(True) + outcomes.count(503) == 4
+    assert metrics["rejected"] == 8 and metrics["peak_queued"] >= 3 and metrics["queued"] == 0
+    # Inline, each check would block the loop for a full bcrypt round (~100ms at cost 10)
+    assert lags[int(len(lags) * 0.99)] < 0.05
+
+
+def test_session_router_hashes_on_the_bounded_pool(monkeypatch, tmp_path):
+    import os
+
+    monkeypatch.setenv("AUTH_DB_PATH", str(tmp_path / "auth.db"))
+    os.environ.setdefault("SECRET_KEY", "test-secret")
+    os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret")
+    from fastapi import HTTPException
+
+    from src.a3e.api.routes import auth_session
+    from src.a3e.services import password_hasher
+
+    hasher = PasswordHasher(rounds=4, max_workers=1, max_queue=0)
+    monkeypatch.setattr(password_hasher, "_hasher", hasher)
+    stored = bcrypt.hashpw(b"pw", bcrypt.gensalt(4)).decode()
+
+    async def run():
+        assert await auth_session._off_loop(auth_session.verify_password, "pw", stored)
+        hasher._admitted = hasher.max_workers  # saturate admission
+        try:
+            await auth_session._off_loop(auth_session.verify_password, "pw", stored)
+        except HTTPException as e:
+            return e
+        finally:
+            hasher._admitted = 0
+
+    busy = asyncio.run(run())
+    hasher.shutdown()
+    assert hasher.stats["completed"] == 1
+    assert busy is not None and busy.status_code == 429 and busy.headers["Retry-After"]
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+
+from src.a3e.services import powerbi_service as powerbi_module
+from src.a3e.services.http_clients import get_http_clients
+from src.a3e.services.powerbi_service import PowerBICredentials, PowerBIService
+
+
+class _FakePowerBI(BaseHTTPRequestHandler):
+    """Azure AD token endpoint plus the Power BI REST calls the service uses."""
+
+    protocol_version = "HTTP/1.1"
+    calls = Counter()
+    embed_ttl = 3600
+    latency = 0.2
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def do_POST(self):
+        body = self._body()
+        if self.path.endswith("/oauth2/v2.0/token"):
+            type(self).calls["aad"] += 1
+            time.sleep(self.latency)
+            return self._reply(200, {"access_token": f"aad-{self.calls['aad']}", "expires_in": 3600})
+        if self.path.endswith("/GenerateToken"):
+            assert self.headers["Authorization"].startswith("Bearer aad-")
+            type(self).calls["embed"] += 1
+            time.sleep(self.latency)
+            request = json.loads(body)
+            claims = {"exp": int(time.time()) + self.embed_ttl, "n": self.calls["embed"],
+                      "user": (request.get("identities") or [{}])[0].get("username")}
+            return self._reply(200, {"token": jwt.encode(claims, "secret", algorithm="HS256"),
+                                     "tokenId": f"tok-{self.calls['embed']}"})
+        self._reply(404, {})
+
+    def do_GET(self):
+        if self.path.endswith("/groups/ws-1/reports"):
+            type(self).calls["reports"] += 1
+            time.sleep(self.latency)
+            return self._reply(200, {"value": [
+                {"id": "r1", "name": "Compliance", "embedUrl": "https://embed/r1", "datasetId": "d1"},
+                {"id": "r2", "name": "Evidence", "embedUrl": "https://embed/r2", "datasetId": "d2"},
+            ]})
+        self._reply(404, {})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_powerbi():
+    _FakePowerBI.calls = Counter()
+    _FakePowerBI.embed_ttl = 3600
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FakePowerBI)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield url
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _service(url):
+    creds = PowerBICredentials(client_id="app", client_secret="s3cret", tenant_id="tenant", workspace_id="ws-1")
+    return PowerBIService(creds, api_url=f"{url}/v1.0/myorg", authority_url=url)
+
+
+async def _embed_like_route(service, user, roles=("User",)):
+    """What POST /powerbi/embed-token does when dataset_ids are omitted."""
+    datasets = [r.dataset_id for r in await service.get_reports() if r.id in ("r1", "r2")]
+    token = await service.generate_embed_token(["r2", "r1"], datasets, username=user, roles=list(roles))
+    embed_url = next(r.embed_url for r in await service.get_reports() if r.id == "r2")
+    return token, embed_url
+
+
+def test_concurrent_embed_requests_share_aad_metadata_and_tokens(fake_powerbi):
+    service = _service(fake_powerbi)
+
+    async def run():
+        try:
+            burst = await asyncio.gather(*(_embed_like_route(service, "a@uni.edu") for _ in range(20)))
+            same_set_reordered = await service.generate_embed_token(["r1", "r2"], ["d2", "d1"],
+                                                                    username="a@uni.edu", roles=["User"])
+            other_user, _ = await _embed_like_route(service, "b@uni.edu")
+            other_roles, _ = await _embed_like_route(service, "a@uni.edu", roles=("Admin",))
+            return burst, same_set_reordered, other_user, other_roles
+        finally:
+            await get_http_clients().aclose()
+
+    burst, reordered, other_user, other_roles = asyncio.run(run())
+    tokens = {token.token for token, _ in burst}
+    assert len(tokens) == 1 and reordered.token in tokens
+    assert {url for _, url in burst} == {"https://embed/r2"}
+    assert jwt.decode(other_user.token, options={"verify_signature": False})["user"] == "b@uni.edu"
+    assert len({reordered.token, other_user.token, other_roles.token}) == 3
+
+    assert _FakePowerBI.calls == Counter(aad=1, reports=1, embed=3)
+    metrics = service.cache_metrics()
+    assert metrics["embed_token_misses"] == 3 and metrics["embed_token_hits"] >= 1
+    assert metrics["coalesced_calls"] >= 19 and metrics["cached_embed_tokens"] == 3
+    assert metrics["aad_token_valid"]
+
+
+def test_near_expiry_tokens_and_stale_metadata_are_refetched(fake_powerbi):
+    _FakePowerBI.embed_ttl = 60  # inside the 120s reuse margin: never cached
+    service = _service(fake_powerbi)
+    service.metadata_ttl = 0.3
+
+    async def run():
+        try:
+            first = await service.generate_embed_token(["r1"], ["d1"], username="a@uni.edu", roles=["User"])
+            second = await service.generate_embed_token(["r1"], ["d1"], username="a@uni.edu", roles=["User"])
+            await service.get_reports()
+            await service.get_reports()
+            await asyncio.sleep(0.35)
+            await service.get_reports()
+            service.invalidate_access_token()  # e.g. after a 401
+            await service.generate_embed_token(["r1"], ["d1"], username="a@uni.edu", roles=["User"])
+            return first, second
+        finally:
+            await get_http_clients().aclose()
+
+    first, second = asyncio.run(run())
+    assert first.token != second.token
+    assert abs((first.expiration - datetime.utcnow()).total_seconds() - 60) < 5  # UTC, from the JWT exp
+    assert _FakePowerBI.calls == Counter(aad=2, embed=3, reports=2)
+    assert service.cache_metrics()["cached_embed_tokens"] == 0
+
+
+def test_process_wide_service_is_reused_until_credentials_change(monkeypatch):
+    monkeypatch.setattr(powerbi_module, "_powerbi_service", None)
+    for name, value in {"POWERBI_CLIENT_ID": "app", "POWERBI_CLIENT_SECRET": "s",
+                        "POWERBI_TENANT_ID": "t", "POWERBI_WORKSPACE_ID": "ws-1"}.items():
+        monkeypatch.setenv(name, value)
+
+    service = powerbi_module.get_powerbi_service()
+    assert service is not None and powerbi_module.get_powerbi_service() is service
+    monkeypatch.setenv("POWERBI_WORKSPACE_ID", "ws-2")
+    rebuilt = powerbi_module.get_powerbi_service()
+    assert rebuilt is not service and rebuilt.credentials.workspace_id == "ws-2"
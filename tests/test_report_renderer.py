@@ -0,0 +1,38 @@
+import asyncio
+import os
+
+from src.a3e.services.report_generation_service import ReportGenerationService
+from src.a3e.services.report_renderer import ReportRenderer
+
+
+def test_unchanged_reports_hit_cache_and_only_changed_sections_rebuild(tmp_path):
+    service = ReportGenerationService()
+    service.renderer = ReportRenderer(tmp_path / "cache", max_workers=1)
+
+    async def run():
+        first = await service.generate_report("comprehensive", "inst-1", {"institution_name": "Alpha"})
+        second = await service.generate_report("comprehensive", "inst-1", {"institution_name": "Alpha"})
+        before = dict(service.renderer.stats)
+        third = await service.generate_report("comprehensive", "inst-1", {"institution_name": "Beta"})
+        return first, second, third, before
+
+    try:
+        first, second, third, before = asyncio.run(run())
+    finally:
+        service.renderer.shutdown()
+
+    assert first["status"] == "completed" and first["cache_hit"] is False
+    assert second["cache_hit"] is True and second["report_id"] != first["report_id"]
+    with open(first["file_path"], "rb") as a, open(second["file_path"], "rb") as b:
+        content = a.read()
+        assert content.startswith(b"%PDF") and b.read() == content
+
+    # Only the cover and executive summary depend on the institution name
+    assert third["cache_hit"] is False
+    stats = service.renderer.stats
+    assert stats["section_misses"] - before["section_misses"] == 2
+    assert stats["section_hits"] - before["section_hits"] == 3
+
+    # Deleting a report's file leaves the cached copy for the next request
+    os.unlink(first["file_path"])
+    assert len(list((tmp_path / "cache" / "documents").glob("*.pdf"))) == 2
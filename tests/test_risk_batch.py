@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from src.a3e.services.gap_risk_predictor import gap_risk_predictor
+from src.a3e.services.risk_explainer import RiskExplainer, StandardEvidenceSnapshot
+
+
+def _random_snapshots(n, seed=7):
+    rng = random.Random(seed)
+    return [
+        StandardEvidenceSnapshot(
+            standard_id=f"STD-{i}",
+            coverage_percent=rng.uniform(0, 100),
+            trust_scores=[rng.random() for _ in range(rng.randint(0, 4))],
+            evidence_ages_days=[rng.randint(0, 1200) for _ in range(rng.randint(0, 3))],
+            overdue_tasks=rng.randint(0, 6),
+            total_tasks=rng.randint(0, 8),
+            recent_changes=rng.randint(0, 8),
+            historical_findings=rng.randint(0, 8),
+            days_to_review=rng.choice([10, 45, 75, 120, 365]),
+        )
+        for i in range(n)
+    ]
+
+
+def test_batch_matches_scalar_predictor():
+    snapshots = _random_snapshots(300)
+    batch = RiskExplainer().compute_snapshots(snapshots)
+    for i, snap in enumerate(snapshots):
+        expected = gap_risk_predictor.predict_risk(**snap.to_inputs()).to_dict()
+        actual = batch.score(i).to_dict()
+        assert actual["risk_score"] == pytest.approx(expected["risk_score"], abs=1e-9)
+        for key in ("risk_level", "remediation_priority", "confidence", "predicted_issues", "time_to_review"):
+            assert actual[key] == expected[key], key
+        assert actual["factors"] == expected["factors"]
+
+
+def test_scores_are_cached_per_tenant_and_bounded():
+    explainer = RiskExplainer(max_tenants=2, max_standards_per_tenant=50)
+    explainer.compute_snapshots(_random_snapshots(120), tenant="a")
+    explainer.compute_snapshots(_random_snapshots(10, seed=1), tenant="b")
+
+    assert explainer.aggregate(tenant="a")["standards_scored"] == 50
+    assert explainer.aggregate(tenant="b")["standards_scored"] == 10
+    assert "risk_score" in explainer.explain_standard("STD-100", tenant="a")
+    assert explainer.explain_standard("STD-0", tenant="a")["status"] == "not_scored"
+
+    explainer.compute_snapshots(_random_snapshots(1), tenant="c")
+    assert explainer.aggregate(tenant="a")["standards_scored"] == 0
+
+
+def test_columnar_bulk_endpoint_fills_missing_values():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from src.a3e.api.routes import user_intelligence_simple
+
+    app = FastAPI()
+    app.include_router(user_intelligence_simple.router)
+    app.dependency_overrides[user_intelligence_simple.get_current_user_simple] = lambda: {"email": "risk@uni.edu"}
+    client = TestClient(app)
+    url = "/api/user/intelligence-simple/risk/score-bulk"
+
+    columns = {
+        "standard_id": ["A", "B", "C"],
+        "coverage_percent": [80, None, 10],
+        "average_trust": [0.9, None, None],
+        "average_age_days": [None, 30, None],
+        "overdue_tasks": [None, 1, 0],
+        "total_tasks": [2, None, 4],
+    }
+    response = client.post(url, json={"columns": columns, "explain": False})
+    assert response.status_code == 200
+    scores = response.json()["columns"]["risk_score"]
+    assert len(scores) == 3 and all(0 <= s <= 1 for s in scores)
+
+    explained = client.post(url, json={"columns": columns})
+    assert explained.status_code == 200 and explained.json()["count"] == 3
+
+    bad = client.post(url, json={"columns": {"standard_id": ["A"], "coverage_percent": ["lots"]}})
+    assert bad.status_code == 400
@@ -0,0 +1,84 @@
+import asyncio
+import os
+
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret")
+
+import pytest
+
+from src.a3e.api.routes.scenarios import (
+    ParameterSpec,
+    ScenarioInputs,
+    ScenarioSweepRequest,
+    calculate_scenario,
+    sweep_scenarios,
+)
+
+BASE = ScenarioInputs(
+    institution_name="Test College", institution_type="Community College", student_enrollment=3000,
+    faculty_count=100, staff_count=75, annual_budget=25_000_000, compliance_team_size=2,
+    accreditations_count=3, reports_per_year=12, hours_per_report=40,
+)
+USER = {"id": "u1", "email": "u1@example.edu"}
+
+
+def test_grid_sweep_matches_single_point_calculator():
+    request = ScenarioSweepRequest(
+        base=BASE,
+        parameters={
+            "compliance_team_size": ParameterSpec(values=[0, 1, 2]),
+            "reports_per_year": ParameterSpec(min=0, max=24, steps=5),
+        },
+        return_points=True,
+    )
+    result = asyncio.run(sweep_scenarios(request, USER, True))
+    assert result["points"] == 15
+    assert result["axes"]["reports_per_year"] == [0.0, 6.0, 12.0, 18.0, 24.0]
+
+    # C-order over (team, reports): team=2, reports=12 is the base point
+    single = asyncio.run(calculate_scenario(BASE, USER, True))
+    flat = 2 * 5 + 2
+    assert result["columns"]["annual_savings"][flat] == pytest.approx(single.annual_savings, abs=0.01)
+    assert result["columns"]["payback_period_months"][flat] == single.payback_period_months
+    assert result["base"]["roi_percentage"] == pytest.approx(single.roi_percentage, abs=0.01)
+    # Zero team and zero reports never pays back
+    assert result["columns"]["payback_period_months"][0] == 999
+
+    bars = result["sensitivity"]
+    assert [b["parameter"] for b in bars] == ["compliance_team_size", "reports_per_year"]
+    assert bars[0]["swing"] >= bars[1]["swing"]
+
+    surface = result["break_even_surface"]
+    assert surface["x"]["parameter"] == "compliance_team_size"
+    assert len(surface["values"]) == 25 and len(surface["values"][0]) == 25
+    # With no team, savings = reports * 40h * $75 * 0.75 - 2388, so break-even is analytic
+    assert surface["break_even"][0] == pytest.approx(2388 / (40 * 75 * 0.75), rel=1e-3)
+
+
+def test_monte_carlo_percentiles_and_validation():
+    request = ScenarioSweepRequest(
+        base=BASE,
+        mode="monte_carlo",
+        seed=7,
+        parameters={
+            "avg_hourly_rate": ParameterSpec(distribution="normal", mean=75, std=10, min=40, max=120),
+            "hours_per_report": ParameterSpec(distribution="triangular", min=20, mode=40, max=80),
+        },
+    )
+    result = asyncio.run(sweep_scenarios(request, USER, True))
+    savings = result["percentiles"]["annual_savings"]
+    assert result["points"] == 100_000
+    assert savings["p5"] < savings["p50"] < savings["p95"]
+    assert savings["probability_positive"] == 1.0
+
+    with pytest.raises(Exception) as exc:
+        asyncio.run(sweep_scenarios(
+            ScenarioSweepRequest(base=BASE, parameters={"faculty_count": ParameterSpec(min=1, max=2)}), USER, True
+        ))
+    assert exc.value.status_code == 400
+
+    from pydantic import ValidationError
+
+    for bad in ([101], [-1], [float("nan")], [float("inf")]):
+        with pytest.raises(ValidationError):  # FastAPI answers 422
+            ScenarioSweepRequest(base=BASE, parameters={}, percentiles=bad)
@@ -0,0 +1,71 @@
+import asyncio
+import sqlite3
+
+from sqlalchemy import event
+
+from src.a3e.database import services
+from src.a3e.database.connection import DatabaseManager
+from src.a3e.database.schema_cache import get_schema_cache
+
+CATALOG_MARKERS = ("information_schema", "pragma", "sqlite_master", "sqlite_temp_master")
+
+
+def _create_schema(path):
+    with sqlite3.connect(path) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE users (id TEXT PRIMARY KEY, email TEXT, name TEXT, password_hash TEXT,
+                                created_at TIMESTAMP);
+            CREATE TABLE files (file_id TEXT PRIMARY KEY, user_id TEXT, filename TEXT,
+                                original_filename TEXT, content_type TEXT, file_size INTEGER,
+                                file_content BLOB, created_at TIMESTAMP);
+            CREATE TABLE jobs (job_id TEXT PRIMARY KEY, user_id TEXT, file_id TEXT, status TEXT,
+                               progress INTEGER, created_at TIMESTAMP);
+            CREATE TABLE alembic_version (version_num TEXT PRIMARY KEY);
+            INSERT INTO alembic_version VALUES ('20261018_0900');
+            """
+        )
+
+
+def test_service_calls_issue_no_catalog_queries_after_warm_up(tmp_path, monkeypatch):
+    path = tmp_path / "app.db"
+    _create_schema(path)
+    manager = DatabaseManager(f"sqlite:///{path}", pool_size=2, max_overflow=0, pool_timeout=5,
+                              pool_recycle=60, bootstrap=False)
+    monkeypatch.setattr(services, "db_manager", manager)
+    cache = get_schema_cache()
+    statements = []
+
+    async def run():
+        await manager.initialize()  # warms the schema cache
+        event.listen(manager.async_engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement.lower()))
+        try:
+            for n in range(3):
+                user = await services.UserService.get_or_create_user(f"user-{n}", f"u{n}@example.edu")
+                created = await services.FileService.create_file(user.id, "plan.pdf", b"%PDF-1.4", "application/pdf",
+                                                                 title="ignored: no such column")
+                job = await services.JobService.create_job(user.id, created.file_id)
+                assert (await services.FileService.get_file(created.file_id, user.id)).file_size == 8
+                assert (await services.JobService.get_job(job.job_id)).status == "queued"
+            warm = [s for s in statements if any(m in s for m in CATALOG_MARKERS)]
+
+            # A migration lands: new column, new revision. The next revision check reloads.
+            with sqlite3.connect(path) as conn:
+                conn.execute("ALTER TABLE files ADD COLUMN title TEXT")
+                conn.execute("UPDATE alembic_version SET version_num = '20261019_1200'")
+            async with manager.get_session() as session:
+                stale = await services._get_table_columns(session, "files")
+                cache.revision_check_seconds = 0
+                fresh = await services._get_table_columns(session, "files")
+            return len(statements), warm, stale, fresh
+        finally:
+            cache.revision_check_seconds = 300
+            await manager.close()
+
+    reloads_before = cache.stats["reloads"]
+    executed, warm, stale, fresh = asyncio.run(run())
+    assert executed >= 15 and warm == []
+    assert "title" not in stale and "title" in fresh
+    assert cache.stats["reloads"] - reloads_before == 2  # startup + after the migration
+
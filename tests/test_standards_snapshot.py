@@ -0,0 +1,75 @@
+from src.a3e.core import standards_snapshot
+from src.a3e.core.standards_snapshot import snapshot_path
+from src.a3e.services import standards_loader
+from src.a3e.services.standards_loader import load_corpus
+
+CORPUS = """
+accreditor: TEST
+metadata:
+  version: "2024"
+standards:
+  - id: "1"
+    title: Mission
+    clauses:
+      - id: "1.1"
+        title: Mission statement
+        indicators: [published, board approved]
+"""
+
+
+def test_snapshot_is_reused_until_sources_change(tmp_path, monkeypatch):
+    monkeypatch.delenv("STANDARDS_SNAPSHOT_DIR", raising=False)
+    monkeypatch.setattr(standards_snapshot, "stats", {"hits": 0, "misses": 0, "writes": 0})
+    corpus_file = tmp_path / "test.yaml"
+    corpus_file.write_text(CORPUS, encoding="utf-8")
+    parses = []
+    parse = standards_loader._parse_corpus
+
+    def counting_parse(sources):
+        parses.append(len(sources))
+        return parse(sources)
+
+    monkeypatch.setattr(standards_loader, "_parse_corpus", counting_parse)
+
+    first = load_corpus(tmp_path)
+    assert first["TEST"][0]["clauses"][0]["id"] == "TEST_1.1"
+    assert snapshot_path(tmp_path, "corpus").exists()
+    assert load_corpus(tmp_path) == first
+    assert standards_loader.get_corpus_metadata()["TEST"]["version"] == "2024"
+    assert len(parses) == 1
+
+    # An edited source invalidates the snapshot
+    corpus_file.write_text(CORPUS.replace("Mission statement", "Mission"), encoding="utf-8")
+    assert load_corpus(tmp_path)["TEST"][0]["clauses"][0]["title"] == "Mission"
+    assert len(parses) == 2
+
+    # A corrupted payload fails its checksum and falls back to YAML
+    snap = snapshot_path(tmp_path, "corpus")
+    data = bytearray(snap.read_bytes())
+    data[-3] ^= 0xFF
+    snap.write_bytes(bytes(data))
+    assert load_corpus(tmp_path)["TEST"][0]["title"] == "Mission"
+    assert len(parses) == 3
+    assert standards_snapshot.stats == {"hits": 1, "misses": 3, "writes": 3}
+
+    monkeypatch.setenv("STANDARDS_SNAPSHOT", "0")
+    load_corpus(tmp_path)
+    assert len(parses) == 4 and standards_snapshot.stats["hits"] == 1
+
+
+def test_script_builds_and_checks_snapshots_outside_the_repo(tmp_path, monkeypatch, capsys):
+    import importlib.util
+    from pathlib import Path
+
+    script_path = Path(__file__).resolve().parents[1] / "scripts" / "standards_snapshot.py"
+    spec = importlib.util.spec_from_file_location("standards_snapshot_script", script_path)
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+    monkeypatch.setenv("STANDARDS_SNAPSHOT_DIR", str(tmp_path))
+
+    assert script.build() == 0
+    assert snapshot_path(script.CORPUS_DIR, "corpus").exists()
+    assert snapshot_path(script.CONFIG_PATH, script.CONFIG_PATH.stem).exists()
+    assert script.check() == 0
+    out = capsys.readouterr().out
+    assert f"wrote {tmp_path}" in out and f"current {tmp_path}" in out and "STALE" not in out
@@ -0,0 +1,180 @@
+import asyncio
+import copy
+import json
+from pathlib import Path
+
+import sqlalchemy as sa
+from sqlalchemy.orm import sessionmaker
+
+from src.a3e.services.stripe_mirror import StripeMirror, stripe_subscriptions
+
+FIXTURES = Path(__file__).parent / "fixtures" / "stripe_webhook_events.json"
+
+
+class PriceNotFound(Exception):
+    pass
+
+
+class FakeStripe:
+    """Offline StripeClient: serves canned objects and counts every call."""
+
+    def __init__(self, customers=(), subscriptions=(), prices=()):
+        self.customers = {c["id"]: c for c in customers}
+        self.subscriptions = list(subscriptions)
+        self.prices = {p["id"]: p for p in prices}
+        self.calls = []
+
+    def retrieve_checkout_session(self, session_id):
+        self.calls.append(("session", session_id))
+        raise AssertionError("checkout sessions should come from the mirror")
+
+    def retrieve_customer(self, customer_id):
+        self.calls.append(("customer", customer_id))
+        return self.customers[customer_id]
+
+    def retrieve_price(self, price_id):
+        self.calls.append(("price", price_id))
+        if price_id not in self.prices:
+            raise PriceNotFound(f"No such price: '{price_id}'")
+        return self.prices[price_id]
+
+    def list_subscriptions(self, customer=None):
+        self.calls.append(("subscriptions", customer))
+        return [s for s in self.subscriptions if customer in (None, s["customer"])]
+
+    def list_customers(self):
+        self.calls.append(("customers", None))
+        return list(self.customers.values())
+
+    def list_prices(self):
+        self.calls.append(("prices", None))
+        return list(self.prices.values())
+
+
+def _mirror(tmp_path, client):
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'stripe.db'}")
+    return StripeMirror(session_factory=sessionmaker(bind=engine), client=client), engine
+
+
+def test_webhook_events_feed_request_reads_without_stripe_calls(tmp_path):
+    yearly = {"id": "price_college_yearly", "object": "price", "active": True, "currency": "usd", "unit_amount": 297000}
+    client = FakeStripe(prices=[yearly])
+    mirror, engine = _mirror(tmp_path, client)
+    events = json.loads(FIXTURES.read_text())
+
+    assert [mirror.apply_event(e) for e in events] == [True] * len(events)
+    # Stripe redelivers an event, and an older event for the subscription arrives late
+    assert mirror.apply_event(events[0]) is False
+    late = copy.deepcopy(events[2])
+    late["id"] = "evt_1PcSubCreatedRetry"
+    assert mirror.apply_event(late) is True
+    assert mirror.stats["duplicates"] == 1 and mirror.stats["stale"] == 1
+
+    async def reads():
+        session = await mirror.get_checkout_session("cs_test_a1B2c3")
+        customer = await mirror.get_customer(session["customer"])
+        subscriptions = await mirror.active_subscriptions("cus_Q1alpha")
+        prices = await mirror.get_prices(["price_college_monthly", "price_college_yearly", "price_gone"])
+        again = await mirror.get_prices(["price_college_yearly"])
+        return session, customer, subscriptions, prices, again
+
+    session, customer, subscriptions, prices, again = asyncio.run(reads())
+    assert session["payment_status"] == "paid" and customer["email"] == "registrar@example.edu"
+    assert [s["status"] for s in subscriptions] == ["active"]
+    assert prices["price_college_monthly"]["unit_amount"] == 29700
+    assert prices["price_college_yearly"]["unit_amount"] == 297000 and again["price_college_yearly"] == yearly
+    assert isinstance(prices["price_gone"], PriceNotFound)
+    # Only the two prices the webhooks never mentioned reached Stripe, once each
+    assert client.calls == [("price", "price_college_yearly"), ("price", "price_gone")]
+
+    with engine.connect() as conn:
+        row = conn.execute(sa.select(stripe_subscriptions)).mappings().one()
+    assert row["status"] == "active" and row["price_id"] == "price_college_monthly"
+    assert row["current_period_end"] == 1723978400
+
+
+def test_reconcile_repairs_missed_webhooks(tmp_path):
+    customer = {"id": "cus_Q2beta", "object": "customer", "email": "Dean@Example.edu"}
+    subscription = {"id": "sub_2beta", "object": "subscription", "customer": "cus_Q2beta",
+                    "status": "canceled", "cancel_at_period_end": False, "items": {"data": []}}
+    client = FakeStripe(customers=[customer], subscriptions=[subscription])
+    mirror, _ = _mirror(tmp_path, client)
+
+    # Webhook said active; the cancellation event was never delivered
+    mirror.apply_event({"id": "evt_old", "type": "customer.subscription.updated", "created": 1000,
+                        "data": {"object": dict(subscription, status="active")}})
+    assert len(asyncio.run(mirror.active_subscriptions("cus_Q2beta"))) == 1
+
+    assert mirror.reconcile() == {"customers": 1, "subscriptions": 1, "prices": 0}
+    assert asyncio.run(mirror.active_subscriptions("cus_Q2beta")) == []
+
+    assert ("subscriptions", "cus_Q2beta") not in client.calls
+
+
+def test_event_id_is_recorded_only_after_handling(tmp_path):
+    mirror, _ = _mirror(tmp_path, FakeStripe())
+    event = json.loads(FIXTURES.read_text())[0]
+
+    # The handler failed after the mirror update: the retry must be processed again
+    assert mirror.apply_event(event, record=False) is True
+    assert mirror.apply_event(event, record=False) is True
+
+    assert mirror.record_event(event) is True
+    assert mirror.apply_event(event, record=False) is False
+    assert mirror.record_event(event) is False
+
+
+def test_webhook_retry_after_failed_user_write_sends_emails_once(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    import pytest
+    from fastapi import HTTPException
+
+    from src.a3e.api.routes import billing
+    from src.a3e.services import database_service, email_service, stripe_mirror
+
+    mirror, _ = _mirror(tmp_path, FakeStripe())
+    monkeypatch.setattr(stripe_mirror, "_mirror", mirror)
+    monkeypatch.delenv("STRIPE_WEBHOOK_SECRET", raising=False)
+    event = json.loads(FIXTURES.read_text())[0]
+    sent = []
+    for name in ("send_welcome_email", "send_admin_new_signup_notification", "send_password_setup_email"):
+        monkeypatch.setattr(email_service.email_service, name,
+                            lambda *a, _name=name, **kw: sent.append(_name) or True)
+
+    db_up = {"ok": False}
+    existing = SimpleNamespace()
+
+    class FakeSession:
+        async def execute(self, stmt):
+            return SimpleNamespace(scalar_one_or_none=lambda: existing)
+
+        async def commit(self):
+            if not db_up["ok"]:
+                raise ConnectionError("database unavailable")
+
+    class FakeDatabaseService:
+        def __init__(self, url):
+            pass
+
+        def get_session(self):
+            class Ctx:
+                async def __aenter__(self):
+                    return FakeSession()
+
+                async def __aexit__(self, *exc):
+                    return False
+
+            return Ctx()
+
+    monkeypatch.setattr(database_service, "DatabaseService", FakeDatabaseService)
+    request = SimpleNamespace(headers={}, body=lambda: asyncio.sleep(0, json.dumps(event).encode()))
+
+    with pytest.raises(HTTPException):
+        asyncio.run(billing.stripe_webhook(request))
+    assert sent == []  # nothing went out for the failed delivery
+
+    db_up["ok"] = True
+    assert asyncio.run(billing.stripe_webhook(request))["status"] == "success"
+    assert asyncio.run(billing.stripe_webhook(request))["status"] == "duplicate"
+    assert sent == ["send_welcome_email", "send_admin_new_signup_notification"]
@@ -0,0 +1,135 @@
+import asyncio
+import multiprocessing
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+
+from src.a3e.services.multi_tenant import (
+    MultiTenantService,
+    TenantConfiguration,
+    TenantStatus,
+    TenantTier,
+)
+from src.a3e.services.tenant_metering import (
+    MemoryCounterBackend,
+    SqlCounterBackend,
+    TenantMeter,
+    ensure_metering_table,
+    period_key,
+)
+
+WORKERS = 4
+ATTEMPTS = 40
+DOCUMENT_LIMIT = 57  # well under WORKERS * ATTEMPTS, so most attempts are refused
+API_CALLS = 30
+
+HOUR = 3600
+
+
+def _service(url, tenant_id, flush_batch=10_000):
+    engine = create_engine(url, connect_args={"timeout": 60})
+    meter = TenantMeter(SqlCounterBackend(engine), flush_batch=flush_batch)
+    service = MultiTenantService(meter=meter)
+    now = datetime.utcnow()
+    service.tenants[tenant_id] = TenantConfiguration(
+        tenant_id=tenant_id, organization_name="Metered College", domain="metered.edu",
+        status=TenantStatus.ACTIVE, tier=TenantTier.PROFESSIONAL, created_at=now, last_accessed=now,
+        max_documents=DOCUMENT_LIMIT, api_rate_limit=WORKERS * API_CALLS,
+    )
+    return service
+
+
+def _worker(url, tenant_id, start, results):
+    service = _service(url, tenant_id)
+
+    async def run():
+        granted = 0
+        for _ in range(ATTEMPTS):
+            granted += await service.consume_tenant_quota(tenant_id, "documents")
+        for _ in range(API_CALLS):
+            await service.record_tenant_usage(tenant_id, "api_request")
+        return granted
+
+    start.wait(timeout=30)
+    granted = asyncio.run(run())
+    assert service.meter.stats["flushes"] == 0  # API calls so far only in the local batch
+    service.meter.flush()
+    results.put(granted)
+
+
+def test_limits_hold_across_worker_processes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'metering.db'}"
+    ensure_metering_table(create_engine(url))  # what the Alembic migration creates
+    ctx = multiprocessing.get_context("spawn")
+    start, results = ctx.Event(), ctx.Queue()
+    workers = [ctx.Process(target=_worker, args=(url, "tenant_shared", start, results)) for _ in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+    start.set()
+    granted = [results.get(timeout=120) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=30)
+        assert worker.exitcode == 0
+
+    assert sum(granted) == DOCUMENT_LIMIT
+    assert sum(1 for g in granted if g) > 1  # the quota really was contended
+
+    service = _service(url, "tenant_shared")
+
+    async def check():
+        usage = await service.get_tenant_current_usage("tenant_shared")
+        return (usage, await service.check_tenant_limits("tenant_shared", "documents"),
+                await service.check_tenant_limits("tenant_shared", "api_requests"),
+                await service.consume_tenant_quota("tenant_shared", "api_requests"))
+
+    usage, documents_ok, api_ok, api_consumed = asyncio.run(check())
+    assert usage.documents_processed == DOCUMENT_LIMIT
+    assert usage.api_requests == WORKERS * API_CALLS
+    assert not documents_ok and not api_ok and not api_consumed
+
+
+def test_record_batches_until_flush_and_reads_include_pending():
+    class CountingBackend(MemoryCounterBackend):
+        calls = 0
+        fail = False
+
+        def increment(self, deltas):
+            type(self).calls += 1
+            if self.fail:
+                raise ConnectionError("backend down")
+            super().increment(deltas)
+
+    backend = CountingBackend()
+    meter = TenantMeter(backend, flush_batch=100)
+    for _ in range(99):
+        meter.record("t1", "documents")
+    meter.record("t1", "storage_gb", 0.25)
+    assert CountingBackend.calls == 1  # the 100th record flushed the whole batch at once
+    assert meter.usage("t1")["documents"] == 99 and meter.usage("t1")["storage_gb"] == 0.25
+
+    backend.fail = True
+    meter.record("t1", "documents", 5)
+    assert meter.flush() == 0 and meter.stats["flush_errors"] == 1
+    assert meter.usage("t1")["documents"] == 104  # kept locally, still visible
+    backend.fail = False
+    assert meter.flush() == 1
+    assert backend.read([period_key("t1", "documents")]) == [104]
+
+
+def test_sliding_window_and_monthly_rollups():
+    meter = TenantMeter(MemoryCounterBackend())
+    start = 10 * HOUR + HOUR / 2
+    meter.record("t1", "api_requests", 100, now=start)
+    meter.flush()
+
+    later = 11 * HOUR + HOUR / 4  # next bucket, a quarter in: 3/4 of the previous bucket still counts
+    assert meter.window_usage("t1", "api_requests", now=later) == pytest.approx(75)
+    meter.record("t1", "api_requests", 10, now=later)
+    assert meter.window_usage("t1", "api_requests", now=later) == pytest.approx(85)
+    assert meter.usage("t1", now=later)["api_requests"] == 110  # same month: nothing decays
+
+    assert meter.consume("t1", "api_requests", 5, limit=90, now=later)
+    assert not meter.consume("t1", "api_requests", 1, limit=90, now=later)
+    assert meter.window_usage("t1", "api_requests", now=later + 2 * HOUR) == 0
+    assert meter.usage("t1", now=later)["api_requests"] == 115
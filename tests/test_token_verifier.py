@@ -0,0 +1,93 @@
+import time
+
+import jwt
+
+from src.a3e.services.token_verifier import TokenVerifier, key_id_for
+
+
+def _token(secret, headers=None, **claims):
+    payload = {"sub": "user-1", "exp": int(time.time()) + 3600}
+    payload.update(claims)
+    return jwt.encode(payload, secret, algorithm="HS256", headers=headers)
+
+
+def test_kid_routes_to_one_key_and_legacy_ring_handles_the_rest(monkeypatch):
+    verifier = TokenVerifier(keys={"rot-2": "rotated-secret"}, legacy_secrets=["primary", "older"])
+    decodes = []
+    real_decode = jwt.decode
+
+    def counting_decode(token, key, *args, **kwargs):
+        decodes.append(key)
+        return real_decode(token, key, *args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+
+    assert verifier.verify(_token("rotated-secret", headers={"kid": "rot-2"}))["sub"] == "user-1"
+    assert decodes == ["rotated-secret"]
+
+    decodes.clear()
+    assert verifier.verify(_token("older"))["sub"] == "user-1"
+    assert decodes == ["primary", "older"]
+
+    # Legacy secrets are addressable by their fingerprint kid as well
+    decodes.clear()
+    headers = verifier.signing_headers("older")
+    assert headers == {"kid": key_id_for("older")}
+    assert verifier.verify(_token("older", headers=headers, n=1)) is not None
+    assert decodes == ["older"]
+
+    assert verifier.verify(_token("x", headers={"kid": "unknown"})) is None
+    assert verifier.signing_headers("not-in-ring") == {}
+
+
+def test_claims_are_cached_until_exp_and_revocable(monkeypatch):
+    verifier = TokenVerifier(legacy_secrets=["primary"])
+    token = _token("primary", jti="abc")
+
+    first = verifier.verify(token)
+    first["user_id"] = "mutated"
+    assert "user_id" not in verifier.verify(token)
+    assert verifier.stats["hits"] == 1 and verifier.stats["misses"] == 1
+
+    verifier.revoke_token(token)
+    assert verifier.verify(token) is None
+
+    other = _token("primary", jti="def")
+    assert verifier.verify(other) is not None
+    verifier.revoke_jti("def")
+    assert verifier.verify(other) is None
+
+    expired = _token("primary", exp=int(time.time()) - 10)
+    assert verifier.verify(expired) is None
+    assert verifier.verify(_token("wrong")) is None
+
+
+def test_lru_is_bounded():
+    verifier = TokenVerifier(legacy_secrets=["primary"], max_entries=2)
+    tokens = [_token("primary", n=i) for i in range(3)]
+    for t in tokens:
+        assert verifier.verify(t) is not None
+    assert len(verifier._cache) == 2
+
+
+def test_scoped_rings_hold_only_configured_secrets(monkeypatch):
+    from src.a3e.services import token_verifier
+
+    for name in ("JWT_SECRET", "ONBOARDING_SHARED_SECRET", "JWT_SIGNING_KEYS"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("JWT_SECRET", "onboarding-only")
+    monkeypatch.setattr(token_verifier, "_verifiers", {})
+
+    auth = token_verifier.get_token_verifier("auth")
+    simple = token_verifier.get_token_verifier("simple")
+    assert "onboarding-only" not in auth.legacy_secrets
+    assert "onboarding-only" in simple.legacy_secrets
+    for literal in ("dev-secret-change", "replace-with-generated-64-char-secret"):
+        assert literal not in simple.legacy_secrets
+        assert simple.verify(_token(literal)) is None
+        assert simple.verify(_token(literal, headers={"kid": key_id_for(literal)})) is None
+
+    token = _token("onboarding-only")
+    assert simple.verify(token) is not None and auth.verify(token) is None
+    token_verifier.revoke_token(token)
+    assert simple.verify(token) is None
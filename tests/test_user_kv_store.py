@@ -0,0 +1,47 @@
+import json
+import threading
+
+from src.a3e.services.user_kv_store import UserKVStore
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = tmp_path / "user_settings_store.json"
+    legacy.write_text(json.dumps({"a@example.com": {"tier": "pro"}, "b@example.com": {"tier": "starter"}}))
+    store = UserKVStore(str(tmp_path / "kv.sqlite3"))
+    store.register_legacy_source("settings", str(legacy))
+
+    assert store.get("settings", "a@example.com") == {"tier": "pro"}
+    store.put("settings", "a@example.com", {"tier": "enterprise"})
+    # A forced re-import never clobbers rows that already exist
+    assert store.import_legacy_json("settings", str(legacy), force=True) == 0
+    assert store.get("settings", "a@example.com") == {"tier": "enterprise"}
+    assert store.get("settings", "missing@example.com") == {}
+
+
+def test_compare_and_set_rejects_stale_version(tmp_path):
+    store = UserKVStore(str(tmp_path / "kv.sqlite3"))
+    assert store.compare_and_set("tasks", "u1", {"n": 1}, 0) == 1
+    assert store.compare_and_set("tasks", "u1", {"n": 2}, 0) is None
+    assert store.compare_and_set("tasks", "u1", {"n": 2}, 1) == 2
+    value, version = store.get_versioned("tasks", "u1")
+    assert value == {"n": 2} and version == 2
+
+
+def test_concurrent_updates_are_not_lost(tmp_path):
+    path = str(tmp_path / "kv.sqlite3")
+    # Separate store instances model separate worker processes sharing the file
+    stores = [UserKVStore(path) for _ in range(4)]
+
+    def _bump(store):
+        for _ in range(25):
+            store.update("sessions", "u1", lambda v: v.update({"count": v.get("count", 0) + 1}))
+
+    threads = [threading.Thread(target=_bump, args=(s,)) for s in stores]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert UserKVStore(path).get("sessions", "u1")["count"] == 100
+    # Cached readers observe writes made through other connections
+    assert stores[0].get("sessions", "u1")["count"] == 100
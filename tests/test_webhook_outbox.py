@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import hmac
+import json
+from datetime import datetime, timezone
+
+import httpx
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.a3e.services.webhook_dispatcher import WebhookDispatcher
+from src.a3e.services.webhook_service import (
+    WebhookEvent,
+    WebhookService,
+    ensure_outbox_table,
+    webhook_outbox,
+)
+
+
+class WebhookSink:
+    """Local HTTP endpoint: records requests, fails the first ``fail`` per path."""
+
+    def __init__(self, fail=None):
+        self.fail = dict(fail or {})
+        self.requests = []
+
+    async def __call__(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = {k.decode(): v.decode() for k, v in scope["headers"]}
+        self.requests.append((scope["path"], headers, body))
+        status = 200
+        if self.fail.get(scope["path"], 0) > 0:
+            self.fail[scope["path"]] -= 1
+            status = 500
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _setup(tmp_path, endpoints):
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'hooks.db'}")
+    with engine.begin() as conn:
+        conn.execute(sa.text(
+            "CREATE TABLE webhook_configs (id TEXT PRIMARY KEY, url TEXT, secret TEXT, headers TEXT,"
+            " events TEXT, institution_id TEXT, active BOOLEAN, last_triggered_at TIMESTAMP,"
+            " failure_count INTEGER DEFAULT 0, last_failure_at TIMESTAMP)"
+        ))
+        conn.execute(sa.text(
+            "CREATE TABLE webhook_deliveries (id TEXT PRIMARY KEY, webhook_id TEXT, event TEXT, payload TEXT,"
+            " status TEXT, response_status INTEGER, response_body TEXT, error_message TEXT, attempts INTEGER,"
+            " created_at TIMESTAMP, delivered_at TIMESTAMP)"
+        ))
+        for webhook_id, url, institution_id in endpoints:
+            conn.execute(
+                sa.text("INSERT INTO webhook_configs VALUES (:id, :url, 's3cret', NULL, :events, :inst, 1, NULL, 0, NULL)"),
+                {"id": webhook_id, "url": url, "inst": institution_id,
+                 "events": json.dumps([WebhookEvent.EVIDENCE_UPLOADED.value])},
+            )
+    ensure_outbox_table(engine)
+    return engine, sessionmaker(bind=engine)
+
+
+def _outbox(engine):
+    with engine.connect() as conn:
+        return [dict(r) for r in conn.execute(sa.select(webhook_outbox)).mappings()]
+
+
+def _queue(Session, event_data, institution_id=None):
+    with Session() as db:
+        asyncio.run(WebhookService().trigger_webhook(db, WebhookEvent.EVIDENCE_UPLOADED, event_data, institution_id))
+        db.commit()
+
+
+def test_trigger_joins_caller_transaction(tmp_path):
+    engine, _ = _setup(tmp_path, [])
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'hooks.db'}")
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+    service = WebhookService(session_factory=AsyncSession)
+
+    async def run():
+        async with AsyncSession() as db:
+            await db.execute(sa.text("CREATE TABLE IF NOT EXISTS business (id INTEGER)"))
+            await db.commit()
+
+        async with AsyncSession() as db:
+            await db.execute(sa.text("INSERT INTO business VALUES (1)"))
+            await service.trigger_event(WebhookEvent.EVIDENCE_UPLOADED, {"id": 1}, "inst-1", db=db)
+            await db.rollback()
+        assert _outbox(engine) == []
+
+        async with AsyncSession() as db:
+            await db.execute(sa.text("INSERT INTO business VALUES (2)"))
+            await service.trigger_event(WebhookEvent.EVIDENCE_UPLOADED, {"id": 2}, "inst-1", db=db)
+            assert _outbox(engine) == []  # nothing written before the caller commits
+            await db.commit()
+        rows = _outbox(engine)
+        assert len(rows) == 1 and rows[0]["status"] == "pending" and rows[0]["webhook_id"] is None
+
+        assert await service.trigger_event(WebhookEvent.EVIDENCE_UPLOADED, {"id": 3})
+        assert len(_outbox(engine)) == 2
+        await async_engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_dispatcher_fans_out_signs_and_batches_delivery_logs(tmp_path):
+    engine, Session = _setup(tmp_path, [
+        ("wh-a", "http://sink/a", "inst-1"),
+        ("wh-b", "http://sink/b", None),
+        ("wh-other", "http://sink/other", "inst-2"),
+    ])
+    sink = WebhookSink()
+    _queue(Session, {"evidence_id": "e1"}, "inst-1")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=sink)) as client:
+            dispatcher = WebhookDispatcher(session_factory=Session, client=client)
+            assert await dispatcher.run_once() == 1
+            assert await dispatcher.run_once() == 0
+            return dispatcher
+
+    dispatcher = asyncio.run(run())
+    assert sorted(path for path, _, _ in sink.requests) == ["/a", "/b"]
+    for _, headers, body in sink.requests:
+        expected = "sha256=" + hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+        assert headers["x-webhook-signature"] == expected
+        assert json.loads(body)["data"] == {"evidence_id": "e1"}
+
+    statuses = sorted((r["webhook_id"] or "", r["status"]) for r in _outbox(engine))
+    assert statuses == [("", "fanned_out"), ("wh-a", "delivered"), ("wh-b", "delivered")]
+    with engine.connect() as conn:
+        logged = conn.execute(sa.text("SELECT webhook_id, status FROM webhook_deliveries ORDER BY webhook_id")).all()
+    assert [tuple(r) for r in logged] == [("wh-a", "delivered"), ("wh-b", "delivered")]
+    assert dispatcher.stats.delivered == 2
+
+
+def test_failures_back_off_trip_breaker_and_die(tmp_path):
+    engine, Session = _setup(tmp_path, [("wh-a", "http://sink/a", None)])
+    sink = WebhookSink(fail={"/a": 10})
+    _queue(Session, {"evidence_id": "e1"})
+
+    def make_due():
+        with engine.begin() as conn:
+            conn.execute(webhook_outbox.update().values(next_attempt_at=datetime.now(timezone.utc)))
+
+    def child():
+        return next(r for r in _outbox(engine) if r["webhook_id"] == "wh-a")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=sink)) as client:
+            dispatcher = WebhookDispatcher(session_factory=Session, client=client, max_attempts=2,
+                                           breaker_threshold=1, breaker_cooldown=3600)
+            await dispatcher.run_once()
+            row = child()
+            assert row["status"] == "pending" and row["attempts"] == 1 and row["last_error"] == "HTTP 500"
+            assert await dispatcher.run_once() == 0  # backoff: not due yet
+
+            # Circuit is open: rescheduled without an HTTP call or an attempt
+            make_due()
+            await dispatcher.run_once()
+            assert len(sink.requests) == 1 and child()["attempts"] == 1
+            assert dispatcher.stats.short_circuited == 1
+
+            dispatcher._breakers["wh-a"].open_until = 0.0
+            make_due()
+            await dispatcher.run_once()
+            assert child()["status"] == "dead"
+
+    asyncio.run(run())
+    with engine.connect() as conn:
+        assert conn.execute(sa.text("SELECT COUNT(*) FROM webhook_deliveries")).scalar() == 2
+        assert conn.execute(sa.text("SELECT failure_count FROM webhook_configs")).scalar() == 1
+
+
+def test_lease_outlasts_the_slowest_batch():
+    dispatcher = WebhookDispatcher(session_factory=lambda: None, batch_size=100, per_endpoint_concurrency=4,
+                                   request_timeout=30.0)
+    # 100 rows to one endpoint, 4 at a time, each timing out after 30 s
+    assert dispatcher.lease_seconds > 25 * 30.0
+    assert WebhookDispatcher(session_factory=lambda: None, batch_size=8, per_endpoint_concurrency=4,
+                             request_timeout=5.0).lease_seconds < dispatcher.lease_seconds